@@ -0,0 +1,60 @@
+"""
+Metrics Endpoint - Process-local Performance Metrics
+パイプライン各段階・外部API呼び出しの処理時間ヒストグラム（p50/p95/p99）を公開
+"""
+from typing import Dict, Any, Optional
+from fastapi import APIRouter, Query
+
+from app_2.infrastructure.integrations.openai.openai_response_cache import get_openai_response_cache
+from app_2.pipelines.job_queue import get_pipeline_job_queue
+from app_2.pipelines.result_cache import get_pipeline_result_cache
+from app_2.infrastructure.integrations.redis.redis_pool_manager import get_redis_pool_manager
+from app_2.infrastructure.integrations.redis.redis_pubsub_dispatcher import get_redis_pubsub_dispatcher
+from app_2.prompt_loader import PromptLoader
+from app_2.utils.metrics import get_metrics_registry
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("")
+async def get_metrics(
+    prefix: Optional[str] = Query(None, description="メトリクス名のプレフィックスで絞り込み（例: pipeline.stage）")
+) -> Dict[str, Any]:
+    """
+    プロセス内メトリクスのスナップショットを取得
+
+    メトリクス名の例:
+    - pipeline.stage.ocr / mapping / categorize / bulk_save / parallel_trigger
+    - pipeline.total / pipeline.total_cached
+    - external.google_vision.* / external.google_translate.* / external.google_search.* / external.openai.*
+    - openai.response_cache.<prompt>.hits / misses
+    - db.commit / redis.publish / redis.pool.acquire
+
+    Args:
+        prefix: メトリクス名のプレフィックス
+
+    Returns:
+        Dict: ヒストグラム・カウンター・ゲージ（APIプロセス単位）
+    """
+    snapshot = get_metrics_registry().snapshot(prefix)
+    snapshot["pipeline"] = {
+        "job_queue": get_pipeline_job_queue().stats(),
+        "result_cache": get_pipeline_result_cache().stats()
+    }
+    snapshot["prompt_cache"] = PromptLoader.cache_stats()
+    snapshot["openai_response_cache"] = get_openai_response_cache().stats()
+    snapshot["redis_pool"] = get_redis_pool_manager().stats()
+    snapshot["sse_dispatcher"] = get_redis_pubsub_dispatcher().stats()
+    return snapshot
+
+
+@router.post("/reset")
+async def reset_metrics() -> Dict[str, Any]:
+    """
+    プロセス内メトリクスをリセット
+
+    Returns:
+        Dict: リセット結果
+    """
+    get_metrics_registry().reset()
+    return {"status": "reset"}
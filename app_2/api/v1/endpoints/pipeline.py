@@ -3,11 +3,15 @@ Pipeline Endpoint - Enhanced Menu Processing with Staged Updates
 OCR→Mapping→Categorize処理の段階別DB更新とSSE配信対応エンドポイント
 """
 import uuid
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from fastapi import APIRouter, UploadFile, File, HTTPException, status, Query
 from fastapi.responses import JSONResponse
 
+from app_2.core.config import settings
+from app_2.infrastructure.integrations.redis.redis_viewport_hint import get_redis_viewport_hint
+from app_2.pipelines.job_queue import PipelineQueueFullError, get_pipeline_job_queue
 from app_2.pipelines.pipeline_runner import get_menu_processing_pipeline
+from app_2.pipelines.result_cache import get_pipeline_result_cache
 from app_2.utils.logger import get_logger
 
 logger = get_logger("pipeline_endpoint")
@@ -236,6 +240,166 @@ async def process_menu_image_with_session(
         )
 
 
+def _log_queue_full(session_id: str, job_queue) -> None:
+    logger.warning(f"⚠️ Pipeline queue full, rejecting session={session_id}: {job_queue.stats()}")
+
+
+def _queue_full_exception(detail: str) -> HTTPException:
+    """キュー満杯時の 503 レスポンス"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=detail,
+        headers={"Retry-After": "30"}
+    )
+
+
+async def _mark_session_rejected(session_id: str) -> None:
+    """受付を拒否したセッションを FAILED に更新（失敗しても例外は送出しない）"""
+    try:
+        from app_2.core.database import async_session_factory
+        from app_2.domain.entities.session_entity import SessionStatus
+        from app_2.services.dependencies import get_session_repository
+        
+        async with async_session_factory() as db_session:
+            session_repo = get_session_repository(db_session)
+            session_entity = await session_repo.get_by_id(session_id)
+            if session_entity and session_entity.status == SessionStatus.PENDING:
+                session_entity.update_status(SessionStatus.FAILED)
+                await session_repo.update(session_entity)
+    except Exception as e:
+        logger.error(f"❌ Failed to mark rejected session {session_id} as FAILED: {e}")
+
+
+@router.post("/process-async", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
+async def process_menu_image_async(
+    file: UploadFile = File(..., description="メニュー画像ファイル (JPEG, PNG, WEBP対応)"),
+    session_id: Optional[str] = Query(None, description="フロントエンドで生成されたセッションID（省略時は自動生成）")
+) -> JSONResponse:
+    """
+    メニュー画像の非同期受付（202 Accepted）
+    
+    アップロードを検証・保持した時点で即座に 202 を返し、
+    OCR→Mapping→Categorize 以降の処理はバックグラウンドで実行する。
+    処理結果は SSE で受信し、待機中の順番は queue エンドポイントで確認できる。
+    
+    Args:
+        file: アップロードされた画像ファイル
+        session_id: セッションID（オプション）
+        
+    Returns:
+        JSONResponse: 受付結果
+        {
+            "session_id": "uuid",
+            "status": "accepted",
+            "queue_position": 0,
+            "sse_info": {...},
+            "status_url": "/api/v1/pipeline/session/{session_id}/status",
+            "queue_url": "/api/v1/pipeline/session/{session_id}/queue"
+        }
+    """
+    session_id = session_id or str(uuid.uuid4())
+    
+    logger.info(f"📥 Async pipeline request received: session={session_id}, file={file.filename}")
+    
+    # ファイル形式チェック
+    if not file.content_type or not file.content_type.startswith('image/'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid file type: {file.content_type}. Only image files are supported."
+        )
+    
+    # 画像データ読み込み
+    image_data = await file.read()
+    
+    if not image_data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Empty file uploaded"
+        )
+    
+    max_upload_bytes = settings.pipeline.max_upload_bytes
+    if len(image_data) > max_upload_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large: {len(image_data)} bytes (max {max_upload_bytes} bytes)"
+        )
+    
+    job_queue = get_pipeline_job_queue()
+    status_info = job_queue.get_status(session_id)
+    if status_info["state"] != "not_queued":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Session {session_id} is already {status_info['state']}"
+        )
+    
+    # キューが満杯ならセッションを登録せずに拒否
+    if job_queue.is_full():
+        _log_queue_full(session_id, job_queue)
+        raise _queue_full_exception(f"Pipeline queue is full ({job_queue.stats()['queued']}/{job_queue.max_queued} waiting)")
+    
+    try:
+        # 受付時点でセッションをPENDINGとして登録（ステータス照会用）
+        from app_2.core.database import async_session_factory
+        from app_2.domain.entities.session_entity import SessionEntity, SessionStatus
+        from app_2.services.dependencies import get_session_repository
+        
+        async with async_session_factory() as db_session:
+            session_repo = get_session_repository(db_session)
+            existing_session = await session_repo.get_by_id(session_id)
+            if existing_session and existing_session.status in (SessionStatus.PROCESSING, SessionStatus.COMPLETED):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Session {session_id} is already {existing_session.status.value}"
+                )
+            await session_repo.upsert_session(
+                SessionEntity(session_id=session_id, status=SessionStatus.PENDING)
+            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Failed to register pending session: session={session_id}, error={e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to register session: {str(e)}"
+        )
+    
+    pipeline = get_menu_processing_pipeline()
+    filename = file.filename
+    
+    try:
+        queue_position = job_queue.submit(
+            session_id,
+            lambda: pipeline.process_menu_image(
+                session_id=session_id,
+                image_data=image_data,
+                filename=filename
+            )
+        )
+    except PipelineQueueFullError as e:
+        # 登録後に満杯になった場合は PENDING のまま残さず FAILED にする（同じ session_id で再送可能）
+        _log_queue_full(session_id, job_queue)
+        await _mark_session_rejected(session_id)
+        raise _queue_full_exception(str(e))
+    
+    logger.info(f"✅ Async pipeline accepted: session={session_id}, queue_position={queue_position}")
+    
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "session_id": session_id,
+            "status": "accepted",
+            "queue_position": queue_position,
+            "sse_info": {
+                "channel": f"sse:{session_id}",
+                "connection_url": f"/api/v1/sse/stream/{session_id}",
+                "message": "Connect to SSE for real-time updates"
+            },
+            "status_url": f"/api/v1/pipeline/session/{session_id}/status",
+            "queue_url": f"/api/v1/pipeline/session/{session_id}/queue"
+        }
+    )
+
+
 @router.get("/health")
 async def health_check() -> Dict[str, Any]:
     """
@@ -262,6 +426,8 @@ async def health_check() -> Dict[str, Any]:
             "Parallel background processing"
         ],
         "sse_channels": "sse:{session_id}",
+        "result_cache": get_pipeline_result_cache().stats(),
+        "job_queue": get_pipeline_job_queue().stats(),
         "message": "Enhanced Pipeline: OCR → Mapping → Categorize with realtime DB updates and SSE broadcasts"
     }
 
@@ -319,4 +485,121 @@ async def get_session_status(session_id: str) -> Dict[str, Any]:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve session status: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+
+@router.post("/session/{session_id}/resume", response_model=Dict[str, Any])
+async def resume_session(
+    session_id: str,
+    file: Optional[UploadFile] = File(None, description="メニュー画像（OCR未完了のセッションを再開する場合のみ必要）")
+) -> JSONResponse:
+    """
+    失敗したセッションを最後に完了した段階から再開
+    
+    stages_data に保存済みの成果物（OCR結果・マッピング・カテゴライズ結果）を復元し、
+    未完了の段階のみ実行する。OCR完了済みであれば画像の再アップロードは不要。
+    
+    Args:
+        session_id: セッションID
+        file: メニュー画像ファイル（オプション）
+        
+    Returns:
+        JSONResponse: 処理結果（restored_stages に再利用した段階を含む）
+    """
+    image_data = None
+    if file is not None:
+        if not file.content_type or not file.content_type.startswith('image/'):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid file type: {file.content_type}. Only image files are supported."
+            )
+        image_data = await file.read() or None
+    
+    try:
+        logger.info(f"🔁 Pipeline resume requested: session={session_id}, image_provided={image_data is not None}")
+        
+        pipeline = get_menu_processing_pipeline()
+        result = await pipeline.resume_menu_processing(session_id, image_data=image_data)
+    except Exception as e:
+        logger.error(f"❌ Pipeline resume failed: session={session_id}, error={e}")
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={
+                "session_id": session_id,
+                "status": "error",
+                "error": {
+                    "type": "processing_error",
+                    "message": str(e)
+                },
+                "sse_info": {
+                    "channel": f"sse:{session_id}",
+                    "connection_url": f"/api/v1/sse/stream/{session_id}",
+                    "message": "Error details have been broadcasted via SSE"
+                }
+            }
+        )
+    
+    if result.get("status") == "error":
+        error_status = {
+            "session_not_found": status.HTTP_404_NOT_FOUND,
+            "not_resumable": status.HTTP_409_CONFLICT,
+            "image_required": status.HTTP_422_UNPROCESSABLE_ENTITY
+        }.get(result.get("error_type"), status.HTTP_400_BAD_REQUEST)
+        raise HTTPException(status_code=error_status, detail=result.get("error_message"))
+    
+    result["sse_info"] = {
+        "channel": f"sse:{session_id}",
+        "connection_url": f"/api/v1/sse/stream/{session_id}",
+        "message": "Connect to SSE for real-time updates"
+    }
+    
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content=result
+    )
+
+@router.get("/session/{session_id}/queue")
+async def get_session_queue_position(session_id: str) -> Dict[str, Any]:
+    """
+    非同期受付されたセッションのキュー位置を取得
+    
+    Args:
+        session_id: セッションID
+        
+    Returns:
+        Dict: キュー状態（queued / running / not_queued）と位置
+    """
+    job_queue = get_pipeline_job_queue()
+    return {
+        "session_id": session_id,
+        **job_queue.get_status(session_id),
+        "queue_stats": job_queue.stats()
+    }
+
+
+@router.post("/session/{session_id}/viewport", status_code=status.HTTP_202_ACCEPTED)
+async def set_viewport_hint(
+    session_id: str,
+    category: str = Query(..., min_length=1, description="クライアントが表示中のカテゴリ名")
+) -> Dict[str, Any]:
+    """
+    ビューポートヒントを登録（表示中カテゴリのアイテムのエンリッチ処理を優先）
+    
+    ヒントは処理中のタスクにも反映され、未開始のバッチのうち該当カテゴリを含むものから処理される。
+    優先度付けのためのヒントのため、記録に失敗しても処理結果には影響しない。
+    
+    Args:
+        session_id: セッションID
+        category: 表示中のカテゴリ名
+        
+    Returns:
+        Dict: 記録結果と現在の優先カテゴリ
+    """
+    viewport_hint = get_redis_viewport_hint()
+    recorded = await viewport_hint.set_hint(session_id, category)
+    return {
+        "session_id": session_id,
+        "category": category,
+        "recorded": recorded,
+        "boosted_categories": await viewport_hint.get_boosted_categories(session_id) if recorded else []
+    }
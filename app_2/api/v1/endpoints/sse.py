@@ -1,16 +1,32 @@
 """
 SSE (Server-Sent Events) Endpoint - Real-time Communication
 Redis Pub/Sub経由でクライアントにリアルタイム更新を配信
+（購読接続はプロセス共通のディスパッチャーで多重化）
+
+Publisher が整形済みのSSEフレームはパースせずそのまま転送し、
+menu_update の結合・展開など中身が必要な場合のみパースする
 """
 
 import asyncio
 import json
-from typing import AsyncGenerator, List, Dict
-from fastapi import APIRouter, HTTPException, status, Request
+from datetime import datetime
+from typing import AsyncGenerator, AsyncIterator, List, Dict, Optional
+from fastapi import APIRouter, HTTPException, status, Request, Query
 from fastapi.responses import StreamingResponse
 
 
-from app_2.infrastructure.integrations.redis.redis_subscriber import RedisSubscriber
+from app_2.core.config import settings
+from app_2.infrastructure.integrations.redis.menu_update_batch import (
+    MENU_BATCH_UPDATE,
+    MENU_UPDATE,
+    MenuUpdateBuffer,
+    build_menu_batch_update_data,
+    expand_menu_batch_update
+)
+from app_2.infrastructure.integrations.redis.redis_event_log import RedisEventLog, parse_event_id
+from app_2.infrastructure.integrations.redis.redis_pubsub_dispatcher import get_redis_pubsub_dispatcher
+from app_2.infrastructure.integrations.redis.sse_event import SSEEvent, format_sse_frame
+from app_2.services.dependencies import get_redis_client
 from app_2.utils.logger import get_logger
 
 logger = get_logger("sse_endpoint")
@@ -59,17 +75,8 @@ async def format_sse_message(message_data: dict) -> str:
         str: SSE形式の文字列
     """
     try:
-        # メッセージタイプを取得
-        message_type = message_data.get("type", "unknown")
-        
-        # JSONデータを文字列化
-        data_json = json.dumps(message_data, ensure_ascii=False)
-        
-        # SSE形式でフォーマット
-        sse_message = f"event: {message_type}\n"
-        sse_message += f"data: {data_json}\n\n"
-        
-        return sse_message
+        # SSE形式でフォーマット（イベントログのIDがあれば id: を付与）
+        return format_sse_frame(message_data)
         
     except Exception as e:
         logger.error(f"❌ Failed to format SSE message: {e}")
@@ -85,22 +92,107 @@ async def format_sse_message(message_data: dict) -> str:
         return f"event: error\ndata: {error_json}\n\n"
 
 
-async def create_sse_stream(session_id: str, connection_id: str) -> AsyncGenerator[str, None]:
+async def expand_menu_batches(events: AsyncIterator[SSEEvent]) -> AsyncGenerator[SSEEvent, None]:
+    """menu_batch_update を個別の menu_update に展開（オプトインしていないクライアント用）"""
+    async for event in events:
+        # menu_batch_update 以外はパースせずそのまま転送
+        if event.type != MENU_BATCH_UPDATE:
+            yield event
+            continue
+        for expanded_message in expand_menu_batch_update(event.message):
+            yield SSEEvent.from_message(expanded_message)
+
+
+async def coalesce_menu_updates(
+    events: AsyncIterator[SSEEvent],
+    session_id: str,
+    window_seconds: float
+) -> AsyncGenerator[SSEEvent, None]:
+    """
+    menu_update / menu_batch_update を時間ウィンドウでまとめて menu_batch_update として返す
+    
+    - 最初の更新からウィンドウ経過時点でまとめて送信（(menu_id, task_type) ごとに後勝ち）
+    - 他のメッセージが届いた場合は順序を保つため先にまとめた更新を送信（パースせずそのまま転送）
+    """
+    loop = asyncio.get_running_loop()
+    iterator = events.__aiter__()
+    buffer = MenuUpdateBuffer()
+    latest_event_id = None
+    deadline = None
+    pending_next = None
+    
+    def batch_event() -> SSEEvent:
+        nonlocal latest_event_id, deadline
+        message = {
+            "type": MENU_BATCH_UPDATE,
+            "session_id": session_id,
+            "data": build_menu_batch_update_data(buffer.drain()),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        if latest_event_id:
+            message["event_id"] = latest_event_id
+        latest_event_id, deadline = None, None
+        return SSEEvent.from_message(message)
+    
+    try:
+        while True:
+            # 受信待ちはウィンドウをまたいで継続（キャンセルしない）
+            if pending_next is None:
+                pending_next = asyncio.ensure_future(iterator.__anext__())
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            done, _ = await asyncio.wait({pending_next}, timeout=timeout)
+            
+            if not done:
+                yield batch_event()
+                continue
+            
+            next_event, pending_next = pending_next, None
+            try:
+                event = next_event.result()
+            except StopAsyncIteration:
+                if len(buffer):
+                    yield batch_event()
+                return
+            
+            if event.type in (MENU_UPDATE, MENU_BATCH_UPDATE):
+                buffer.add_message(event.message)
+                latest_event_id = event.event_id or latest_event_id
+                if deadline is None:
+                    deadline = loop.time() + window_seconds
+                continue
+            
+            if len(buffer):
+                yield batch_event()
+            yield event
+    finally:
+        if pending_next is not None and not pending_next.done():
+            pending_next.cancel()
+
+
+async def create_sse_stream(
+    session_id: str,
+    connection_id: str,
+    last_event_id: Optional[str] = None,
+    coalesce_window_seconds: Optional[float] = None
+) -> AsyncGenerator[str, None]:
     """
     SSEストリームを作成
     
     Args:
         session_id: セッションID
         connection_id: 接続ID
+        last_event_id: 再接続時にクライアントが最後に受信したイベントID
+        coalesce_window_seconds: 指定時は menu_update をまとめて menu_batch_update で送信
         
     Yields:
         str: SSE形式のメッセージ
     """
-    subscriber = None
+    dispatcher = get_redis_pubsub_dispatcher()
+    subscription = None
     
     try:
-        # Redis Subscriberを初期化
-        subscriber = RedisSubscriber()
+        # 共有の購読接続でセッションチャンネルを購読（履歴送信中のメッセージもキューに保持）
+        subscription = await dispatcher.subscribe(settings.celery.get_sse_channel(session_id))
         
         # 接続をマネージャーに追加
         connection_manager.add_connection(session_id, connection_id)
@@ -122,18 +214,46 @@ async def create_sse_stream(session_id: str, connection_id: str) -> AsyncGenerat
         
         logger.info(f"📡 SSE stream started for session: {session_id}")
         
-        # 🎯 セッション状態をチェックして既存の進捗履歴を送信
-        history_messages = await get_session_history(session_id)
-        for history_message in history_messages:
-            yield await format_sse_message(history_message)
+        # 🎯 再接続時はイベントログから取りこぼしたイベントのみ再送（DBにアクセスしない）
+        replay = None
+        if last_event_id and settings.celery.sse_event_log_enabled:
+            replay = await RedisEventLog(get_redis_client()).read_after(session_id, last_event_id)
+        
+        # イベントログで補完できない場合はセッション状態から既存の進捗履歴を送信
+        if replay is None or not replay.complete:
+            history_messages = await get_session_history(session_id)
+            for history_message in history_messages:
+                yield await format_sse_message(history_message)
+        
+        last_sent_position = parse_event_id(last_event_id)
+        for replayed_message in (replay.events if replay else []):
+            last_sent_position = parse_event_id(replayed_message["event_id"])
+            if coalesce_window_seconds is None:
+                for expanded_message in expand_menu_batch_update(replayed_message):
+                    yield await format_sse_message(expanded_message)
+            else:
+                yield await format_sse_message(replayed_message)
+        
+        async def live_events() -> AsyncGenerator[SSEEvent, None]:
+            async for live_event in subscription:
+                # 再送済みのイベントは重複配信しない（購読開始後・再送前に配信された分）
+                event_position = parse_event_id(live_event.event_id) if last_sent_position else None
+                if event_position and event_position <= last_sent_position:
+                    continue
+                yield live_event
         
-        # Redisメッセージを受信してSSE配信
-        async for message in subscriber.listen_for_session_messages(session_id):
+        # menu_update はクライアントの指定に応じてまとめる・個別に展開する
+        if coalesce_window_seconds is None:
+            event_source = expand_menu_batches(live_events())
+        else:
+            event_source = coalesce_menu_updates(live_events(), session_id, coalesce_window_seconds)
+        
+        # Redisメッセージを受信してSSE配信（整形済みフレームはそのまま送信）
+        async for event in event_source:
             try:
-                # メッセージをSSE形式でフォーマット
-                sse_message = await format_sse_message(message)
+                sse_message = event.frame
                 
-                logger.debug(f"📨 SSE message sent: session={session_id}, type={message.get('type', 'unknown')}")
+                logger.debug(f"📨 SSE message sent: session={session_id}, type={event.type}")
                 yield sse_message
                 
             except Exception as e:
@@ -173,8 +293,8 @@ async def create_sse_stream(session_id: str, connection_id: str) -> AsyncGenerat
         try:
             connection_manager.remove_connection(session_id, connection_id)
             
-            if subscriber:
-                await subscriber.cleanup()
+            if subscription:
+                await dispatcher.unsubscribe(subscription)
                 
             logger.info(f"🔌 SSE stream cleanup completed for session: {session_id}")
             
@@ -269,13 +389,25 @@ async def get_session_history(session_id: str) -> List[Dict]:
 
 
 @router.get("/stream/{session_id}")
-async def stream_session_events(session_id: str, request: Request):
+async def stream_session_events(
+    session_id: str,
+    request: Request,
+    last_event_id: Optional[str] = Query(None, description="再送開始位置（Last-Event-IDヘッダーを送れないクライアント用）"),
+    coalesce: bool = Query(False, description="menu_update をまとめて menu_batch_update で受信する"),
+    coalesce_ms: Optional[int] = Query(None, ge=10, le=2000, description="まとめるウィンドウ（ミリ秒、指定時は coalesce を有効化）")
+):
     """
     SSEエンドポイント - セッション固有のリアルタイム更新を配信
     
+    SSE_EVENT_LOG_ENABLED 時は各イベントに id: が付き、再接続時の Last-Event-ID ヘッダー
+    （または last_event_id クエリ）以降のイベントを Redis Stream から再送する
+    
     Args:
         session_id: セッションID
         request: HTTPリクエスト
+        last_event_id: 最後に受信したイベントID
+        coalesce: menu_batch_update で受信するか（オプトイン）
+        coalesce_ms: まとめるウィンドウ（既定 SSE_COALESCE_DEFAULT_MS）
         
     Returns:
         StreamingResponse: SSEストリーミングレスポンス
@@ -305,7 +437,12 @@ async def stream_session_events(session_id: str, request: Request):
     user_agent = request.headers.get("user-agent", "unknown")[:50]
     connection_id = f"{client_ip}_{hash(user_agent) % 10000}"
     
-    logger.info(f"🚀 SSE connection requested: session={session_id}, client={client_ip}")
+    last_event_id = request.headers.get("last-event-id") or last_event_id
+    coalesce_window_seconds = None
+    if coalesce or coalesce_ms:
+        coalesce_window_seconds = (coalesce_ms or settings.celery.sse_coalesce_default_ms) / 1000
+    
+    logger.info(f"🚀 SSE connection requested: session={session_id}, client={client_ip}, last_event_id={last_event_id}")
     
     # SSEヘッダーを設定
     headers = {
@@ -313,14 +450,14 @@ async def stream_session_events(session_id: str, request: Request):
         "Cache-Control": "no-cache",
         "Connection": "keep-alive",
         "Access-Control-Allow-Origin": "*",
-        "Access-Control-Allow-Headers": "Cache-Control",
+        "Access-Control-Allow-Headers": "Cache-Control, Last-Event-ID",
         "X-Accel-Buffering": "no",  # nginxでのバッファリング無効化
     }
     
     try:
         # SSEストリームを作成
         return StreamingResponse(
-            create_sse_stream(session_id, connection_id),
+            create_sse_stream(session_id, connection_id, last_event_id, coalesce_window_seconds),
             media_type="text/event-stream",
             headers=headers
         )
@@ -412,7 +549,7 @@ async def test_sse_message(session_id: str, message: dict):
     try:
         from app_2.infrastructure.integrations.redis.redis_publisher import RedisPublisher
         
-        publisher = RedisPublisher()
+        publisher = RedisPublisher(get_redis_client())
         
         # テストメッセージを送信
         success = await publisher.publish_session_message(
@@ -4,6 +4,7 @@ Minimal Celery configuration for 5-task async pipeline processing
 """
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 from app_2.core.config import settings
 from app_2.utils.logger import get_logger
@@ -70,6 +71,12 @@ def get_celery_config() -> dict:
         
         # 🎯 Redis specific settings
         "visibility_timeout": 3600,  # 1時間
+        # タスク優先度（Redis ブローカーは 0 が最優先。画面上位アイテムのメッセージを先に処理）
+        "broker_transport_options": {
+            "priority_steps": list(range(10)),
+            "sep": ":",
+            "queue_order_strategy": "priority",
+        },
         "result_expires": 3600,      # 1時間
     }
 
@@ -97,6 +104,47 @@ def create_celery_app() -> Celery:
 celery_app = create_celery_app()
 
 
+# ==========================================
+# Worker Process Lifecycle
+# ==========================================
+
+@worker_process_init.connect
+def _init_worker_process(**kwargs) -> None:
+    """
+    ワーカープロセス起動時の初期化
+
+    - 親プロセスから fork で引き継いだDB/Redis接続プールを破棄（接続を共有しない）
+    - 常駐イベントループを起動（タスク間でHTTP/DB/Redis接続プールを維持）
+    - プロンプト/スキーマYAMLを事前読み込み
+    """
+    from app_2.core.database import engine
+    from app_2.core.worker_loop import get_worker_loop_runner
+    from app_2.infrastructure.integrations.redis.redis_pool_manager import get_redis_pool_manager
+    from app_2.prompt_loader import PromptLoader
+    
+    engine.sync_engine.dispose(close=False)
+    get_redis_pool_manager().reset()
+    get_worker_loop_runner().start()
+    PromptLoader().preload_all()
+    logger.info("✅ Worker process initialized with persistent event loop")
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_process(**kwargs) -> None:
+    """ワーカープロセス終了時に接続プールを閉じてイベントループを停止"""
+    from app_2.core.database import engine
+    from app_2.core.worker_loop import get_worker_loop_runner
+    
+    async def _cleanup() -> None:
+        await engine.dispose()
+        from app_2.services.dependencies import get_redis_client
+        from app_2.infrastructure.integrations.redis.redis_pool_manager import get_redis_pool_manager
+        await get_redis_client().cleanup()
+        await get_redis_pool_manager().close_loop_pools()
+    
+    get_worker_loop_runner().stop(cleanup=_cleanup())
+
+
 # ==========================================
 # Export
 # ==========================================
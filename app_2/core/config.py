@@ -4,6 +4,7 @@
 - AI/API設定 (OpenAI, Gemini, Imagen)
 - AWS設定 (S3, Secrets Manager)
 - Redis/Celery設定
+- パイプライン設定 (結果キャッシュ等)
 - CORS設定
 """
 
@@ -67,11 +68,53 @@ class AISettings(BaseModel):
     google_cloud_project_id: Optional[str] = os.getenv("GOOGLE_CLOUD_PROJECT_ID")
     google_search_engine_id: Optional[str] = os.getenv("GOOGLE_SEARCH_ENGINE_ID")
     
+    # Google SDK実行スレッドプール（プロバイダー別の最大同時呼び出し数）
+    google_vision_max_workers: int = int(os.getenv("GOOGLE_VISION_MAX_WORKERS", 4))
+    google_translate_max_workers: int = int(os.getenv("GOOGLE_TRANSLATE_MAX_WORKERS", 8))
+    google_search_max_workers: int = int(os.getenv("GOOGLE_SEARCH_MAX_WORKERS", 8))
+    
+    # Google Translate セッション単位一括翻訳（重複除去して複数テキストを1リクエストで翻訳）
+    google_translate_batch_enabled: bool = os.getenv("GOOGLE_TRANSLATE_BATCH_ENABLED", "true").lower() == "true"
+    google_translate_max_segments: int = int(os.getenv("GOOGLE_TRANSLATE_MAX_SEGMENTS", 128))
+    google_translate_max_request_chars: int = int(os.getenv("GOOGLE_TRANSLATE_MAX_REQUEST_CHARS", 5000))
+    
+    # 翻訳メモリ（Redis: 参照のたびにTTL延長 / PostgreSQL: 最終参照から保持期間を過ぎたら削除）
+    translation_memory_enabled: bool = os.getenv("TRANSLATION_MEMORY_ENABLED", "true").lower() == "true"
+    translation_memory_redis_prefix: str = os.getenv("TRANSLATION_MEMORY_REDIS_PREFIX", "tm:")
+    translation_memory_redis_ttl_seconds: int = int(os.getenv("TRANSLATION_MEMORY_REDIS_TTL", 7 * 24 * 3600))
+    translation_memory_retention_days: int = int(os.getenv("TRANSLATION_MEMORY_RETENTION_DAYS", 180))
+    translation_memory_purge_interval_seconds: int = int(os.getenv("TRANSLATION_MEMORY_PURGE_INTERVAL", 3600))
+    
     # OpenAI設定
     openai_model_name: str = "gpt-4.1-mini"
     openai_timeout: float = float(os.getenv("OPENAI_TIMEOUT", 120.0))
     openai_max_retries: int = int(os.getenv("OPENAI_MAX_RETRIES", 3))
     
+    # OpenAI複数アイテム一括呼び出し（describe / allergen / ingredient）
+    openai_batch_enabled: bool = os.getenv("OPENAI_BATCH_ENABLED", "true").lower() == "true"
+    openai_batch_max_items: int = int(os.getenv("OPENAI_BATCH_MAX_ITEMS", 8))
+    openai_batch_token_budget: int = int(os.getenv("OPENAI_BATCH_TOKEN_BUDGET", 6000))
+    
+    # 外部API分散レート制限（全ワーカー共通の Redis トークンバケット、RPM / TPM）
+    rate_limit_enabled: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    rate_limit_max_wait_seconds: float = float(os.getenv("RATE_LIMIT_MAX_WAIT_SECONDS", 120.0))
+    rate_limit_redis_backoff_seconds: float = float(os.getenv("RATE_LIMIT_REDIS_BACKOFF_SECONDS", 30.0))
+    openai_rate_limit_rpm: int = int(os.getenv("OPENAI_RATE_LIMIT_RPM", 500))
+    openai_rate_limit_tpm: int = int(os.getenv("OPENAI_RATE_LIMIT_TPM", 200000))
+    openai_rate_limit_output_tokens: int = int(os.getenv("OPENAI_RATE_LIMIT_OUTPUT_TOKENS", 800))
+    google_vision_rate_limit_rpm: int = int(os.getenv("GOOGLE_VISION_RATE_LIMIT_RPM", 1800))
+    google_translate_rate_limit_rpm: int = int(os.getenv("GOOGLE_TRANSLATE_RATE_LIMIT_RPM", 600))
+    google_search_rate_limit_rpm: int = int(os.getenv("GOOGLE_SEARCH_RATE_LIMIT_RPM", 100))
+    
+    # OpenAI Function Calling 応答キャッシュ（オプトイン、プロンプト名をカンマ区切りで指定 / "*" で全プロンプト）
+    openai_response_cache_enabled: bool = os.getenv("OPENAI_RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+    openai_response_cache_backend: str = os.getenv("OPENAI_RESPONSE_CACHE_BACKEND", "redis")  # redis / postgres
+    openai_response_cache_prompts: str = os.getenv("OPENAI_RESPONSE_CACHE_PROMPTS", "*")
+    openai_response_cache_prefix: str = os.getenv("OPENAI_RESPONSE_CACHE_PREFIX", "openai_cache:")
+    openai_response_cache_ttl_seconds: int = int(os.getenv("OPENAI_RESPONSE_CACHE_TTL", 24 * 3600))
+    openai_response_cache_max_entries: int = int(os.getenv("OPENAI_RESPONSE_CACHE_MAX_ENTRIES", 10000))
+    openai_response_cache_purge_interval_seconds: int = int(os.getenv("OPENAI_RESPONSE_CACHE_PURGE_INTERVAL", 600))
+    
     # Gemini設定
     gemini_model: str = "gemini-2.0-flash-exp"
     
@@ -122,6 +165,50 @@ class CelerySettings(BaseModel):
     redis_url: str = os.getenv("REDIS_URL")
     sse_channel_prefix: str = os.getenv("SSE_CHANNEL_PREFIX", "sse:")
     
+    # プロセス共通のRedis接続プール（URL × イベントループ単位）
+    redis_max_connections: int = int(os.getenv("REDIS_MAX_CONNECTIONS", 100))
+    redis_pool_timeout: float = float(os.getenv("REDIS_POOL_TIMEOUT", 5))
+    redis_health_check_interval: int = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+    
+    # SSE配信用のPub/Sub多重化（購読接続数・接続ごとの受信キュー上限・遅い接続の扱い）
+    sse_pubsub_shards: int = int(os.getenv("SSE_PUBSUB_SHARDS", 1))
+    sse_subscriber_queue_size: int = int(os.getenv("SSE_SUBSCRIBER_QUEUE_SIZE", 256))
+    sse_slow_consumer_policy: str = os.getenv("SSE_SLOW_CONSUMER_POLICY", "drop_oldest")  # drop_oldest / disconnect
+    
+    # SSEイベントログ（セッションごとの Redis Stream、Last-Event-ID による再接続時の再送）
+    sse_event_log_enabled: bool = os.getenv("SSE_EVENT_LOG_ENABLED", "false").lower() == "true"
+    sse_event_log_prefix: str = os.getenv("SSE_EVENT_LOG_PREFIX", "sse_log:")
+    sse_event_log_maxlen: int = int(os.getenv("SSE_EVENT_LOG_MAXLEN", 1000))
+    sse_event_log_ttl_seconds: int = int(os.getenv("SSE_EVENT_LOG_TTL_SECONDS", 3600))
+    
+    # Publisher が整形済みSSEフレームを配信し、SSE接続はそのまま転送（イベントごとに1回だけシリアライズ）
+    sse_preserialized_frames: bool = os.getenv("SSE_PRESERIALIZED_FRAMES", "true").lower() == "true"
+    
+    # menu_update の結合（menu_batch_update）
+    # 配信側: タスクの menu_update を指定ミリ秒まとめて1回の PUBLISH にする（0で無効）
+    sse_publish_coalesce_ms: int = int(os.getenv("SSE_PUBLISH_COALESCE_MS", 0))
+    # SSE側: ?coalesce=true のクライアントに送る menu_batch_update の既定ウィンドウ
+    sse_coalesce_default_ms: int = int(os.getenv("SSE_COALESCE_DEFAULT_MS", 150))
+    
+    # タスク結果のDB書き込みバッファ（write-behind: 件数・待機時間で一括UPDATE）
+    write_behind_enabled: bool = os.getenv("WRITE_BEHIND_ENABLED", "true").lower() == "true"
+    write_behind_max_items: int = int(os.getenv("WRITE_BEHIND_MAX_ITEMS", 50))
+    write_behind_max_latency_ms: int = int(os.getenv("WRITE_BEHIND_MAX_LATENCY_MS", 200))
+    write_behind_max_attempts: int = int(os.getenv("WRITE_BEHIND_MAX_ATTEMPTS", 3))
+
+    # BatchProcessor の同時実行バッチ数の自動調整（AIMD: レイテンシ・エラー・429 から加算増加 / 乗算減少）
+    batch_adaptive_enabled: bool = os.getenv("BATCH_ADAPTIVE_ENABLED", "false").lower() == "true"
+    batch_adaptive_min_concurrency: int = int(os.getenv("BATCH_ADAPTIVE_MIN_CONCURRENCY", 1))
+    batch_adaptive_max_concurrency: int = int(os.getenv("BATCH_ADAPTIVE_MAX_CONCURRENCY", 8))
+    batch_adaptive_increase_step: float = float(os.getenv("BATCH_ADAPTIVE_INCREASE_STEP", 1.0))
+    batch_adaptive_decrease_factor: float = float(os.getenv("BATCH_ADAPTIVE_DECREASE_FACTOR", 0.5))
+    batch_adaptive_latency_target_ms: int = int(os.getenv("BATCH_ADAPTIVE_LATENCY_TARGET_MS", 15000))
+
+    # アイテム単位のタスク完了チェックポイント（リトライ・再配信時に完了済みアイテムを再処理しない）
+    task_checkpoint_enabled: bool = os.getenv("TASK_CHECKPOINT_ENABLED", "true").lower() == "true"
+    task_checkpoint_prefix: str = os.getenv("TASK_CHECKPOINT_PREFIX", "task_done:")
+    task_checkpoint_ttl_seconds: int = int(os.getenv("TASK_CHECKPOINT_TTL_SECONDS", 86400))
+
     def get_sse_channel(self, session_id: str) -> str:
         """SSE用チャンネル名を生成"""
         return f"{self.sse_channel_prefix}{session_id}"
@@ -151,6 +238,46 @@ class CelerySettings(BaseModel):
             return False
 
 
+# ==========================================
+# Pipeline Settings
+# ==========================================
+
+class PipelineSettings(BaseModel):
+    """メニュー処理パイプライン設定"""
+    
+    # 画像結果キャッシュ（OCR・Mapping・Categorize結果の再利用）
+    result_cache_enabled: bool = os.getenv("PIPELINE_RESULT_CACHE_ENABLED", "true").lower() == "true"
+    result_cache_ttl_seconds: int = int(os.getenv("PIPELINE_RESULT_CACHE_TTL", 3600))
+    result_cache_max_entries: int = int(os.getenv("PIPELINE_RESULT_CACHE_MAX_ENTRIES", 128))
+    
+    # 非同期受付モード（APIプロセスあたりの同時実行数・待機上限）
+    max_concurrent_pipelines: int = int(os.getenv("PIPELINE_MAX_CONCURRENCY", 4))
+    max_queued_pipelines: int = int(os.getenv("PIPELINE_MAX_QUEUE_SIZE", 100))
+    max_upload_bytes: int = int(os.getenv("PIPELINE_MAX_UPLOAD_BYTES", 10 * 1024 * 1024))
+    
+    # DAGステージ設定（タイムアウト・同時実行数）
+    ocr_stage_timeout_seconds: float = float(os.getenv("PIPELINE_OCR_TIMEOUT", 90))
+    categorize_stage_timeout_seconds: float = float(os.getenv("PIPELINE_CATEGORIZE_TIMEOUT", 180))
+    categorize_max_concurrency: int = int(os.getenv("PIPELINE_CATEGORIZE_CONCURRENCY", 4))
+    
+    # 説明・アレルギー・内容物の生成方式（separate: 個別3タスク / fused: 統合エンリッチ1タスク）
+    enrichment_mode: str = os.getenv("ENRICHMENT_MODE", "separate").lower()
+    
+    # 並列タスクのメッセージに session_id のみを載せ、ワーカーがDBから必要なカラムを1クエリで読み込む
+    slim_task_messages: bool = os.getenv("PIPELINE_SLIM_TASK_MESSAGES", "true").lower() == "true"
+    
+    # エンリッチ処理の優先順位（位置・カテゴリ順 + クライアントのビューポートヒントで上位のアイテムから処理）
+    enrichment_priority_enabled: bool = os.getenv("ENRICHMENT_PRIORITY_ENABLED", "true").lower() == "true"
+    # 上位N件を高優先度のCeleryメッセージとして分割送信（0で分割しない）
+    priority_head_items: int = int(os.getenv("PIPELINE_PRIORITY_HEAD_ITEMS", 0))
+    viewport_hint_prefix: str = os.getenv("VIEWPORT_HINT_PREFIX", "viewport:")
+    viewport_hint_max_categories: int = int(os.getenv("VIEWPORT_HINT_MAX_CATEGORIES", 3))
+    viewport_hint_ttl_seconds: int = int(os.getenv("VIEWPORT_HINT_TTL_SECONDS", 3600))
+    
+    def is_fused_enrichment(self) -> bool:
+        return self.enrichment_mode == "fused"
+
+
 # ==========================================
 # Unified Configuration Management
 # ==========================================
@@ -163,6 +290,7 @@ class Settings:
         self.ai = AISettings()
         self.aws = AWSSettings()
         self.celery = CelerySettings()
+        self.pipeline = PipelineSettings()
     
     def validate_all(self) -> Dict[str, List[str]]:
         """全設定の妥当性を検証"""
@@ -270,6 +398,7 @@ base_settings = settings.base
 ai_settings = settings.ai
 aws_settings = settings.aws
 celery_settings = settings.celery
+pipeline_settings = settings.pipeline
 
 
 # ==========================================
@@ -314,6 +443,7 @@ __all__ = [
     "AISettings", 
     "AWSSettings",
     "CelerySettings",
+    "PipelineSettings",
     "Settings",
     
     # Compatibility aliases
@@ -321,6 +451,7 @@ __all__ = [
     "ai_settings",
     "aws_settings", 
     "celery_settings",
+    "pipeline_settings",
     
     # Utility functions
     "validate_settings",
@@ -11,12 +11,16 @@ Clean Architecture-based database connection management
 
 from typing import AsyncGenerator
 
-from sqlalchemy import MetaData, text
+import time
+
+from sqlalchemy import MetaData, event, text
+from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 
 from app_2.core.config import settings
 from app_2.utils.logger import get_logger
+from app_2.utils.metrics import get_metrics_registry
 
 logger = get_logger("database")
 
@@ -106,6 +110,35 @@ async_session_factory = async_sessionmaker(
 )
 
 
+# ==========================================
+# Commit Timing
+# ==========================================
+
+_COMMIT_STARTED_KEY = "_commit_started_at"
+
+
+@event.listens_for(Session, "before_commit")
+def _record_commit_start(session: Session) -> None:
+    """コミット開始時刻を記録（flush + COMMIT の往復時間を計測）"""
+    session.info[_COMMIT_STARTED_KEY] = time.perf_counter()
+
+
+@event.listens_for(Session, "after_commit")
+def _record_commit_duration(session: Session) -> None:
+    """コミット完了時に処理時間をメトリクスへ記録"""
+    started_at = session.info.pop(_COMMIT_STARTED_KEY, None)
+    if started_at is not None:
+        get_metrics_registry().observe("db.commit", time.perf_counter() - started_at)
+
+
+@event.listens_for(Session, "after_rollback")
+def _record_commit_failure(session: Session) -> None:
+    """コミット失敗（ロールバック）をエラーとして記録"""
+    started_at = session.info.pop(_COMMIT_STARTED_KEY, None)
+    if started_at is not None:
+        get_metrics_registry().observe("db.commit", time.perf_counter() - started_at, success=False)
+
+
 # ==========================================
 # Database Session Management
 # ==========================================
@@ -203,8 +236,12 @@ async def init_database():
     try:
         from app_2.infrastructure.models.menu_model import MenuModel  # noqa: F401
         from app_2.infrastructure.models.session_model import SessionModel  # noqa: F401
+        from app_2.infrastructure.models.translation_memory_model import TranslationMemoryModel  # noqa: F401
+        from app_2.infrastructure.models.openai_response_cache_model import OpenAIResponseCacheModel  # noqa: F401
         logger.info("📊 MenuModel imported and registered")
         logger.info("📊 SessionModel imported and registered")
+        logger.info("📊 TranslationMemoryModel imported and registered")
+        logger.info("📊 OpenAIResponseCacheModel imported and registered")
     except ImportError as e:
         logger.warning(f"⚠️ Failed to import models: {e}")
     
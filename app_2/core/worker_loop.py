@@ -0,0 +1,134 @@
+"""
+Worker Event Loop - Menu Processor v2
+Celeryワーカープロセスごとに1つの常駐asyncioイベントループを提供
+
+タスクごとに asyncio.run() でループを作り直すと、AsyncOpenAI / SQLAlchemy async engine /
+Redis などのコネクションプールが破棄済みループに紐づいたままになるため、
+ワーカー起動時（worker_process_init）に専用スレッドでループを起動し、
+各タスクはそのループへコルーチンを投入して結果を待つ。
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, Coroutine, Optional
+
+from app_2.utils.logger import get_logger
+
+logger = get_logger("worker_loop")
+
+
+class WorkerLoopRunner:
+    """
+    常駐イベントループ（専用デーモンスレッドで run_forever）
+
+    start() はワーカープロセス初期化時に呼ばれるが、
+    未起動のまま run() が呼ばれた場合は遅延起動する
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop
+
+    def is_running(self) -> bool:
+        return self._loop is not None and self._loop.is_running()
+
+    def start(self) -> None:
+        """イベントループスレッドを起動（起動済みなら何もしない）"""
+        with self._lock:
+            if self.is_running():
+                return
+
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def _run_loop() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_run_loop, name="worker-event-loop", daemon=True)
+            thread.start()
+            started.wait()
+
+            self._loop = loop
+            self._thread = thread
+            logger.info("🔁 Worker event loop started")
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """
+        コルーチンを常駐ループで実行し、完了まで呼び出し元スレッドをブロック
+
+        Args:
+            coro: 実行するコルーチン
+            timeout: 待機タイムアウト秒数（None は無制限）
+
+        Returns:
+            Any: コルーチンの戻り値（例外はそのまま送出）
+        """
+        if not self.is_running():
+            self.start()
+
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("WorkerLoopRunner.run() cannot be called from the worker loop thread")
+
+        future: Future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # タイムアウト・SoftTimeLimitExceeded 等で中断された場合はループ側のタスクも取り消す
+            future.cancel()
+            raise
+
+    def stop(self, cleanup: Optional[Coroutine[Any, Any, Any]] = None, timeout: float = 10.0) -> None:
+        """
+        イベントループを停止
+
+        Args:
+            cleanup: 停止前にループ上で実行するクリーンアップ処理
+            timeout: クリーンアップ・スレッド終了の待機秒数
+        """
+        with self._lock:
+            if not self.is_running():
+                if cleanup is not None:
+                    cleanup.close()
+                return
+
+            loop, thread = self._loop, self._thread
+            if cleanup is not None:
+                try:
+                    asyncio.run_coroutine_threadsafe(cleanup, loop).result(timeout)
+                except Exception as e:
+                    logger.warning(f"⚠️ Worker loop cleanup failed: {e}")
+
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not loop.is_running():
+                loop.close()
+
+            self._loop = None
+            self._thread = None
+            logger.info("🛑 Worker event loop stopped")
+
+
+@lru_cache(maxsize=1)
+def get_worker_loop_runner() -> WorkerLoopRunner:
+    """
+    WorkerLoopRunnerのシングルトンインスタンスを取得
+
+    Returns:
+        WorkerLoopRunner: ワーカープロセスの常駐イベントループ
+    """
+    return WorkerLoopRunner()
+
+
+def run_in_worker_loop(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """コルーチンをワーカーの常駐ループで実行（Celeryタスクから使用）"""
+    return get_worker_loop_runner().run(coro, timeout)
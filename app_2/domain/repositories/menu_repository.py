@@ -4,7 +4,7 @@ Abstract repository for menu data access
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
 from app_2.domain.entities.menu_entity import MenuEntity
 
@@ -71,6 +71,20 @@ class MenuRepositoryInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    async def get_task_items(self, session_id: str, item_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Celeryタスクの入力となるメニューアイテムを取得（必要なカラムのみ）
+        
+        Args:
+            session_id: セッションID
+            item_ids: 対象メニューIDの部分集合（省略時はセッション内の全メニュー）
+            
+        Returns:
+            List[Dict[str, Any]]: メニューアイテムの辞書一覧（メニュー上の並び順）
+        """
+        pass
+    
     @abstractmethod
     async def update(self, menu: MenuEntity) -> MenuEntity:
         """
@@ -98,6 +112,33 @@ class MenuRepositoryInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    async def update_columns(self, menu_id: str, fields: Dict[str, Any]) -> bool:
+        """
+        指定カラムのみを1文で更新（読み取り・書き戻しなし）
+        
+        Args:
+            menu_id: メニューID
+            fields: 更新するカラムの辞書
+            
+        Returns:
+            bool: 行が更新された場合 True
+        """
+        pass
+
+    @abstractmethod
+    async def bulk_update_fields(self, updates: Dict[str, Dict[str, Any]]) -> List[str]:
+        """
+        複数メニューの部分更新を一括実行
+        
+        Args:
+            updates: メニューID -> 更新フィールドの辞書
+            
+        Returns:
+            List[str]: 実際に更新されたメニューIDのリスト
+        """
+        pass
+
     @abstractmethod
     async def delete(self, menu_id: str) -> bool:
         """
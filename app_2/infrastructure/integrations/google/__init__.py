@@ -2,6 +2,7 @@ from app_2.infrastructure.integrations.google.google_credential_manager import g
 from app_2.infrastructure.integrations.google.google_vision_client import GoogleVisionClient, get_google_vision_client
 from app_2.infrastructure.integrations.google.google_translate_client import GoogleTranslateClient, get_google_translate_client
 from app_2.infrastructure.integrations.google.google_search_client import GoogleSearchClient, get_google_search_client
+from app_2.infrastructure.integrations.google.google_executor import BlockingCallExecutor, get_google_executor
 
 __all__ = [
     "get_google_credential_manager",
@@ -11,4 +12,6 @@ __all__ = [
     "get_google_vision_client",
     "get_google_translate_client",
     "get_google_search_client",
+    "BlockingCallExecutor",
+    "get_google_executor",
 ]
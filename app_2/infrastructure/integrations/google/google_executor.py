@@ -0,0 +1,128 @@
+"""
+Google SDK Executor - Blocking call adapter
+同期版 Google SDK（Vision / Translate v2 / Custom Search）の呼び出しを
+プロバイダー別の有界スレッドプールで実行し、イベントループをブロックしない
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict
+
+from app_2.core.config import settings
+from app_2.utils.logger import get_logger
+from app_2.utils.metrics import get_metrics_registry
+
+logger = get_logger("google_executor")
+
+
+class BlockingCallExecutor:
+    """
+    プロバイダー専用の有界スレッドプール
+
+    - max_workers を超える呼び出しはプール内で待機（待機時間をメトリクス化）
+    - 実行中/待機中の件数をゲージとして公開
+    """
+
+    def __init__(self, provider: str, max_workers: int):
+        self.provider = provider
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=f"google-{provider}"
+        )
+        self._lock = threading.Lock()
+        self._active = 0
+        self._pending = 0
+        self._metrics = get_metrics_registry()
+        self._metrics.set_gauge(f"google_executor.{provider}.max_workers", max_workers)
+        self._publish_gauges()
+
+    def _publish_gauges(self) -> None:
+        self._metrics.set_gauge(f"google_executor.{self.provider}.active", self._active)
+        self._metrics.set_gauge(f"google_executor.{self.provider}.pending", self._pending)
+        self._metrics.set_gauge(
+            f"google_executor.{self.provider}.occupancy",
+            round(self._active / self.max_workers, 3) if self.max_workers else 0.0
+        )
+
+    def _run_in_thread(self, submitted_at: float, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """ワーカースレッド側: 待機時間を記録してから実行"""
+        with self._lock:
+            self._pending -= 1
+            self._active += 1
+            self._publish_gauges()
+        self._metrics.observe(f"google_executor.{self.provider}.queue_wait", time.perf_counter() - submitted_at)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._publish_gauges()
+
+    def _on_call_done(self, future: Future) -> None:
+        """開始前にキャンセルされた呼び出し（呼び出し元のキャンセル・shutdown）は待機数から除外"""
+        if future.cancelled():
+            with self._lock:
+                self._pending -= 1
+                self._publish_gauges()
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        同期関数をスレッドプールで実行して結果を待機
+
+        Args:
+            func: 同期関数（SDK呼び出し）
+            *args, **kwargs: 関数の引数
+
+        Returns:
+            Any: 関数の戻り値（例外はそのまま送出）
+        """
+        with self._lock:
+            self._pending += 1
+            self._publish_gauges()
+        self._metrics.increment(f"google_executor.{self.provider}.submitted")
+
+        # 待機中に呼び出し元がキャンセルされると future もキャンセルされ、_run_in_thread は実行されない
+        future = self._executor.submit(self._run_in_thread, time.perf_counter(), func, *args, **kwargs)
+        future.add_done_callback(self._on_call_done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "provider": self.provider,
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "pending": self._pending
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+_PROVIDER_POOL_SIZES = {
+    "vision": lambda: settings.ai.google_vision_max_workers,
+    "translate": lambda: settings.ai.google_translate_max_workers,
+    "search": lambda: settings.ai.google_search_max_workers,
+}
+
+
+@lru_cache(maxsize=None)
+def get_google_executor(provider: str) -> BlockingCallExecutor:
+    """
+    プロバイダー別のBlockingCallExecutorを取得（プロバイダーごとにシングルトン）
+
+    Args:
+        provider: "vision" / "translate" / "search"
+
+    Returns:
+        BlockingCallExecutor: プロバイダー専用スレッドプール
+    """
+    if provider not in _PROVIDER_POOL_SIZES:
+        raise ValueError(f"Unknown Google provider: {provider}")
+    max_workers = _PROVIDER_POOL_SIZES[provider]()
+    logger.info(f"🧵 Google {provider} executor created: max_workers={max_workers}")
+    return BlockingCallExecutor(provider, max_workers)
@@ -2,10 +2,16 @@
 Google Search Client - Minimal Implementation
 """
 
+import threading
 from functools import lru_cache
 from typing import List, Dict
 
+import httplib2
+
 from app_2.infrastructure.integrations.google.google_credential_manager import get_google_credential_manager
+from app_2.infrastructure.integrations.google.google_executor import get_google_executor
+from app_2.infrastructure.integrations.redis.redis_rate_limiter import get_redis_rate_limiter
+from app_2.utils.metrics import span
 
 
 class GoogleSearchClient:
@@ -13,15 +19,19 @@ class GoogleSearchClient:
         credential_manager = get_google_credential_manager()
         self.service = credential_manager.get_search_service()
         self.search_engine_id = credential_manager.get_search_engine_id()
+        # httplib2.Http はスレッドセーフではないため、ワーカースレッドごとに保持
+        self._thread_local = threading.local()
+
+    def _get_thread_http(self) -> httplib2.Http:
+        http = getattr(self._thread_local, "http", None)
+        if http is None:
+            http = self._thread_local.http = httplib2.Http()
+        return http
 
     async def search_images(self, query: str, num_results: int = 10) -> List[Dict[str, str]]:
-        result = self.service.cse().list(
-            q=f"{query} food dish",
-            cx=self.search_engine_id,
-            searchType='image',
-            num=min(num_results, 10),
-            safe='active'
-        ).execute()
+        # 画像検索はバックグラウンド処理のため、対話的な処理の送信枠を残して待機
+        await get_redis_rate_limiter().acquire("google_search", priority="background")
+        result = await get_google_executor("search").run(self._search_sync, query, num_results)
         
         images = []
         if 'items' in result:
@@ -34,6 +44,17 @@ class GoogleSearchClient:
         
         return images
 
+    def _search_sync(self, query: str, num_results: int) -> dict:
+        """Custom Search API呼び出し（同期・ワーカースレッドで実行）"""
+        with span("external.google_search.cse_list"):
+            return self.service.cse().list(
+                q=f"{query} food dish",
+                cx=self.search_engine_id,
+                searchType='image',
+                num=min(num_results, 10),
+                safe='active'
+            ).execute(http=self._get_thread_http())
+
 
 @lru_cache(maxsize=1)
 def get_google_search_client():
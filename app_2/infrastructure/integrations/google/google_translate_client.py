@@ -2,11 +2,16 @@
 Google Translate Client - AWS Secrets Manager Integration
 """
 
+import asyncio
 from functools import lru_cache
 from typing import List
 
+from app_2.core.config import settings
 from app_2.infrastructure.integrations.google.google_credential_manager import get_google_credential_manager
+from app_2.infrastructure.integrations.google.google_executor import get_google_executor
+from app_2.infrastructure.integrations.redis.redis_rate_limiter import get_redis_rate_limiter
 from app_2.utils.logger import get_logger
+from app_2.utils.metrics import span
 
 logger = get_logger("google_translate_client")
 
@@ -40,7 +45,10 @@ class GoogleTranslateClient:
             # 認証済みクライアントを確保
             client = await self._ensure_client()
             
-            result = client.translate(text, target_language=target_language)
+            await get_redis_rate_limiter().acquire("google_translate")
+            result = await get_google_executor("translate").run(
+                self._translate_sync, client, text, target_language
+            )
             logger.info(f"Translation successful: '{text[:30]}...' -> '{result['translatedText'][:30]}...'")
             return result['translatedText']
             
@@ -49,6 +57,11 @@ class GoogleTranslateClient:
             # エラー時は元のテキストを返す
             return text
 
+    def _translate_sync(self, client, text: str, target_language: str) -> dict:
+        """Translate API呼び出し（同期・ワーカースレッドで実行）"""
+        with span("external.google_translate.translate"):
+            return client.translate(text, target_language=target_language)
+
     async def translate_list(self, texts: List[str], target_language: str = "ja") -> List[str]:
         """
         複数のテキストを翻訳
@@ -60,7 +73,73 @@ class GoogleTranslateClient:
         Returns:
             List[str]: 翻訳されたテキストのリスト
         """
-        return [await self.translate(text, target_language) for text in texts]
+        return await self.translate_batch(texts, target_language)
+
+    async def translate_batch(self, texts: List[str], target_language: str = "ja") -> List[str]:
+        """
+        複数のテキストを複数テキスト指定のリクエストで一括翻訳
+        
+        リクエストあたりのテキスト数・文字数の上限に収まるようチャンクに分割して呼び出す。
+        失敗したチャンクは元のテキストを返す。
+        
+        Args:
+            texts: 翻訳するテキストのリスト
+            target_language: 翻訳先言語コード（デフォルト: 日本語）
+            
+        Returns:
+            List[str]: 翻訳されたテキストのリスト（入力と同じ順序）
+        """
+        results = list(texts)
+        indexes = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not indexes:
+            return results
+        
+        try:
+            client = await self._ensure_client()
+        except Exception as e:
+            logger.error(f"Batch translation failed for {len(indexes)} texts: {e}")
+            return results
+        chunks = self._chunk_indexes(indexes, texts)
+        
+        async def translate_chunk(chunk: List[int]) -> None:
+            chunk_texts = [texts[i] for i in chunk]
+            try:
+                await get_redis_rate_limiter().acquire("google_translate")
+                translated = await get_google_executor("translate").run(
+                    self._translate_batch_sync, client, chunk_texts, target_language
+                )
+                for i, item in zip(chunk, translated):
+                    results[i] = item['translatedText']
+            except Exception as e:
+                logger.error(f"Batch translation failed for {len(chunk)} texts: {e}")
+        
+        await asyncio.gather(*(translate_chunk(chunk) for chunk in chunks))
+        logger.info(f"Batch translation completed: {len(indexes)} texts in {len(chunks)} requests")
+        return results
+
+    @staticmethod
+    def _chunk_indexes(indexes: List[int], texts: List[str]) -> List[List[int]]:
+        """テキスト数・合計文字数の上限でチャンクに分割"""
+        max_segments = settings.ai.google_translate_max_segments
+        max_chars = settings.ai.google_translate_max_request_chars
+        chunks: List[List[int]] = []
+        current: List[int] = []
+        current_chars = 0
+        for i in indexes:
+            length = len(texts[i])
+            if current and (len(current) >= max_segments or current_chars + length > max_chars):
+                chunks.append(current)
+                current, current_chars = [], 0
+            current.append(i)
+            current_chars += length
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _translate_batch_sync(self, client, texts: List[str], target_language: str) -> List[dict]:
+        """Translate API 複数テキスト呼び出し（同期・ワーカースレッドで実行）"""
+        with span("external.google_translate.translate_batch"):
+            return client.translate(texts, target_language=target_language)
 
 
 @lru_cache(maxsize=1)
@@ -9,7 +9,10 @@ from google.cloud import vision
 from google.api_core import exceptions as google_exceptions
 
 from app_2.infrastructure.integrations.google.google_credential_manager import get_google_credential_manager
+from app_2.infrastructure.integrations.google.google_executor import get_google_executor
+from app_2.infrastructure.integrations.redis.redis_rate_limiter import get_redis_rate_limiter
 from app_2.utils.logger import get_logger
+from app_2.utils.metrics import span
 
 logger = get_logger("google_vision_client")
 
@@ -78,8 +81,19 @@ class GoogleVisionClient:
                     await asyncio.sleep(wait_time)
                     continue
                     
+                elif attempt < max_retries and self._is_rate_limit_error(e):
+                    # Rate Limit: 全ワーカーの送信を止めてから再試行（停止できない場合のみ自前で待機）
+                    wait_time = 2 ** attempt
+                    logger.warning(
+                        f"Vision API rate limited (attempt {attempt + 1}/{max_retries + 1}): {e}. "
+                        f"Pausing requests for {wait_time} seconds..."
+                    )
+                    if not await get_redis_rate_limiter().report_rate_limited("google_vision", retry_after_seconds=wait_time):
+                        await asyncio.sleep(wait_time)
+                    continue
+                    
                 elif attempt < max_retries:
-                    # その他のエラー（Rate Limit等）
+                    # その他のエラー
                     wait_time = 2 ** attempt
                     logger.warning(
                         f"Vision API error (attempt {attempt + 1}/{max_retries + 1}): {e}. "
@@ -95,6 +109,14 @@ class GoogleVisionClient:
         # このコードには到達しないはずだが、念のため
         raise Exception("Unexpected error in Vision API retry logic")
 
+    @staticmethod
+    def _is_rate_limit_error(error: Exception) -> bool:
+        """Rate Limit / クォータ超過エラーか判定"""
+        if isinstance(error, google_exceptions.ResourceExhausted):
+            return True
+        error_message = str(error).lower()
+        return any(keyword in error_message for keyword in ["429", "resource exhausted", "rate limit", "quota"])
+
     async def _execute_vision_api_call(self, image_data: bytes, level: str) -> List[Dict[str, Union[str, float]]]:
         """
         実際のVision API呼び出しを実行
@@ -109,8 +131,29 @@ class GoogleVisionClient:
         # 認証済みクライアントを確保
         client = await self._ensure_client()
         
+        # OCR はユーザーが待つ段階のため最優先で送信枠を確保
+        await get_redis_rate_limiter().acquire("google_vision", priority="interactive")
+        
+        # 同期SDK呼び出しとレスポンス解析はVision専用スレッドプールで実行
+        return await get_google_executor("vision").run(
+            self._detect_text_sync, client, image_data, level
+        )
+
+    def _detect_text_sync(self, client, image_data: bytes, level: str) -> List[Dict[str, Union[str, float]]]:
+        """
+        Vision API呼び出しとレスポンス解析（同期・ワーカースレッドで実行）
+        
+        Args:
+            client: Vision APIクライアント
+            image_data: 画像バイナリデータ
+            level: 抽出レベル ("word" または "paragraph")
+            
+        Returns:
+            List[Dict]: テキストと位置情報の辞書リスト
+        """
         image = vision.Image(content=image_data)
-        response = client.document_text_detection(image=image)
+        with span("external.google_vision.document_text_detection"):
+            response = client.document_text_detection(image=image)
         
         if response.error.message:
             raise Exception(f"Vision API error: {response.error.message}")
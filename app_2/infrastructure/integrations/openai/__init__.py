@@ -2,6 +2,7 @@ from .openai_base_client import OpenAIBaseClient
 from .description_client import DescriptionClient, get_description_client
 from .allergen_client import AllergenClient, get_allergen_client
 from .ingredient_client import IngredientClient, get_ingredient_client
+from .enrich_client import EnrichClient, get_enrich_client
 from .categorize_client import CategorizeClient, get_categorize_client
 from .openai_client import OpenAIClient, get_openai_client
 
@@ -10,11 +11,13 @@ __all__ = [
     "DescriptionClient",
     "AllergenClient",
     "IngredientClient", 
+    "EnrichClient",
     "CategorizeClient",
     "OpenAIClient",
     "get_description_client",
     "get_allergen_client",
     "get_ingredient_client",
+    "get_enrich_client",
     "get_categorize_client",
     "get_openai_client",
 ]
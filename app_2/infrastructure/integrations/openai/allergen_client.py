@@ -47,7 +47,8 @@ class AllergenClient(OpenAIBaseClient):
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
                 functions=self._get_allergen_function_schema(),
-                function_call={"name": "extract_allergens"}
+                function_call={"name": "extract_allergens"},
+                prompt_name="allergen"
             )
             
             allergen_count = len(result.get("allergens", []))
@@ -65,6 +66,29 @@ class AllergenClient(OpenAIBaseClient):
                 "confidence": 0.0
             }
 
+    async def extract_allergens_batch(self, items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Extract allergens for several menu items with one request per token-budgeted chunk
+        
+        Args:
+            items: Items with "id", "name" and "category"
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Allergen results keyed by item id
+        """
+        async def single_call(item: Dict[str, Any]) -> Dict[str, Any]:
+            return await self.extract_allergens(item.get("name", ""), item.get("category", ""))
+
+        results = await self._run_batched_function_call(
+            prompt_name="allergen",
+            item_schema=self._get_allergen_function_schema()[0],
+            items=items,
+            single_call=single_call,
+            output_tokens_per_item=80
+        )
+        logger.info(f"Extracted allergens for {len(results)}/{len(items)} items (batched)")
+        return results
+
 
 @lru_cache(maxsize=1)
 def get_allergen_client() -> AllergenClient:
@@ -50,12 +50,13 @@ class CategorizeClient(OpenAIBaseClient):
         Returns:
             Dict[str, Any]: カテゴライズ結果
         """
-        # YAMLファイルからプロンプトを読み込み
-        prompts = self.prompt_loader.load_prompt("openai", "menu_analysis", "categorize")
-        menu_structure_prompts = prompts["menu_structure"]
-        
-        system_prompt = menu_structure_prompts["system"]
-        user_prompt = menu_structure_prompts["user"].format(
+        # YAMLファイルからプロンプトを読み込み（パース済みキャッシュを使用）
+        system_prompt = self.prompt_loader.get_template(
+            "openai", "menu_analysis", "categorize", "menu_structure", "system"
+        ).template
+        user_prompt = self.prompt_loader.get_template(
+            "openai", "menu_analysis", "categorize", "menu_structure", "user"
+        ).format(
             mapping_data=mapping_data,
             level=level
         )
@@ -65,7 +66,8 @@ class CategorizeClient(OpenAIBaseClient):
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
                 functions=self._get_menu_structure_categorize_function_schema(),
-                function_call={"name": "categorize_menu_structure"}
+                function_call={"name": "categorize_menu_structure"},
+                prompt_name="categorize"
             )
             
             logger.info("Menu structure categorization successful - structured JSON returned")
@@ -3,7 +3,7 @@ Description Client - Infrastructure Layer
 Specialized client for menu item description generation using prompts
 """
 from functools import lru_cache
-from typing import Dict, Any
+from typing import Dict, List, Any
 from app_2.utils.logger import get_logger
 from .openai_base_client import OpenAIBaseClient
 
@@ -43,6 +43,46 @@ class DescriptionClient(OpenAIBaseClient):
             return {
                 "description": f"{menu_item}は、厳選された食材を使用して丁寧に調理された料理です。独特の風味と食感をお楽しみいただけます。"
             }
+    def _get_description_function_schema(self) -> Dict[str, Any]:
+        """
+        Get single-item description schema (used to build the batched schema)
+        
+        Returns:
+            Dict[str, Any]: Function Calling schema definition
+        """
+        return self.prompt_loader.get_function_schema(
+            provider="openai",
+            category="menu_analysis",
+            schema_name="description",
+            function_name="describe_menu_item"
+        )
+
+    async def generate_descriptions_batch(self, items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate descriptions for several menu items with one request per token-budgeted chunk
+        
+        Args:
+            items: Items with "id", "name" and "category"
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: {"description": ...} keyed by item id
+        """
+        async def single_call(item: Dict[str, Any]) -> Dict[str, Any]:
+            return await self.generate_description(item.get("name", ""), item.get("category", ""))
+
+        results = await self._run_batched_function_call(
+            prompt_name="description",
+            item_schema=self._get_description_function_schema(),
+            items=items,
+            single_call=single_call,
+            output_tokens_per_item=200
+        )
+        logger.info(f"Generated descriptions for {len(results)}/{len(items)} items (batched)")
+        return {
+            item_id: {"description": str(result.get("description", "")).strip()}
+            for item_id, result in results.items()
+        }
+
 
 @lru_cache(maxsize=1)
 def get_description_client() -> DescriptionClient:
@@ -0,0 +1,166 @@
+"""
+Enrich Client - Infrastructure Layer
+Fused client generating description, allergen and ingredient information in one Function Calling pass
+"""
+from functools import lru_cache
+from typing import Dict, List, Any
+from app_2.utils.logger import get_logger
+from .openai_base_client import OpenAIBaseClient
+
+logger = get_logger("enrich_client")
+
+
+class EnrichClient(OpenAIBaseClient):
+    """
+    Fused menu enrichment client (Function Calling support)
+
+    Replaces three separate description / allergen / ingredient requests with one.
+    Results are split per task type so they match the output of the individual clients.
+    """
+
+    def __init__(self):
+        """Initialize enrich client"""
+        super().__init__()
+        logger.info("EnrichClient initialized")
+
+    def _get_enrich_function_schema(self) -> List[Dict[str, Any]]:
+        """
+        Get Function Calling schema for fused enrichment (loaded from YAML file)
+
+        Returns:
+            List[Dict[str, Any]]: Function Calling schema definition
+        """
+        schema = self.prompt_loader.get_function_schema(
+            provider="openai",
+            category="menu_analysis",
+            schema_name="enrich",
+            function_name="enrich_menu_item"
+        )
+        return [schema]
+
+    @staticmethod
+    def _fallback_allergen(reason: str) -> Dict[str, Any]:
+        return {
+            "allergens": [],
+            "allergen_free": False,
+            "notes": f"Unable to retrieve allergen information due to analysis error: {reason}",
+            "confidence": 0.0
+        }
+
+    @staticmethod
+    def _fallback_ingredient() -> Dict[str, Any]:
+        return {
+            "main_ingredients": [],
+            "cooking_method": [],
+            "cuisine_category": "unknown",
+            "flavor_profile": {
+                "taste": [],
+                "texture": "unknown",
+                "intensity": "unknown"
+            },
+            "dietary_info": {
+                "vegetarian": False,
+                "vegan": False,
+                "gluten_free": False,
+                "dairy_free": False,
+                "low_carb": False,
+                "keto_friendly": False
+            },
+            "confidence": 0.0
+        }
+
+    @staticmethod
+    def _fallback_description(menu_item: str) -> Dict[str, Any]:
+        return {
+            "description": f"{menu_item}は、厳選された食材を使用して丁寧に調理された料理です。独特の風味と食感をお楽しみいただけます。"
+        }
+
+    def _split_enrich_result(self, menu_item: str, result: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Split a fused result into per-task results
+
+        Returns:
+            Dict[str, Dict[str, Any]]: {"description": {...}, "allergen": {...}, "ingredient": {...}}
+        """
+        description = str(result.get("description") or "").strip()
+        allergen = result.get("allergen")
+        ingredient = result.get("ingredient")
+        return {
+            "description": {"description": description} if description else self._fallback_description(menu_item),
+            "allergen": allergen if isinstance(allergen, dict) else self._fallback_allergen("missing in response"),
+            "ingredient": ingredient if isinstance(ingredient, dict) else self._fallback_ingredient()
+        }
+
+    async def enrich_menu_item(self, menu_item: str, category: str = "") -> Dict[str, Dict[str, Any]]:
+        """
+        Generate description, allergens and ingredients for one menu item
+
+        Args:
+            menu_item: Menu item name
+            category: Menu category (optional)
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Results keyed by task type (description / allergen / ingredient)
+        """
+        try:
+            system_prompt, user_prompt = self._get_prompts("enrich", menu_item, category)
+
+            result = await self._make_function_call_request(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                functions=self._get_enrich_function_schema(),
+                function_call={"name": "enrich_menu_item"},
+                prompt_name="enrich"
+            )
+
+            logger.info(f"Enriched menu item: {menu_item}" + (f" (category: {category})" if category else ""))
+            return self._split_enrich_result(menu_item, result)
+
+        except Exception as e:
+            logger.error(f"Failed to enrich {menu_item} (category: {category}): {e}")
+            return {
+                "description": self._fallback_description(menu_item),
+                "allergen": self._fallback_allergen(str(e)),
+                "ingredient": self._fallback_ingredient()
+            }
+
+    async def enrich_menu_items_batch(self, items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Enrich several menu items with one request per token-budgeted chunk
+
+        Args:
+            items: Items with "id", "name" and "category"
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, Any]]]: Per-task results keyed by item id
+        """
+        names = {str(item["id"]): item.get("name", "") for item in items}
+
+        async def single_call(item: Dict[str, Any]) -> Dict[str, Any]:
+            # Re-flatten so per-item fallback results share the batched response shape
+            split = await self.enrich_menu_item(item.get("name", ""), item.get("category", ""))
+            return {"description": split["description"]["description"], **{k: split[k] for k in ("allergen", "ingredient")}}
+
+        results = await self._run_batched_function_call(
+            prompt_name="enrich",
+            item_schema=self._get_enrich_function_schema()[0],
+            items=items,
+            single_call=single_call,
+            output_tokens_per_item=700
+        )
+        logger.info(f"Enriched {len(results)}/{len(items)} items (batched)")
+        return {
+            item_id: self._split_enrich_result(names.get(item_id, ""), result)
+            for item_id, result in results.items()
+        }
+
+
+@lru_cache(maxsize=1)
+def get_enrich_client() -> EnrichClient:
+    """
+    Get EnrichClient instance (singleton)
+
+    Returns:
+        EnrichClient: Fused enrichment client (cached)
+    """
+    return EnrichClient()
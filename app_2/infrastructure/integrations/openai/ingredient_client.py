@@ -50,7 +50,8 @@ class IngredientClient(OpenAIBaseClient):
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
                 functions=self._get_ingredient_function_schema(),
-                function_call={"name": "extract_ingredients"}
+                function_call={"name": "extract_ingredients"},
+                prompt_name="ingredient"
             )
             
             ingredient_count = len(result.get("main_ingredients", []))
@@ -81,6 +82,29 @@ class IngredientClient(OpenAIBaseClient):
                 "confidence": 0.0
             }
 
+    async def extract_ingredients_batch(self, items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Extract ingredients for several menu items with one request per token-budgeted chunk
+        
+        Args:
+            items: Items with "id", "name" and "category"
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Ingredient results keyed by item id
+        """
+        async def single_call(item: Dict[str, Any]) -> Dict[str, Any]:
+            return await self.extract_ingredients(item.get("name", ""), item.get("category", ""))
+
+        results = await self._run_batched_function_call(
+            prompt_name="ingredient",
+            item_schema=self._get_ingredient_function_schema()[0],
+            items=items,
+            single_call=single_call,
+            output_tokens_per_item=400
+        )
+        logger.info(f"Extracted ingredients for {len(results)}/{len(items)} items (batched)")
+        return results
+
 
 @lru_cache(maxsize=1)
 def get_ingredient_client() -> IngredientClient:
@@ -4,7 +4,7 @@ Base functionality for OpenAI API integration with Function Calling support
 """
 import json
 import asyncio
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Awaitable, Callable, Optional
 try:
     from openai import AsyncOpenAI
     import openai
@@ -13,11 +13,19 @@ except ImportError:
     openai = None
 
 from app_2.core.config import settings
+from app_2.infrastructure.integrations.openai.openai_response_cache import get_openai_response_cache
+from app_2.infrastructure.integrations.redis.redis_rate_limiter import get_redis_rate_limiter
 from app_2.utils.logger import get_logger
+from app_2.utils.metrics import get_metrics_registry, span
 from app_2.prompt_loader import PromptLoader
 
 logger = get_logger("openai_base")
 
+# レート制限の優先度（対話的なパイプライン段階を先に通し、それ以外はバックグラウンド扱い）
+PROMPT_PRIORITIES: Dict[str, str] = {
+    "categorize": "interactive"
+}
+
 
 class OpenAIBaseClient:
     """
@@ -55,17 +63,23 @@ class OpenAIBaseClient:
         user_prompt: str,
         functions: List[Dict[str, Any]],
         function_call: Dict[str, str],
-        max_retries: int = 3
+        max_retries: int = 3,
+        prompt_name: Optional[str] = None,
+        use_response_cache: bool = True
     ) -> Dict[str, Any]:
         """
         OpenAI Function Calling API への共通リクエスト処理
         
+        応答キャッシュが有効なプロンプトは、同一のモデル・プロンプト・スキーマの結果を再利用する
+        
         Args:
             system_prompt: システムプロンプト
             user_prompt: ユーザープロンプト  
             functions: Function Callingのスキーマ定義
             function_call: 呼び出す関数の指定
             max_retries: 最大リトライ回数
+            prompt_name: プロンプト名（応答キャッシュの有効化・ヒット率集計の単位、省略時は関数名）
+            use_response_cache: False の場合はリクエスト単位の応答キャッシュを使わない（一括呼び出しはアイテム単位でキャッシュ）
             
         Returns:
             Dict[str, Any]: パースされたFunction Callingの結果
@@ -76,23 +90,49 @@ class OpenAIBaseClient:
         if not self.is_available():
             raise Exception("OpenAI API is not available")
 
+        # 応答キャッシュ参照（オプトインしたプロンプトのみ）
+        prompt_name = prompt_name or function_call.get("name", "unknown")
+        response_cache = get_openai_response_cache()
+        cache_key = None
+        if use_response_cache and response_cache.is_enabled_for(prompt_name):
+            cache_key = response_cache.build_key(
+                prompt_name, settings.ai.openai_model_name, system_prompt, user_prompt, functions, function_call
+            )
+            cached_result = await response_cache.get(prompt_name, cache_key)
+            if cached_result is not None:
+                logger.info(f"Function call served from response cache: {prompt_name}")
+                return cached_result
+
+        rate_limiter = get_redis_rate_limiter()
+        estimated_tokens = self._estimate_tokens(system_prompt + user_prompt) + settings.ai.openai_rate_limit_output_tokens
+
         for attempt in range(max_retries + 1):
             try:
-                response = await self.client.chat.completions.create(
-                    model=settings.ai.openai_model_name,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    functions=functions,
-                    function_call=function_call
+                # 全ワーカー共通のレート制限で送信可能になるまで待機
+                await rate_limiter.acquire(
+                    "openai",
+                    settings.ai.openai_model_name,
+                    tokens=estimated_tokens,
+                    priority=PROMPT_PRIORITIES.get(prompt_name, "background")
                 )
+                with span(f"external.openai.function_call.{function_call.get('name', 'unknown')}"):
+                    response = await self.client.chat.completions.create(
+                        model=settings.ai.openai_model_name,
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt}
+                        ],
+                        functions=functions,
+                        function_call=function_call
+                    )
                 
                 # Function Callingの結果をパース
                 function_call_result = response.choices[0].message.function_call
                 if function_call_result and function_call_result.arguments:
                     result = json.loads(function_call_result.arguments)
                     logger.info(f"Function call successful: {function_call_result.name}")
+                    if cache_key is not None:
+                        await response_cache.set(prompt_name, cache_key, result)
                     return result
                 else:
                     raise ValueError("Function call not found in response")
@@ -101,9 +141,11 @@ class OpenAIBaseClient:
                 if attempt == max_retries:
                     raise Exception(f"Rate limit exceeded after {max_retries + 1} attempts: {str(e)}")
                 
-                wait_time = 2 ** attempt
+                # 全ワーカーの送信を止めてから再試行（停止できない場合のみ自前で待機）
+                wait_time = self._get_retry_after(e) or 2 ** attempt
                 logger.warning(f"Rate limit hit, waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}")
-                await asyncio.sleep(wait_time)
+                if not await rate_limiter.report_rate_limited("openai", settings.ai.openai_model_name, wait_time):
+                    await asyncio.sleep(wait_time)
                 
             except (openai.APITimeoutError, openai.APIConnectionError) as e:
                 if attempt == max_retries:
@@ -147,15 +189,22 @@ class OpenAIBaseClient:
             raise Exception("OpenAI API is not available")
 
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.ai.openai_model_name,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=temperature
+            await get_redis_rate_limiter().acquire(
+                "openai",
+                settings.ai.openai_model_name,
+                tokens=self._estimate_tokens(system_prompt + user_prompt) + max_tokens,
+                priority="background"
             )
+            with span("external.openai.completion"):
+                response = await self.client.chat.completions.create(
+                    model=settings.ai.openai_model_name,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                )
             
             return response.choices[0].message.content.strip()
             
@@ -163,6 +212,15 @@ class OpenAIBaseClient:
             logger.error(f"OpenAI API request failed: {e}")
             raise
 
+    @staticmethod
+    def _get_retry_after(error: Exception) -> Optional[float]:
+        """429 レスポンスの Retry-After ヘッダー（秒）を取得"""
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        try:
+            return float(headers.get("retry-after")) if headers and headers.get("retry-after") else None
+        except (TypeError, ValueError):
+            return None
+
     def _get_prompts(
         self,
         prompt_name: str,
@@ -180,19 +238,21 @@ class OpenAIBaseClient:
         Returns:
             tuple[str, str]: (system_prompt, user_prompt)
         """
-        prompts = self.prompt_loader.load_prompt(
-            "openai", "menu_analysis", prompt_name
+        # パース済み・事前解析済みテンプレートを使用（ファイル更新時のみ再読み込み）
+        system_prompt = self.prompt_loader.get_template(
+            "openai", "menu_analysis", prompt_name, "system"
+        ).template
+        compiled_user = self.prompt_loader.get_template(
+            "openai", "menu_analysis", prompt_name, "user"
         )
-        
-        system_prompt = prompts.get("system", "")
-        user_template = prompts.get("user", "")
+        user_template = compiled_user.template
         
         # デバッグ用ログ
         logger.debug(f"Raw user template: {user_template}")
         logger.debug(f"Available format keys: menu_item='{menu_item}', category='{category}'")
         
         try:
-            user_prompt = user_template.format(menu_item=menu_item, category=category)
+            user_prompt = compiled_user.format(menu_item=menu_item, category=category)
         except KeyError as e:
             logger.error(f"Template formatting error. Missing key: {e}")
             logger.error(f"Template requires keys: {e}, but menu_item='{menu_item}', category='{category}' provided")
@@ -203,4 +263,238 @@ class OpenAIBaseClient:
                 # 最終フォールバック: 単純に文字列置換
                 user_prompt = user_template.replace("{menu_item}", menu_item).replace("{category}", category)
         
-        return system_prompt, user_prompt 
\ No newline at end of file
+        return system_prompt, user_prompt 
+
+    # ------------------------------------------------------------------
+    # 複数アイテム一括 Function Calling
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """
+        トークナイザーを使わない概算トークン数
+        
+        UTF-8 バイト数 / 3 は日本語（1文字 ≈ 1トークン）に近く、英語では多めに見積もるため予算を超えにくい
+        """
+        return max(1, len(text.encode("utf-8")) // 3)
+
+    @staticmethod
+    def _format_batch_item(item: Dict[str, Any]) -> str:
+        """一括リクエストのユーザープロンプト用にアイテムを1行のJSONに整形"""
+        return json.dumps(
+            {
+                "item_id": str(item["id"]),
+                "menu_item": item.get("name", ""),
+                "category": item.get("category", "")
+            },
+            ensure_ascii=False
+        )
+
+    def _build_token_budgeted_batches(
+        self,
+        items: List[Dict[str, Any]],
+        output_tokens_per_item: int,
+        token_budget: int = None,
+        max_items: int = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        入力 + 出力の見込みトークン数が予算に収まるようにアイテムをチャンクに分割
+        
+        Args:
+            items: "id" / "name" / "category" を持つアイテム
+            output_tokens_per_item: アイテムあたりの見込み出力トークン数
+            token_budget: 1リクエストあたりのトークン予算（省略時は設定値）
+            max_items: 1リクエストあたりの最大アイテム数（省略時は設定値）
+            
+        Returns:
+            List[List[Dict[str, Any]]]: アイテムのチャンク一覧（各チャンクは1件以上）
+        """
+        token_budget = token_budget or settings.ai.openai_batch_token_budget
+        max_items = max_items or settings.ai.openai_batch_max_items
+
+        chunks: List[List[Dict[str, Any]]] = []
+        current: List[Dict[str, Any]] = []
+        current_tokens = 0
+
+        for item in items:
+            cost = self._estimate_tokens(self._format_batch_item(item)) + output_tokens_per_item
+            if current and (current_tokens + cost > token_budget or len(current) >= max_items):
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(item)
+            current_tokens += cost
+
+        if current:
+            chunks.append(current)
+        return chunks
+
+    @staticmethod
+    def _build_batch_function_schema(item_schema: Dict[str, Any], batch_function_name: str) -> Dict[str, Any]:
+        """
+        単一アイテムの関数スキーマを item_id 付き結果配列のスキーマに変換
+        
+        Args:
+            item_schema: 単一アイテムの Function Calling スキーマ（YAML から読み込み）
+            batch_function_name: 一括処理用の関数名
+            
+        Returns:
+            Dict[str, Any]: 一括処理用の Function Calling スキーマ
+        """
+        parameters = item_schema.get("parameters", {})
+        item_properties = {
+            "item_id": {
+                "type": "string",
+                "description": "item_id of the input item this result belongs to (copied unchanged)"
+            },
+            **parameters.get("properties", {})
+        }
+        return {
+            "name": batch_function_name,
+            "description": f"{item_schema.get('description', '')} (one result per input item)",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "results": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": item_properties,
+                            "required": ["item_id", *parameters.get("required", [])]
+                        }
+                    }
+                },
+                "required": ["results"]
+            }
+        }
+
+    async def _make_batch_function_call_request(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        batch_schema: Dict[str, Any],
+        item_ids: List[str],
+        prompt_name: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        複数アイテムをまとめた1回の Function Calling リクエスト
+        
+        Args:
+            system_prompt: システムプロンプト（バッチ全体で1回のみ送信）
+            user_prompt: 全アイテムを列挙したユーザープロンプト
+            batch_schema: _build_batch_function_schema で構築したスキーマ
+            item_ids: リクエストに含めたアイテムID
+            prompt_name: プロンプト名（レート制限の優先度・ログの単位）
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: item_id をキーとした結果（未知・重複の item_id は無視）
+        """
+        result = await self._make_function_call_request(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            functions=[batch_schema],
+            function_call={"name": batch_schema["name"]},
+            prompt_name=prompt_name,
+            use_response_cache=False
+        )
+
+        expected_ids = set(item_ids)
+        keyed_results: Dict[str, Dict[str, Any]] = {}
+        for entry in result.get("results", []):
+            if not isinstance(entry, dict):
+                continue
+            entry = dict(entry)
+            item_id = str(entry.pop("item_id", ""))
+            if item_id in expected_ids and item_id not in keyed_results:
+                keyed_results[item_id] = entry
+        return keyed_results
+
+    async def _run_batched_function_call(
+        self,
+        prompt_name: str,
+        item_schema: Dict[str, Any],
+        items: List[Dict[str, Any]],
+        single_call: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        output_tokens_per_item: int
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        トークン予算で分割したチャンクごとに1回の Function Calling リクエストで処理
+        
+        モデルが結果を返さなかったアイテム（またはリクエスト自体が失敗したチャンク）は
+        single_call で個別処理し、全アイテムの結果を揃える
+        
+        Args:
+            prompt_name: "system" / "batch_user" を持つプロンプトYAML名
+            item_schema: 単一アイテムの Function Calling スキーマ
+            items: "id" / "name" / "category" を持つアイテム
+            single_call: アイテム単位のフォールバック処理
+            output_tokens_per_item: アイテムあたりの見込み出力トークン数
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: アイテムID（文字列）をキーとした結果
+        """
+        prompts = self.prompt_loader.load_prompt("openai", "menu_analysis", prompt_name)
+        system_prompt = prompts.get("system", "")
+        batch_template = prompts.get("batch_user", "")
+        batch_schema = self._build_batch_function_schema(item_schema, f"{item_schema['name']}_batch")
+        metrics = get_metrics_registry()
+
+        # アイテム単位の応答キャッシュ参照（ヒットしたアイテムは一括リクエストから除外）
+        results: Dict[str, Dict[str, Any]] = {}
+        response_cache = get_openai_response_cache()
+        item_keys: Dict[str, str] = {}
+        if response_cache.is_enabled_for(prompt_name):
+            # プロンプトYAML（system / batch_user）の変更で別キーになるようファイルの内容ハッシュを使用
+            prompt_hash = self.prompt_loader.get_prompt_hash("openai", "menu_analysis", prompt_name)
+            item_keys = {
+                str(item["id"]): response_cache.build_item_key(
+                    prompt_name,
+                    settings.ai.openai_model_name,
+                    prompt_hash,
+                    item_schema,
+                    item.get("name", ""),
+                    item.get("category", "")
+                )
+                for item in items
+            }
+            cached_results = await asyncio.gather(
+                *[response_cache.get(prompt_name, item_keys[str(item["id"])]) for item in items]
+            )
+            results = {
+                str(item["id"]): cached_result
+                for item, cached_result in zip(items, cached_results)
+                if cached_result is not None
+            }
+            items = [item for item in items if str(item["id"]) not in results]
+
+        async def process_chunk(chunk: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+            chunk_ids = [str(item["id"]) for item in chunk]
+            chunk_results: Dict[str, Dict[str, Any]] = {}
+            try:
+                user_prompt = batch_template.replace(
+                    "{items}", "\n".join(self._format_batch_item(item) for item in chunk)
+                )
+                chunk_results = await self._make_batch_function_call_request(
+                    system_prompt, user_prompt, batch_schema, chunk_ids, prompt_name=prompt_name
+                )
+                metrics.increment(f"openai.batch.{prompt_name}.requests")
+                if item_keys:
+                    await asyncio.gather(*[
+                        response_cache.set(prompt_name, item_keys[item_id], item_result)
+                        for item_id, item_result in chunk_results.items()
+                    ])
+            except Exception as e:
+                logger.warning(f"Batched {prompt_name} request failed for {len(chunk)} items, falling back: {e}")
+
+            missing = [item for item in chunk if str(item["id"]) not in chunk_results]
+            if missing:
+                logger.info(f"Batched {prompt_name}: {len(missing)}/{len(chunk)} items missing, calling per item")
+                metrics.increment(f"openai.batch.{prompt_name}.fallback_items", len(missing))
+                fallback_results = await asyncio.gather(*[single_call(item) for item in missing])
+                for item, item_result in zip(missing, fallback_results):
+                    chunk_results[str(item["id"])] = item_result
+            return chunk_results
+
+        chunks = self._build_token_budgeted_batches(items, output_tokens_per_item)
+        for chunk_results in await asyncio.gather(*[process_chunk(chunk) for chunk in chunks]):
+            results.update(chunk_results)
+        return results
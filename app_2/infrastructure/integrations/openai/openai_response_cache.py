@@ -0,0 +1,291 @@
+"""
+OpenAI Response Cache - Infrastructure Layer
+OpenAI Function Calling 応答のメモ化（オプトイン）
+
+キー: プロンプト名 + (モデル名, システムプロンプト, ユーザープロンプト, 関数スキーマ, 関数指定) のハッシュ
+     複数アイテム一括呼び出しはアイテム単位（正規化した料理名・カテゴリ + プロンプトファイル・スキーマ）のハッシュ
+保存先: Redis（既定）または PostgreSQL
+退避: TTL + 最大エントリ数（古いものから削除）
+"""
+import hashlib
+import json
+import time
+import unicodedata
+from collections import defaultdict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app_2.core.config import settings
+from app_2.core.database import async_session_factory
+from app_2.infrastructure.integrations.redis.redis_client import RedisClient
+from app_2.infrastructure.models.openai_response_cache_model import OpenAIResponseCacheModel
+from app_2.utils.logger import get_logger
+from app_2.utils.metrics import get_metrics_registry, span
+
+logger = get_logger("openai_response_cache")
+
+RESPONSE_CACHE_BACKENDS = ("redis", "postgres")
+
+# SET（TTL付き）+ 作成時刻インデックス更新 + 期限切れ・上限超過分の削除を1往復で実行
+SET_AND_EVICT_SCRIPT = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('ZADD', KEYS[2], ARGV[3], KEYS[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', tonumber(ARGV[3]) - tonumber(ARGV[2]))
+local excess = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[4])
+if excess > 0 then
+    local oldest = redis.call('ZRANGE', KEYS[2], 0, excess - 1)
+    redis.call('DEL', unpack(oldest))
+    redis.call('ZREMRANGEBYRANK', KEYS[2], 0, excess - 1)
+end
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return math.max(excess, 0)
+"""
+
+
+class OpenAIResponseCache:
+    """
+    OpenAI Function Calling 応答キャッシュ
+
+    - OPENAI_RESPONSE_CACHE_ENABLED かつ OPENAI_RESPONSE_CACHE_PROMPTS に含まれるプロンプトのみ対象
+    - 保存先の障害時は例外を送出せず、ミスとしてAPIを呼び出す
+    - ヒット率はプロンプト名ごとに集計
+    """
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        redis_client: Optional[RedisClient] = None,
+        session_factory: Callable = async_session_factory
+    ):
+        self.backend = backend or settings.ai.openai_response_cache_backend
+        if self.backend not in RESPONSE_CACHE_BACKENDS:
+            raise ValueError(f"Unknown OpenAI response cache backend: {self.backend}")
+        self.redis_client = redis_client or RedisClient()
+        self.session_factory = session_factory
+        self.prefix = settings.ai.openai_response_cache_prefix
+        self.ttl_seconds = settings.ai.openai_response_cache_ttl_seconds
+        self.max_entries = settings.ai.openai_response_cache_max_entries
+        self.purge_interval_seconds = settings.ai.openai_response_cache_purge_interval_seconds
+        self._last_purge_at = time.monotonic()
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self._metrics = get_metrics_registry()
+
+    @staticmethod
+    def is_enabled_for(prompt_name: str) -> bool:
+        """プロンプトがキャッシュ対象か判定"""
+        if not settings.ai.openai_response_cache_enabled:
+            return False
+        prompts = {name.strip() for name in settings.ai.openai_response_cache_prompts.split(",") if name.strip()}
+        return "*" in prompts or prompt_name in prompts
+
+    @staticmethod
+    def build_key(
+        prompt_name: str,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        functions: List[Dict[str, Any]],
+        function_call: Dict[str, str]
+    ) -> str:
+        """モデル名・プロンプト内容・スキーマからキャッシュキーを生成"""
+        payload = json.dumps(
+            {
+                "model": model,
+                "system": system_prompt,
+                "user": user_prompt,
+                "functions": functions,
+                "function_call": function_call
+            },
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return f"{prompt_name}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    @classmethod
+    def build_item_key(
+        cls,
+        prompt_name: str,
+        model: str,
+        prompt_hash: str,
+        item_schema: Dict[str, Any],
+        menu_item: str,
+        category: str = ""
+    ) -> str:
+        """
+        複数アイテム一括呼び出しのアイテム単位キーを生成
+
+        一括リクエストのユーザープロンプトにはセッション固有の item_id が含まれるため、
+        料理名・カテゴリ（NFKC・前後空白除去）とプロンプトファイルの内容ハッシュ（system / batch_user を含む）・
+        スキーマのみでキーを作り、セッションを跨いで再利用する
+        """
+        item = {
+            "menu_item": unicodedata.normalize("NFKC", menu_item or "").strip(),
+            "category": unicodedata.normalize("NFKC", category or "").strip()
+        }
+        return cls.build_key(
+            prompt_name,
+            model,
+            prompt_hash,
+            json.dumps(item, ensure_ascii=False, sort_keys=True),
+            [item_schema],
+            {"name": item_schema.get("name", "")}
+        )
+
+    async def get(self, prompt_name: str, key: str) -> Optional[Dict[str, Any]]:
+        """
+        キャッシュを参照
+
+        Args:
+            prompt_name: プロンプト名
+            key: build_key で生成したキー
+
+        Returns:
+            Optional[Dict[str, Any]]: ヒット時は Function Calling の結果
+        """
+        try:
+            with span("openai.response_cache.get"):
+                if self.backend == "redis":
+                    cached = await self._redis_get(key)
+                else:
+                    cached = await self._database_get(key)
+            result = json.loads(cached) if cached is not None else None
+        except Exception as e:
+            logger.warning(f"⚠️ OpenAI response cache lookup failed for {prompt_name}: {e}")
+            result = None
+
+        outcome = "hits" if result is not None else "misses"
+        self._counts[prompt_name][outcome] += 1
+        self._metrics.increment(f"openai.response_cache.{prompt_name}.{outcome}")
+        return result
+
+    async def set(self, prompt_name: str, key: str, result: Dict[str, Any]) -> None:
+        """
+        Function Calling の結果を保存
+
+        Args:
+            prompt_name: プロンプト名
+            key: build_key で生成したキー
+            result: Function Calling の結果
+        """
+        try:
+            value = json.dumps(result, ensure_ascii=False)
+            if self.backend == "redis":
+                evicted = await self._redis_set(key, value)
+            else:
+                evicted = await self._database_set(prompt_name, key, value)
+        except Exception as e:
+            logger.warning(f"⚠️ OpenAI response cache write failed for {prompt_name}: {e}")
+            return
+
+        if evicted:
+            self._metrics.increment("openai.response_cache.evictions", evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        """プロンプト名ごとのヒット率を取得"""
+        prompts = {}
+        for prompt_name, counts in sorted(self._counts.items()):
+            lookups = counts["hits"] + counts["misses"]
+            prompts[prompt_name] = {
+                **counts,
+                "hit_ratio": round(counts["hits"] / lookups, 3) if lookups else 0.0
+            }
+        return {
+            "enabled": settings.ai.openai_response_cache_enabled,
+            "backend": self.backend,
+            "ttl_seconds": self.ttl_seconds,
+            "max_entries": self.max_entries,
+            "prompts": prompts
+        }
+
+    # ------------------------------------------------------------------
+    # Redis
+    # ------------------------------------------------------------------
+
+    async def _redis_get(self, key: str) -> Optional[str]:
+        async with self.redis_client.get_connection() as client:
+            return await client.get(f"{self.prefix}{key}")
+
+    async def _redis_set(self, key: str, value: str) -> int:
+        async with self.redis_client.get_connection() as client:
+            return await client.eval(
+                SET_AND_EVICT_SCRIPT,
+                2,
+                f"{self.prefix}{key}",
+                f"{self.prefix}index",
+                value,
+                self.ttl_seconds,
+                time.time(),
+                self.max_entries
+            )
+
+    # ------------------------------------------------------------------
+    # PostgreSQL
+    # ------------------------------------------------------------------
+
+    async def _database_get(self, key: str) -> Optional[str]:
+        async with self.session_factory() as db_session:
+            result = await db_session.execute(
+                select(OpenAIResponseCacheModel.response).where(
+                    OpenAIResponseCacheModel.cache_key == key,
+                    OpenAIResponseCacheModel.expires_at > datetime.utcnow()
+                )
+            )
+            return result.scalar_one_or_none()
+
+    async def _database_set(self, prompt_name: str, key: str, value: str) -> int:
+        now = datetime.utcnow()
+        stmt = pg_insert(OpenAIResponseCacheModel).values(
+            cache_key=key,
+            prompt_name=prompt_name,
+            response=value,
+            created_at=now,
+            expires_at=now + timedelta(seconds=self.ttl_seconds)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["cache_key"],
+            set_={"response": stmt.excluded.response, "created_at": now, "expires_at": stmt.excluded.expires_at}
+        )
+        async with self.session_factory() as db_session:
+            await db_session.execute(stmt)
+            await db_session.commit()
+
+        if time.monotonic() - self._last_purge_at < self.purge_interval_seconds:
+            return 0
+        self._last_purge_at = time.monotonic()
+        return await self._database_purge()
+
+    async def _database_purge(self) -> int:
+        """期限切れ・上限超過分（古いものから）を削除"""
+        async with self.session_factory() as db_session:
+            expired = await db_session.execute(
+                delete(OpenAIResponseCacheModel).where(OpenAIResponseCacheModel.expires_at <= datetime.utcnow())
+            )
+            count = (await db_session.execute(select(func.count()).select_from(OpenAIResponseCacheModel))).scalar_one()
+            trimmed = 0
+            if count > self.max_entries:
+                oldest = (
+                    select(OpenAIResponseCacheModel.cache_key)
+                    .order_by(OpenAIResponseCacheModel.created_at)
+                    .limit(count - self.max_entries)
+                )
+                result = await db_session.execute(
+                    delete(OpenAIResponseCacheModel).where(OpenAIResponseCacheModel.cache_key.in_(oldest))
+                )
+                trimmed = result.rowcount or 0
+            await db_session.commit()
+        return (expired.rowcount or 0) + trimmed
+
+
+@lru_cache(maxsize=1)
+def get_openai_response_cache() -> OpenAIResponseCache:
+    """
+    OpenAIResponseCacheのシングルトンインスタンスを取得
+
+    Returns:
+        OpenAIResponseCache: OpenAI応答キャッシュ
+    """
+    return OpenAIResponseCache()
@@ -3,9 +3,17 @@ Redis Integration - Infrastructure Layer
 Real-time messaging infrastructure for SSE and pipeline communication
 """
 
+from app_2.infrastructure.integrations.redis.redis_pool_manager import RedisPoolManager, get_redis_pool_manager
 from app_2.infrastructure.integrations.redis.redis_client import RedisClient
+from app_2.infrastructure.integrations.redis.sse_event import SSEEvent
+from app_2.infrastructure.integrations.redis.redis_event_log import RedisEventLog
+from app_2.infrastructure.integrations.redis.menu_update_batch import MenuUpdateBuffer
 from app_2.infrastructure.integrations.redis.redis_publisher import RedisPublisher
 from app_2.infrastructure.integrations.redis.redis_subscriber import RedisSubscriber
+from app_2.infrastructure.integrations.redis.redis_pubsub_dispatcher import RedisPubSubDispatcher, get_redis_pubsub_dispatcher
 from app_2.infrastructure.integrations.redis.redis_distributed_lock import RedisDistributedLock, get_redis_distributed_lock
+from app_2.infrastructure.integrations.redis.redis_rate_limiter import RedisRateLimiter, get_redis_rate_limiter
+from app_2.infrastructure.integrations.redis.redis_task_checkpoint import RedisTaskCheckpoint, get_redis_task_checkpoint
+from app_2.infrastructure.integrations.redis.redis_viewport_hint import RedisViewportHint, get_redis_viewport_hint
 
-__all__ = ["RedisClient", "RedisPublisher", "RedisSubscriber", "RedisDistributedLock", "get_redis_distributed_lock"] 
\ No newline at end of file
+__all__ = ["RedisPoolManager", "get_redis_pool_manager", "RedisClient", "SSEEvent", "RedisEventLog", "MenuUpdateBuffer", "RedisPublisher", "RedisSubscriber", "RedisPubSubDispatcher", "get_redis_pubsub_dispatcher", "RedisDistributedLock", "get_redis_distributed_lock", "RedisRateLimiter", "get_redis_rate_limiter", "RedisTaskCheckpoint", "get_redis_task_checkpoint", "RedisViewportHint", "get_redis_viewport_hint"] 
\ No newline at end of file
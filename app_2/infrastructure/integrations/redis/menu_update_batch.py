@@ -0,0 +1,90 @@
+"""
+Menu Update Batch - Infrastructure Layer
+menu_update イベントの結合（menu_batch_update）と展開
+
+同一ウィンドウ内の更新を (menu_id, task_type) ごとに後勝ちで1つにまとめる。
+配信側（BatchProcessor）とSSE側（クライアントがオプトインした場合）の両方で使用する。
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+MENU_UPDATE = "menu_update"
+MENU_BATCH_UPDATE = "menu_batch_update"
+
+
+class MenuUpdateBuffer:
+    """(menu_id, task_type) ごとに最新の menu_update を保持するバッファ"""
+
+    def __init__(self):
+        self._updates: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._updates)
+
+    def add(self, menu_id: str, menu_data: Dict[str, Any]) -> None:
+        """更新を追加（同じアイテム・タスクの既存更新は置き換え）"""
+        self._updates[(str(menu_id), (menu_data or {}).get("task_type"))] = {
+            "menu_id": menu_id,
+            "menu_data": menu_data
+        }
+
+    def add_message(self, message: Dict[str, Any]) -> None:
+        """menu_update / menu_batch_update メッセージの更新を追加"""
+        data = message.get("data") or {}
+        if message.get("type") == MENU_BATCH_UPDATE:
+            for update in data.get("updates", []):
+                self.add(update.get("menu_id"), update.get("menu_data"))
+        else:
+            self.add(data.get("menu_id"), data.get("menu_data"))
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """保持している更新を取り出してバッファを空にする"""
+        updates, self._updates = list(self._updates.values()), {}
+        return updates
+
+
+def build_menu_batch_update_data(updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """menu_batch_update の data を構築"""
+    return {"updates": updates, "count": len(updates)}
+
+
+def expand_menu_batch_update(message: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    menu_batch_update を個別の menu_update メッセージに展開（オプトインしていないクライアント用）
+
+    イベントIDは最後のメッセージにのみ付与（途中で切断した場合はバッチ全体を再送させる）
+    """
+    if message.get("type") != MENU_BATCH_UPDATE:
+        return [message]
+
+    updates = (message.get("data") or {}).get("updates", [])
+    expanded = [
+        {
+            "type": MENU_UPDATE,
+            "session_id": message.get("session_id"),
+            "data": update,
+            "timestamp": message.get("timestamp")
+        }
+        for update in updates
+    ]
+    if expanded and message.get("event_id"):
+        expanded[-1]["event_id"] = message["event_id"]
+    return expanded
+
+
+def is_menu_update(message: Dict[str, Any]) -> bool:
+    return message.get("type") in (MENU_UPDATE, MENU_BATCH_UPDATE)
+
+
+# ==========================================
+# Export
+# ==========================================
+
+__all__ = [
+    "MENU_UPDATE",
+    "MENU_BATCH_UPDATE",
+    "MenuUpdateBuffer",
+    "build_menu_batch_update_data",
+    "expand_menu_batch_update",
+    "is_menu_update"
+]
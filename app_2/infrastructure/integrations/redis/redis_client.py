@@ -6,12 +6,12 @@ Simple Redis client for MVP (Simplified)
 from typing import Optional, Union, List, Any
 from contextlib import asynccontextmanager
 
-import redis.asyncio as redis
 from redis.asyncio import Redis
 from redis.exceptions import RedisError, ConnectionError
 
-from app_2.core.config import settings
+from app_2.infrastructure.integrations.redis.redis_pool_manager import get_redis_pool_manager
 from app_2.utils.logger import get_logger
+from app_2.utils.metrics import span
 
 logger = get_logger("redis_client")
 
@@ -21,6 +21,7 @@ class RedisClient:
     シンプルRedis非同期クライアント（MVP版）
     
     基本的な接続管理とエラーハンドリングを提供
+    （接続はプロセス共通の RedisPoolManager から借用）
     """
     
     def __init__(self):
@@ -39,11 +40,8 @@ class RedisClient:
             return
         
         try:
-            # シンプルな接続設定
-            self._client = redis.from_url(
-                settings.celery.redis_url,
-                decode_responses=True
-            )
+            # プロセス共通の接続プールを使用（インスタンスごとに接続を作成しない）
+            self._client = get_redis_pool_manager().get_client()
             
             # 接続テスト
             await self._client.ping()
@@ -57,11 +55,13 @@ class RedisClient:
             raise ConnectionError(f"Redis initialization failed: {e}")
 
     async def cleanup(self) -> None:
-        """Redis接続をクリーンアップ"""
+        """
+        Redis接続をクリーンアップ
+        
+        接続プールは共有のため切断しない（RedisPoolManager.close_loop_pools で切断）
+        """
         try:
-            if self._client:
-                await self._client.aclose()
-                self._client = None
+            self._client = None
             
             self._is_initialized = False
             logger.info("🔌 Redis client cleaned up")
@@ -122,7 +122,8 @@ class RedisClient:
         """
         try:
             async with self.get_connection() as client:
-                result = await client.publish(channel, message)
+                with span("redis.publish"):
+                    result = await client.publish(channel, message)
                 logger.debug(f"📢 Published to {channel}: {len(message)} bytes -> {result} subscribers")
                 return result
         except Exception as e:
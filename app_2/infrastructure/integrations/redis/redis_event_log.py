@@ -0,0 +1,146 @@
+"""
+Redis Event Log - Infrastructure Layer
+セッションごとのSSEイベントログ（上限・TTL付き Redis Stream）
+
+配信メッセージを Stream に追記してイベントIDを採番し、同じIDを付けて PUBLISH する。
+再接続したクライアントは Last-Event-ID 以降のイベントを Stream から取得して取りこぼしを補完する。
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from app_2.infrastructure.integrations.redis.redis_client import RedisClient
+from app_2.infrastructure.integrations.redis.sse_event import SSEEvent, is_sse_frame
+from app_2.core.config import settings
+from app_2.utils.logger import get_logger
+from app_2.utils.metrics import span
+
+logger = get_logger("redis_event_log")
+
+# XADD（上限付き）+ EXPIRE + PUBLISH を1往復・原子的に実行
+# 採番したイベントIDを、SSEフレームなら id: 行として、JSONなら先頭キーとして差し込む（Stream順 = 配信順）
+APPEND_AND_PUBLISH_SCRIPT = """
+local event_id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[2], '*', 'message', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+local payload
+if ARGV[4] == 'frame' then
+    payload = 'id: ' .. event_id .. '\\n' .. ARGV[1]
+else
+    payload = '{"event_id":"' .. event_id .. '",' .. string.sub(ARGV[1], 2)
+end
+redis.call('PUBLISH', KEYS[2], payload)
+return event_id
+"""
+
+
+def parse_event_id(event_id: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Stream ID（"<ms>-<seq>"）を比較用タプルに変換（不正な値は None）"""
+    if not event_id:
+        return None
+    try:
+        milliseconds, _, sequence = str(event_id).partition("-")
+        return int(milliseconds), int(sequence or 0)
+    except ValueError:
+        return None
+
+
+@dataclass
+class EventReplay:
+    """Last-Event-ID 以降のイベント"""
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    # False: Stream が存在しない・上限で切り詰められていたため取りこぼしがある可能性
+    complete: bool = False
+
+
+class RedisEventLog:
+    """
+    セッションイベントログ（Redis Stream）
+
+    sse_log:{session_id} に最大 SSE_EVENT_LOG_MAXLEN 件、最終追記から SSE_EVENT_LOG_TTL_SECONDS 秒保持
+    """
+
+    def __init__(self, redis_client: RedisClient):
+        self.redis_client = redis_client
+        self.maxlen = settings.celery.sse_event_log_maxlen
+        self.ttl_seconds = settings.celery.sse_event_log_ttl_seconds
+
+    @staticmethod
+    def stream_key(session_id: str) -> str:
+        return f"{settings.celery.sse_event_log_prefix}{session_id}"
+
+    async def append_and_publish(self, session_id: str, payload: str) -> Optional[str]:
+        """
+        メッセージを Stream に追記し、イベントID付きで PUBLISH
+
+        Args:
+            session_id: セッションID
+            payload: メッセージJSON（オブジェクト）または整形済みSSEフレーム
+
+        Returns:
+            Optional[str]: 採番したイベントID（失敗時 None）
+        """
+        try:
+            async with self.redis_client.get_connection() as client:
+                with span("redis.event_log.append"):
+                    return await client.eval(
+                        APPEND_AND_PUBLISH_SCRIPT,
+                        2,
+                        self.stream_key(session_id),
+                        settings.celery.get_sse_channel(session_id),
+                        payload,
+                        self.maxlen,
+                        self.ttl_seconds,
+                        "frame" if is_sse_frame(payload) else "json"
+                    )
+        except Exception as e:
+            logger.error(f"❌ Failed to append event for session {session_id}: {e}")
+            return None
+
+    async def read_after(self, session_id: str, last_event_id: str) -> EventReplay:
+        """
+        Last-Event-ID より後のイベントを取得（DBにはアクセスしない）
+
+        Args:
+            session_id: セッションID
+            last_event_id: クライアントが最後に受信したイベントID
+
+        Returns:
+            EventReplay: 取りこぼしたイベント（event_id 付き）
+        """
+        last_position = parse_event_id(last_event_id)
+        if last_position is None:
+            return EventReplay()
+
+        key = self.stream_key(session_id)
+        try:
+            async with self.redis_client.get_connection() as client:
+                with span("redis.event_log.replay"):
+                    oldest = await client.xrange(key, min="-", max="+", count=1)
+                    if not oldest:
+                        return EventReplay()
+                    # 排他的開始位置（XRANGE の "(" は Redis 6.2 未満で使えないため seq+1 を指定）
+                    entries = await client.xrange(key, min=f"{last_position[0]}-{last_position[1] + 1}", max="+")
+        except Exception as e:
+            logger.error(f"❌ Failed to read event log for session {session_id}: {e}")
+            return EventReplay()
+
+        events = []
+        for event_id, fields in entries:
+            try:
+                message = SSEEvent.from_payload(fields["message"], event_id=event_id).message
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(f"❌ Invalid event log entry {event_id}: {e}")
+                continue
+            events.append({"event_id": event_id, **message})
+
+        # 最古のイベントが Last-Event-ID より新しければ途中が切り詰められている
+        complete = parse_event_id(oldest[0][0]) <= last_position
+        logger.info(f"📜 Replaying {len(events)} events for session {session_id} after {last_event_id} (complete={complete})")
+        return EventReplay(events=events, complete=complete)
+
+
+# ==========================================
+# Export
+# ==========================================
+
+__all__ = ["RedisEventLog", "EventReplay", "parse_event_id", "APPEND_AND_PUBLISH_SCRIPT"]
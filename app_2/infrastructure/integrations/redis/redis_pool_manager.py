@@ -0,0 +1,173 @@
+"""
+Redis Pool Manager - Infrastructure Layer
+プロセス共通のRedis接続プール管理（URL × イベントループ単位）
+
+Publisher / Subscriber / 分散ロック / Celeryタスクはすべてこのプールから接続を借用し、
+リクエスト・アイテムごとにTCP接続を作成・破棄しない
+"""
+
+import asyncio
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.exceptions import ConnectionError
+
+from app_2.core.config import settings
+from app_2.utils.logger import get_logger
+from app_2.utils.metrics import get_metrics_registry, span
+
+logger = get_logger("redis_pool_manager")
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """
+    接続待ち時間・枯渇回数を計測する BlockingConnectionPool
+
+    上限に達した場合は timeout 秒まで空きを待ち、それでも空かなければ ConnectionError
+    """
+
+    def is_exhausted(self) -> bool:
+        return not self._available_connections and len(self._in_use_connections) >= self.max_connections
+
+    async def get_connection(self, *args, **kwargs):
+        metrics = get_metrics_registry()
+        if self.is_exhausted():
+            metrics.increment("redis.pool.exhausted")
+        try:
+            with span("redis.pool.acquire"):
+                return await super().get_connection(*args, **kwargs)
+        except ConnectionError:
+            metrics.increment("redis.pool.timeouts")
+            raise
+
+
+@dataclass
+class _PoolEntry:
+    """イベントループに紐づく接続プールとクライアント"""
+    loop: Optional[asyncio.AbstractEventLoop]
+    pool: InstrumentedConnectionPool
+    client: Redis
+
+
+class RedisPoolManager:
+    """
+    プロセス共通のRedis接続プールマネージャー
+
+    redis.asyncio の接続は作成したイベントループでしか使えないため、
+    プールは (URL, イベントループ) ごとに作成する
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        pool_timeout: Optional[float] = None,
+        health_check_interval: Optional[int] = None
+    ):
+        self.max_connections = max_connections or settings.celery.redis_max_connections
+        self.pool_timeout = pool_timeout or settings.celery.redis_pool_timeout
+        self.health_check_interval = (
+            health_check_interval if health_check_interval is not None
+            else settings.celery.redis_health_check_interval
+        )
+        self._entries: Dict[Tuple[str, int], _PoolEntry] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def _get_entry(self, url: Optional[str] = None) -> _PoolEntry:
+        url = url or settings.celery.redis_url
+        loop = self._current_loop()
+        key = (url, id(loop))
+
+        with self._lock:
+            # 終了したイベントループのプールは破棄
+            for stale_key in [k for k, e in self._entries.items() if e.loop is not None and e.loop.is_closed()]:
+                del self._entries[stale_key]
+
+            entry = self._entries.get(key)
+            if entry is None or entry.loop is not loop:
+                pool = InstrumentedConnectionPool.from_url(
+                    url,
+                    max_connections=self.max_connections,
+                    timeout=self.pool_timeout,
+                    health_check_interval=self.health_check_interval,
+                    socket_connect_timeout=5,
+                    socket_keepalive=True,
+                    decode_responses=True
+                )
+                entry = _PoolEntry(loop=loop, pool=pool, client=Redis(connection_pool=pool))
+                self._entries[key] = entry
+                get_metrics_registry().increment("redis.pool.created")
+                logger.info(f"🔌 Redis connection pool created (max_connections={self.max_connections})")
+            return entry
+
+    def get_pool(self, url: Optional[str] = None) -> InstrumentedConnectionPool:
+        """現在のイベントループ用の接続プールを取得"""
+        return self._get_entry(url).pool
+
+    def get_client(self, url: Optional[str] = None) -> Redis:
+        """現在のイベントループ用の接続プールを使うRedisクライアントを取得"""
+        return self._get_entry(url).client
+
+    async def close_loop_pools(self) -> None:
+        """現在のイベントループのプールを切断して破棄"""
+        loop = self._current_loop()
+        with self._lock:
+            entries = [(k, e) for k, e in self._entries.items() if e.loop is loop]
+            for key, _ in entries:
+                del self._entries[key]
+
+        for _, entry in entries:
+            try:
+                await entry.pool.disconnect()
+            except Exception as e:
+                logger.error(f"❌ Redis pool disconnect error: {e}")
+        if entries:
+            logger.info(f"🔌 Redis connection pools closed: {len(entries)}")
+
+    def reset(self) -> None:
+        """切断せずに全プールを破棄（fork 後の子プロセス用）"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """プールごとの使用状況"""
+        with self._lock:
+            entries = list(self._entries.values())
+        return [
+            {
+                "host": entry.pool.connection_kwargs.get("host"),
+                "db": entry.pool.connection_kwargs.get("db", 0),
+                "max_connections": entry.pool.max_connections,
+                "in_use": len(entry.pool._in_use_connections),
+                "available": len(entry.pool._available_connections),
+                "exhausted": entry.pool.is_exhausted()
+            }
+            for entry in entries
+        ]
+
+
+@lru_cache(maxsize=1)
+def get_redis_pool_manager() -> RedisPoolManager:
+    """
+    RedisPoolManagerのシングルトンインスタンスを取得
+
+    Returns:
+        RedisPoolManager: Redis接続プールマネージャー
+    """
+    return RedisPoolManager()
+
+
+# ==========================================
+# Export
+# ==========================================
+
+__all__ = ["RedisPoolManager", "InstrumentedConnectionPool", "get_redis_pool_manager"]
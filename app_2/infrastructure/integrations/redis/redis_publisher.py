@@ -8,6 +8,9 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime
 
 from app_2.infrastructure.integrations.redis.redis_client import RedisClient
+from app_2.infrastructure.integrations.redis.redis_event_log import RedisEventLog
+from app_2.infrastructure.integrations.redis.menu_update_batch import MENU_BATCH_UPDATE, build_menu_batch_update_data
+from app_2.infrastructure.integrations.redis.sse_event import format_sse_frame
 from app_2.core.config import settings
 from app_2.utils.logger import get_logger
 
@@ -29,6 +32,8 @@ class RedisPublisher:
             redis_client: Redis クライアント（オプション）
         """
         self.redis_client = redis_client or RedisClient()
+        # イベントログ有効時は Stream 追記と PUBLISH を1回で実行（イベントID付き）
+        self.event_log = RedisEventLog(self.redis_client) if settings.celery.sse_event_log_enabled else None
 
     async def publish_session_message(
         self, 
@@ -59,11 +64,19 @@ class RedisPublisher:
                 "timestamp": self._get_timestamp()
             }
             
-            # JSON文字列に変換
+            # JSON文字列に変換（SSE_PRESERIALIZED_FRAMES 時はSSEフレームまで整形して1回だけシリアライズ）
             message_json = json.dumps(message, ensure_ascii=False)
+            payload = format_sse_frame(message, message_json) if settings.celery.sse_preserialized_frames else message_json
+            
+            # イベントログに追記して配信（失敗時は通常の PUBLISH にフォールバック）
+            if self.event_log is not None:
+                event_id = await self.event_log.append_and_publish(session_id, payload)
+                if event_id is not None:
+                    logger.info(f"📢 Published {message_type} to session {session_id} (event {event_id})")
+                    return True
             
             # Redis に配信
-            subscriber_count = await self.redis_client.publish(channel, message_json)
+            subscriber_count = await self.redis_client.publish(channel, payload)
             
             logger.info(f"📢 Published {message_type} to session {session_id} -> {subscriber_count} subscribers")
             return True
@@ -354,6 +367,27 @@ class RedisPublisher:
             data=data
         )
 
+    async def publish_menu_batch_update(
+        self, 
+        session_id: str, 
+        updates: List[Dict[str, Any]]
+    ) -> bool:
+        """
+        複数メニューの更新を1メッセージで配信
+        
+        Args:
+            session_id: セッションID
+            updates: {"menu_id": ..., "menu_data": ...} のリスト
+            
+        Returns:
+            bool: 配信が成功したか
+        """
+        return await self.publish_session_message(
+            session_id=session_id,
+            message_type=MENU_BATCH_UPDATE,
+            data=build_menu_batch_update_data(updates)
+        )
+
     async def publish_error_message(
         self, 
         session_id: str, 
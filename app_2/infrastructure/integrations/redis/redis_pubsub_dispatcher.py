@@ -0,0 +1,278 @@
+"""
+Redis Pub/Sub Dispatcher - Infrastructure Layer
+APIプロセス共通のPub/Sub受信とSSE接続へのファンアウト
+
+SSE接続ごとに購読接続を作らず、少数（シャード数）の購読接続でチャンネルを参照カウント管理し、
+受信メッセージを接続ごとの上限付きキューへ配信する。
+ペイロードはパースせず SSEEvent として全接続で共有する（整形済みSSEフレームはそのまま転送）
+"""
+
+import asyncio
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Set
+
+from redis.asyncio.client import PubSub
+
+from app_2.core.config import settings
+from app_2.infrastructure.integrations.redis.redis_pool_manager import get_redis_pool_manager
+from app_2.infrastructure.integrations.redis.sse_event import SSEEvent
+from app_2.utils.logger import get_logger
+from app_2.utils.metrics import get_metrics_registry
+
+logger = get_logger("redis_pubsub_dispatcher")
+
+SLOW_CONSUMER_POLICIES = ("drop_oldest", "disconnect")
+
+_DISCONNECT = object()
+
+
+class SlowConsumerError(Exception):
+    """受信キューが溢れたため購読を切断"""
+    pass
+
+
+class PubSubSubscription:
+    """
+    1接続分の購読（上限付きキュー）
+
+    async for event in subscription: で受信イベント（SSEEvent）を取得する
+    """
+
+    def __init__(self, channel: str, max_queue_size: int, slow_consumer_policy: str):
+        self.channel = channel
+        self.slow_consumer_policy = slow_consumer_policy
+        self.dropped_messages = 0
+        self.disconnected = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+
+    def deliver(self, message: SSEEvent) -> None:
+        """メッセージをキューに投入（満杯時はポリシーに従う）"""
+        if self.disconnected:
+            return
+        try:
+            self._queue.put_nowait(message)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        metrics = get_metrics_registry()
+        if self.slow_consumer_policy == "disconnect":
+            # 未送信メッセージを破棄して切断を通知
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(_DISCONNECT)
+            self.disconnected = True
+            metrics.increment("sse.dispatcher.slow_consumer_disconnects")
+            logger.warning(f"⚠️ Slow SSE consumer disconnected: {self.channel}")
+        else:
+            # 最も古いメッセージを破棄して最新を優先
+            self._queue.get_nowait()
+            self._queue.put_nowait(message)
+            self.dropped_messages += 1
+            metrics.increment("sse.dispatcher.dropped_messages")
+
+    def __aiter__(self) -> "PubSubSubscription":
+        return self
+
+    async def __anext__(self) -> SSEEvent:
+        message = await self._queue.get()
+        if message is _DISCONNECT:
+            raise SlowConsumerError(f"SSE consumer too slow for channel {self.channel}")
+        return message
+
+
+class _PubSubShard:
+    """1本の購読接続と、その接続で購読中のチャンネル"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.pubsub: Optional[PubSub] = None
+        self.channels: Set[str] = set()
+        self.reader: Optional[asyncio.Task] = None
+        self.lock = asyncio.Lock()
+
+
+class RedisPubSubDispatcher:
+    """
+    プロセス共通のPub/Subディスパッチャー
+
+    - チャンネルは最初の購読で SUBSCRIBE、最後の購読解除で UNSUBSCRIBE（参照カウント）
+    - チャンネルは crc32 でシャード（購読接続）に振り分け
+    - ペイロードはパースせず、全購読へ同じ SSEEvent を配信（パース・整形は必要時にイベントごとに1回）
+    """
+
+    def __init__(
+        self,
+        shards: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+        slow_consumer_policy: Optional[str] = None,
+        pubsub_factory: Optional[Callable[[], PubSub]] = None,
+        poll_timeout: float = 1.0
+    ):
+        self.max_queue_size = max_queue_size or settings.celery.sse_subscriber_queue_size
+        self.slow_consumer_policy = slow_consumer_policy or settings.celery.sse_slow_consumer_policy
+        if self.slow_consumer_policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {self.slow_consumer_policy}")
+        self.poll_timeout = poll_timeout
+        self._pubsub_factory = pubsub_factory or (lambda: get_redis_pool_manager().get_client().pubsub())
+        self._shards = [_PubSubShard(i) for i in range(shards or settings.celery.sse_pubsub_shards)]
+        self._subscribers: Dict[str, Set[PubSubSubscription]] = {}
+        self._metrics = get_metrics_registry()
+
+    def _shard_for(self, channel: str) -> _PubSubShard:
+        return self._shards[zlib.crc32(channel.encode("utf-8")) % len(self._shards)]
+
+    async def subscribe(self, channel: str) -> PubSubSubscription:
+        """
+        チャンネルを購読
+
+        Args:
+            channel: チャンネル名
+
+        Returns:
+            PubSubSubscription: この接続専用の購読
+        """
+        subscription = PubSubSubscription(channel, self.max_queue_size, self.slow_consumer_policy)
+        subscribers = self._subscribers.setdefault(channel, set())
+        subscribers.add(subscription)
+
+        if len(subscribers) == 1:
+            shard = self._shard_for(channel)
+            try:
+                async with shard.lock:
+                    if shard.pubsub is None:
+                        shard.pubsub = self._pubsub_factory()
+                    await shard.pubsub.subscribe(channel)
+                    shard.channels.add(channel)
+            except Exception:
+                await self.unsubscribe(subscription)
+                raise
+            if shard.reader is None or shard.reader.done():
+                shard.reader = asyncio.create_task(self._read_loop(shard))
+            logger.info(f"📡 Subscribed to channel: {channel} (shard {shard.index})")
+
+        return subscription
+
+    async def unsubscribe(self, subscription: PubSubSubscription) -> None:
+        """購読を解除（最後の購読ならチャンネルを UNSUBSCRIBE）"""
+        channel = subscription.channel
+        subscribers = self._subscribers.get(channel)
+        if not subscribers or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        if subscribers:
+            return
+        del self._subscribers[channel]
+
+        shard = self._shard_for(channel)
+        async with shard.lock:
+            # ロック待ちの間に再購読された場合は維持
+            if channel in self._subscribers or channel not in shard.channels:
+                return
+            shard.channels.discard(channel)
+            try:
+                await shard.pubsub.unsubscribe(channel)
+                logger.info(f"📡 Unsubscribed from channel: {channel}")
+            except Exception as e:
+                logger.error(f"❌ Failed to unsubscribe {channel}: {e}")
+
+    async def _read_loop(self, shard: _PubSubShard) -> None:
+        """シャードの購読接続からメッセージを受信して配信（購読チャンネルがなくなったら終了）"""
+        while shard.channels:
+            try:
+                message = await shard.pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=self.poll_timeout
+                )
+                if message and message.get("type") == "message":
+                    self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Pub/Sub listener error (shard {shard.index}): {e}")
+                self._metrics.increment("sse.dispatcher.reconnects")
+                await asyncio.sleep(1)
+                await self._reconnect(shard)
+
+    async def _reconnect(self, shard: _PubSubShard) -> None:
+        """購読接続を作り直して購読中のチャンネルを再購読"""
+        async with shard.lock:
+            old_pubsub, shard.pubsub = shard.pubsub, self._pubsub_factory()
+            try:
+                if old_pubsub is not None:
+                    await old_pubsub.aclose()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to close broken Pub/Sub connection: {e}")
+            try:
+                if shard.channels:
+                    await shard.pubsub.subscribe(*shard.channels)
+            except Exception as e:
+                logger.error(f"❌ Failed to resubscribe shard {shard.index}: {e}")
+
+    def _dispatch(self, channel: str, data: Any) -> None:
+        subscribers = self._subscribers.get(channel)
+        if not subscribers:
+            return
+        if not isinstance(data, str):
+            logger.error(f"❌ Unexpected Pub/Sub payload type: {type(data).__name__}")
+            return
+
+        # ヘッダー行のみ読み取り、JSON はフィルタ・結合が必要になるまでパースしない
+        event = SSEEvent.from_payload(data)
+        self._metrics.increment("sse.dispatcher.messages")
+        for subscription in list(subscribers):
+            subscription.deliver(event)
+
+    async def close(self) -> None:
+        """全シャードの受信を停止して購読接続を返却"""
+        for shard in self._shards:
+            if shard.reader is not None:
+                shard.reader.cancel()
+                try:
+                    await shard.reader
+                except (asyncio.CancelledError, Exception):
+                    pass
+                shard.reader = None
+            if shard.pubsub is not None:
+                try:
+                    await shard.pubsub.aclose()
+                except Exception as e:
+                    logger.error(f"❌ Pub/Sub close error: {e}")
+                shard.pubsub = None
+            shard.channels.clear()
+        self._subscribers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """購読状況"""
+        return {
+            "shards": len(self._shards),
+            "channels": len(self._subscribers),
+            "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            "slow_consumer_policy": self.slow_consumer_policy,
+            "max_queue_size": self.max_queue_size,
+            "channels_per_shard": [len(shard.channels) for shard in self._shards]
+        }
+
+
+@lru_cache(maxsize=1)
+def get_redis_pubsub_dispatcher() -> RedisPubSubDispatcher:
+    """
+    RedisPubSubDispatcherのシングルトンインスタンスを取得
+
+    Returns:
+        RedisPubSubDispatcher: Pub/Subディスパッチャー
+    """
+    return RedisPubSubDispatcher()
+
+
+# ==========================================
+# Export
+# ==========================================
+
+__all__ = [
+    "RedisPubSubDispatcher",
+    "PubSubSubscription",
+    "SlowConsumerError",
+    "SLOW_CONSUMER_POLICIES",
+    "get_redis_pubsub_dispatcher"
+]
@@ -0,0 +1,250 @@
+"""
+Redis Rate Limiter - Infrastructure Layer
+外部API（OpenAI / Google）の全ワーカー共通レート制限（Redis トークンバケット）
+
+- プロバイダー・モデルごとに RPM（リクエスト数）と TPM（トークン数）の2つのバケットを管理
+- 送信前に acquire() で容量を待つ（429 を受けてからの一斉リトライを防ぐ）
+- 優先度ごとに残すべき容量を変え、categorize など対話的な処理を enrichment より先に通す
+- 429 を受けた場合は report_rate_limited() で全ワーカーの送信を一時停止
+- Redis 障害時は制限せずに送信（fail-open）。障害検知後は一定時間 Redis を参照せず、ログは状態の切り替わり時のみ
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional
+
+from app_2.core.config import settings
+from app_2.infrastructure.integrations.redis.redis_client import RedisClient
+from app_2.utils.logger import get_logger
+from app_2.utils.metrics import get_metrics_registry
+
+logger = get_logger("redis_rate_limiter")
+
+# 優先度ごとに残しておく容量の割合（低優先度ほど多く残し、高優先度の待ちを先に解消）
+PRIORITY_RESERVES: Dict[str, float] = {
+    "interactive": 0.0,
+    "normal": 0.1,
+    "background": 0.25
+}
+
+# バケットを補充して、両バケットに容量があれば消費（0 を返す）。なければ必要な待機時間（ms）を返す
+ACQUIRE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local rpm = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local cost = math.min(tonumber(ARGV[3]), tpm)
+local reserve = tonumber(ARGV[4])
+
+local state = redis.call('HMGET', KEYS[1], 'requests', 'tokens', 'ts', 'blocked_until')
+local requests = tonumber(state[1]) or rpm
+local tokens = tonumber(state[2]) or tpm
+local elapsed = math.max(0, now - (tonumber(state[3]) or now))
+local blocked_until = tonumber(state[4]) or 0
+
+requests = math.min(rpm, requests + elapsed * rpm / 60000)
+if tpm > 0 then
+    tokens = math.min(tpm, tokens + elapsed * tpm / 60000)
+end
+
+local wait = 0
+if blocked_until > now then
+    wait = blocked_until - now
+end
+local need_requests = math.min(rpm, 1 + rpm * reserve)
+if requests < need_requests then
+    wait = math.max(wait, math.ceil((need_requests - requests) * 60000 / rpm))
+end
+if tpm > 0 then
+    local need_tokens = math.min(tpm, cost + tpm * reserve)
+    if tokens < need_tokens then
+        wait = math.max(wait, math.ceil((need_tokens - tokens) * 60000 / tpm))
+    end
+end
+
+if wait == 0 then
+    requests = requests - 1
+    if tpm > 0 then
+        tokens = tokens - cost
+    end
+end
+redis.call('HSET', KEYS[1], 'requests', requests, 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], 120000)
+return wait
+"""
+
+# 429 を受けたバケットを指定時間停止（既存の停止期限より長い場合のみ延長）
+BLOCK_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local blocked_until = now + tonumber(ARGV[1])
+local current = tonumber(redis.call('HGET', KEYS[1], 'blocked_until')) or 0
+if blocked_until > current then
+    redis.call('HSET', KEYS[1], 'blocked_until', blocked_until)
+end
+redis.call('PEXPIRE', KEYS[1], 120000 + tonumber(ARGV[1]))
+return blocked_until
+"""
+
+
+@dataclass
+class RateLimit:
+    """プロバイダーのレート上限（tpm=0 はトークン数を制限しない）"""
+    rpm: int
+    tpm: int = 0
+
+
+class RedisRateLimiter:
+    """
+    分散トークンバケット型レート制限
+
+    キー: ratelimit:{provider}:{model}
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[RedisClient] = None,
+        max_wait_seconds: Optional[float] = None,
+        redis_backoff_seconds: Optional[float] = None
+    ):
+        self.redis_client = redis_client or RedisClient()
+        self.max_wait_seconds = max_wait_seconds or settings.ai.rate_limit_max_wait_seconds
+        self.redis_backoff_seconds = (
+            settings.ai.rate_limit_redis_backoff_seconds if redis_backoff_seconds is None else redis_backoff_seconds
+        )
+        self._redis_down = False
+        self._redis_retry_at = 0.0
+        self._metrics = get_metrics_registry()
+
+    def _redis_skipped(self) -> bool:
+        """Redis 障害検知後の待機期間中か（期間中は Redis に接続せず制限なしで送信）"""
+        return self._redis_down and time.monotonic() < self._redis_retry_at
+
+    def _mark_redis_down(self, error: Exception) -> None:
+        """Redis 障害を記録し、redis_backoff_seconds の間は Redis を参照しない"""
+        self._redis_retry_at = time.monotonic() + self.redis_backoff_seconds
+        if not self._redis_down:
+            self._redis_down = True
+            self._metrics.increment("rate_limiter.redis_unavailable")
+            logger.warning(
+                f"⚠️ Rate limiter Redis unavailable, sending without limit "
+                f"(retrying every {self.redis_backoff_seconds:.0f}s): {error}"
+            )
+
+    def _mark_redis_up(self) -> None:
+        """Redis の復旧を記録"""
+        if self._redis_down:
+            self._redis_down = False
+            logger.info("✅ Rate limiter Redis recovered, rate limiting resumed")
+
+    @staticmethod
+    def limit_for(provider: str) -> RateLimit:
+        """プロバイダーのレート上限を取得"""
+        ai = settings.ai
+        limits = {
+            "openai": RateLimit(ai.openai_rate_limit_rpm, ai.openai_rate_limit_tpm),
+            "google_vision": RateLimit(ai.google_vision_rate_limit_rpm),
+            "google_translate": RateLimit(ai.google_translate_rate_limit_rpm),
+            "google_search": RateLimit(ai.google_search_rate_limit_rpm)
+        }
+        if provider not in limits:
+            raise ValueError(f"Unknown rate limit provider: {provider}")
+        return limits[provider]
+
+    @staticmethod
+    def bucket_key(provider: str, model: str) -> str:
+        return f"ratelimit:{provider}:{model}"
+
+    async def acquire(
+        self,
+        provider: str,
+        model: str = "default",
+        tokens: int = 0,
+        priority: str = "normal"
+    ) -> float:
+        """
+        送信可能になるまで待機して容量を消費
+
+        Args:
+            provider: プロバイダー（openai / google_vision / google_translate / google_search）
+            model: モデル名（モデルごとに別バケット）
+            tokens: 見込みトークン数（入力 + 出力）
+            priority: 優先度（interactive / normal / background）
+
+        Returns:
+            float: 待機した秒数
+        """
+        if not settings.ai.rate_limit_enabled or self._redis_skipped():
+            return 0.0
+
+        limit = self.limit_for(provider)
+        reserve = PRIORITY_RESERVES.get(priority, PRIORITY_RESERVES["normal"])
+        key = self.bucket_key(provider, model)
+        started = time.perf_counter()
+        throttled = False
+
+        while True:
+            try:
+                async with self.redis_client.get_connection() as client:
+                    wait_ms = int(await client.eval(ACQUIRE_SCRIPT, 1, key, limit.rpm, limit.tpm, tokens, reserve))
+            except Exception as e:
+                self._mark_redis_down(e)
+                return time.perf_counter() - started
+            self._mark_redis_up()
+
+            if wait_ms <= 0:
+                break
+            if time.perf_counter() - started >= self.max_wait_seconds:
+                logger.warning(f"⚠️ Rate limiter wait for {provider}/{model} exceeded {self.max_wait_seconds}s, sending anyway")
+                break
+
+            throttled = True
+            # 複数ワーカーが同時に再試行しないよう待機時間に揺らぎを加える
+            await asyncio.sleep(min(wait_ms / 1000, 1.0) + random.uniform(0, 0.05))
+
+        waited = time.perf_counter() - started
+        if throttled:
+            self._metrics.increment(f"rate_limiter.{provider}.throttled")
+            self._metrics.observe(f"rate_limiter.{provider}.wait.{priority}", waited)
+        return waited
+
+    async def report_rate_limited(self, provider: str, model: str = "default", retry_after_seconds: float = 1.0) -> bool:
+        """
+        429 を受けたことを通知し、全ワーカーの送信を retry_after_seconds 停止
+
+        Returns:
+            bool: 停止を設定できた場合 True（呼び出し側は False の場合に自前で待機）
+        """
+        self._metrics.increment(f"rate_limiter.{provider}.rate_limited")
+        if not settings.ai.rate_limit_enabled or self._redis_skipped():
+            return False
+        try:
+            async with self.redis_client.get_connection() as client:
+                await client.eval(BLOCK_SCRIPT, 1, self.bucket_key(provider, model), int(retry_after_seconds * 1000))
+        except Exception as e:
+            self._mark_redis_down(e)
+            return False
+        self._mark_redis_up()
+        logger.warning(f"⚠️ {provider}/{model} rate limited, pausing all workers for {retry_after_seconds:.1f}s")
+        return True
+
+
+@lru_cache(maxsize=1)
+def get_redis_rate_limiter() -> RedisRateLimiter:
+    """
+    RedisRateLimiterのシングルトンインスタンスを取得
+
+    Returns:
+        RedisRateLimiter: 分散レート制限
+    """
+    return RedisRateLimiter()
+
+
+# ==========================================
+# Export
+# ==========================================
+
+__all__ = ["RedisRateLimiter", "RateLimit", "PRIORITY_RESERVES", "get_redis_rate_limiter"]
@@ -8,6 +8,7 @@ import asyncio
 from typing import Dict, Any, Optional, AsyncGenerator, Callable
 
 from app_2.infrastructure.integrations.redis.redis_client import RedisClient
+from app_2.infrastructure.integrations.redis.sse_event import SSEEvent
 from app_2.core.config import settings
 from app_2.utils.logger import get_logger
 
@@ -78,8 +79,8 @@ class RedisSubscriber:
                 # 実際のメッセージのみ処理
                 if message["type"] == "message":
                     try:
-                        # JSON文字列をパース
-                        message_data = json.loads(message["data"])
+                        # JSON文字列・整形済みSSEフレームをパース
+                        message_data = SSEEvent.from_payload(message["data"]).message
                         
                         logger.debug(f"📨 Received message: {message_data['type']}")
                         yield message_data
@@ -154,15 +155,11 @@ class RedisSubscriber:
             # 購読解除
             await self.unsubscribe()
             
-            # PubSub接続をクリーンアップ
+            # PubSub接続をプールに返却（Redis クライアントは共有のため閉じない）
             if self._pubsub:
                 await self._pubsub.aclose()
                 self._pubsub = None
             
-            # Redis クライアントクリーンアップ
-            if self.redis_client:
-                await self.redis_client.cleanup()
-            
             logger.info("🔌 Redis subscriber cleaned up")
             
         except Exception as e:
@@ -0,0 +1,100 @@
+"""
+Redis Task Checkpoint - Infrastructure Layer
+セッション × タスク種別ごとの完了アイテム記録（Celery リトライ・再配信時に完了済みアイテムを再処理しない）
+
+キー: {prefix}{session_id}:{task_name}（完了したアイテムIDの SET、TTL付き）
+Redis 障害時は完了記録なしとして全アイテムを処理（fail-open）
+"""
+
+from functools import lru_cache
+from typing import Iterable, Optional, Set
+
+from app_2.core.config import settings
+from app_2.infrastructure.integrations.redis.redis_client import RedisClient
+from app_2.utils.logger import get_logger
+from app_2.utils.metrics import get_metrics_registry
+
+logger = get_logger("redis_task_checkpoint")
+
+
+class RedisTaskCheckpoint:
+    """
+    アイテム単位のタスク完了チェックポイント
+
+    BatchProcessor がアイテムのDB更新成功後に記録し、次回の process_items で記録済みアイテムを除外する
+    """
+
+    def __init__(self, redis_client: Optional[RedisClient] = None):
+        self.redis_client = redis_client or RedisClient()
+        self.prefix = settings.celery.task_checkpoint_prefix
+        self.ttl_seconds = settings.celery.task_checkpoint_ttl_seconds
+        self._metrics = get_metrics_registry()
+
+    def checkpoint_key(self, session_id: str, task_name: str) -> str:
+        return f"{self.prefix}{session_id}:{task_name}"
+
+    async def get_completed(self, session_id: str, task_name: str) -> Set[str]:
+        """
+        完了済みアイテムIDを取得
+
+        Returns:
+            Set[str]: 完了済みアイテムID（無効時・Redis 障害時は空）
+        """
+        if not settings.celery.task_checkpoint_enabled:
+            return set()
+        try:
+            async with self.redis_client.get_connection() as client:
+                members = await client.smembers(self.checkpoint_key(session_id, task_name))
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load task checkpoint for {task_name} (session={session_id}): {e}")
+            return set()
+        return {member.decode() if isinstance(member, bytes) else str(member) for member in members}
+
+    async def mark_completed(self, session_id: str, task_name: str, item_ids: Iterable[str]) -> bool:
+        """
+        アイテムを完了として記録
+
+        Returns:
+            bool: 記録できた場合 True
+        """
+        item_ids = [str(item_id) for item_id in item_ids]
+        if not item_ids or not settings.celery.task_checkpoint_enabled:
+            return False
+        key = self.checkpoint_key(session_id, task_name)
+        try:
+            async with self.redis_client.get_connection() as client:
+                async with client.pipeline(transaction=True) as pipe:
+                    pipe.sadd(key, *item_ids)
+                    pipe.expire(key, self.ttl_seconds)
+                    await pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to record task checkpoint for {task_name} (session={session_id}): {e}")
+            return False
+        self._metrics.increment(f"task_checkpoint.{task_name}.marked", len(item_ids))
+        return True
+
+    async def clear(self, session_id: str, task_name: str) -> None:
+        """チェックポイントを削除（セッションを最初から再処理する場合）"""
+        try:
+            async with self.redis_client.get_connection() as client:
+                await client.delete(self.checkpoint_key(session_id, task_name))
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to clear task checkpoint for {task_name} (session={session_id}): {e}")
+
+
+@lru_cache(maxsize=1)
+def get_redis_task_checkpoint() -> RedisTaskCheckpoint:
+    """
+    RedisTaskCheckpointのシングルトンインスタンスを取得
+
+    Returns:
+        RedisTaskCheckpoint: タスク完了チェックポイント
+    """
+    return RedisTaskCheckpoint()
+
+
+# ==========================================
+# Export
+# ==========================================
+
+__all__ = ["RedisTaskCheckpoint", "get_redis_task_checkpoint"]
@@ -0,0 +1,84 @@
+"""
+Redis Viewport Hint - Infrastructure Layer
+クライアントが表示中のカテゴリ（ビューポートヒント）をセッションごとに保持
+
+キー: {prefix}{session_id}（LIST、先頭が最新のヒント）
+BatchProcessor はバッチを開始するたびに参照し、表示中カテゴリのアイテムを含むバッチを優先する
+Redis 障害時はヒントなしとして扱う（fail-open）
+"""
+
+from functools import lru_cache
+from typing import List, Optional
+
+from app_2.core.config import settings
+from app_2.infrastructure.integrations.redis.redis_client import RedisClient
+from app_2.utils.logger import get_logger
+
+logger = get_logger("redis_viewport_hint")
+
+
+class RedisViewportHint:
+    """セッション単位のビューポートヒント"""
+
+    def __init__(self, redis_client: Optional[RedisClient] = None):
+        self.redis_client = redis_client or RedisClient()
+        self.prefix = settings.pipeline.viewport_hint_prefix
+        self.max_categories = settings.pipeline.viewport_hint_max_categories
+        self.ttl_seconds = settings.pipeline.viewport_hint_ttl_seconds
+
+    def hint_key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    async def set_hint(self, session_id: str, category: str) -> bool:
+        """
+        表示中のカテゴリを記録（同じカテゴリは先頭に移動）
+
+        Returns:
+            bool: 記録できた場合 True
+        """
+        key = self.hint_key(session_id)
+        try:
+            async with self.redis_client.get_connection() as client:
+                async with client.pipeline(transaction=True) as pipe:
+                    pipe.lrem(key, 0, category)
+                    pipe.lpush(key, category)
+                    pipe.ltrim(key, 0, self.max_categories - 1)
+                    pipe.expire(key, self.ttl_seconds)
+                    await pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to record viewport hint for session {session_id}: {e}")
+            return False
+
+    async def get_boosted_categories(self, session_id: str) -> List[str]:
+        """
+        優先するカテゴリを取得
+
+        Returns:
+            List[str]: カテゴリ名（最新のヒントが先頭。ヒントなし・Redis 障害時は空）
+        """
+        try:
+            async with self.redis_client.get_connection() as client:
+                categories = await client.lrange(self.hint_key(session_id), 0, -1)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load viewport hint for session {session_id}: {e}")
+            return []
+        return [category.decode() if isinstance(category, bytes) else str(category) for category in categories]
+
+
+@lru_cache(maxsize=1)
+def get_redis_viewport_hint() -> RedisViewportHint:
+    """
+    RedisViewportHintのシングルトンインスタンスを取得
+
+    Returns:
+        RedisViewportHint: ビューポートヒント
+    """
+    return RedisViewportHint()
+
+
+# ==========================================
+# Export
+# ==========================================
+
+__all__ = ["RedisViewportHint", "get_redis_viewport_hint"]
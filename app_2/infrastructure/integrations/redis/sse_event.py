@@ -0,0 +1,125 @@
+"""
+SSE Event - Infrastructure Layer
+Pub/Sub で受信したSSEイベント（生ペイロードを保持し、必要になるまでパースしない）
+
+ペイロードは2形式に対応:
+- SSEフレーム: "id: ...\\nevent: <type>\\ndata: <json>\\n\\n"（Publisher が1回だけ整形、そのまま転送）
+- JSON: {"type": ..., ...}（従来形式、フレームはイベントごとに1回だけ整形）
+
+同じイベントを受信した全SSE接続で1つのインスタンスを共有するため、
+パース・整形のコストは接続数によらずイベントごとに1回
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+FRAME_PREFIXES = ("id: ", "event: ")
+
+
+def format_sse_frame(message: Dict[str, Any], message_json: Optional[str] = None) -> str:
+    """メッセージをSSEフレームに整形（event_id があれば id: を付与）"""
+    if message_json is None:
+        message_json = json.dumps(message, ensure_ascii=False)
+    frame = f"id: {message['event_id']}\n" if message.get("event_id") else ""
+    return frame + f"event: {message.get('type', 'unknown')}\ndata: {message_json}\n\n"
+
+
+def is_sse_frame(payload: str) -> bool:
+    return payload.startswith(FRAME_PREFIXES)
+
+
+class SSEEvent:
+    """1イベント分のペイロード（パース結果・整形済みフレームを遅延生成してキャッシュ）"""
+
+    __slots__ = ("raw", "_message", "_frame", "_type", "_event_id", "_data_span")
+
+    def __init__(self):
+        self.raw: Optional[str] = None
+        self._message: Optional[Dict[str, Any]] = None
+        self._frame: Optional[str] = None
+        self._type: Optional[str] = None
+        self._event_id: Optional[str] = None
+        self._data_span = None
+
+    @classmethod
+    def from_payload(cls, payload: str, event_id: Optional[str] = None) -> "SSEEvent":
+        """Pub/Sub・Stream の生ペイロードから作成"""
+        event = cls()
+        event.raw = payload
+        event._event_id = event_id
+        if is_sse_frame(payload):
+            event._parse_frame_headers()
+            if event_id and not payload.startswith("id: "):
+                # Stream に保存したフレームには id: がないため付与
+                event._frame = f"id: {event_id}\n{payload}"
+            else:
+                event._frame = payload
+        return event
+
+    @classmethod
+    def from_message(cls, message: Dict[str, Any]) -> "SSEEvent":
+        """サーバー内で生成したメッセージから作成"""
+        event = cls()
+        event._message = message
+        event._type = message.get("type", "unknown")
+        event._event_id = message.get("event_id")
+        return event
+
+    def _parse_frame_headers(self) -> None:
+        """フレームの id / event 行と data の位置のみ読み取る（JSONはパースしない）"""
+        raw = self.raw
+        position = 0
+        while position < len(raw):
+            line_end = raw.find("\n", position)
+            if line_end < 0:
+                line_end = len(raw)
+            line = raw[position:line_end]
+            if line.startswith("data: "):
+                self._data_span = (position + 6, line_end)
+                return
+            if line.startswith("id: "):
+                self._event_id = self._event_id or line[4:]
+            elif line.startswith("event: "):
+                self._type = line[7:]
+            position = line_end + 1
+
+    @property
+    def message(self) -> Dict[str, Any]:
+        """パース済みメッセージ（サーバー側でフィルタ・結合する場合のみ使用）"""
+        if self._message is None:
+            if self._data_span is not None:
+                data = self.raw[self._data_span[0]:self._data_span[1]]
+            else:
+                data = self.raw
+            message = json.loads(data)
+            if self._event_id and "event_id" not in message:
+                message["event_id"] = self._event_id
+            self._message = message
+        return self._message
+
+    @property
+    def type(self) -> str:
+        if self._type is None:
+            self._type = self.message.get("type", "unknown")
+        return self._type
+
+    @property
+    def event_id(self) -> Optional[str]:
+        if self._event_id is None and self._frame is None:
+            self._event_id = self.message.get("event_id")
+        return self._event_id
+
+    @property
+    def frame(self) -> str:
+        """SSEフレーム（Publisher 整形済みならそのまま、JSON 形式なら1回だけ整形）"""
+        if self._frame is None:
+            # 受信したJSONは再シリアライズせずそのまま data 行に使用
+            self._frame = format_sse_frame(self.message, self.raw)
+        return self._frame
+
+
+# ==========================================
+# Export
+# ==========================================
+
+__all__ = ["SSEEvent", "format_sse_frame", "is_sse_frame"]
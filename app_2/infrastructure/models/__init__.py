@@ -1,3 +1,5 @@
 from app_2.infrastructure.models.menu_model import MenuModel
+from app_2.infrastructure.models.translation_memory_model import TranslationMemoryModel
+from app_2.infrastructure.models.openai_response_cache_model import OpenAIResponseCacheModel
 
-__all__ = ["MenuModel"]
+__all__ = ["MenuModel", "TranslationMemoryModel", "OpenAIResponseCacheModel"]
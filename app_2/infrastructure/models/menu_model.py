@@ -3,9 +3,10 @@ Menu Model - Infrastructure Layer
 SQLAlchemy model for menu data persistence
 """
 
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
+from typing import Optional
 
 from app_2.core.database import Base
 from app_2.domain.entities.menu_entity import MenuEntity
@@ -55,6 +56,9 @@ class MenuModel(Base):
     
     # 生成画像URL
     gen_image = Column(String, nullable=True)
+    
+    # メニュー上の並び順（カテゴライズ結果の順序 = OCR の y_center 順、セッション内で0始まり）
+    position = Column(Integer, nullable=True)
 
     # ========================================
     # タイムスタンプフィールド
@@ -91,13 +95,14 @@ class MenuModel(Base):
         )
 
     @classmethod
-    def from_entity_with_session(cls, entity: MenuEntity, session_id: str) -> "MenuModel":
+    def from_entity_with_session(cls, entity: MenuEntity, session_id: str, position: Optional[int] = None) -> "MenuModel":
         """
         ドメインエンティティからセッション付きSQLAlchemyモデルを作成
         
         Args:
             entity: ドメインエンティティ
             session_id: セッションID
+            position: メニュー上の並び順
             
         Returns:
             MenuModel: SQLAlchemyモデル
@@ -114,7 +119,8 @@ class MenuModel(Base):
             allergy=entity.allergy,
             ingredient=entity.ingredient,
             search_engine=entity.search_engine,
-            gen_image=entity.gen_image
+            gen_image=entity.gen_image,
+            position=position
         )
 
     def update_from_entity(self, entity: MenuEntity) -> None:
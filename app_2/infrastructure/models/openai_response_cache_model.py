@@ -0,0 +1,34 @@
+"""
+OpenAI Response Cache Model - Infrastructure Layer
+SQLAlchemy model for cached OpenAI Function Calling responses
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, String, Text, DateTime
+
+from app_2.core.database import Base
+
+
+class OpenAIResponseCacheModel(Base):
+    """
+    OpenAI応答キャッシュSQLAlchemyモデル
+
+    OPENAI_RESPONSE_CACHE_BACKEND=postgres の場合の保存先
+    """
+    __tablename__ = "openai_response_cache"
+
+    # キャッシュキー（モデル名・プロンプト・スキーマのハッシュ）
+    cache_key = Column(String, primary_key=True)
+
+    # プロンプト名（ヒット率の集計単位）
+    prompt_name = Column(String, nullable=False, index=True)
+
+    # Function Calling の結果（JSON文字列）
+    response = Column(Text, nullable=False)
+
+    # 作成日時（件数上限を超えた場合は古いものから削除）
+    created_at = Column(DateTime, default=lambda: datetime.utcnow(), nullable=False, index=True)
+
+    # 有効期限
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,41 @@
+"""
+Translation Memory Model - Infrastructure Layer
+SQLAlchemy model for translation memory persistence
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, String, Integer, DateTime
+
+from app_2.core.database import Base
+
+
+class TranslationMemoryModel(Base):
+    """
+    翻訳メモリSQLAlchemyモデル
+
+    正規化済み原文・翻訳先言語・翻訳プロバイダーごとに翻訳結果を永続化
+    （Redis の翻訳メモリが失効した後の参照先）
+    """
+    __tablename__ = "translation_memory"
+
+    # 翻訳プロバイダー（例: google）
+    provider = Column(String, primary_key=True)
+
+    # 翻訳先言語コード
+    target_language = Column(String, primary_key=True)
+
+    # 正規化済み原文（NFKC・前後空白除去）
+    source_text = Column(String, primary_key=True)
+
+    # 翻訳結果
+    translated_text = Column(String, nullable=False)
+
+    # DB参照回数
+    hit_count = Column(Integer, nullable=False, default=0)
+
+    # 作成日時
+    created_at = Column(DateTime, default=lambda: datetime.utcnow(), nullable=False)
+
+    # 最終参照日時（保持期間を過ぎたエントリを削除する基準）
+    last_used_at = Column(DateTime, default=lambda: datetime.utcnow(), nullable=False, index=True)
@@ -3,11 +3,11 @@ Menu Repository Implementation - Infrastructure Layer
 Concrete implementation of MenuRepositoryInterface using SQLAlchemy (MVP Simplified)
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import String, column, select, delete, update, values
 
 from app_2.domain.entities.menu_entity import MenuEntity
 from app_2.domain.repositories.menu_repository import MenuRepositoryInterface
@@ -94,9 +94,9 @@ class MenuRepositoryImpl(MenuRepositoryInterface):
             saved_entities = []
             menu_models = []
             
-            # 全てのエンティティをモデルに変換
-            for menu in menus:
-                menu_model = MenuModel.from_entity_with_session(menu, session_id)
+            # 全てのエンティティをモデルに変換（リストの順序をメニュー上の並び順として保存）
+            for position, menu in enumerate(menus):
+                menu_model = MenuModel.from_entity_with_session(menu, session_id, position)
                 menu_models.append(menu_model)
                 self.session.add(menu_model)
             
@@ -158,6 +158,38 @@ class MenuRepositoryImpl(MenuRepositoryInterface):
             logger.error(f"Failed to get menus by session {session_id}: {e}")
             raise
 
+    async def get_task_items(self, session_id: str, item_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Celeryタスクの入力となるメニューアイテムを1クエリで取得（必要なカラムのみ）
+        
+        created_at は一括保存で同値になり得るため、保存時の並び順（position）で並べる
+        
+        Args:
+            session_id: セッションID
+            item_ids: 対象メニューIDの部分集合（省略時はセッション内の全メニュー）
+            
+        Returns:
+            List[Dict[str, Any]]: id / name / category / price / translation / category_translation の辞書一覧（メニュー上の並び順）
+        """
+        try:
+            stmt = select(
+                MenuModel.id,
+                MenuModel.name,
+                MenuModel.category,
+                MenuModel.price,
+                MenuModel.translation,
+                MenuModel.category_translation
+            ).where(MenuModel.session_id == session_id).order_by(MenuModel.position, MenuModel.created_at, MenuModel.id)
+            if item_ids is not None:
+                stmt = stmt.where(MenuModel.id.in_(item_ids))
+            
+            result = await self.session.execute(stmt)
+            return [dict(row) for row in result.mappings().all()]
+            
+        except Exception as e:
+            logger.error(f"Failed to get task items for session {session_id}: {e}")
+            raise
+
     async def update(self, menu: MenuEntity) -> MenuEntity:
         """
         メニューを更新（統一メソッド）
@@ -231,6 +263,112 @@ class MenuRepositoryImpl(MenuRepositoryInterface):
             logger.error(f"Failed to partially update menu {menu_id}: {e}")
             raise
 
+    async def update_columns(self, menu_id: str, fields: Dict[str, Any]) -> bool:
+        """
+        指定カラムのみを1文で更新（UPDATE menus SET ... WHERE id = ...）
+        
+        update_partial と異なり SELECT → 書き戻しを行わないため、
+        別タスクが同じ行の他カラムを並行更新しても上書きされない。
+        
+        Args:
+            menu_id: メニューID
+            fields: 更新するカラムの辞書
+            
+        Returns:
+            bool: 行が更新された場合 True（存在しないIDは False）
+        """
+        table_columns = MenuModel.__table__.c
+        known_fields = {name: value for name, value in fields.items() if name in table_columns and name != "id"}
+        unknown_fields = set(fields) - set(known_fields)
+        if unknown_fields:
+            logger.warning(f"Unknown fields {sorted(unknown_fields)} for menu {menu_id}")
+        if not known_fields:
+            return False
+        
+        try:
+            stmt = (
+                update(MenuModel)
+                .where(MenuModel.id == menu_id)
+                .values({**known_fields, "updated_at": datetime.utcnow()})
+                .returning(MenuModel.id)
+                .execution_options(synchronize_session=False)
+            )
+            result = await self.session.execute(stmt)
+            updated = result.scalar_one_or_none() is not None
+            await self.session.commit()
+            
+            if updated:
+                logger.info(f"Menu columns updated: {menu_id}, fields: {list(known_fields.keys())}")
+            else:
+                logger.warning(f"Menu not found for column update: {menu_id}")
+            return updated
+            
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Failed to update columns for menu {menu_id}: {e}")
+            raise
+
+    async def bulk_update_fields(self, updates: Dict[str, Dict[str, Any]]) -> List[str]:
+        """
+        複数メニューの部分更新を一括実行（UPDATE ... FROM (VALUES ...)）
+        
+        更新カラムの組み合わせごとに1文を発行し、全体を1回のcommitで確定する。
+        SELECT を伴わないため、存在しないIDは戻り値に含まれない。
+        
+        Args:
+            updates: メニューID -> 更新フィールドの辞書
+            
+        Returns:
+            List[str]: 実際に更新されたメニューIDのリスト
+        """
+        if not updates:
+            return []
+        
+        table_columns = MenuModel.__table__.c
+        
+        # 更新カラムの組み合わせごとにグループ化
+        groups: Dict[tuple, Dict[str, Dict[str, Any]]] = {}
+        for menu_id, fields in updates.items():
+            known_fields = {name: value for name, value in fields.items() if name in table_columns and name != "id"}
+            unknown_fields = set(fields) - set(known_fields)
+            if unknown_fields:
+                logger.warning(f"Unknown fields {sorted(unknown_fields)} for menu {menu_id}")
+            if known_fields:
+                groups.setdefault(tuple(sorted(known_fields)), {})[menu_id] = known_fields
+        
+        try:
+            updated_ids: List[str] = []
+            now = datetime.utcnow()
+            
+            for field_names, group in groups.items():
+                value_rows = values(
+                    column("id", String),
+                    *[column(name, table_columns[name].type) for name in field_names],
+                    name="v"
+                ).data([
+                    (menu_id, *[fields[name] for name in field_names])
+                    for menu_id, fields in group.items()
+                ])
+                stmt = (
+                    update(MenuModel)
+                    .where(MenuModel.id == value_rows.c.id)
+                    .values({**{name: value_rows.c[name] for name in field_names}, "updated_at": now})
+                    .returning(MenuModel.id)
+                    .execution_options(synchronize_session=False)
+                )
+                result = await self.session.execute(stmt)
+                updated_ids.extend(result.scalars().all())
+            
+            await self.session.commit()
+            
+            logger.info(f"Menu bulk partial update: {len(updated_ids)}/{len(updates)} rows in {len(groups)} statements")
+            return updated_ids
+            
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Failed to bulk update {len(updates)} menus: {e}")
+            raise
+
     async def delete(self, menu_id: str) -> bool:
         """
         メニューを削除
@@ -5,17 +5,23 @@ from contextlib import asynccontextmanager
 from app_2.core.config import settings
 from app_2.core.cors import get_cors_settings
 from app_2.core.database import init_database, shutdown_database
+from app_2.prompt_loader import PromptLoader
 from app_2.api.v1.endpoints.pipeline import router as pipeline_router
 from app_2.api.v1.endpoints.menu_images import router as menu_images_router
 from app_2.api.v1.endpoints.sse import router as sse_router
 from app_2.api.v1.endpoints.service import router as service_router
+from app_2.api.v1.endpoints.metrics import router as metrics_router
 
 async def shutdown_redis():
     """Redisリソースのグローバルクリーンアップ"""
     try:
         from app_2.services.dependencies import get_redis_client
+        from app_2.infrastructure.integrations.redis.redis_pool_manager import get_redis_pool_manager
+        from app_2.infrastructure.integrations.redis.redis_pubsub_dispatcher import get_redis_pubsub_dispatcher
+        await get_redis_pubsub_dispatcher().close()
         redis_client = get_redis_client()
         await redis_client.cleanup()
+        await get_redis_pool_manager().close_loop_pools()
     except Exception as e:
         print(f"Redis cleanup error: {e}")
 
@@ -23,6 +29,7 @@ async def shutdown_redis():
 async def lifespan(app: FastAPI):
     # アプリケーション起動時
     await init_database()
+    PromptLoader().preload_all()
     yield
     # アプリケーション終了時
     await shutdown_database()
@@ -47,6 +54,7 @@ def create_app() -> FastAPI:
     app.include_router(menu_images_router, prefix="/api/v1")
     app.include_router(sse_router, prefix="/api/v1")  # SSEエンドポイント
     app.include_router(service_router, prefix="/api/v1")  # サービステストエンドポイント
+    app.include_router(metrics_router, prefix="/api/v1")  # メトリクスエンドポイント
     
     return app
 
@@ -1 +1,71 @@
-# Redisで状態を保持（進捗やcontext_id管理） 
\ No newline at end of file
+"""
+Pipeline Context Store - Menu Processor v2
+パイプライン実行中の中間成果物（artifact）をステージ間で受け渡すストア
+
+- 成果物はオブジェクト参照のまま保持（JSON再シリアライズしない）
+- 永続化は各ステージが stages_data に記録する（再開時はそこから復元）
+"""
+import asyncio
+from typing import Any, Dict, Iterable, Optional
+
+
+class PipelineContext:
+    """
+    1回のパイプライン実行に紐づく成果物ストア（プロセス内）
+
+    キーごとに asyncio.Event を持ち、未生成の成果物を待機できる
+    """
+
+    def __init__(self, session_id: str, initial: Optional[Dict[str, Any]] = None):
+        self.session_id = session_id
+        self._artifacts: Dict[str, Any] = {}
+        self._events: Dict[str, asyncio.Event] = {}
+        for key, value in (initial or {}).items():
+            self.put(key, value)
+
+    def _event(self, key: str) -> asyncio.Event:
+        event = self._events.get(key)
+        if event is None:
+            event = self._events[key] = asyncio.Event()
+        return event
+
+    def put(self, key: str, value: Any) -> None:
+        """成果物を登録"""
+        self._artifacts[key] = value
+        self._event(key).set()
+
+    def update(self, values: Dict[str, Any]) -> None:
+        """複数の成果物を登録"""
+        for key, value in values.items():
+            self.put(key, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """成果物を取得（未生成なら default）"""
+        return self._artifacts.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._artifacts[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._artifacts
+
+    def has_all(self, keys: Iterable[str]) -> bool:
+        """指定キーの成果物が全て揃っているか"""
+        return all(key in self._artifacts for key in keys)
+
+    async def wait_for(self, key: str, timeout: Optional[float] = None) -> Any:
+        """
+        成果物の生成を待機
+
+        Args:
+            key: 成果物キー
+            timeout: タイムアウト秒数（None は無制限）
+
+        Returns:
+            Any: 成果物
+        """
+        await asyncio.wait_for(self._event(key).wait(), timeout)
+        return self._artifacts[key]
+
+    def keys(self):
+        return self._artifacts.keys()
@@ -0,0 +1,156 @@
+"""
+Pipeline Job Queue - Menu Processor v2
+APIプロセス内でパイプラインをバックグラウンド実行するための有界ジョブキュー
+
+- 同時実行数をセマフォで制限
+- 待機中ジョブの順番（キュー位置）を提供
+- 待機数が上限を超えた場合は受け付けを拒否
+"""
+import asyncio
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app_2.core.config import settings
+from app_2.utils.logger import get_logger
+
+logger = get_logger("pipeline_job_queue")
+
+
+class PipelineQueueFullError(Exception):
+    """待機キューが上限に達している場合の例外"""
+    pass
+
+
+class PipelineJobQueue:
+    """
+    パイプラインのバックグラウンド実行キュー（プロセス内）
+
+    submit() されたジョブは asyncio タスクとして起動され、
+    セマフォを取得できた順（FIFO）に実行される
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_queued: int = 100):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._queued: List[str] = []
+        self._running: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """実行中のイベントループでセマフォを生成"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    def submit(
+        self,
+        session_id: str,
+        job_factory: Callable[[], Awaitable[Any]]
+    ) -> int:
+        """
+        ジョブを登録してバックグラウンド実行を開始
+
+        Args:
+            session_id: セッションID
+            job_factory: 実行時に呼び出されるコルーチン生成関数
+
+        Returns:
+            int: 登録時点のキュー位置（0 = 即時実行可能）
+
+        Raises:
+            PipelineQueueFullError: 待機キューが上限に達している場合
+            ValueError: 同じセッションIDが既に登録されている場合
+        """
+        if session_id in self._queued or session_id in self._running:
+            raise ValueError(f"Session {session_id} is already queued or running")
+
+        if self.is_full():
+            raise PipelineQueueFullError(
+                f"Pipeline queue is full ({len(self._queued)}/{self.max_queued} waiting)"
+            )
+
+        self._queued.append(session_id)
+        position = self._position_of(session_id)
+
+        task = asyncio.create_task(self._run(session_id, job_factory))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        logger.info(f"📥 Pipeline job queued: session={session_id}, position={position}")
+        return position
+
+    async def _run(self, session_id: str, job_factory: Callable[[], Awaitable[Any]]) -> None:
+        """セマフォ取得後にジョブを実行"""
+        try:
+            async with self._get_semaphore():
+                self._queued.remove(session_id)
+                self._running.add(session_id)
+                logger.info(f"▶️ Pipeline job started: session={session_id}, running={len(self._running)}")
+                try:
+                    await job_factory()
+                except Exception as e:
+                    # パイプライン側でSSE配信・セッション状態更新済み
+                    logger.error(f"❌ Background pipeline job failed: session={session_id}, error={e}")
+                finally:
+                    self._running.discard(session_id)
+        finally:
+            if session_id in self._queued:
+                self._queued.remove(session_id)
+
+    def is_full(self) -> bool:
+        """待機キューが上限に達しているか（submit が PipelineQueueFullError を送出する状態）"""
+        return len(self._queued) >= self.max_queued
+
+    def _position_of(self, session_id: str) -> int:
+        """
+        待機中ジョブのキュー位置を計算
+
+        空きスロットがあれば位置0（即時実行）とみなす
+        """
+        index = self._queued.index(session_id)
+        free_slots = max(self.max_concurrent - len(self._running), 0)
+        return max(index - free_slots + 1, 0)
+
+    def get_status(self, session_id: str) -> Dict[str, Any]:
+        """
+        セッションのキュー状態を取得
+
+        Args:
+            session_id: セッションID
+
+        Returns:
+            Dict[str, Any]: state は "queued" / "running" / "not_queued"
+        """
+        if session_id in self._running:
+            return {"state": "running", "queue_position": 0}
+        if session_id in self._queued:
+            return {
+                "state": "queued",
+                "queue_position": self._position_of(session_id),
+                "queued_ahead": self._queued.index(session_id)
+            }
+        return {"state": "not_queued", "queue_position": None}
+
+    def stats(self) -> Dict[str, Any]:
+        """キュー全体の統計"""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+            "running": len(self._running),
+            "queued": len(self._queued)
+        }
+
+
+@lru_cache(maxsize=1)
+def get_pipeline_job_queue() -> PipelineJobQueue:
+    """
+    PipelineJobQueueのシングルトンインスタンスを取得
+
+    Returns:
+        PipelineJobQueue: パイプラインジョブキュー
+    """
+    return PipelineJobQueue(
+        max_concurrent=settings.pipeline.max_concurrent_pipelines,
+        max_queued=settings.pipeline.max_queued_pipelines
+    )
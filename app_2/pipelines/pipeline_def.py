@@ -1 +1,292 @@
-# group/chord構成定義（並列→統合） 
\ No newline at end of file
+"""
+Pipeline Definition - Menu Processor v2
+ステージ間の依存関係（入力/出力）を宣言的に定義し、DAGとして実行する小さなエンジン
+
+- 入力が揃ったステージから順に起動（独立したステージは自動的に並行実行）
+- ステージごとのタイムアウト・リトライ・同時実行数制限
+- 必須ステージの失敗でパイプライン全体を中断、任意ステージの失敗は後続のみスキップ
+"""
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app_2.pipelines.context_store import PipelineContext
+from app_2.utils.logger import get_logger
+from app_2.utils.metrics import span
+
+logger = get_logger("pipeline_def")
+
+StageFunc = Callable[[PipelineContext], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class PipelineDefinitionError(Exception):
+    """パイプライン定義の不整合（出力重複・未定義入力・循環依存）"""
+    pass
+
+
+class StageExecutionError(Exception):
+    """必須ステージの実行失敗"""
+
+    def __init__(self, stage: str, original: BaseException):
+        super().__init__(f"Stage '{stage}' failed: {original}")
+        self.stage = stage
+        self.original = original
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """ステージのリトライ方針（max_attempts は初回を含む試行回数）"""
+    max_attempts: int = 1
+    backoff_seconds: float = 0.0
+    backoff_multiplier: float = 2.0
+
+    def delay_for(self, attempt: int) -> float:
+        """attempt 回目（1始まり）の失敗後の待機秒数"""
+        return self.backoff_seconds * (self.backoff_multiplier ** (attempt - 1))
+
+
+@dataclass
+class StageSpec:
+    """
+    ステージ定義
+
+    Attributes:
+        name: ステージ名
+        run: 実行関数（PipelineContext を受け取り、outputs のキーを持つ辞書を返す）
+        inputs: 実行前に揃っている必要がある成果物キー
+        outputs: 実行後に登録される成果物キー
+        timeout_seconds: 1試行あたりのタイムアウト（None は無制限）
+        retry: リトライ方針
+        max_concurrency: プロセス内での同時実行数上限（None は無制限）
+        required: False の場合、失敗しても後続の依存ステージをスキップするのみ
+        task_name: 進捗・エラー通知で使用するタスク名（省略時は name）
+        progress: (開始時, 完了時) の進捗率。None の側は通知しない
+    """
+    name: str
+    run: StageFunc
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    timeout_seconds: Optional[float] = None
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    max_concurrency: Optional[int] = None
+    required: bool = True
+    task_name: Optional[str] = None
+    progress: Tuple[Optional[int], Optional[int]] = (None, None)
+    _semaphore: Optional[asyncio.Semaphore] = field(default=None, init=False, repr=False)
+
+    @property
+    def display_name(self) -> str:
+        return self.task_name or self.name
+
+    def get_semaphore(self) -> Optional[asyncio.Semaphore]:
+        """同時実行数制限用セマフォ（定義インスタンス間で共有）"""
+        if self.max_concurrency is None:
+            return None
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+
+@dataclass
+class StageResult:
+    """ステージ実行結果"""
+    name: str
+    status: str  # completed / restored / skipped / failed
+    duration: float = 0.0
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+class PipelineHooks:
+    """ステージのライフサイクル通知（進捗配信・エラー配信用に上書きする）"""
+
+    async def on_stage_start(self, context: PipelineContext, stage: StageSpec) -> None:
+        pass
+
+    async def on_stage_complete(self, context: PipelineContext, stage: StageSpec, result: StageResult) -> None:
+        pass
+
+    async def on_stage_error(self, context: PipelineContext, stage: StageSpec, error: BaseException) -> None:
+        pass
+
+
+class PipelineDefinition:
+    """
+    宣言的パイプライン定義（DAG）
+
+    initial_inputs は実行開始時に PipelineContext へ投入される成果物キー
+    """
+
+    def __init__(self, name: str, stages: List[StageSpec], initial_inputs: Tuple[str, ...] = ()):
+        self.name = name
+        self.stages = list(stages)
+        self.initial_inputs = tuple(initial_inputs)
+        self._validate()
+
+    def _validate(self) -> None:
+        names: Set[str] = set()
+        producers: Dict[str, str] = {}
+        for stage in self.stages:
+            if stage.name in names:
+                raise PipelineDefinitionError(f"Duplicate stage name: {stage.name}")
+            names.add(stage.name)
+            for output in stage.outputs:
+                if output in producers or output in self.initial_inputs:
+                    raise PipelineDefinitionError(f"Artifact '{output}' is produced more than once")
+                producers[output] = stage.name
+
+        available = set(self.initial_inputs) | set(producers)
+        for stage in self.stages:
+            missing = [key for key in stage.inputs if key not in available]
+            if missing:
+                raise PipelineDefinitionError(f"Stage '{stage.name}' has unresolved inputs: {missing}")
+
+        # 循環依存チェック（トポロジカル順に解決できるか）
+        resolved = set(self.initial_inputs)
+        remaining = list(self.stages)
+        while remaining:
+            ready = [stage for stage in remaining if all(key in resolved for key in stage.inputs)]
+            if not ready:
+                raise PipelineDefinitionError(
+                    f"Cyclic dependency between stages: {[stage.name for stage in remaining]}"
+                )
+            for stage in ready:
+                resolved.update(stage.outputs)
+                remaining.remove(stage)
+
+    def get_stage(self, name: str) -> StageSpec:
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        raise KeyError(name)
+
+    async def run(
+        self,
+        context: PipelineContext,
+        hooks: Optional[PipelineHooks] = None
+    ) -> Dict[str, StageResult]:
+        """
+        パイプラインを実行
+
+        入力が揃ったステージを即座に起動し、完了するたびに新たに実行可能になったステージを起動する。
+        出力が全て context に存在するステージは実行せず "restored" とする（再開用）。
+
+        Args:
+            context: 成果物ストア（initial_inputs を投入済みであること）
+            hooks: ライフサイクル通知
+
+        Returns:
+            Dict[str, StageResult]: ステージ名ごとの実行結果
+
+        Raises:
+            StageExecutionError: 必須ステージが失敗した場合
+        """
+        hooks = hooks or PipelineHooks()
+        results: Dict[str, StageResult] = {}
+        pending: List[StageSpec] = list(self.stages)
+        running: Dict[asyncio.Task, StageSpec] = {}
+        failed_artifacts: Set[str] = set()
+
+        def _schedule_ready() -> None:
+            for stage in list(pending):
+                if any(key in failed_artifacts for key in stage.inputs):
+                    pending.remove(stage)
+                    failed_artifacts.update(stage.outputs)
+                    results[stage.name] = StageResult(stage.name, "skipped")
+                    logger.warning(f"⏭️ Stage skipped (upstream failed): {self.name}.{stage.name}")
+                    continue
+                if not context.has_all(stage.inputs):
+                    continue
+                pending.remove(stage)
+                if stage.outputs and context.has_all(stage.outputs):
+                    results[stage.name] = StageResult(stage.name, "restored")
+                    logger.info(f"♻️ Stage restored from context: {self.name}.{stage.name}")
+                    continue
+                task = asyncio.create_task(self._run_stage(context, stage, hooks))
+                running[task] = stage
+
+        try:
+            _schedule_ready()
+            while running:
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    stage = running.pop(task)
+                    result, error = task.result()
+                    results[stage.name] = result
+                    if error is not None:
+                        failed_artifacts.update(stage.outputs)
+                        if stage.required:
+                            raise StageExecutionError(stage.name, error)
+                # 完了したステージの出力で新たに実行可能になったステージを起動
+                # （スキップ連鎖も含めて収束するまで繰り返す）
+                before = None
+                while before != len(pending):
+                    before = len(pending)
+                    _schedule_ready()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+
+        for stage in pending:
+            results[stage.name] = StageResult(stage.name, "skipped")
+        return results
+
+    async def _run_stage(
+        self,
+        context: PipelineContext,
+        stage: StageSpec,
+        hooks: PipelineHooks
+    ) -> Tuple[StageResult, Optional[BaseException]]:
+        """ステージを1つ実行（タイムアウト・リトライ・同時実行数制限込み）"""
+        result = StageResult(stage.name, "failed")
+        semaphore = stage.get_semaphore()
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        last_error: Optional[BaseException] = None
+
+        await hooks.on_stage_start(context, stage)
+
+        for attempt in range(1, stage.retry.max_attempts + 1):
+            result.attempts = attempt
+            try:
+                with span(f"pipeline.dag.{stage.name}"):
+                    if semaphore is not None:
+                        async with semaphore:
+                            outputs = await asyncio.wait_for(stage.run(context), stage.timeout_seconds)
+                    else:
+                        outputs = await asyncio.wait_for(stage.run(context), stage.timeout_seconds)
+
+                outputs = outputs or {}
+                missing = [key for key in stage.outputs if key not in outputs]
+                if missing:
+                    raise PipelineDefinitionError(f"Stage '{stage.name}' did not produce outputs: {missing}")
+                context.update({key: outputs[key] for key in stage.outputs})
+                last_error = None
+                break
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    e = TimeoutError(f"Stage '{stage.name}' timed out after {stage.timeout_seconds}s")
+                last_error = e
+                if attempt < stage.retry.max_attempts:
+                    delay = stage.retry.delay_for(attempt)
+                    logger.warning(
+                        f"⚠️ Stage {self.name}.{stage.name} failed (attempt {attempt}/{stage.retry.max_attempts}), "
+                        f"retrying in {delay:.1f}s: {e}"
+                    )
+                    await asyncio.sleep(delay)
+
+        result.duration = loop.time() - started_at
+        if last_error is None:
+            result.status = "completed"
+            await hooks.on_stage_complete(context, stage, result)
+            return result, None
+
+        result.error = str(last_error)
+        logger.error(f"❌ Stage {self.name}.{stage.name} failed: {last_error}")
+        await hooks.on_stage_error(context, stage, last_error)
+        return result, last_error
@@ -5,20 +5,67 @@ Pipeline Runner - Menu Processor v2
 import time
 import json
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 from app_2.services.ocr_service import get_ocr_service
 from app_2.services.categorize_service import get_categorize_service
 from app_2.services.mapping_service import get_menu_mapping_categorize_service
 from app_2.services.menu_save_service import create_menu_save_service
-from app_2.services.dependencies import get_menu_repository, get_session_repository
+from app_2.services.dependencies import get_menu_repository, get_session_repository, get_redis_client
 from app_2.infrastructure.integrations.redis.redis_publisher import RedisPublisher
+from app_2.infrastructure.integrations.redis.redis_viewport_hint import get_redis_viewport_hint
 from app_2.domain.entities.session_entity import SessionEntity, SessionStatus
+from app_2.pipelines.context_store import PipelineContext
+from app_2.pipelines.pipeline_def import (
+    PipelineDefinition, PipelineHooks, RetryPolicy, StageExecutionError, StageResult, StageSpec
+)
+from app_2.pipelines.result_cache import get_pipeline_result_cache, compute_prompt_version
+from app_2.core.config import settings
 from app_2.utils.logger import get_logger
+from app_2.utils.metrics import get_metrics_registry, span
 
 logger = get_logger("pipeline_runner")
 
+# 並列タスクのCelery優先度（Redis ブローカーは 0 が最優先）
+# 画面上位アイテムのメッセージ → 分割しないメッセージ → 大きなメニューの残りアイテム の順に処理
+TASK_PRIORITY_HEAD = 0
+TASK_PRIORITY_DEFAULT = 3
+TASK_PRIORITY_TAIL = 6
+
+
+class PipelineProgressHooks(PipelineHooks):
+    """ステージ定義の進捗率・タスク名に従って進捗/エラーをSSE配信"""
+    
+    def __init__(self, redis_publisher: RedisPublisher):
+        self.redis_publisher = redis_publisher
+    
+    async def _publish_progress(self, session_id: str, stage: StageSpec, status: str, progress: Optional[int]):
+        if progress is None:
+            return
+        await self.redis_publisher.publish_progress_update(
+            session_id=session_id,
+            task_name=stage.display_name,
+            status=status,
+            progress_data={"progress": progress}
+        )
+    
+    async def on_stage_start(self, context: PipelineContext, stage: StageSpec) -> None:
+        await self._publish_progress(context.session_id, stage, "processing", stage.progress[0])
+    
+    async def on_stage_complete(self, context: PipelineContext, stage: StageSpec, result: StageResult) -> None:
+        await self._publish_progress(context.session_id, stage, "completed", stage.progress[1])
+    
+    async def on_stage_error(self, context: PipelineContext, stage: StageSpec, error: BaseException) -> None:
+        if not stage.required:
+            return
+        await self.redis_publisher.publish_error_message(
+            session_id=context.session_id,
+            error_type=f"{stage.display_name}_processing_failed",
+            error_message=str(error),
+            task_name=stage.display_name
+        )
+
 
 class MenuProcessingPipeline:
     """
@@ -28,13 +75,18 @@ class MenuProcessingPipeline:
     1. OCR → Mapping → Categorize → DB Save (4段階基本処理)
     2. SSE進捗配信
     3. 並列タスクのトリガー
+    
+    ステージの順序・進捗率・タイムアウトは _build_pipeline_definition() のDAG定義で管理する
     """
     
     def __init__(self):
-        self.redis_publisher = RedisPublisher()
+        self.redis_publisher = RedisPublisher(get_redis_client())
         self.ocr_service = get_ocr_service()
         self.categorize_service = get_categorize_service()
         self.mapping_service = get_menu_mapping_categorize_service()
+        self.result_cache = get_pipeline_result_cache()
+        self.definition = self._build_pipeline_definition()
+        self.hooks = PipelineProgressHooks(self.redis_publisher)
 
     async def _update_session_stage_completion(
         self, 
@@ -82,230 +134,349 @@ class MenuProcessingPipeline:
             logger.error(f"❌ Failed to update session stage {session_id}/{stage}: {e}")
             return False
 
-    async def _execute_ocr_stage(self, session_id: str, image_data: bytes) -> List[Dict]:
+    def _build_pipeline_definition(self) -> PipelineDefinition:
+        """
+        メニュー処理パイプラインのDAG定義
+
+        ocr → mapping → categorize → save ─┬→ categorize_publish → parallel_tasks
+                                          └→ session_menu_ids
+        ocr / mapping / categorize ───────────→ result_cache
+        """
+        pipeline_settings = settings.pipeline
+        return PipelineDefinition(
+            name="menu_processing",
+            initial_inputs=("image_data", "cached_result", "result_cache_key"),
+            stages=[
+                StageSpec(
+                    name="ocr",
+                    run=self._stage_ocr,
+                    inputs=("image_data", "cached_result"),
+                    outputs=("ocr_results",),
+                    timeout_seconds=pipeline_settings.ocr_stage_timeout_seconds,
+                    progress=(10, 25)
+                ),
+                StageSpec(
+                    name="mapping",
+                    run=self._stage_mapping,
+                    inputs=("ocr_results", "cached_result"),
+                    outputs=("formatted_mapping_data",),
+                    progress=(35, 45)
+                ),
+                StageSpec(
+                    name="categorize",
+                    run=self._stage_categorize,
+                    inputs=("formatted_mapping_data", "cached_result"),
+                    outputs=("categorized_results", "categorize_duration"),
+                    timeout_seconds=pipeline_settings.categorize_stage_timeout_seconds,
+                    max_concurrency=pipeline_settings.categorize_max_concurrency,
+                    progress=(55, None)
+                ),
+                StageSpec(
+                    name="save",
+                    run=self._stage_save,
+                    inputs=("categorized_results",),
+                    outputs=("saved_entities", "saved_menu_items", "save_duration"),
+                    task_name="categorize"
+                ),
+                StageSpec(
+                    name="categorize_publish",
+                    run=self._stage_publish_categorize,
+                    inputs=("categorized_results", "saved_menu_items", "categorize_duration", "save_duration"),
+                    outputs=("sse_broadcast_success",),
+                    task_name="categorize",
+                    progress=(None, 65)
+                ),
+                StageSpec(
+                    name="session_menu_ids",
+                    run=self._stage_update_session_menu_ids,
+                    inputs=("saved_entities",),
+                    retry=RetryPolicy(max_attempts=3, backoff_seconds=0.5),
+                    required=False
+                ),
+                StageSpec(
+                    name="parallel_tasks",
+                    run=self._stage_trigger_parallel_tasks,
+                    inputs=("saved_entities", "sse_broadcast_success"),
+                    outputs=("parallel_tasks_triggered",)
+                ),
+                StageSpec(
+                    name="result_cache",
+                    run=self._stage_store_result_cache,
+                    inputs=("ocr_results", "formatted_mapping_data", "categorized_results", "result_cache_key"),
+                    required=False
+                ),
+            ]
+        )
+
+    async def _stage_ocr(self, context: PipelineContext) -> Dict[str, Any]:
         """
         Stage 1: OCR実行 → DB更新 → SSE配信
         
-        Args:
-            session_id: セッションID
-            image_data: 画像データ
-            
-        Returns:
-            List[Dict]: OCR結果リスト
+        キャッシュヒット時はVision API呼び出しを省略し、同じDB更新・SSE配信のみ行う
         """
+        session_id = context.session_id
+        cached_result = context["cached_result"]
         logger.info(f"🔍 Starting OCR stage for session: {session_id}")
         
-        # OCR処理開始通知
-        await self._update_progress(session_id, "ocr", "processing", 10)
-        
-        try:
+        if cached_result:
+            ocr_results = cached_result.ocr_results
+            processing_duration = 0.0
+        else:
             # OCR実行
-            ocr_results = await self.ocr_service.extract_text_with_positions(
-                image_data, level="paragraph"
-            )
-            
-            logger.info(f"📝 OCR completed: {len(ocr_results)} text elements extracted")
-            
-            # 🎯 DB更新: セッション状態にOCR結果を保存
-            stage_data = {
-                "ocr_elements_count": len(ocr_results),
-                "ocr_results": ocr_results,
-                "stage_completed_at": datetime.utcnow().isoformat(),
-                "processing_duration": time.time() - time.time(),  # 実際の処理時間を計算する場合
-                "image_analysis": {
-                    "text_density": "high" if len(ocr_results) > 20 else "medium" if len(ocr_results) > 10 else "low",
-                    "elements_extracted": len(ocr_results),
-                    "preview_available": len(ocr_results) > 0
-                }
+            with span("pipeline.stage.ocr") as ocr_span:
+                ocr_results = await self.ocr_service.extract_text_with_positions(
+                    context["image_data"], level="paragraph"
+                )
+            processing_duration = ocr_span.duration
+            logger.info(f"📝 OCR completed: {len(ocr_results)} text elements extracted ({processing_duration:.2f}s)")
+        
+        # 🎯 DB更新: セッション状態にOCR結果を保存
+        stage_data = {
+            "ocr_elements_count": len(ocr_results),
+            "ocr_results": ocr_results,
+            "stage_completed_at": datetime.utcnow().isoformat(),
+            "processing_duration": round(processing_duration, 3),
+            "image_analysis": {
+                "text_density": "high" if len(ocr_results) > 20 else "medium" if len(ocr_results) > 10 else "low",
+                "elements_extracted": len(ocr_results),
+                "preview_available": len(ocr_results) > 0
             }
-            
-            # セッション状態更新
-            db_update_success = await self._update_session_stage_completion(
-                session_id, "ocr_completed", stage_data
-            )
-            
-            if not db_update_success:
-                logger.warning(f"⚠️ DB update failed for OCR stage, but continuing with SSE broadcast")
-            
-            # 🎯 SSE配信: OCR完了通知（汎用メソッド使用）
-            sse_success = await self.redis_publisher.publish_ocr_completion(
-                session_id=session_id,
-                ocr_results=ocr_results,
-                db_saved=db_update_success
-            )
-            
-            if sse_success:
-                logger.info(f"📡 OCR completion broadcasted successfully for session: {session_id}")
-            else:
-                logger.warning(f"⚠️ SSE broadcast failed for OCR completion: {session_id}")
-            
-            # 進捗更新
-            await self._update_progress(session_id, "ocr", "completed", 25)
-            
-            return ocr_results
-            
-        except Exception as e:
-            logger.error(f"❌ OCR stage failed for session {session_id}: {e}")
-            
-            # エラー時のSSE配信
-            await self.redis_publisher.publish_error_message(
-                session_id=session_id,
-                error_type="ocr_processing_failed",
-                error_message=str(e),
-                task_name="ocr"
-            )
-            
-            raise
+        }
+        
+        # セッション状態更新
+        db_update_success = await self._update_session_stage_completion(
+            session_id, "ocr_completed", stage_data
+        )
+        
+        if not db_update_success:
+            logger.warning(f"⚠️ DB update failed for OCR stage, but continuing with SSE broadcast")
+        
+        # 🎯 SSE配信: OCR完了通知（汎用メソッド使用）
+        sse_success = await self.redis_publisher.publish_ocr_completion(
+            session_id=session_id,
+            ocr_results=ocr_results,
+            db_saved=db_update_success
+        )
+        
+        if sse_success:
+            logger.info(f"📡 OCR completion broadcasted successfully for session: {session_id}")
+        else:
+            logger.warning(f"⚠️ SSE broadcast failed for OCR completion: {session_id}")
+        
+        return {"ocr_results": ocr_results}
 
-    async def _execute_mapping_stage(self, session_id: str, ocr_results: List[Dict]) -> str:
+    async def _stage_mapping(self, context: PipelineContext) -> Dict[str, Any]:
         """
         Stage 2: Mapping実行 → DB更新 → SSE配信
-        
-        Args:
-            session_id: セッションID
-            ocr_results: OCR結果リスト
-            
-        Returns:
-            str: フォーマット済みマッピングデータ
         """
+        session_id = context.session_id
+        ocr_results = context["ocr_results"]
+        cached_result = context["cached_result"]
         logger.info(f"🗺️ Starting Mapping stage for session: {session_id}")
         
-        await self._update_progress(session_id, "mapping", "processing", 35)
+        # マッピング処理実行（キャッシュ済みデータがあれば再利用）
+        with span("pipeline.stage.mapping") as mapping_span:
+            if cached_result:
+                formatted_mapping_data = cached_result.formatted_mapping_data
+            else:
+                formatted_mapping_data = self.mapping_service._format_mapping_data(ocr_results)
         
-        try:
-            # マッピング処理実行
-            formatted_mapping_data = self.mapping_service._format_mapping_data(ocr_results)
-            
-            logger.info("📋 Mapping completed: Position data formatted for categorization")
-            
-            # 🎯 DB更新: マッピング結果を保存
-            stage_data = {
-                "formatted_data_length": len(formatted_mapping_data),
-                "mapping_preview": formatted_mapping_data[:500],
-                "stage_completed_at": datetime.utcnow().isoformat(),
-                "ocr_elements_processed": len(ocr_results),
-                "mapping_analysis": {
-                    "data_size": len(formatted_mapping_data),
-                    "processing_successful": True,
-                    "preview_available": True
-                }
+        logger.info("📋 Mapping completed: Position data formatted for categorization")
+        
+        # 🎯 DB更新: マッピング結果を保存
+        stage_data = {
+            "formatted_data_length": len(formatted_mapping_data),
+            "mapping_preview": formatted_mapping_data[:500],
+            "formatted_mapping_data": formatted_mapping_data,
+            "stage_completed_at": datetime.utcnow().isoformat(),
+            "ocr_elements_processed": len(ocr_results),
+            "processing_duration": round(mapping_span.duration, 3),
+            "mapping_analysis": {
+                "data_size": len(formatted_mapping_data),
+                "processing_successful": True,
+                "preview_available": True
             }
-            
-            # セッション状態更新
-            db_update_success = await self._update_session_stage_completion(
-                session_id, "mapping_completed", stage_data
-            )
-            
-            # 🎯 SSE配信: Mapping完了通知（汎用メソッド使用）
-            sse_success = await self.redis_publisher.publish_mapping_completion(
-                session_id=session_id,
-                mapping_data=formatted_mapping_data,
-                db_saved=db_update_success
-            )
-            
-            if sse_success:
-                logger.info(f"📡 Mapping completion broadcasted successfully for session: {session_id}")
-            else:
-                logger.warning(f"⚠️ SSE broadcast failed for mapping completion: {session_id}")
-            
-            await self._update_progress(session_id, "mapping", "completed", 45)
-            
-            return formatted_mapping_data
-            
-        except Exception as e:
-            logger.error(f"❌ Mapping stage failed for session {session_id}: {e}")
-            
-            # エラー時のSSE配信
-            await self.redis_publisher.publish_error_message(
-                session_id=session_id,
-                error_type="mapping_processing_failed",
-                error_message=str(e),
-                task_name="mapping"
-            )
-            
-            raise
+        }
+        
+        # セッション状態更新
+        db_update_success = await self._update_session_stage_completion(
+            session_id, "mapping_completed", stage_data
+        )
+        
+        # 🎯 SSE配信: Mapping完了通知（汎用メソッド使用）
+        sse_success = await self.redis_publisher.publish_mapping_completion(
+            session_id=session_id,
+            mapping_data=formatted_mapping_data,
+            db_saved=db_update_success
+        )
+        
+        if sse_success:
+            logger.info(f"📡 Mapping completion broadcasted successfully for session: {session_id}")
+        else:
+            logger.warning(f"⚠️ SSE broadcast failed for mapping completion: {session_id}")
+        
+        return {"formatted_mapping_data": formatted_mapping_data}
 
-    async def _execute_categorize_stage(self, session_id: str, mapping_data: str) -> Dict[str, Any]:
+    async def _stage_categorize(self, context: PipelineContext) -> Dict[str, Any]:
         """
-        Stage 3: Categorize実行 → DB更新 → SSE配信
+        Stage 3: Categorize実行（OpenAI）
         
-        Args:
-            session_id: セッションID
-            mapping_data: フォーマット済みマッピングデータ
-            
-        Returns:
-            Dict[str, Any]: カテゴライズ結果と保存されたエンティティ
+        メニュー保存・SSE配信は後続の save / categorize_publish ステージで行う
         """
+        session_id = context.session_id
+        cached_result = context["cached_result"]
         logger.info(f"🗂️ Starting Categorize stage for session: {session_id}")
         
-        await self._update_progress(session_id, "categorize", "processing", 55)
+        if cached_result:
+            return {
+                "categorized_results": cached_result.categorized_results,
+                "categorize_duration": 0.0
+            }
         
-        try:
-            # カテゴライズ処理実行
+        # カテゴライズ処理実行
+        with span("pipeline.stage.categorize") as categorize_span:
             categorized_results = await self.categorize_service.categorize_menu_structure(
-                mapping_data, level="paragraph"
+                context["formatted_mapping_data"], level="paragraph"
             )
-            
-            logger.info("🏷️ Categorization completed: Menu structure analyzed")
-            
-            # メニューアイテムを基本情報でDB保存
-            saved_entities = await self._save_basic_menu_items(session_id, categorized_results)
-            
-            # 保存されたエンティティを辞書形式に変換
-            saved_menu_items = [self._entity_to_dict(entity) for entity in saved_entities]
-            
-            # 🎯 DB更新: カテゴライズ結果とメニューアイテム保存
-            stage_data = {
-                "categories_found": self._extract_categories(categorized_results),
-                "menu_items_saved": len(saved_entities),
-                "saved_menu_items": saved_menu_items,
-                "stage_completed_at": datetime.utcnow().isoformat(),
-                "categorization_analysis": {
-                    "categories_detected": len(self._extract_categories(categorized_results)),
-                    "items_categorized": len(saved_entities),
-                    "processing_successful": True
-                }
+        
+        logger.info(f"🏷️ Categorization completed: Menu structure analyzed ({categorize_span.duration:.2f}s)")
+        
+        return {
+            "categorized_results": categorized_results,
+            "categorize_duration": categorize_span.duration
+        }
+
+    async def _stage_save(self, context: PipelineContext) -> Dict[str, Any]:
+        """カテゴライズ結果のメニューアイテムを基本情報でDB保存"""
+        with span("pipeline.stage.bulk_save") as save_span:
+            saved_entities = await self._save_basic_menu_items(
+                context.session_id, context["categorized_results"]
+            )
+        
+        return {
+            "saved_entities": saved_entities,
+            "saved_menu_items": [self._entity_to_dict(entity) for entity in saved_entities],
+            "save_duration": save_span.duration
+        }
+
+    async def _stage_publish_categorize(self, context: PipelineContext) -> Dict[str, Any]:
+        """
+        Stage 3 完了処理: カテゴライズ結果のDB更新 → SSE配信
+        """
+        session_id = context.session_id
+        categorized_results = context["categorized_results"]
+        saved_menu_items = context["saved_menu_items"]
+        
+        # 🎯 DB更新: カテゴライズ結果とメニューアイテム保存
+        stage_data = {
+            "categories_found": self._extract_categories(categorized_results),
+            "menu_items_saved": len(saved_menu_items),
+            "saved_menu_items": saved_menu_items,
+            "categorized_results": categorized_results,
+            "stage_completed_at": datetime.utcnow().isoformat(),
+            "processing_duration": round(context["categorize_duration"], 3),
+            "save_duration": round(context["save_duration"], 3),
+            "categorization_analysis": {
+                "categories_detected": len(self._extract_categories(categorized_results)),
+                "items_categorized": len(saved_menu_items),
+                "processing_successful": True
             }
+        }
+        
+        # セッション状態更新
+        db_update_success = await self._update_session_stage_completion(
+            session_id, "categorize_completed", stage_data
+        )
+        
+        # 🎯 SSE配信: Categorize完了通知（汎用メソッド使用）
+        sse_success = await self.redis_publisher.publish_categorize_completion(
+            session_id=session_id,
+            categorize_results=categorized_results,
+            saved_menu_items=saved_menu_items,
+            db_saved=db_update_success
+        )
+        
+        if sse_success:
+            logger.info(f"📡 Categorize completion broadcasted successfully for session: {session_id}")
+        else:
+            logger.warning(f"⚠️ SSE broadcast failed for categorize completion: {session_id}")
+        
+        return {"sse_broadcast_success": sse_success}
+
+    async def _stage_update_session_menu_ids(self, context: PipelineContext) -> Dict[str, Any]:
+        """セッションに保存済みメニューIDを登録（SSE配信・並列タスク起動と並行実行）"""
+        saved_entities = context["saved_entities"]
+        if not saved_entities:
+            return {}
+        
+        from app_2.core.database import async_session_factory
+        async with async_session_factory() as db_session:
+            session_repo = get_session_repository(db_session)
+            session_entity = await session_repo.get_by_id(context.session_id)
+            if session_entity:
+                session_entity.menu_ids = [entity.id for entity in saved_entities]
+                session_entity.status = SessionStatus.PROCESSING
+                session_entity.updated_at = datetime.utcnow()
+                await session_repo.update(session_entity)
+        return {}
+
+    async def _stage_trigger_parallel_tasks(self, context: PipelineContext) -> Dict[str, Any]:
+        """
+        Phase 4: 並列タスクトリガー（SSE送信成功を条件とする）
+        """
+        session_id = context.session_id
+        saved_entities = context["saved_entities"]
+        sse_broadcast_success = context["sse_broadcast_success"]
+        
+        if sse_broadcast_success and saved_entities:
+            logger.info(f"Phase 4: Triggering parallel tasks after successful SSE broadcast - session={session_id}")
+            await self._update_progress(session_id, "parallel_tasks", "started", 90)
             
-            # セッション状態更新
-            db_update_success = await self._update_session_stage_completion(
-                session_id, "categorize_completed", stage_data
-            )
+            # SSE送信が成功した時点でDBは確実にコミット済みなので、追加の確認は不要
+            logger.info(f"✅ SSE broadcast confirmed DB commit, triggering parallel tasks with retry-enabled workers")
+            with span("pipeline.stage.parallel_trigger"):
+                await self._trigger_parallel_tasks(session_id, saved_entities)
             
-            # 🎯 SSE配信: Categorize完了通知（汎用メソッド使用）
-            sse_success = await self.redis_publisher.publish_categorize_completion(
-                session_id=session_id,
-                categorize_results=categorized_results,
-                saved_menu_items=saved_menu_items,
-                db_saved=db_update_success
+            # 再開時に並列タスクを二重起動しないよう記録
+            await self._update_session_stage_completion(
+                session_id, "parallel_tasks_triggered", {
+                    "menu_items_count": len(saved_entities),
+                    "stage_completed_at": datetime.utcnow().isoformat()
+                }
             )
             
-            if sse_success:
-                logger.info(f"📡 Categorize completion broadcasted successfully for session: {session_id}")
-            else:
-                logger.warning(f"⚠️ SSE broadcast failed for categorize completion: {session_id}")
-            
-            await self._update_progress(session_id, "categorize", "completed", 65)
-            
-            return {
-                "categorized_results": categorized_results,
-                "saved_entities": saved_entities,
-                "saved_menu_items": saved_menu_items,
-                "sse_broadcast_success": sse_success  # SSE送信結果を追加
-            }
-            
-        except Exception as e:
-            logger.error(f"❌ Categorize stage failed for session {session_id}: {e}")
-            
-            # エラー時のSSE配信
+            logger.info(f"🚀 Parallel tasks triggered successfully after SSE confirmation - session={session_id}")
+            return {"parallel_tasks_triggered": True}
+        
+        if not sse_broadcast_success:
+            logger.warning(f"⚠️ Skipping parallel tasks due to SSE broadcast failure - session={session_id}")
             await self.redis_publisher.publish_error_message(
                 session_id=session_id,
-                error_type="categorize_processing_failed",
-                error_message=str(e),
-                task_name="categorize"
+                error_type="sse_broadcast_failed",
+                error_message="Categorize SSE broadcast failed, parallel tasks not triggered",
+                task_name="parallel_tasks"
             )
-            
-            raise
+        else:
+            logger.warning(f"⚠️ Skipping parallel tasks due to no saved entities - session={session_id}")
+        
+        return {"parallel_tasks_triggered": False}
+
+    async def _stage_store_result_cache(self, context: PipelineContext) -> Dict[str, Any]:
+        """OCR・Mapping・Categorize結果をキャッシュに保存（フォールバック結果・キャッシュヒット時は保存しない）"""
+        cache_key = context["result_cache_key"]
+        categorized_results = context["categorized_results"]
+        if cache_key and not context["cached_result"] and not categorized_results.get("fallback_used"):
+            self.result_cache.set(
+                cache_key,
+                ocr_results=context["ocr_results"],
+                formatted_mapping_data=context["formatted_mapping_data"],
+                categorized_results=categorized_results
+            )
+        return {}
+
+    def _get_prompt_version(self) -> str:
+        """カテゴライズ用プロンプト/スキーマのバージョンを取得（PromptLoaderの内容ハッシュを使用するため毎回計算しても安価）"""
+        return compute_prompt_version()
 
     async def _save_basic_menu_items(self, session_id: str, categorized_results: Dict) -> List:
         """基本メニューアイテムをDBに保存"""
@@ -420,59 +591,41 @@ class MenuProcessingPipeline:
                 }
             )
             
-            # 🔄 Stage 1: OCR処理 - DB更新とSSE配信を含む
-            ocr_results = await self._execute_ocr_stage(session_id, image_data)
-            
-            # 🔄 Stage 2: Mapping処理 - DB更新とSSE配信を含む
-            formatted_mapping_data = await self._execute_mapping_stage(session_id, ocr_results)
-            
-            # 🔄 Stage 3: Categorize処理 - DB更新とSSE配信を含む
-            categorize_data = await self._execute_categorize_stage(session_id, formatted_mapping_data)
-            
-            # セッション更新（メニューIDを追加）
-            saved_entities = categorize_data["saved_entities"]
-            if saved_entities:
-                menu_ids = [entity.id for entity in saved_entities]
-                async with async_session_factory() as db_session:
-                    session_repo = get_session_repository(db_session)
-                    session_entity = await session_repo.get_by_id(session_id)
-                    if session_entity:
-                        session_entity.menu_ids = menu_ids
-                        session_entity.status = SessionStatus.PROCESSING
-                        session_entity.updated_at = datetime.utcnow()
-                        await session_repo.update(session_entity)
-            
-            # Phase 4: 並列タスクトリガー（SSE送信成功を条件とする）
-            sse_broadcast_success = categorize_data.get("sse_broadcast_success", False)
-            
-            if sse_broadcast_success and saved_entities:
-                logger.info(f"Phase 4: Triggering parallel tasks after successful SSE broadcast - session={session_id}")
-                await self._update_progress(session_id, "parallel_tasks", "started", 90)
-                
-                # SSE送信が成功した時点でDBは確実にコミット済みなので、追加の確認は不要
-                logger.info(f"✅ SSE broadcast confirmed DB commit, triggering parallel tasks with retry-enabled workers")
-                await self._trigger_parallel_tasks(session_id, saved_entities)
-                
-                logger.info(f"🚀 Parallel tasks triggered successfully after SSE confirmation - session={session_id}")
-            else:
-                if not sse_broadcast_success:
-                    logger.warning(f"⚠️ Skipping parallel tasks due to SSE broadcast failure - session={session_id}")
-                    await self.redis_publisher.publish_error_message(
-                        session_id=session_id,
-                        error_type="sse_broadcast_failed",
-                        error_message="Categorize SSE broadcast failed, parallel tasks not triggered",
-                        task_name="parallel_tasks"
-                    )
-                elif not saved_entities:
-                    logger.warning(f"⚠️ Skipping parallel tasks due to no saved entities - session={session_id}")
-                else:
-                    logger.warning(f"⚠️ Parallel tasks skipped for unknown reason - session={session_id}")
+            # ♻️ 結果キャッシュ参照（画像ハッシュ + プロンプトバージョン）
+            cache_key = None
+            cached_result = None
+            if settings.pipeline.result_cache_enabled:
+                cache_key = self.result_cache.build_key(image_data, self._get_prompt_version())
+                cached_result = self.result_cache.get(cache_key)
+            
+            if cached_result:
+                logger.info(f"♻️ Result cache hit: skipping OCR and categorize API calls - session={session_id}")
+            
+            # 🔄 Stage 1〜4: DAG定義に従い、入力が揃ったステージから順に実行
+            context = PipelineContext(session_id, {
+                "image_data": image_data,
+                "cached_result": cached_result,
+                "result_cache_key": cache_key
+            })
+            try:
+                stage_results = await self.definition.run(context, self.hooks)
+            except StageExecutionError as e:
+                raise e.original
+            
+            ocr_results = context["ocr_results"]
+            formatted_mapping_data = context["formatted_mapping_data"]
+            categorized_results = context["categorized_results"]
+            saved_entities = context["saved_entities"]
+            sse_broadcast_success = context["sse_broadcast_success"]
             
             # 初期処理完了通知
             await self._update_progress(session_id, "initial_processing", "completed", 100)
             
             # 処理時間計算
             processing_time = time.time() - start_time
+            get_metrics_registry().observe(
+                "pipeline.total_cached" if cached_result else "pipeline.total", processing_time
+            )
             
             # レスポンス構築
             result = {
@@ -495,7 +648,7 @@ class MenuProcessingPipeline:
                     },
                     "step3_categorize": {
                         "description": "Menu structure categorization with realtime broadcast",
-                        "results": categorize_data["categorized_results"],
+                        "results": categorized_results,
                         "saved_items_count": len(saved_entities),
                         "db_updated": True,
                         "sse_broadcasted": True
@@ -503,14 +656,19 @@ class MenuProcessingPipeline:
                     "step4_parallel_tasks": {
                         "description": "Triggering parallel processing tasks after SSE broadcast confirmation",
                         "sse_broadcast_success": sse_broadcast_success,
-                        "parallel_tasks_triggered": sse_broadcast_success and len(saved_entities) > 0,
+                        "parallel_tasks_triggered": context["parallel_tasks_triggered"],
                         "trigger_condition": "sse_broadcast_confirmed" if sse_broadcast_success else "sse_broadcast_failed"
                     }
                 },
-                "final_results": categorize_data["categorized_results"],
-                "saved_menu_items": categorize_data["saved_menu_items"],
-                "categories": self._extract_categories(categorize_data["categorized_results"]),
+                "final_results": categorized_results,
+                "saved_menu_items": context["saved_menu_items"],
+                "categories": self._extract_categories(categorized_results),
                 "ocr_elements": len(ocr_results),
+                "result_cache_hit": cached_result is not None,
+                "stage_results": {
+                    name: {"status": stage_result.status, "duration": round(stage_result.duration, 3)}
+                    for name, stage_result in stage_results.items()
+                },
                 "processing_time": round(processing_time, 2),
                 "message": f"Enhanced Pipeline: OCR → Mapping → Categorization with realtime DB updates and SSE broadcasts completed successfully. Parallel tasks {'triggered after SSE confirmation' if sse_broadcast_success else 'skipped due to SSE broadcast failure'}."
             }
@@ -542,18 +700,209 @@ class MenuProcessingPipeline:
                 task_name="enhanced_initial_processing"
             )
             
-            # セッション状態更新
+            # セッション状態更新（再開可能な FAILED 状態にする）
+            await self._mark_session_failed(session_id)
+            
+            raise
+    
+    async def _mark_session_failed(self, session_id: str) -> None:
+        """セッションを FAILED に更新（失敗しても例外は送出しない）"""
+        try:
+            from app_2.core.database import async_session_factory
+            async with async_session_factory() as db_session:
+                session_repo = get_session_repository(db_session)
+                session_entity = await session_repo.get_by_id(session_id)
+                if session_entity:
+                    session_entity.status = SessionStatus.FAILED
+                    session_entity.updated_at = datetime.utcnow()
+                    await session_repo.update(session_entity)
+        except Exception as e:
+            logger.error(f"❌ Failed to mark session {session_id} as FAILED: {e}")
+    
+    async def _restore_context_artifacts(
+        self, 
+        session_id: str, 
+        stages_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        stages_data から完了済みステージの成果物を復元
+        
+        復元した成果物の出力を持つステージは、DAG実行時に restored としてスキップされる
+        
+        Args:
+            session_id: セッションID
+            stages_data: SessionModel.stages_data
+            
+        Returns:
+            Dict[str, Any]: PipelineContext に投入する成果物
+        """
+        artifacts: Dict[str, Any] = {}
+        
+        ocr_stage = stages_data.get("ocr_completed") or {}
+        if "ocr_results" in ocr_stage:
+            artifacts["ocr_results"] = ocr_stage["ocr_results"]
+        
+        # 旧形式（プレビューのみ）の場合は Mapping を再実行（外部API呼び出しなし）
+        mapping_stage = stages_data.get("mapping_completed") or {}
+        if "formatted_mapping_data" in mapping_stage:
+            artifacts["formatted_mapping_data"] = mapping_stage["formatted_mapping_data"]
+        
+        from app_2.core.database import async_session_factory
+        categorize_stage = stages_data.get("categorize_completed") or {}
+        async with async_session_factory() as db_session:
+            menu_repository = get_menu_repository(db_session)
+            saved_entities = await menu_repository.get_by_session_id(session_id)
+            
+            if "categorized_results" in categorize_stage:
+                artifacts.update({
+                    "categorized_results": categorize_stage["categorized_results"],
+                    "categorize_duration": categorize_stage.get("processing_duration", 0.0),
+                    "saved_entities": saved_entities,
+                    "saved_menu_items": [self._entity_to_dict(entity) for entity in saved_entities],
+                    "save_duration": categorize_stage.get("save_duration", 0.0),
+                    "sse_broadcast_success": True
+                })
+            elif saved_entities:
+                # 保存後・完了記録前に中断した場合は再カテゴライズ時の重複を避けるため削除
+                logger.warning(f"⚠️ Removing {len(saved_entities)} partially saved menu items before resume: {session_id}")
+                for entity in saved_entities:
+                    await menu_repository.delete(entity.id)
+        
+        if "parallel_tasks_triggered" in stages_data:
+            artifacts["parallel_tasks_triggered"] = True
+        
+        return artifacts
+
+    async def resume_menu_processing(
+        self, 
+        session_id: str, 
+        image_data: Optional[bytes] = None
+    ) -> Dict[str, Any]:
+        """
+        失敗したセッションを stages_data のチェックポイントから再開
+        
+        完了済みステージの成果物を復元し、未完了のステージのみ実行する
+        （OCR完了済みなら Vision API を再度呼び出さない）
+        
+        Args:
+            session_id: セッションID
+            image_data: 画像データ（OCR未完了のセッションを再開する場合のみ必要）
+            
+        Returns:
+            Dict[str, Any]: 処理結果（再開できない場合は status="error"）
+        """
+        start_time = time.time()
+        
+        from app_2.core.database import async_session_factory
+        from sqlalchemy import select
+        from app_2.infrastructure.models.session_model import SessionModel
+        
+        async with async_session_factory() as db_session:
+            stmt = select(SessionModel).where(SessionModel.session_id == session_id)
+            result = await db_session.execute(stmt)
+            session_model = result.scalar_one_or_none()
+            
+            if not session_model:
+                return {
+                    "status": "error",
+                    "session_id": session_id,
+                    "error_type": "session_not_found",
+                    "error_message": f"Session not found: {session_id}"
+                }
+            
+            if session_model.status in (SessionStatus.PROCESSING.value, SessionStatus.COMPLETED.value):
+                return {
+                    "status": "error",
+                    "session_id": session_id,
+                    "error_type": "not_resumable",
+                    "error_message": f"Session {session_id} is {session_model.status}",
+                    "existing_status": session_model.status
+                }
+            
+            stages_data = session_model.get_stages_data()
+            
+            if "ocr_completed" not in stages_data and not image_data:
+                return {
+                    "status": "error",
+                    "session_id": session_id,
+                    "error_type": "image_required",
+                    "error_message": "OCR has not completed for this session; upload the image again to resume"
+                }
+            
+            # 二重再開を防ぐため先に PROCESSING にする
+            session_model.status = SessionStatus.PROCESSING.value
+            session_model.updated_at = datetime.utcnow()
+            await db_session.commit()
+        
+        try:
+            logger.info(f"🔁 Resuming pipeline from checkpoint: session={session_id}, stages={list(stages_data.keys())}")
+            
+            artifacts = await self._restore_context_artifacts(session_id, stages_data)
+            context = PipelineContext(session_id, {
+                "image_data": image_data,
+                "cached_result": None,
+                "result_cache_key": None,
+                **artifacts
+            })
+            
+            await self.redis_publisher.publish_progress_update(
+                session_id=session_id,
+                task_name="initial_processing",
+                status="resumed",
+                progress_data={
+                    "phase": "enhanced_pipeline",
+                    "restored_artifacts": sorted(artifacts.keys())
+                }
+            )
+            
             try:
-                from app_2.core.database import async_session_factory
-                async with async_session_factory() as db_session:
-                    session_repo = get_session_repository(db_session)
-                    session_entity = await session_repo.get_by_id(session_id)
-                    if session_entity:
-                        session_entity.status = SessionStatus.ERROR
-                        session_entity.updated_at = datetime.utcnow()
-                        await session_repo.update(session_entity)
-            except Exception:
-                pass
+                stage_results = await self.definition.run(context, self.hooks)
+            except StageExecutionError as e:
+                raise e.original
+            
+            await self._update_progress(session_id, "initial_processing", "completed", 100)
+            
+            async with async_session_factory() as db_session:
+                session_repo = get_session_repository(db_session)
+                session_entity = await session_repo.get_by_id(session_id)
+                if session_entity:
+                    session_entity.status = SessionStatus.COMPLETED
+                    session_entity.updated_at = datetime.utcnow()
+                    await session_repo.update(session_entity)
+            
+            processing_time = time.time() - start_time
+            get_metrics_registry().observe("pipeline.resume", processing_time)
+            logger.info(f"✅ Pipeline resumed and completed: session={session_id}, time={processing_time:.2f}s")
+            
+            return {
+                "session_id": session_id,
+                "status": "success",
+                "resumed": True,
+                "restored_stages": [
+                    name for name, stage_result in stage_results.items() if stage_result.status == "restored"
+                ],
+                "stage_results": {
+                    name: {"status": stage_result.status, "duration": round(stage_result.duration, 3)}
+                    for name, stage_result in stage_results.items()
+                },
+                "final_results": context["categorized_results"],
+                "saved_menu_items": context["saved_menu_items"],
+                "categories": self._extract_categories(context["categorized_results"]),
+                "parallel_tasks_triggered": context["parallel_tasks_triggered"],
+                "processing_time": round(processing_time, 2),
+                "message": "Pipeline resumed from the last completed stage"
+            }
+            
+        except Exception as e:
+            logger.error(f"❌ Pipeline resume failed: session={session_id}, error={e}")
+            
+            await self.redis_publisher.publish_error_message(
+                session_id=session_id,
+                error_type="enhanced_pipeline_resume_failed",
+                error_message=str(e),
+                task_name="enhanced_initial_processing"
+            )
+            await self._mark_session_failed(session_id)
             
             raise
     
@@ -584,45 +933,91 @@ class MenuProcessingPipeline:
         except Exception:
             return []
     
+    async def _build_task_messages(self, session_id: str, menu_entities: List) -> List[Tuple[tuple, int]]:
+        """
+        並列タスクのメッセージ（引数, 優先度）を構築
+        
+        - ENRICHMENT_PRIORITY_ENABLED: 位置・カテゴリ順・ビューポートヒントでアイテムを並べ替え
+        - PIPELINE_PRIORITY_HEAD_ITEMS > 0: 上位N件を高優先度、残りを低優先度の別メッセージに分割
+        - PIPELINE_SLIM_TASK_MESSAGES: session_id（分割時は item_ids も）のみを送信
+        """
+        menu_items_data = [
+            {
+                "id": entity.id,
+                "name": entity.name,
+                "category": entity.category,
+                "price": entity.price,
+                "translation": entity.translation,
+                "category_translation": entity.category_translation
+            }
+            for entity in menu_entities
+        ]
+        if settings.pipeline.enrichment_priority_enabled:
+            from app_2.tasks.item_priority import rank_items
+            boosted_categories = await get_redis_viewport_hint().get_boosted_categories(session_id)
+            menu_items_data = rank_items(menu_items_data, boosted_categories)
+        
+        head_items = settings.pipeline.priority_head_items
+        if 0 < head_items < len(menu_items_data):
+            parts = [
+                (menu_items_data[:head_items], TASK_PRIORITY_HEAD),
+                (menu_items_data[head_items:], TASK_PRIORITY_TAIL)
+            ]
+        else:
+            parts = [(menu_items_data, TASK_PRIORITY_DEFAULT)]
+        
+        if not settings.pipeline.slim_task_messages:
+            return [((session_id, items), priority) for items, priority in parts]
+        if len(parts) == 1:
+            return [((session_id,), TASK_PRIORITY_DEFAULT)]
+        return [((session_id, None, [item["id"] for item in items]), priority) for items, priority in parts]
+    
+    def _enqueue_task(self, task, task_messages: List[Tuple[tuple, int]]):
+        """タスクをメッセージごとに優先度付きで送信し、先頭（最優先）のメッセージの結果を返す"""
+        results = [task.apply_async(args=args, priority=priority) for args, priority in task_messages]
+        for result in results[1:]:
+            logger.info(f"✅ {task.name} follow-up part triggered: task_id={result.id}")
+        return results[0]
+    
     async def _trigger_parallel_tasks(self, session_id: str, menu_entities: List):
         """並列タスクのトリガー（翻訳 + 詳細説明 + アレルギー + 内容物を同時実行）"""
         try:
-            # メニューアイテムデータを準備
-            menu_items_data = [
-                {
-                    "id": entity.id,
-                    "name": entity.name,
-                    "category": entity.category,
-                    "price": entity.price,
-                    "translation": entity.translation,
-                    "category_translation": entity.category_translation
-                }
-                for entity in menu_entities
-            ]
+            # タスクメッセージを準備（優先順位付け・上位N件の高優先度メッセージ分割）
+            total_items = len(menu_entities)
+            task_messages = await self._build_task_messages(session_id, menu_entities)
             
-            logger.info(f"Triggering parallel tasks with {len(menu_items_data)} menu items")
+            logger.info(
+                f"Triggering parallel tasks with {total_items} menu items "
+                f"(slim_messages={settings.pipeline.slim_task_messages}, messages_per_task={len(task_messages)})"
+            )
             
             # 🎯 並列タスクを同時実行：翻訳 + 詳細説明 + アレルギー + 内容物 + 画像検索
             
             # 翻訳タスクをトリガー
             from app_2.tasks.translate_task import translate_menu_task
-            translate_task_result = translate_menu_task.delay(session_id, menu_items_data)
-            
-            # 詳細説明タスクをトリガー（同時実行）
-            from app_2.tasks.describe_task import describe_menu_task
-            describe_task_result = describe_menu_task.delay(session_id, menu_items_data)
+            translate_task_result = self._enqueue_task(translate_menu_task, task_messages)
             
-            # アレルギー解析タスクをトリガー（同時実行）
-            from app_2.tasks.allergen_task import allergen_menu_task
-            allergen_task_result = allergen_menu_task.delay(session_id, menu_items_data)
-            
-            # 内容物解析タスクをトリガー（同時実行）
-            from app_2.tasks.ingredient_task import ingredient_menu_task
-            ingredient_task_result = ingredient_menu_task.delay(session_id, menu_items_data)
+            if settings.pipeline.is_fused_enrichment():
+                # 詳細説明 + アレルギー + 内容物を統合エンリッチタスク1本で実行
+                from app_2.tasks.enrich_task import enrich_menu_task
+                enrich_task_result = self._enqueue_task(enrich_menu_task, task_messages)
+                describe_task_result = allergen_task_result = ingredient_task_result = enrich_task_result
+            else:
+                # 詳細説明タスクをトリガー（同時実行）
+                from app_2.tasks.describe_task import describe_menu_task
+                describe_task_result = self._enqueue_task(describe_menu_task, task_messages)
+                
+                # アレルギー解析タスクをトリガー（同時実行）
+                from app_2.tasks.allergen_task import allergen_menu_task
+                allergen_task_result = self._enqueue_task(allergen_menu_task, task_messages)
+                
+                # 内容物解析タスクをトリガー（同時実行）
+                from app_2.tasks.ingredient_task import ingredient_menu_task
+                ingredient_task_result = self._enqueue_task(ingredient_menu_task, task_messages)
             
             # 画像検索タスクをトリガー（同時実行）
             from app_2.tasks.search_image_task import search_image_menu_task
-            search_image_task_result = search_image_menu_task.delay(session_id, menu_items_data)
+            search_image_task_result = self._enqueue_task(search_image_menu_task, task_messages)
             
             logger.info(f"✅ Translation task triggered: task_id={translate_task_result.id}")
             logger.info(f"✅ Description task triggered: task_id={describe_task_result.id}")
@@ -643,9 +1038,10 @@ class MenuProcessingPipeline:
                         "ingredient": ingredient_task_result.id,
                         "search_image": search_image_task_result.id
                     },
-                    "total_items": len(menu_items_data),
+                    "total_items": total_items,
                     "execution_mode": "parallel",
-                    "message": f"Translation, description, allergen analysis, ingredient analysis, and image search started in parallel for {len(menu_items_data)} items"
+                    "enrichment_mode": settings.pipeline.enrichment_mode,
+                    "message": f"Translation, description, allergen analysis, ingredient analysis, and image search started in parallel for {total_items} items"
                 }
             )
             
@@ -0,0 +1,183 @@
+"""
+Pipeline Result Cache - Menu Processor v2
+同一メニュー画像の再アップロード時に OCR / Mapping / Categorize 結果を再利用するキャッシュ
+
+キー: 画像バイト列のハッシュ + プロンプト/スキーマのバージョン
+退避: TTL + 最大エントリ数（LRU）
+"""
+import copy
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from app_2.core.config import settings
+from app_2.prompt_loader import PromptLoader
+from app_2.utils.logger import get_logger
+
+logger = get_logger("pipeline_result_cache")
+
+
+@dataclass
+class CachedPipelineResult:
+    """キャッシュされたパイプライン中間結果"""
+    ocr_results: List[Dict[str, Any]]
+    formatted_mapping_data: str
+    categorized_results: Dict[str, Any]
+    created_at: float = 0.0
+
+
+def compute_image_hash(image_data: bytes) -> str:
+    """画像バイト列のSHA-256ハッシュを計算"""
+    return hashlib.sha256(image_data).hexdigest()
+
+
+def compute_prompt_version(
+    base_path: str = "app_2/prompts",
+    prompt_files: Optional[List[str]] = None
+) -> str:
+    """
+    カテゴライズ処理に影響するプロンプト/スキーマのバージョンを計算
+
+    プロンプトYAML・スキーマYAMLの内容とモデル名をハッシュ化する。
+    いずれかが変わればキーが変わり、古い結果は参照されなくなる。
+
+    Args:
+        base_path: プロンプトディレクトリ
+        prompt_files: base_path からの相対パス一覧
+
+    Returns:
+        str: バージョン文字列（16桁）
+    """
+    files = prompt_files or [
+        "openai/menu_analysis/categorize.yaml",
+        "openai/menu_analysis/schemas/categorize.yaml",
+    ]
+    # PromptLoader のキャッシュ済み内容ハッシュを使用（ファイル変更時のみ再計算）
+    loader = PromptLoader(base_path)
+    digest = hashlib.sha256(settings.ai.openai_model_name.encode("utf-8"))
+    for relative_path in files:
+        digest.update(relative_path.encode("utf-8"))
+        try:
+            digest.update(loader.get_file_hash(relative_path).encode("utf-8"))
+        except (OSError, ValueError):
+            digest.update(b"<missing>")
+    return digest.hexdigest()[:16]
+
+
+class PipelineResultCache:
+    """
+    コンテンツアドレス型のパイプライン結果キャッシュ（プロセス内）
+
+    - TTLを超えたエントリは参照時に破棄
+    - 最大エントリ数を超えた場合は最も古く参照されたものから破棄（LRU）
+    - 取得時はディープコピーを返し、呼び出し側の変更がキャッシュに波及しないようにする
+    """
+
+    def __init__(self, max_entries: int = 128, ttl_seconds: int = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CachedPipelineResult]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def build_key(image_data: bytes, prompt_version: str, level: str = "paragraph") -> str:
+        """画像ハッシュとプロンプトバージョンからキャッシュキーを生成"""
+        return f"{compute_image_hash(image_data)}:{prompt_version}:{level}"
+
+    def get(self, key: str) -> Optional[CachedPipelineResult]:
+        """
+        キャッシュを参照
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            Optional[CachedPipelineResult]: ヒット時は結果のコピー
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        if self._is_expired(entry):
+            del self._entries[key]
+            self._evictions += 1
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return copy.deepcopy(entry)
+
+    def set(
+        self,
+        key: str,
+        ocr_results: List[Dict[str, Any]],
+        formatted_mapping_data: str,
+        categorized_results: Dict[str, Any]
+    ) -> None:
+        """
+        結果をキャッシュに保存
+
+        Args:
+            key: キャッシュキー
+            ocr_results: OCR結果
+            formatted_mapping_data: フォーマット済みマッピングデータ
+            categorized_results: カテゴライズ結果
+        """
+        if self.max_entries <= 0:
+            return
+
+        self._entries[key] = CachedPipelineResult(
+            ocr_results=copy.deepcopy(ocr_results),
+            formatted_mapping_data=formatted_mapping_data,
+            categorized_results=copy.deepcopy(categorized_results),
+            created_at=time.monotonic()
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """指定キー（未指定なら全体）を破棄"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """キャッシュ統計を取得"""
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_ratio": round(self._hits / lookups, 3) if lookups else 0.0
+        }
+
+    def _is_expired(self, entry: CachedPipelineResult) -> bool:
+        return self.ttl_seconds > 0 and time.monotonic() - entry.created_at > self.ttl_seconds
+
+
+@lru_cache(maxsize=1)
+def get_pipeline_result_cache() -> PipelineResultCache:
+    """
+    PipelineResultCacheのシングルトンインスタンスを取得
+
+    Returns:
+        PipelineResultCache: パイプライン結果キャッシュ
+    """
+    return PipelineResultCache(
+        max_entries=settings.pipeline.result_cache_max_entries,
+        ttl_seconds=settings.pipeline.result_cache_ttl_seconds
+    )
@@ -1,13 +1,150 @@
 """
 YAML基盤でのシンプルなプロンプト管理
+
+パース済みプロンプト/スキーマはプロセス内で共有キャッシュし、
+ファイルの mtime・サイズが変わった場合（または invalidate() 時）のみ再読み込みする
 """
-from typing import Dict
+import copy
+import hashlib
+import string
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 import yaml
 from pathlib import Path
 from .utils.logger import get_logger
+from .utils.metrics import get_metrics_registry
 
 logger = get_logger("prompt_loader")
 
+# 直近に更新されたファイルは mtime の粒度内で再更新されうるため、内容ハッシュで再確認する
+_RACY_MTIME_WINDOW_SECONDS = 2.0
+
+
+class CompiledTemplate:
+    """
+    事前解析済みテンプレート
+
+    str.format と同じ結果を返すが、テンプレートの解析は生成時の1回のみ。
+    書式指定・属性参照を含む場合は str.format にそのまま委譲する
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        self._segments: List[Tuple[str, Optional[str]]] = []
+        self._simple = True
+        try:
+            for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+                if field_name is not None and (format_spec or conversion or not field_name.isidentifier()):
+                    self._simple = False
+                self._segments.append((literal, field_name))
+        except ValueError:
+            # 不正なテンプレートは format 時に str.format と同じ例外を送出させる
+            self._simple = False
+
+    @property
+    def fields(self) -> List[str]:
+        return [field_name for _, field_name in self._segments if field_name is not None]
+
+    def format(self, **kwargs) -> str:
+        if not self._simple:
+            return self.template.format(**kwargs)
+        parts = []
+        for literal, field_name in self._segments:
+            parts.append(literal)
+            if field_name is not None:
+                parts.append(str(kwargs[field_name]))
+        return "".join(parts)
+
+
+@dataclass
+class _CachedFile:
+    """パース済みYAMLファイル"""
+    data: Any
+    content_hash: str
+    mtime_ns: int
+    size: int
+    templates: Dict[Tuple[str, ...], CompiledTemplate]
+
+
+class _PromptFileCache:
+    """全PromptLoaderで共有するパース済みYAMLキャッシュ（スレッドセーフ）"""
+
+    def __init__(self):
+        self._entries: Dict[Path, _CachedFile] = {}
+        self._lock = threading.Lock()
+        self._metrics = get_metrics_registry()
+
+    def get(self, file_path: Path) -> _CachedFile:
+        """
+        パース済みファイルを取得（未キャッシュ・変更時のみ読み込み）
+
+        Raises:
+            FileNotFoundError: ファイルが存在しない場合
+            ValueError: YAMLが不正な場合
+        """
+        key = file_path.resolve()
+        stat = key.stat()
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            if time.time() - stat.st_mtime > _RACY_MTIME_WINDOW_SECONDS:
+                self._metrics.increment("prompt_cache.hits")
+                return entry
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            raw = f.read()
+        content_hash = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+        if entry is not None and entry.content_hash == content_hash:
+            # 内容は同一（touch・再デプロイ等）: 新しい mtime / サイズを記録し、次回から再読み込みしない
+            with self._lock:
+                entry.mtime_ns = stat.st_mtime_ns
+                entry.size = stat.st_size
+            self._metrics.increment("prompt_cache.hits")
+            return entry
+
+        try:
+            data = yaml.safe_load(raw)
+        except yaml.YAMLError as e:
+            logger.error(f"YAML parsing error in {file_path}: {e}")
+            raise ValueError(f"Invalid YAML format: {e}")
+
+        entry = _CachedFile(
+            data=data,
+            content_hash=content_hash,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            templates={}
+        )
+        with self._lock:
+            self._entries[key] = entry
+        self._metrics.increment("prompt_cache.misses")
+        logger.info(f"Loaded prompt file: {file_path}")
+        return entry
+
+    def invalidate(self, file_path: Optional[Path] = None) -> None:
+        """キャッシュを破棄（file_path 未指定時は全件）"""
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(file_path.resolve(), None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = len(self._entries)
+        return {
+            "entries": entries,
+            "hits": self._metrics.get_counter("prompt_cache.hits"),
+            "misses": self._metrics.get_counter("prompt_cache.misses")
+        }
+
+
+_prompt_file_cache = _PromptFileCache()
+
 
 class PromptLoader:
     """シンプルなYAML基盤プロンプト管理クラス"""
@@ -17,6 +154,12 @@ class PromptLoader:
         プロンプトローダーを初期化
         """
         self.base_path = Path(base_path)
+    
+    def _prompt_path(self, provider: str, category: str, prompt_name: str) -> Path:
+        return self.base_path / provider / category / f"{prompt_name}.yaml"
+    
+    def _schema_path(self, provider: str, category: str, schema_name: str) -> Path:
+        return self.base_path / provider / category / "schemas" / f"{schema_name}.yaml"
         
     def load_prompt(
         self, 
@@ -27,21 +170,13 @@ class PromptLoader:
         """
         プロンプトを読み込み
         """
-        file_path = self.base_path / provider / category / f"{prompt_name}.yaml"
+        file_path = self._prompt_path(provider, category, prompt_name)
         
         if not file_path.exists():
             raise FileNotFoundError(f"Prompt file not found: {file_path}")
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                prompt_data = yaml.safe_load(f)
-            
-            logger.info(f"Loaded prompt: {provider}/{category}/{prompt_name}")
-            return prompt_data
-            
-        except yaml.YAMLError as e:
-            logger.error(f"YAML parsing error in {file_path}: {e}")
-            raise ValueError(f"Invalid YAML format: {e}")
+        # 呼び出し側での変更がキャッシュに波及しないようコピーを返す
+        return copy.deepcopy(_prompt_file_cache.get(file_path).data)
         
     def format_prompt(self, template: str, **kwargs) -> str:
         """
@@ -116,21 +251,12 @@ class PromptLoader:
         Raises:
             FileNotFoundError: スキーマファイルが見つからない場合
         """
-        file_path = self.base_path / provider / category / "schemas" / f"{schema_name}.yaml"
+        file_path = self._schema_path(provider, category, schema_name)
         
         if not file_path.exists():
             raise FileNotFoundError(f"Schema file not found: {file_path}")
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                schema_data = yaml.safe_load(f)
-            
-            logger.info(f"Loaded schema: {provider}/{category}/schemas/{schema_name}")
-            return schema_data
-            
-        except yaml.YAMLError as e:
-            logger.error(f"YAML parsing error in {file_path}: {e}")
-            raise ValueError(f"Invalid YAML format: {e}")
+        return copy.deepcopy(_prompt_file_cache.get(file_path).data)
     
     def get_function_schema(
         self,
@@ -157,4 +283,76 @@ class PromptLoader:
         if not function_schema:
             raise KeyError(f"Function schema '{function_name}' not found in {schema_name}")
         
-        return function_schema 
\ No newline at end of file
+        return function_schema
+    
+    def get_template(
+        self,
+        provider: str,
+        category: str,
+        prompt_name: str,
+        *keys: str
+    ) -> CompiledTemplate:
+        """
+        事前解析済みテンプレートを取得（ファイル更新まで再解析しない）
+        
+        Args:
+            provider: AIプロバイダー名
+            category: カテゴリー名
+            prompt_name: プロンプト名
+            *keys: テンプレートまでのキー（例: "user" / "menu_structure", "user"）
+            
+        Returns:
+            CompiledTemplate: 事前解析済みテンプレート（キーが存在しない場合は空テンプレート）
+        """
+        file_path = self._prompt_path(provider, category, prompt_name)
+        if not file_path.exists():
+            raise FileNotFoundError(f"Prompt file not found: {file_path}")
+        
+        entry = _prompt_file_cache.get(file_path)
+        template = entry.templates.get(keys)
+        if template is None:
+            value: Any = entry.data
+            for key in keys:
+                value = value.get(key, "") if isinstance(value, dict) else ""
+            template = CompiledTemplate(value if isinstance(value, str) else "")
+            entry.templates[keys] = template
+        return template
+    
+    def get_prompt_hash(self, provider: str, category: str, prompt_name: str) -> str:
+        """プロンプトファイルの内容ハッシュ（下流キャッシュのキー用）"""
+        return _prompt_file_cache.get(self._prompt_path(provider, category, prompt_name)).content_hash
+    
+    def get_schema_hash(self, provider: str, category: str, schema_name: str) -> str:
+        """スキーマファイルの内容ハッシュ（下流キャッシュのキー用）"""
+        return _prompt_file_cache.get(self._schema_path(provider, category, schema_name)).content_hash
+    
+    def get_file_hash(self, relative_path: str) -> str:
+        """base_path からの相対パスで指定したYAMLファイルの内容ハッシュ"""
+        return _prompt_file_cache.get(self.base_path / relative_path).content_hash
+    
+    def preload_all(self) -> int:
+        """
+        base_path 配下の全YAMLを事前に読み込み（起動時のウォームアップ用）
+        
+        Returns:
+            int: 読み込んだファイル数
+        """
+        loaded = 0
+        for file_path in sorted(self.base_path.rglob("*.yaml")):
+            try:
+                _prompt_file_cache.get(file_path)
+                loaded += 1
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to preload prompt file {file_path}: {e}")
+        logger.info(f"📚 Preloaded {loaded} prompt/schema files from {self.base_path}")
+        return loaded
+    
+    @staticmethod
+    def invalidate(file_path: Optional[str] = None) -> None:
+        """パース済みキャッシュを明示的に破棄（file_path 未指定時は全件）"""
+        _prompt_file_cache.invalidate(Path(file_path) if file_path else None)
+    
+    @staticmethod
+    def cache_stats() -> Dict[str, Any]:
+        """キャッシュ統計（エントリ数・ヒット数・ミス数）"""
+        return _prompt_file_cache.stats()
@@ -2,6 +2,7 @@ from .allergen_service import AllergenService, get_allergen_service
 from .ingredient_service import IngredientService, get_ingredient_service
 from .categorize_service import CategorizeService, get_categorize_service
 from .describe_service import DescribeService, get_describe_service
+from .enrich_service import EnrichService, get_enrich_service
 from .ocr_service import OCRService, get_ocr_service
 from .translate_service import TranslateService, get_translate_service
 from .mapping_service import MenuMappingCategorizeService, get_menu_mapping_categorize_service
@@ -12,6 +13,7 @@ __all__ = [
     "IngredientService", 
     "CategorizeService",
     "DescribeService",
+    "EnrichService",
     "OCRService",
     "TranslateService",
     "MenuMappingCategorizeService",
@@ -20,6 +22,7 @@ __all__ = [
     "get_ingredient_service",
     "get_categorize_service",
     "get_describe_service",
+    "get_enrich_service",
     "get_ocr_service",
     "get_translate_service",
     "get_menu_mapping_categorize_service",
@@ -3,7 +3,7 @@ Allergen Service - Menu Processor v2
 Simple allergen analysis service for menu items
 """
 from functools import lru_cache
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from app_2.infrastructure.integrations.openai import AllergenClient, get_allergen_client
 from app_2.utils.logger import get_logger
 
@@ -56,6 +56,23 @@ class AllergenService:
             logger.error(f"Failed to analyze allergens for '{menu_item}': {e}")
             raise
 
+    async def analyze_allergens_batch(self, items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze allergens for several menu items in batched requests
+        
+        Args:
+            items: Items with "id", "name" and "category"
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Allergen analysis results keyed by item id
+        """
+        valid_items = [item for item in items if str(item.get("name", "")).strip()]
+        if not valid_items:
+            return {}
+        
+        logger.info(f"Analyzing allergens for {len(valid_items)} items (batched)")
+        return await self.allergen_client.extract_allergens_batch(valid_items)
+
 
 
 @lru_cache(maxsize=1)
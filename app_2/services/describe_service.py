@@ -3,7 +3,7 @@ Describe Service - Menu Processor v2
 OpenAI API を使用したメニュー詳細説明生成サービス
 """
 from functools import lru_cache
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from app_2.infrastructure.integrations.openai import DescriptionClient, get_description_client
 from app_2.utils.logger import get_logger
 
@@ -47,6 +47,23 @@ class DescribeService:
         except Exception as e:
             logger.error(f"Failed to generate description for '{menu_item}': {e}")
             raise
+    
+    async def generate_menu_descriptions_batch(self, items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        複数メニュー項目の詳細説明を一括生成
+        
+        Args:
+            items: "id" / "name" / "category" を持つアイテムリスト
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: アイテムIDごとの詳細説明
+        """
+        valid_items = [item for item in items if str(item.get("name", "")).strip()]
+        if not valid_items:
+            return {}
+        
+        logger.info(f"Generating detailed descriptions for {len(valid_items)} items (batched)")
+        return await self.description_client.generate_descriptions_batch(valid_items)
 
 
 @lru_cache(maxsize=1)
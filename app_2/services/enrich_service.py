@@ -0,0 +1,72 @@
+"""
+Enrich Service - Menu Processor v2
+詳細説明・アレルギー・内容物を1回のOpenAI呼び出しで生成する統合エンリッチサービス
+"""
+from functools import lru_cache
+from typing import Optional, Dict, Any, List
+from app_2.infrastructure.integrations.openai import EnrichClient, get_enrich_client
+from app_2.utils.logger import get_logger
+
+logger = get_logger("enrich_service")
+
+
+class EnrichService:
+    """統合エンリッチサービス（description / allergen / ingredient）"""
+
+    def __init__(self, enrich_client: Optional[EnrichClient] = None):
+        """
+        統合エンリッチサービスを初期化
+        """
+        self.enrich_client = enrich_client or get_enrich_client()
+        logger.info("EnrichService initialized")
+
+    async def enrich_menu_item(
+        self,
+        menu_item: str,
+        category: str = ""
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        メニュー項目の詳細説明・アレルギー・内容物を一括生成
+
+        Returns:
+            Dict[str, Dict[str, Any]]: タスク種別（description / allergen / ingredient）ごとの結果
+        """
+        if not menu_item or not menu_item.strip():
+            logger.warning("Empty or whitespace-only menu item provided for enrichment")
+            raise ValueError("Menu item cannot be empty")
+
+        try:
+            logger.info(f"Enriching menu item: {menu_item}")
+            return await self.enrich_client.enrich_menu_item(menu_item=menu_item, category=category)
+
+        except Exception as e:
+            logger.error(f"Failed to enrich '{menu_item}': {e}")
+            raise
+
+    async def enrich_menu_items_batch(self, items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        複数メニュー項目を一括エンリッチ
+
+        Args:
+            items: "id" / "name" / "category" を持つアイテムリスト
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, Any]]]: アイテムIDごとのタスク種別別結果
+        """
+        valid_items = [item for item in items if str(item.get("name", "")).strip()]
+        if not valid_items:
+            return {}
+
+        logger.info(f"Enriching {len(valid_items)} items (batched)")
+        return await self.enrich_client.enrich_menu_items_batch(valid_items)
+
+
+@lru_cache(maxsize=1)
+def get_enrich_service() -> EnrichService:
+    """
+    EnrichServiceのシングルトンインスタンスを取得
+
+    Returns:
+        EnrichService: 統合エンリッチサービスシングルトンインスタンス
+    """
+    return EnrichService()
@@ -56,6 +56,23 @@ class IngredientService:
             logger.error(f"Failed to analyze ingredients for '{menu_item}': {e}")
             raise
     
+    async def analyze_ingredients_batch(self, items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze ingredients for several menu items in batched requests
+        
+        Args:
+            items: Items with "id", "name" and "category"
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Ingredient analysis results keyed by item id
+        """
+        valid_items = [item for item in items if str(item.get("name", "")).strip()]
+        if not valid_items:
+            return {}
+        
+        logger.info(f"Analyzing ingredients for {len(valid_items)} items (batched)")
+        return await self.ingredient_client.extract_ingredients_batch(valid_items)
+    
     async def get_main_ingredients(self, menu_item: str, category: str = "") -> List[str]:
         """
         Get list of main ingredients
@@ -1,10 +1,14 @@
 from functools import lru_cache
 from typing import List, Optional, Dict, Any
+from app_2.core.config import settings
 from app_2.infrastructure.integrations.google import GoogleTranslateClient, get_google_translate_client
+from app_2.services.translation_memory import TranslationMemory, get_translation_memory, normalize_source_text
 from app_2.utils.logger import get_logger
 
 logger = get_logger("translate_service")
 
+TRANSLATION_PROVIDER = "google"
+
 
 class TranslateService:
     """
@@ -12,19 +16,68 @@ class TranslateService:
     
     Google Translate APIを使用してメニュー項目を多言語翻訳。
     単一項目から複数項目の一括処理まで対応。
+    翻訳メモリにある原文はAPIを呼び出さずに再利用する。
     """
     
-    def __init__(self, translate_client: Optional[GoogleTranslateClient] = None):
+    def __init__(
+        self,
+        translate_client: Optional[GoogleTranslateClient] = None,
+        translation_memory: Optional[TranslationMemory] = None
+    ):
         """
         翻訳サービスを初期化
         
         Args:
             translate_client: GoogleTranslateClientインスタンス（テスト用）
                             Noneの場合はシングルトンクライアントを使用
+            translation_memory: TranslationMemoryインスタンス（テスト用）
+                            Noneの場合は TRANSLATION_MEMORY_ENABLED 時にシングルトンを使用
         """
         self.translate_client = translate_client or get_google_translate_client()
+        if translation_memory is None and settings.ai.translation_memory_enabled:
+            translation_memory = get_translation_memory()
+        self.translation_memory = translation_memory
         logger.info("TranslateService initialized")
     
+    async def _translate_texts(self, texts: List[str], target_language: str) -> Dict[str, str]:
+        """
+        原文リストを翻訳（翻訳メモリを参照し、未登録の原文のみAPIで一括翻訳）
+        
+        Args:
+            texts: 原文のリスト
+            target_language: 対象言語コード
+            
+        Returns:
+            Dict[str, str]: 原文ごとの翻訳結果（翻訳できなかった原文はそのまま）
+        """
+        normalized = {text: normalize_source_text(text) for text in texts}
+        sources = [source for source in dict.fromkeys(normalized.values()) if source]
+        if not sources:
+            return {text: text for text in texts}
+        
+        memory = self.translation_memory
+        found = await memory.get_many(sources, target_language, TRANSLATION_PROVIDER) if memory else {}
+        
+        missing = [source for source in sources if source not in found]
+        if missing:
+            translated_texts = await self.translate_client.translate_batch(missing, target_language)
+            new_translations = {
+                source: translated.strip()
+                for source, translated in zip(missing, translated_texts)
+                if translated and translated.strip()
+            }
+            found.update(new_translations)
+            if memory:
+                # API失敗時は原文がそのまま返るため、原文と同じ結果はメモリに保存しない
+                await memory.put_many(
+                    {source: translated for source, translated in new_translations.items() if translated != source},
+                    target_language,
+                    TRANSLATION_PROVIDER
+                )
+        
+        logger.debug(f"Translated {len(sources)} texts ({len(missing)} via API)")
+        return {text: found.get(source, text) for text, source in normalized.items()}
+    
     async def translate_menu_data(
         self, 
         menu_data: Dict[str, Any], 
@@ -52,19 +105,23 @@ class TranslateService:
             # 翻訳対象フィールドを定義
             translatable_fields = ["name", "category"]
             
+            # 翻訳実行（翻訳メモリ参照 + 未登録分を1回のAPI呼び出しで翻訳）
+            source_values = [
+                value for key, value in menu_data.items()
+                if key in translatable_fields and value and isinstance(value, str)
+            ]
+            try:
+                translations = await self._translate_texts(source_values, target_language)
+            except Exception as e:
+                logger.error(f"Failed to translate {source_values} - {e}")
+                translations = {}  # フォールバック
+            
             for key, value in menu_data.items():
                 if key in translatable_fields and value and isinstance(value, str):
-                    # 翻訳実行（直接translate_clientを呼び出し）
-                    try:
-                        translated_value = await self.translate_client.translate(value, target_language)
-                        translated_data[key] = translated_value.strip() if translated_value else value
-                        
-                        # 元の値も保持（_originalサフィックス）
-                        translated_data[f"{key}_original"] = value
-                    except Exception as e:
-                        logger.error(f"Failed to translate {key}: '{value}' - {e}")
-                        translated_data[key] = value  # フォールバック
-                        translated_data[f"{key}_original"] = value
+                    translated_data[key] = translations.get(value, value)
+                    
+                    # 元の値も保持（_originalサフィックス）
+                    translated_data[f"{key}_original"] = value
                 else:
                     # 翻訳対象外フィールドはそのまま保持
                     translated_data[key] = value
@@ -76,6 +133,58 @@ class TranslateService:
             logger.error(f"Menu data translation failed: {e}")
             return menu_data
 
+    
+    async def translate_menu_items(
+        self,
+        menu_items: List[Dict[str, Any]],
+        target_language: str = "en"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        セッションの全メニュー項目をまとめて翻訳
+        
+        name / category の重複を除いた原文を一括翻訳し（翻訳メモリにない原文のみ、数回のAPI呼び出し）、各項目に対応付ける
+        
+        Args:
+            menu_items: "id" / "name" / "category" を持つアイテムリスト
+            target_language: 対象言語コード
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: アイテムIDごとの翻訳済みデータ（translate_menu_data と同じ形式）
+        """
+        translatable_fields = ["name", "category"]
+        # 出現順を保ったまま重複を除去
+        unique_texts: Dict[str, None] = {}
+        for item in menu_items:
+            for key in translatable_fields:
+                value = item.get(key)
+                if value and isinstance(value, str):
+                    unique_texts.setdefault(value)
+        source_texts = list(unique_texts)
+        
+        if not source_texts:
+            return {}
+        
+        try:
+            translations = await self._translate_texts(source_texts, target_language)
+        except Exception as e:
+            logger.error(f"Session translation failed for {len(menu_items)} items: {e}")
+            return {}
+        
+        logger.info(f"Translated {len(menu_items)} items using {len(source_texts)} unique texts")
+        
+        results = {}
+        for item in menu_items:
+            translated_data = {}
+            for key in translatable_fields:
+                value = item.get(key, "")
+                if value and isinstance(value, str):
+                    translated_data[key] = translations.get(value, value)
+                    translated_data[f"{key}_original"] = value
+                else:
+                    translated_data[key] = value
+            results[str(item["id"])] = translated_data
+        return results
+
 
 @lru_cache(maxsize=1)
 def get_translate_service() -> TranslateService:
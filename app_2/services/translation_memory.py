@@ -0,0 +1,234 @@
+"""
+Translation Memory - Menu Processor v2
+原文・翻訳先言語・プロバイダーをキーに翻訳結果を再利用する翻訳メモリ
+
+- Redis（ホット層）: 参照のたびにTTLを延長し、使われなくなったエントリは自然に失効
+- PostgreSQL（永続層）: Redis 失効後の参照先。最終参照から保持期間を過ぎたエントリは定期的に削除
+- いずれの層の障害時も例外は送出せず、ミスとして翻訳APIにフォールバック
+"""
+import hashlib
+import time
+import unicodedata
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app_2.core.config import settings
+from app_2.core.database import async_session_factory
+from app_2.infrastructure.integrations.redis.redis_client import RedisClient
+from app_2.infrastructure.models.translation_memory_model import TranslationMemoryModel
+from app_2.utils.logger import get_logger
+from app_2.utils.metrics import get_metrics_registry, span
+
+logger = get_logger("translation_memory")
+
+
+def normalize_source_text(text: str) -> str:
+    """翻訳メモリのキー用に原文を正規化（NFKC・前後空白除去）"""
+    return unicodedata.normalize("NFKC", text).strip()
+
+
+class TranslationMemory:
+    """Redis + PostgreSQL の2層翻訳メモリ"""
+
+    def __init__(
+        self,
+        redis_client: Optional[RedisClient] = None,
+        session_factory: Callable = async_session_factory
+    ):
+        self.redis_client = redis_client or RedisClient()
+        self.session_factory = session_factory
+        self.redis_prefix = settings.ai.translation_memory_redis_prefix
+        self.redis_ttl_seconds = settings.ai.translation_memory_redis_ttl_seconds
+        self.retention_days = settings.ai.translation_memory_retention_days
+        self.purge_interval_seconds = settings.ai.translation_memory_purge_interval_seconds
+        self._last_purge_at = time.monotonic()
+        self._metrics = get_metrics_registry()
+
+    def _redis_key(self, source_text: str, target_language: str, provider: str) -> str:
+        digest = hashlib.sha1(source_text.encode("utf-8")).hexdigest()
+        return f"{self.redis_prefix}{provider}:{target_language}:{digest}"
+
+    async def get_many(
+        self,
+        source_texts: List[str],
+        target_language: str,
+        provider: str = "google"
+    ) -> Dict[str, str]:
+        """
+        正規化済み原文の翻訳結果を取得（Redis → PostgreSQL の順に参照）
+
+        Args:
+            source_texts: 正規化済み原文のリスト
+            target_language: 翻訳先言語コード
+            provider: 翻訳プロバイダー
+
+        Returns:
+            Dict[str, str]: ヒットした原文ごとの翻訳結果
+        """
+        texts = list(dict.fromkeys(text for text in source_texts if text))
+        if not texts:
+            return {}
+
+        found = await self._get_from_redis(texts, target_language, provider)
+        redis_hits = len(found)
+
+        missing = [text for text in texts if text not in found]
+        if missing:
+            db_found = await self._get_from_database(missing, target_language, provider)
+            if db_found:
+                found.update(db_found)
+                # 次回以降は Redis でヒットするよう書き戻し
+                await self._set_to_redis(db_found, target_language, provider)
+
+        self._metrics.increment("translation_memory.hits.redis", redis_hits)
+        self._metrics.increment("translation_memory.hits.db", len(found) - redis_hits)
+        self._metrics.increment("translation_memory.misses", len(texts) - len(found))
+        return found
+
+    async def put_many(
+        self,
+        translations: Dict[str, str],
+        target_language: str,
+        provider: str = "google"
+    ) -> None:
+        """
+        翻訳結果を両層に保存
+
+        Args:
+            translations: 正規化済み原文ごとの翻訳結果
+            target_language: 翻訳先言語コード
+            provider: 翻訳プロバイダー
+        """
+        translations = {source: translated for source, translated in translations.items() if source and translated}
+        if not translations:
+            return
+
+        await self._set_to_redis(translations, target_language, provider)
+        await self._upsert_to_database(translations, target_language, provider)
+        self._metrics.increment("translation_memory.writes", len(translations))
+
+        if time.monotonic() - self._last_purge_at >= self.purge_interval_seconds:
+            self._last_purge_at = time.monotonic()
+            await self.purge_expired()
+
+    async def purge_expired(self) -> int:
+        """
+        保持期間を過ぎた永続層のエントリを削除
+
+        Returns:
+            int: 削除件数
+        """
+        cutoff = datetime.utcnow() - timedelta(days=self.retention_days)
+        try:
+            async with self.session_factory() as db_session:
+                result = await db_session.execute(
+                    delete(TranslationMemoryModel).where(TranslationMemoryModel.last_used_at < cutoff)
+                )
+                await db_session.commit()
+            deleted = result.rowcount or 0
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to purge translation memory: {e}")
+            return 0
+
+        if deleted:
+            self._metrics.increment("translation_memory.evictions", deleted)
+            logger.info(f"🧹 Purged {deleted} translation memory entries unused since {cutoff.date()}")
+        return deleted
+
+    async def _get_from_redis(self, texts: List[str], target_language: str, provider: str) -> Dict[str, str]:
+        keys = [self._redis_key(text, target_language, provider) for text in texts]
+        try:
+            async with self.redis_client.get_connection() as client:
+                with span("translation_memory.redis_get"):
+                    values = await client.mget(keys)
+                    hit_keys = [key for key, value in zip(keys, values) if value is not None]
+                    if hit_keys:
+                        # 参照されたエントリのTTLを延長
+                        pipe = client.pipeline(transaction=False)
+                        for key in hit_keys:
+                            pipe.expire(key, self.redis_ttl_seconds)
+                        await pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Translation memory Redis lookup failed: {e}")
+            return {}
+        return {text: value for text, value in zip(texts, values) if value is not None}
+
+    async def _set_to_redis(self, translations: Dict[str, str], target_language: str, provider: str) -> None:
+        try:
+            async with self.redis_client.get_connection() as client:
+                pipe = client.pipeline(transaction=False)
+                for source, translated in translations.items():
+                    pipe.set(self._redis_key(source, target_language, provider), translated, ex=self.redis_ttl_seconds)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Translation memory Redis write failed: {e}")
+
+    async def _get_from_database(self, texts: List[str], target_language: str, provider: str) -> Dict[str, str]:
+        conditions = (
+            TranslationMemoryModel.provider == provider,
+            TranslationMemoryModel.target_language == target_language,
+            TranslationMemoryModel.source_text.in_(texts)
+        )
+        try:
+            async with self.session_factory() as db_session:
+                with span("translation_memory.db_get"):
+                    result = await db_session.execute(
+                        select(TranslationMemoryModel.source_text, TranslationMemoryModel.translated_text).where(*conditions)
+                    )
+                    found = {row.source_text: row.translated_text for row in result}
+                    if found:
+                        # 最終参照日時を更新（保持期間の基準）
+                        await db_session.execute(
+                            update(TranslationMemoryModel)
+                            .where(*conditions[:2], TranslationMemoryModel.source_text.in_(list(found)))
+                            .values(
+                                last_used_at=datetime.utcnow(),
+                                hit_count=TranslationMemoryModel.hit_count + 1
+                            )
+                        )
+                        await db_session.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ Translation memory database lookup failed: {e}")
+            return {}
+        return found
+
+    async def _upsert_to_database(self, translations: Dict[str, str], target_language: str, provider: str) -> None:
+        now = datetime.utcnow()
+        stmt = pg_insert(TranslationMemoryModel).values([
+            {
+                "provider": provider,
+                "target_language": target_language,
+                "source_text": source,
+                "translated_text": translated,
+                "hit_count": 0,
+                "created_at": now,
+                "last_used_at": now
+            }
+            for source, translated in translations.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["provider", "target_language", "source_text"],
+            set_={"translated_text": stmt.excluded.translated_text, "last_used_at": now}
+        )
+        try:
+            async with self.session_factory() as db_session:
+                with span("translation_memory.db_put"):
+                    await db_session.execute(stmt)
+                    await db_session.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ Translation memory database write failed: {e}")
+
+
+@lru_cache(maxsize=1)
+def get_translation_memory() -> TranslationMemory:
+    """
+    TranslationMemoryのシングルトンインスタンスを取得
+
+    Returns:
+        TranslationMemory: 翻訳メモリ
+    """
+    return TranslationMemory()
@@ -8,6 +8,7 @@ from .describe_task import describe_menu_task
 from .allergen_task import allergen_menu_task
 from .ingredient_task import ingredient_menu_task
 from .search_image_task import search_image_menu_task
+from .enrich_task import enrich_menu_task
 
 __all__ = [
     "translate_menu_task",
@@ -15,4 +16,5 @@ __all__ = [
     "allergen_menu_task", 
     "ingredient_menu_task",
     "search_image_menu_task",
+    "enrich_menu_task",
 ] 
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Adaptive Concurrency - Menu Processor v2
+BatchProcessor の同時実行バッチ数を AIMD（加算増加・乗算減少）で調整
+
+- バッチが目標レイテンシ内にエラーなく完了するたびに上限を加算増加（1ラウンドあたり約 +increase_step）
+- 429 / エラー / 目標レイテンシ超過で上限を乗算減少（同時に失敗した複数バッチで一気に下がらないよう、
+  減少は目標レイテンシに1回まで）
+- 上限は floor〜ceiling の範囲に収める
+- コントローラーはタスク種別ごとにプロセス内で共有し、タスク実行をまたいで収束させる
+"""
+import asyncio
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from app_2.core.config import settings
+from app_2.utils.logger import get_logger
+from app_2.utils.metrics import get_metrics_registry
+
+logger = get_logger("adaptive_concurrency")
+
+RATE_LIMIT_KEYWORDS = ("429", "rate limit", "resource exhausted", "quota")
+
+
+def is_rate_limit_error(error: Any) -> bool:
+    """Rate Limit / クォータ超過エラー（またはそのメッセージ）か判定"""
+    if getattr(error, "status_code", None) == 429:
+        return True
+    error_message = str(error).lower()
+    return any(keyword in error_message for keyword in RATE_LIMIT_KEYWORDS)
+
+
+class AdaptiveConcurrencyController:
+    """
+    AIMD による同時実行数コントローラー
+
+    limit は小数で保持し、実際の同時実行数は int(limit)（floor 以上）とする
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: Optional[int] = None,
+        floor: Optional[int] = None,
+        ceiling: Optional[int] = None,
+        increase_step: Optional[float] = None,
+        decrease_factor: Optional[float] = None,
+        latency_target_seconds: Optional[float] = None
+    ):
+        celery = settings.celery
+        self.name = name
+        self.floor = max(1, floor or celery.batch_adaptive_min_concurrency)
+        self.ceiling = max(self.floor, ceiling or celery.batch_adaptive_max_concurrency)
+        self.increase_step = increase_step or celery.batch_adaptive_increase_step
+        self.decrease_factor = decrease_factor or celery.batch_adaptive_decrease_factor
+        self.latency_target_seconds = latency_target_seconds or celery.batch_adaptive_latency_target_ms / 1000
+        self._limit = float(self._clamp(initial or self.floor))
+        self._last_decrease_at = float("-inf")
+        self._metrics = get_metrics_registry()
+        self._publish_gauge()
+
+    @property
+    def limit(self) -> int:
+        """現在の同時実行数上限"""
+        return self._clamp(int(self._limit))
+
+    def _clamp(self, value: float) -> float:
+        return min(self.ceiling, max(self.floor, value))
+
+    def record(self, latency_seconds: float, error_count: int = 0, rate_limited: int = 0) -> int:
+        """
+        バッチの処理結果を反映して上限を調整
+
+        Args:
+            latency_seconds: バッチの処理時間
+            error_count: バッチ内のエラー件数（429 を含む）
+            rate_limited: バッチ内の 429 / クォータ超過件数
+
+        Returns:
+            int: 調整後の同時実行数上限
+        """
+        self._metrics.observe(f"batch.{self.name}.latency", latency_seconds, success=error_count == 0)
+
+        if rate_limited:
+            self._decrease("rate_limited")
+        elif error_count:
+            self._decrease("errors")
+        elif latency_seconds > self.latency_target_seconds:
+            self._decrease("latency")
+        else:
+            # 1ラウンド（limit 個のバッチ完了）で約 increase_step 増える
+            self._limit = self._clamp(self._limit + self.increase_step / max(self._limit, 1.0))
+
+        self._publish_gauge()
+        return self.limit
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease_at < self.latency_target_seconds:
+            return
+        self._last_decrease_at = now
+        previous = self.limit
+        self._limit = self._clamp(self._limit * self.decrease_factor)
+        self._metrics.increment(f"batch.{self.name}.concurrency.decrease.{reason}")
+        if self.limit < previous:
+            logger.warning(f"⚠️ {self.name} concurrency decreased {previous} -> {self.limit} ({reason})")
+
+    def _publish_gauge(self) -> None:
+        self._metrics.set_gauge(f"batch.{self.name}.concurrency", self.limit)
+
+    def stats(self) -> Dict[str, Any]:
+        """現在の設定値と上限"""
+        return {
+            "concurrency": self.limit,
+            "min_concurrency": self.floor,
+            "max_concurrency": self.ceiling
+        }
+
+
+class AdaptiveSemaphore:
+    """
+    コントローラーの現在の上限に従うセマフォ（process_items 1回ごとに生成）
+
+    上限が下がった場合は実行中のバッチの完了を待ち、上がった場合は待機中のバッチを即座に開始
+    """
+
+    def __init__(self, controller: AdaptiveConcurrencyController):
+        self.controller = controller
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self) -> "AdaptiveSemaphore":
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.controller.limit)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+
+@lru_cache(maxsize=None)
+def get_concurrency_controller(task_name: str, initial: int) -> AdaptiveConcurrencyController:
+    """
+    タスク種別ごとのAdaptiveConcurrencyControllerを取得（プロセス内で共有）
+
+    Args:
+        task_name: タスク種別
+        initial: 初回の同時実行数（BatchConfig.max_concurrent_batches）
+
+    Returns:
+        AdaptiveConcurrencyController: 同時実行数コントローラー
+    """
+    return AdaptiveConcurrencyController(task_name, initial=initial)
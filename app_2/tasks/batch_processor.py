@@ -3,21 +3,47 @@ Batch Processor - 汎用バッチ処理エンジン (Simplified)
 各タスク（翻訳、アレルゲン検出、成分分析など）で共通利用するバッチ処理ロジック
 """
 import asyncio
-from typing import Dict, List, Any, Callable
+import time
+from typing import Dict, List, Any, Callable, Optional, Tuple
 from dataclasses import dataclass
 
+from app_2.core.config import settings
 from app_2.infrastructure.integrations.redis.redis_publisher import RedisPublisher
+from app_2.infrastructure.integrations.redis.redis_task_checkpoint import get_redis_task_checkpoint
+from app_2.infrastructure.integrations.redis.redis_viewport_hint import get_redis_viewport_hint
+from app_2.services.dependencies import get_redis_client
+from app_2.tasks.adaptive_concurrency import AdaptiveSemaphore, get_concurrency_controller, is_rate_limit_error
+from app_2.tasks.item_priority import pick_next_batch, rank_items
+from app_2.tasks.menu_update_coalescer import MenuUpdateCoalescer
+from app_2.tasks.write_behind import MenuWriteBehindBuffer
 from app_2.utils.logger import get_logger
 
 logger = get_logger("batch_processor")
 
 
+class BatchItemsFailedError(Exception):
+    """一部のアイテムが失敗したバッチ処理（Celery の autoretry で未完了アイテムのみ再処理させる）"""
+
+
+def can_retry_failed_items(task_instance) -> bool:
+    """Celery タスクにリトライの余地があるか（最終試行では失敗アイテムがあっても結果を返す）"""
+    retry_kwargs = getattr(task_instance, "retry_kwargs", None) or {}
+    max_retries = retry_kwargs.get("max_retries", task_instance.max_retries)
+    return max_retries is None or task_instance.request.retries < max_retries
+
+
 @dataclass
 class BatchConfig:
     """バッチ処理設定"""
     batch_size: int = 8
     max_concurrent_batches: int = 3
     task_name: str = ""
+    # 統合タスク用: menu_update / 進捗を配信するタスク種別（processed_data[task_type] を各結果とする）
+    update_task_types: Tuple[str, ...] = ()
+    # 同時実行バッチ数の自動調整（None は BATCH_ADAPTIVE_ENABLED に従う。有効時 max_concurrent_batches は初期値）
+    adaptive: Optional[bool] = None
+    # 失敗したアイテムがあれば BatchItemsFailedError を送出（完了済みアイテムはチェックポイントでリトライ時に除外）
+    retry_failed_items: bool = False
 
 
 class BatchProcessor:
@@ -25,18 +51,32 @@ class BatchProcessor:
     汎用バッチ処理エンジン (Simplified)
     
     各タスクは processor_func と db_updater_func のみ実装すればよい
+    （batch_processor_func を渡すとバッチ単位で1回だけ呼び出す）
+    （field_builder_func を渡すとDB更新を write-behind バッファで一括書き込み）
+    （完了したアイテムはチェックポイントに記録し、リトライ時は未完了のアイテムのみ処理）
+    （retry_failed_items 時は失敗アイテムがあれば例外を送出し、Celery のリトライで再処理）
+    （ENRICHMENT_PRIORITY_ENABLED 時は位置・カテゴリ順・ビューポートヒントの優先順にバッチを開始）
     """
     
     def __init__(self, config: BatchConfig):
         self.config = config
-        self.redis_publisher = RedisPublisher()
+        # ワーカー常駐ループ上で接続を再利用するため共有クライアントを使用
+        self.redis_publisher = RedisPublisher(get_redis_client())
+        self.checkpoint = get_redis_task_checkpoint()
+        self.viewport_hint = get_redis_viewport_hint()
         
+    def _update_task_types(self) -> Tuple[str, ...]:
+        """SSE配信対象のタスク種別（通常は task_name のみ）"""
+        return self.config.update_task_types or (self.config.task_name,)
+    
     async def process_items(
         self,
         session_id: str,
         items: List[Dict[str, Any]],
         processor_func: Callable[[Dict[str, Any]], Dict[str, Any]],
-        db_updater_func: Callable[[str, Dict[str, Any]], bool]
+        db_updater_func: Callable[[str, Dict[str, Any]], bool],
+        batch_processor_func: Optional[Callable[[List[Dict[str, Any]]], Dict[str, Dict[str, Any]]]] = None,
+        field_builder_func: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
         アイテムバッチ処理のメインエンジン
@@ -46,39 +86,137 @@ class BatchProcessor:
             items: 処理対象アイテム
             processor_func: 各タスク固有の処理関数
             db_updater_func: DB更新関数
+            batch_processor_func: バッチ一括処理関数（アイテムID -> 処理結果）。
+                結果に含まれないアイテムは processor_func で個別処理
+            field_builder_func: 処理結果 -> 更新カラム辞書。指定時（WRITE_BEHIND_ENABLED）は
+                db_updater_func の代わりに write-behind バッファで一括更新
             
         Returns:
             Dict[str, Any]: 処理結果
+            
+        Raises:
+            BatchItemsFailedError: retry_failed_items 時に失敗したアイテムがある場合
         """
         total_items = len(items)
         logger.info(f"{self.config.task_name} processing: {total_items} items")
         
+        # 前回の試行（Celery リトライ・再配信）で完了済みのアイテムを除外
+        items = await self.pending_items(session_id, items)
+        skipped_items = total_items - len(items)
+        if skipped_items:
+            logger.info(f"{self.config.task_name} resuming: {skipped_items} items already completed")
+        
+        # 優先順位付け（画面上位・表示中カテゴリのアイテムを先頭のバッチに集める）
+        if settings.pipeline.enrichment_priority_enabled:
+            items = rank_items(items, await self.viewport_hint.get_boosted_categories(session_id))
+        
         # 開始通知
         await self._notify_start(session_id, total_items)
         
         # バッチ分割
         batches = [
             items[i:i + self.config.batch_size] 
-            for i in range(0, total_items, self.config.batch_size)
+            for i in range(0, len(items), self.config.batch_size)
         ]
         
-        # 並列バッチ処理
-        semaphore = asyncio.Semaphore(self.config.max_concurrent_batches)
+        # DB更新の write-behind バッファ（全バッチで共有）
+        write_buffer = None
+        if field_builder_func is not None and settings.celery.write_behind_enabled:
+            write_buffer = MenuWriteBehindBuffer(name=self.config.task_name)
+        
+        # menu_update の結合配信（SSE_PUBLISH_COALESCE_MS > 0 の場合）
+        menu_updates = None
+        if settings.celery.sse_publish_coalesce_ms > 0:
+            menu_updates = MenuUpdateCoalescer(
+                self.redis_publisher, session_id, settings.celery.sse_publish_coalesce_ms / 1000
+            )
         
-        async def process_batch(batch_idx: int, batch_items: List[Dict]) -> Dict:
+        # 並列バッチ処理（adaptive 時はバッチ完了ごとに同時実行数を調整）
+        controller = None
+        if self._is_adaptive():
+            controller = get_concurrency_controller(self.config.task_name, self.config.max_concurrent_batches)
+            semaphore = AdaptiveSemaphore(controller)
+            initial_concurrency = controller.limit
+        else:
+            semaphore = asyncio.Semaphore(self.config.max_concurrent_batches)
+        
+        # 空きができるたびに未開始のバッチから優先度の最も高いものを開始
+        pending_batches = list(enumerate(batches))
+        
+        async def process_next_batch() -> Dict:
             async with semaphore:
-                return await self._process_batch(
-                    session_id, batch_idx, batch_items, processor_func, db_updater_func
+                batch_idx, batch_items = await self._next_batch(session_id, pending_batches)
+                started = time.perf_counter()
+                result = await self._process_batch(
+                    session_id, batch_idx, batch_items, processor_func, db_updater_func,
+                    batch_processor_func, field_builder_func, write_buffer, menu_updates
                 )
+                if controller is not None:
+                    controller.record(
+                        time.perf_counter() - started,
+                        error_count=len(result["errors"]),
+                        rate_limited=result["rate_limited"]
+                    )
+                return result
         
         # 全バッチ実行
-        batch_results = await asyncio.gather(
-            *[process_batch(i, batch) for i, batch in enumerate(batches)],
-            return_exceptions=True
-        )
+        try:
+            batch_results = await asyncio.gather(
+                *[process_next_batch() for _ in batches],
+                return_exceptions=True
+            )
+        finally:
+            if write_buffer is not None:
+                await write_buffer.close()
+            if menu_updates is not None:
+                await menu_updates.close()
+        
+        # 失敗アイテムがあればリトライ（完了通知は最終試行でのみ送信）
+        if self.config.retry_failed_items:
+            completed_items = sum(result.get("completed", 0) for result in batch_results if isinstance(result, dict))
+            failed_items = len(items) - completed_items
+            if failed_items > 0:
+                raise BatchItemsFailedError(
+                    f"{self.config.task_name}: {failed_items}/{total_items} items failed, retrying unfinished items"
+                )
         
         # 結果集計
-        return await self._aggregate_and_notify(session_id, batch_results, total_items)
+        result = await self._aggregate_and_notify(session_id, batch_results, total_items, skipped_items)
+        result["batch_size"] = self.config.batch_size
+        if controller is not None:
+            result["concurrency"] = {
+                "adaptive": True,
+                "initial": initial_concurrency,
+                "peak_in_flight": semaphore.peak_in_flight,
+                **controller.stats()
+            }
+        else:
+            result["concurrency"] = {"adaptive": False, "concurrency": self.config.max_concurrent_batches}
+        return result
+    
+    async def pending_items(self, session_id: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """チェックポイントに完了記録のないアイテムのみを返す"""
+        completed_ids = await self.checkpoint.get_completed(session_id, self.config.task_name)
+        if not completed_ids:
+            return items
+        return [item for item in items if str(item["id"]) not in completed_ids]
+    
+    async def _next_batch(
+        self,
+        session_id: str,
+        pending_batches: List[Tuple[int, List[Dict[str, Any]]]]
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """次に開始するバッチを取り出す（処理中に届いたビューポートヒントを反映）"""
+        if not settings.pipeline.enrichment_priority_enabled or len(pending_batches) <= 1:
+            return pending_batches.pop(0)
+        boosted_categories = await self.viewport_hint.get_boosted_categories(session_id)
+        return pick_next_batch(pending_batches, boosted_categories)
+    
+    def _is_adaptive(self) -> bool:
+        """同時実行数の自動調整を行うか"""
+        if self.config.adaptive is not None:
+            return self.config.adaptive
+        return settings.celery.batch_adaptive_enabled
     
     async def _process_batch(
         self, 
@@ -86,91 +224,67 @@ class BatchProcessor:
         batch_idx: int,
         batch_items: List[Dict],
         processor_func: Callable,
-        db_updater_func: Callable
+        db_updater_func: Callable,
+        batch_processor_func: Optional[Callable] = None,
+        field_builder_func: Optional[Callable] = None,
+        write_buffer: Optional[MenuWriteBehindBuffer] = None,
+        menu_updates: Optional[MenuUpdateCoalescer] = None
     ) -> Dict:
         """単一バッチの処理"""
         completed = 0
         errors = []
+        rate_limited = 0
+        
+        # バッチ内の全アイテムが登録（または失敗）した時点で待機せずにフラッシュ
+        unqueued = [len(batch_items)]
+        
+        def mark_queued() -> None:
+            unqueued[0] -= 1
+            if unqueued[0] == 0 and write_buffer is not None:
+                write_buffer.request_flush()
+        
+        # バッチ一括処理（失敗時は全アイテムを個別処理にフォールバック）
+        batch_results: Dict[str, Dict[str, Any]] = {}
+        if batch_processor_func is not None:
+            try:
+                batch_results = await batch_processor_func(batch_items) or {}
+            except Exception as e:
+                logger.warning(f"⚠️ {self.config.task_name} batch {batch_idx} failed, processing items individually: {e}")
+                if is_rate_limit_error(e):
+                    rate_limited += 1
         
         # バッチ内並列処理
         async def process_item(item: Dict[str, Any]) -> bool:
+            queued = False
             try:
-                # 処理実行
-                processed_data = await processor_func(item)
+                # 処理実行（一括処理結果があればそれを使用）
+                processed_data = batch_results.get(str(item["id"]))
+                if processed_data is None:
+                    processed_data = await processor_func(item)
                 
-                # DB更新
-                success = await db_updater_func(item["id"], processed_data)
+                # DB更新（write-behind 時は一括UPDATEのコミット完了を待ってからSSE配信）
+                if write_buffer is not None:
+                    update_future = write_buffer.enqueue(item["id"], field_builder_func(processed_data))
+                    queued = True
+                    mark_queued()
+                    success = await update_future
+                else:
+                    success = await db_updater_func(item["id"], processed_data)
                 
                 if success:
                     # 個別完了通知（実際の処理データを含む）
-                    menu_update_data = {
-                        "task_type": self.config.task_name,
-                        "status": "completed",
-                        "batch_idx": batch_idx,
-                        "item_id": item["id"],
-                        "original_name": item.get("name", ""),
-                        "category": item.get("category", "")
-                    }
-                    
-                    # 翻訳タスクの場合は翻訳結果を追加
-                    if self.config.task_name == "translation" and processed_data:
-                        menu_update_data.update({
-                            "translation": processed_data.get("name", ""),
-                            "category_translation": processed_data.get("category", ""),
-                            "translation_language": "en"
-                        })
-                    # 詳細説明タスクの場合は説明を追加
-                    elif self.config.task_name == "description" and processed_data:
-                        menu_update_data.update({
-                            "description": processed_data.get("description", ""),
-                            "description_language": "ja",
-                            "description_length": len(processed_data.get("description", ""))
-                        })
-                    # アレルギー解析タスクの場合はアレルギー情報を追加
-                    elif self.config.task_name == "allergen" and processed_data:
-                        allergen_list = processed_data.get("allergens", [])
-                        # 辞書形式のアレルギー情報に対応
-                        allergen_info_text = ", ".join([
-                            allergen.get("name", allergen) if isinstance(allergen, dict) else str(allergen) 
-                            for allergen in allergen_list
-                        ]) if allergen_list else processed_data.get("notes", "アレルギー情報なし")
-                        
-                        menu_update_data.update({
-                            "allergen_info": allergen_info_text,
-                            "allergen_details": allergen_list,
-                            "allergen_free": processed_data.get("allergen_free", False),
-                            "safety_level": "safe" if processed_data.get("allergen_free", False) else "check_required"
-                        })
-                    # 内容物解析タスクの場合は内容物情報を追加
-                    elif self.config.task_name == "ingredient" and processed_data:
-                        main_ingredients = processed_data.get("main_ingredients", [])
-                        dietary_info = processed_data.get("dietary_info", {})
-                        menu_update_data.update({
-                            "ingredient_info": ", ".join([ing.get("ingredient", ing) if isinstance(ing, dict) else str(ing) for ing in main_ingredients]),
-                            "main_ingredients": main_ingredients,
-                            "dietary_info": dietary_info,
-                            "cuisine_category": processed_data.get("cuisine_category", "unknown")
-                        })
-                    # 画像検索タスクの場合は画像URL情報を追加
-                    elif self.config.task_name == "search_image" and processed_data:
-                        search_engine_data = processed_data.get("search_engine", "")
-                        images_found = processed_data.get("images_found", 0)
-                        
-                        # JSONとして送信されたsearch_engineをそのまま転送
-                        menu_update_data.update({
-                            "search_engine": search_engine_data,
-                            "images_found": images_found,
-                            "image_search_status": "completed" if images_found > 0 else "no_results"
-                        })
-                    # その他のタスクの場合は該当するデータを追加
-                    elif processed_data:
-                        menu_update_data["processed_data"] = processed_data
-                    
-                    await self.redis_publisher.publish_menu_update(
-                        session_id=session_id,
-                        menu_id=item["id"],
-                        menu_data=menu_update_data
-                    )
+                    # 統合タスクは processed_data[task_type] を各タスクの結果として配信
+                    for task_type in self._update_task_types():
+                        task_data = (processed_data or {}).get(task_type) if self.config.update_task_types else processed_data
+                        menu_data = self._build_menu_update_data(task_type, batch_idx, item, task_data)
+                        if menu_updates is not None:
+                            menu_updates.add(item["id"], menu_data)
+                        else:
+                            await self.redis_publisher.publish_menu_update(
+                                session_id=session_id,
+                                menu_id=item["id"],
+                                menu_data=menu_data
+                            )
                     return True
                 else:
                     errors.append(f"DB update failed: {item['id']}")
@@ -188,6 +302,9 @@ class BatchProcessor:
                     task_name=self.config.task_name
                 )
                 return False
+            finally:
+                if not queued:
+                    mark_queued()
         
         # バッチ内全アイテム並列処理
         results = await asyncio.gather(
@@ -196,38 +313,122 @@ class BatchProcessor:
         )
         
         # 成功数カウント
-        for result in results:
+        completed_ids = []
+        for item, result in zip(batch_items, results):
             if result is True:
                 completed += 1
+                completed_ids.append(item["id"])
             elif isinstance(result, Exception):
                 errors.append(str(result))
         
+        # 完了アイテムを記録（リトライ時に再処理しない）
+        await self.checkpoint.mark_completed(session_id, self.config.task_name, completed_ids)
+        
+        # 429 / クォータ超過（同時実行数の自動調整に使用）
+        rate_limited += sum(1 for error in errors if is_rate_limit_error(error))
+        
         return {
             "completed": completed,
             "total": len(batch_items),
-            "errors": errors
+            "errors": errors,
+            "rate_limited": rate_limited
         }
     
+    def _build_menu_update_data(
+        self,
+        task_type: str,
+        batch_idx: int,
+        item: Dict[str, Any],
+        processed_data: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """menu_update イベントのデータをタスク種別ごとに構築"""
+        menu_update_data = {
+            "task_type": task_type,
+            "status": "completed",
+            "batch_idx": batch_idx,
+            "item_id": item["id"],
+            "original_name": item.get("name", ""),
+            "category": item.get("category", "")
+        }
+        
+        # 翻訳タスクの場合は翻訳結果を追加
+        if task_type == "translation" and processed_data:
+            menu_update_data.update({
+                "translation": processed_data.get("name", ""),
+                "category_translation": processed_data.get("category", ""),
+                "translation_language": "en"
+            })
+        # 詳細説明タスクの場合は説明を追加
+        elif task_type == "description" and processed_data:
+            menu_update_data.update({
+                "description": processed_data.get("description", ""),
+                "description_language": "ja",
+                "description_length": len(processed_data.get("description", ""))
+            })
+        # アレルギー解析タスクの場合はアレルギー情報を追加
+        elif task_type == "allergen" and processed_data:
+            allergen_list = processed_data.get("allergens", [])
+            # 辞書形式のアレルギー情報に対応
+            allergen_info_text = ", ".join([
+                allergen.get("name", allergen) if isinstance(allergen, dict) else str(allergen) 
+                for allergen in allergen_list
+            ]) if allergen_list else processed_data.get("notes", "アレルギー情報なし")
+        
+            menu_update_data.update({
+                "allergen_info": allergen_info_text,
+                "allergen_details": allergen_list,
+                "allergen_free": processed_data.get("allergen_free", False),
+                "safety_level": "safe" if processed_data.get("allergen_free", False) else "check_required"
+            })
+        # 内容物解析タスクの場合は内容物情報を追加
+        elif task_type == "ingredient" and processed_data:
+            main_ingredients = processed_data.get("main_ingredients", [])
+            dietary_info = processed_data.get("dietary_info", {})
+            menu_update_data.update({
+                "ingredient_info": ", ".join([ing.get("ingredient", ing) if isinstance(ing, dict) else str(ing) for ing in main_ingredients]),
+                "main_ingredients": main_ingredients,
+                "dietary_info": dietary_info,
+                "cuisine_category": processed_data.get("cuisine_category", "unknown")
+            })
+        # 画像検索タスクの場合は画像URL情報を追加
+        elif task_type == "search_image" and processed_data:
+            search_engine_data = processed_data.get("search_engine", "")
+            images_found = processed_data.get("images_found", 0)
+        
+            # JSONとして送信されたsearch_engineをそのまま転送
+            menu_update_data.update({
+                "search_engine": search_engine_data,
+                "images_found": images_found,
+                "image_search_status": "completed" if images_found > 0 else "no_results"
+            })
+        # その他のタスクの場合は該当するデータを追加
+        elif processed_data:
+            menu_update_data["processed_data"] = processed_data
+        
+        return menu_update_data
+    
     async def _notify_start(self, session_id: str, total_items: int):
         """開始通知"""
-        await self.redis_publisher.publish_progress_update(
-            session_id=session_id,
-            task_name=self.config.task_name,
-            status="started",
-            progress_data={
-                "total_items": total_items,
-                "batch_size": self.config.batch_size
-            }
-        )
+        for task_type in self._update_task_types():
+            await self.redis_publisher.publish_progress_update(
+                session_id=session_id,
+                task_name=task_type,
+                status="started",
+                progress_data={
+                    "total_items": total_items,
+                    "batch_size": self.config.batch_size
+                }
+            )
     
     async def _aggregate_and_notify(
         self, 
         session_id: str, 
         batch_results: List, 
-        total_items: int
+        total_items: int,
+        skipped_items: int = 0
     ) -> Dict[str, Any]:
-        """結果集計と最終通知"""
-        total_completed = 0
+        """結果集計と最終通知（skipped_items: チェックポイントにより完了済みとして除外した件数）"""
+        total_completed = skipped_items
         all_errors = []
         completed_batches = 0
         
@@ -245,17 +446,18 @@ class BatchProcessor:
         success_rate = round((total_completed / total_items) * 100, 1) if total_items > 0 else 0
         
         # 最終通知
-        await self.redis_publisher.publish_progress_update(
-            session_id=session_id,
-            task_name=self.config.task_name,
-            status="completed",
-            progress_data={
-                "progress": 100,
-                "completed_items": total_completed,
-                "total_items": total_items,
-                "success_rate": success_rate
-            }
-        )
+        for task_type in self._update_task_types():
+            await self.redis_publisher.publish_progress_update(
+                session_id=session_id,
+                task_name=task_type,
+                status="completed",
+                progress_data={
+                    "progress": 100,
+                    "completed_items": total_completed,
+                    "total_items": total_items,
+                    "success_rate": success_rate
+                }
+            )
         
         logger.info(f"{self.config.task_name} completed: {total_completed}/{total_items} ({success_rate}%)")
         
@@ -266,5 +468,6 @@ class BatchProcessor:
             "completed_items": total_completed,
             "total_items": total_items,
             "success_rate": success_rate,
-            "error_count": len(all_errors)
+            "error_count": len(all_errors),
+            "skipped_items": skipped_items
         }
@@ -0,0 +1,160 @@
+"""
+Enrich Task - Menu Processor v2 (Fused description + allergen + ingredient)
+詳細説明・アレルギー解析・内容物解析を1回のOpenAI呼び出しと1回のDB更新で処理するCeleryワーカー
+"""
+from typing import Dict, List, Any, Optional
+
+from app_2.core.celery_app import celery_app
+from app_2.core.worker_loop import run_in_worker_loop
+from app_2.tasks.batch_processor import BatchProcessor, BatchConfig, can_retry_failed_items
+from app_2.tasks.menu_item_loader import load_task_items
+from app_2.tasks.menu_updater import make_menu_column_updater
+from app_2.tasks.menu_field_formatters import build_enrich_fields
+from app_2.services.enrich_service import get_enrich_service
+from app_2.core.config import settings
+from app_2.utils.logger import get_logger
+
+logger = get_logger("enrich_task")
+
+# 統合タスクが置き換える個別タスク（SSEはこの task_type ごとに配信）
+ENRICH_TASK_TYPES = ("description", "allergen", "ingredient")
+
+
+@celery_app.task(bind=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3}, queue='enrich_queue')
+def enrich_menu_task(
+    self,
+    session_id: str,
+    menu_items: Optional[List[Dict[str, Any]]] = None,
+    item_ids: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    メニュー項目の統合エンリッチ処理タスク（詳細説明 + アレルギー + 内容物）
+
+    Args:
+        session_id: セッションID
+        menu_items: エンリッチ対象のメニューアイテムリスト（実際のentityから変換されたdict。省略時は session_id から読み込む）
+        item_ids: 対象メニューIDの部分集合（menu_items 省略時のみ。省略時はセッション内の全メニュー）
+
+    Returns:
+        Dict[str, Any]: 処理結果
+    """
+    # ワーカー常駐イベントループで非同期処理を実行
+    return run_in_worker_loop(_enrich_menu_task_async(self, session_id, menu_items, item_ids))
+
+
+async def _enrich_menu_task_async(
+    task_instance,
+    session_id: str,
+    menu_items: Optional[List[Dict[str, Any]]] = None,
+    item_ids: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    メニュー項目の統合エンリッチ処理タスク（BatchProcessor使用版）
+
+    Args:
+        session_id: セッションID
+        menu_items: エンリッチ対象のメニューアイテムリスト（省略時は session_id から読み込む）
+        item_ids: 対象メニューIDの部分集合
+
+    Returns:
+        Dict[str, Any]: 処理結果
+    """
+    task_id = task_instance.request.id
+    menu_items = await load_task_items(session_id, menu_items, item_ids)
+    total_items = len(menu_items)
+
+    logger.info(f"Enrich task started: session={session_id}, items={total_items}, task_id={task_id}")
+
+    try:
+        # バッチプロセッサー設定（menu_update は description / allergen / ingredient ごとに配信）
+        config = BatchConfig(
+            batch_size=6,
+            max_concurrent_batches=2,
+            task_name="enrich",
+            update_task_types=ENRICH_TASK_TYPES,
+            retry_failed_items=can_retry_failed_items(task_instance)
+        )
+
+        processor = BatchProcessor(config)
+        enrich_service = get_enrich_service()
+
+        def _enrich_input(item: Dict[str, Any]) -> str:
+            # 翻訳済みの名前があれば、それも併用
+            translation = item.get("translation", "")
+            menu_name = item.get("name", "")
+            return f"{menu_name} ({translation})" if translation else menu_name
+
+        # エンリッチ処理関数（タスク固有ロジック）
+        async def enrich_processor(item: Dict[str, Any]) -> Dict[str, Any]:
+            """統合エンリッチ固有の処理ロジック"""
+            return await enrich_service.enrich_menu_item(
+                menu_item=_enrich_input(item),
+                category=item.get("category", "")
+            )
+
+        # 一括処理関数（1バッチ = 1回のLLM呼び出し、結果が欠落したアイテムは個別処理）
+        async def enrich_batch_processor(batch_items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+            """統合エンリッチの一括処理ロジック"""
+            return await enrich_service.enrich_menu_items_batch([
+                {
+                    "id": item["id"],
+                    "name": _enrich_input(item),
+                    "category": item.get("category", "")
+                }
+                for item in batch_items
+            ])
+
+        # DB更新関数（担当カラムのみを1文で更新するため分散ロック不要）
+        enrich_db_updater = make_menu_column_updater("enrich", build_enrich_fields)
+
+        # バッチ処理実行
+        result = await processor.process_items(
+            session_id=session_id,
+            items=menu_items,
+            processor_func=enrich_processor,
+            db_updater_func=enrich_db_updater,
+            batch_processor_func=enrich_batch_processor if settings.ai.openai_batch_enabled else None,
+            field_builder_func=build_enrich_fields
+        )
+
+        # タスクIDを結果に追加
+        result["task_id"] = task_id
+
+        # 🎯 個別タスクと同じ完了通知を task_type ごとに送信（クライアント互換）
+        if result.get("status") == "success":
+            from app_2.infrastructure.integrations.redis.redis_publisher import RedisPublisher
+            from app_2.services.dependencies import get_redis_client
+            redis_publisher = RedisPublisher(get_redis_client())
+
+            for task_type in ENRICH_TASK_TYPES:
+                await redis_publisher.publish_session_message(
+                    session_id=session_id,
+                    message_type=f"{task_type}_batch_completed",
+                    data={
+                        "task_type": task_type,
+                        "batch_status": "completed",
+                        "completed_items": result.get("completed_items", 0),
+                        "total_items": result.get("total_items", 0),
+                        "success_rate": result.get("success_rate", 0),
+                        "task_id": task_id,
+                        "processing_summary": {
+                            "items_processed": len(menu_items),
+                            "batch_completed_at": "now",
+                            "execution_mode": "fused_enrichment"
+                        },
+                        "message": f"{task_type.capitalize()} completed: {result.get('completed_items', 0)}/{result.get('total_items', 0)} items (fused enrichment)"
+                    }
+                )
+
+            logger.info(f"✨ Enrich batch completion broadcasted for session: {session_id}")
+
+        logger.info(f"Enrich task completed successfully: {result}")
+        return result
+
+    except Exception as e:
+        logger.error(f"Enrich task failed: {e}", extra={
+            "session_id": session_id,
+            "task_id": task_id,
+            "input_count": total_items
+        })
+        raise
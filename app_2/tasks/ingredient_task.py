@@ -2,16 +2,15 @@
 Ingredient Task - Menu Processor v2 (Refactored with BatchProcessor)
 内容物解析処理を担当するCeleryワーカー（BatchProcessor使用版）
 """
-import asyncio
-import uuid
-from typing import Dict, List, Any
-import redis.asyncio as redis
+from typing import Dict, List, Any, Optional
 
 from app_2.core.celery_app import celery_app
-from app_2.tasks.batch_processor import BatchProcessor, BatchConfig
+from app_2.core.worker_loop import run_in_worker_loop
+from app_2.tasks.batch_processor import BatchProcessor, BatchConfig, can_retry_failed_items
+from app_2.tasks.menu_item_loader import load_task_items
+from app_2.tasks.menu_updater import make_menu_column_updater
+from app_2.tasks.menu_field_formatters import build_ingredient_fields
 from app_2.services.ingredient_service import get_ingredient_service
-from app_2.infrastructure.repositories.menu_repository_impl import MenuRepositoryImpl
-from app_2.core.database import async_session_factory
 from app_2.core.config import settings
 from app_2.utils.logger import get_logger
 
@@ -22,38 +21,43 @@ logger = get_logger("ingredient_task")
 def ingredient_menu_task(
     self, 
     session_id: str, 
-    menu_items: List[Dict[str, Any]]
+    menu_items: Optional[List[Dict[str, Any]]] = None,
+    item_ids: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     メニュー項目の内容物解析処理タスク（BatchProcessor使用版）
     
     Args:
         session_id: セッションID
-        menu_items: 内容物解析対象のメニューアイテムリスト（実際のentityから変換されたdict）
+        menu_items: 内容物解析対象のメニューアイテムリスト（実際のentityから変換されたdict。省略時は session_id から読み込む）
+        item_ids: 対象メニューIDの部分集合（menu_items 省略時のみ。省略時はセッション内の全メニュー）
         
     Returns:
         Dict[str, Any]: 処理結果
     """
-    # 非同期処理をラップして実行
-    return asyncio.run(_ingredient_menu_task_async(self, session_id, menu_items))
+    # ワーカー常駐イベントループで非同期処理を実行
+    return run_in_worker_loop(_ingredient_menu_task_async(self, session_id, menu_items, item_ids))
 
 
 async def _ingredient_menu_task_async(
     task_instance,
     session_id: str, 
-    menu_items: List[Dict[str, Any]]
+    menu_items: Optional[List[Dict[str, Any]]] = None,
+    item_ids: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     メニュー項目の内容物解析処理タスク（BatchProcessor使用版）
     
     Args:
         session_id: セッションID
-        menu_items: 内容物解析対象のメニューアイテムリスト
+        menu_items: 内容物解析対象のメニューアイテムリスト（省略時は session_id から読み込む）
+        item_ids: 対象メニューIDの部分集合
         
     Returns:
         Dict[str, Any]: 処理結果
     """
     task_id = task_instance.request.id
+    menu_items = await load_task_items(session_id, menu_items, item_ids)
     total_items = len(menu_items)
     
     logger.info(f"Ingredient task started: session={session_id}, items={total_items}, task_id={task_id}")
@@ -63,7 +67,8 @@ async def _ingredient_menu_task_async(
         config = BatchConfig(
             batch_size=8,
             max_concurrent_batches=3, 
-            task_name="ingredient"
+            task_name="ingredient",
+            retry_failed_items=can_retry_failed_items(task_instance)
         )
         
         processor = BatchProcessor(config)
@@ -88,114 +93,29 @@ async def _ingredient_menu_task_async(
                 category=category
             )
         
-        # 🔥 完全分離型DB更新関数（タスク専用Redis接続）
-        async def ingredient_db_updater(item_id: str, ingredient_data: Dict[str, Any]) -> bool:
-            """内容物解析結果をDBに更新（完全分離型Redis）"""
-            # 🔥 タスク専用Redis接続を作成（シングルトンなし）
-            task_redis = None
-            try:
-                task_redis = redis.from_url(
-                    settings.celery.redis_url,
-                    decode_responses=True,
-                    socket_connect_timeout=5,
-                    socket_timeout=5
-                )
-                
-                # 分散ロック処理
-                lock_key = f"lock:menu_update:ingredient:{item_id}"
-                lock_value = str(uuid.uuid4())
-                
-                # ロック取得試行（10秒タイムアウト）
-                acquired = await task_redis.set(lock_key, lock_value, ex=10, nx=True)
-                if not acquired:
-                    logger.error(f"Failed to acquire lock for ingredient update: {item_id}")
-                    return False
-                
-                try:
-                    # リトライ機構付きDB更新
-                    for retry_count in range(3):
-                        try:
-                            async with async_session_factory() as db_session:
-                                menu_repository = MenuRepositoryImpl(db_session)
-                                
-                                # 内容物解析データを準備
-                                main_ingredients = ingredient_data.get("main_ingredients", [])
-                                if main_ingredients:
-                                    # 主要材料リストを文字列に変換
-                                    ingredient_text = ", ".join([ing.get("ingredient", ing) if isinstance(ing, dict) else str(ing) for ing in main_ingredients])
-                                else:
-                                    # 内容物情報がない場合の対応
-                                    cuisine_category = ingredient_data.get("cuisine_category", "")
-                                    cooking_method = ingredient_data.get("cooking_method", [])
-                                    if cuisine_category != "unknown":
-                                        ingredient_text = f"料理タイプ: {cuisine_category}"
-                                    elif cooking_method:
-                                        ingredient_text = f"調理法: {', '.join(cooking_method)}"
-                                    else:
-                                        ingredient_text = "材料情報不明"
-                                
-                                # 部分更新を使用（内容物フィールドのみ更新）
-                                update_fields = {
-                                    "ingredient": ingredient_text
-                                }
-                                
-                                updated_entity = await menu_repository.update_partial(item_id, update_fields)
-                                
-                                if updated_entity:
-                                    logger.info(f"Ingredient DB update successful: {item_id}")
-                                    return True
-                                else:
-                                    if retry_count < 2:
-                                        # エンティティが見つからない場合、少し待ってリトライ
-                                        logger.warning(f"Menu entity not found for {item_id}, retrying... ({retry_count + 1}/3)")
-                                        await asyncio.sleep(0.5 * (retry_count + 1))
-                                        continue
-                                    else:
-                                        logger.error(f"Menu entity not found for ingredient update after 3 retries: {item_id}")
-                                        return False
-                            
-                        except Exception as e:
-                            if retry_count < 2:
-                                logger.warning(f"Ingredient DB update failed for {item_id}, retrying... ({retry_count + 1}/3): {e}")
-                                await asyncio.sleep(0.5 * (retry_count + 1))
-                                continue
-                            else:
-                                logger.error(f"Ingredient DB update failed for {item_id} after 3 retries: {e}")
-                                return False
-                    
-                    return False
-                    
-                finally:
-                    # 🔥 原子的ロック解放（Luaスクリプト）
-                    lua_script = """
-                    if redis.call("get", KEYS[1]) == ARGV[1] then
-                        return redis.call("del", KEYS[1])
-                    else
-                        return 0
-                    end
-                    """
-                    try:
-                        await task_redis.eval(lua_script, 1, lock_key, lock_value)
-                    except Exception as e:
-                        logger.warning(f"Failed to release lock {lock_key}: {e}")
-                
-            except Exception as e:
-                logger.error(f"Redis connection error for ingredient update {item_id}: {e}")
-                return False
-            finally:
-                # 🔥 確実にRedis接続をクリーンアップ
-                if task_redis:
-                    try:
-                        await task_redis.aclose()
-                    except Exception as e:
-                        logger.warning(f"Redis cleanup error: {e}")
+        # 一括処理関数（1バッチ = 1回のLLM呼び出し、結果が欠落したアイテムは個別処理）
+        async def ingredient_batch_processor(batch_items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+            """内容物解析の一括処理ロジック"""
+            return await ingredient_service.analyze_ingredients_batch([
+                {
+                    "id": item["id"],
+                    "name": f"{item.get('name', '')} ({item['translation']})" if item.get("translation") else item.get("name", ""),
+                    "category": item.get("category", "")
+                }
+                for item in batch_items
+            ])
+        
+        # DB更新関数（担当カラムのみを1文で更新するため分散ロック不要）
+        ingredient_db_updater = make_menu_column_updater("ingredient", build_ingredient_fields)
         
         # バッチ処理実行
         result = await processor.process_items(
             session_id=session_id,
             items=menu_items,
             processor_func=ingredient_processor,
-            db_updater_func=ingredient_db_updater
+            db_updater_func=ingredient_db_updater,
+            batch_processor_func=ingredient_batch_processor if settings.ai.openai_batch_enabled else None,
+            field_builder_func=build_ingredient_fields
         )
         
         # タスクIDを結果に追加
@@ -204,7 +124,8 @@ async def _ingredient_menu_task_async(
         # 🎯 内容物解析タスク完了後の詳細SSE送信
         if result.get("status") == "success":
             from app_2.infrastructure.integrations.redis.redis_publisher import RedisPublisher
-            redis_publisher = RedisPublisher()
+            from app_2.services.dependencies import get_redis_client
+            redis_publisher = RedisPublisher(get_redis_client())
             
             # 内容物解析完了の詳細通知を送信
             await redis_publisher.publish_session_message(
@@ -0,0 +1,67 @@
+"""
+Item Priority - Menu Processor v2
+エンリッチ処理の優先順位付け（画面の上にあるアイテムから処理し、最初の画面が揃うまでの時間を短縮）
+
+- 位置: メニューアイテムの並び順（カテゴライズ結果の OCR y_center 順を menus.position に保存し、その順で読み込む）
+- カテゴリ順: カテゴリの初出順
+- ビューポートヒント: クライアントが表示中のカテゴリ（最新のヒントほど優先）
+"""
+from typing import Any, Dict, List, Sequence, Tuple
+
+
+def _category_order(items: Sequence[Dict[str, Any]]) -> Dict[str, int]:
+    order: Dict[str, int] = {}
+    for item in items:
+        order.setdefault(item.get("category") or "", len(order))
+    return order
+
+
+def _boost_rank(category: str, boosted_categories: Sequence[str]) -> int:
+    return boosted_categories.index(category) if category in boosted_categories else len(boosted_categories)
+
+
+def rank_items(items: List[Dict[str, Any]], boosted_categories: Sequence[str] = ()) -> List[Dict[str, Any]]:
+    """
+    アイテムを優先順に並べ替え
+
+    Args:
+        items: メニューアイテム（位置順）
+        boosted_categories: 優先するカテゴリ（先頭ほど優先）
+
+    Returns:
+        List[Dict[str, Any]]: ビューポートヒント → カテゴリ順 → 位置 の順に並べたアイテム
+    """
+    category_order = _category_order(items)
+
+    def sort_key(indexed: Tuple[int, Dict[str, Any]]) -> Tuple[int, int, int]:
+        position, item = indexed
+        category = item.get("category") or ""
+        return _boost_rank(category, boosted_categories), category_order[category], position
+
+    return [item for _, item in sorted(enumerate(items), key=sort_key)]
+
+
+def pick_next_batch(
+    pending_batches: List[Tuple[int, List[Dict[str, Any]]]],
+    boosted_categories: Sequence[str] = ()
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    次に開始するバッチを取り出す（表示中カテゴリのアイテムを含むバッチを優先、同順位はバッチ番号順）
+
+    Args:
+        pending_batches: 未開始の (バッチ番号, アイテム) 一覧（取り出したバッチは削除される）
+        boosted_categories: 優先するカテゴリ（先頭ほど優先）
+
+    Returns:
+        Tuple[int, List[Dict[str, Any]]]: バッチ番号とアイテム
+    """
+    position = 0
+    if boosted_categories:
+        position = min(
+            range(len(pending_batches)),
+            key=lambda index: (
+                min(_boost_rank(item.get("category") or "", boosted_categories) for item in pending_batches[index][1]),
+                pending_batches[index][0]
+            )
+        )
+    return pending_batches.pop(position)
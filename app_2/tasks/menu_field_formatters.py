@@ -0,0 +1,87 @@
+"""
+Menu Field Formatters - Menu Processor v2
+AI解析結果をメニューDBカラム（description / allergy / ingredient）の文字列に変換
+個別タスクと統合エンリッチタスクで同じ変換結果になるよう共通化
+
+build_*_fields は処理結果を部分更新用のカラム辞書に変換（write-behind バッファで使用）
+"""
+from typing import Dict, Any
+
+
+def format_description_text(description_data: Dict[str, Any]) -> str:
+    """詳細説明結果を description カラム用文字列に変換"""
+    description_text = description_data.get("description", "")
+    if not description_text:
+        # フォールバック用の説明
+        description_text = description_data.get("summary", "説明情報を生成できませんでした")
+    return description_text
+
+
+def format_allergen_text(allergen_data: Dict[str, Any]) -> str:
+    """アレルギー解析結果を allergy カラム用文字列に変換"""
+    allergen_list = allergen_data.get("allergens", [])
+    allergen_free = allergen_data.get("allergen_free", False)
+
+    if allergen_list and len(allergen_list) > 0:
+        # Convert simple string list to comma-separated format
+        return ", ".join(allergen_list)
+    if allergen_free:
+        # No allergens present
+        return "None"
+    # Unable to determine allergens
+    notes = allergen_data.get("notes", "")
+    return notes if notes else "Unable to determine"
+
+
+def format_ingredient_text(ingredient_data: Dict[str, Any]) -> str:
+    """内容物解析結果を ingredient カラム用文字列に変換"""
+    main_ingredients = ingredient_data.get("main_ingredients", [])
+    if main_ingredients:
+        # 主要材料リストを文字列に変換
+        return ", ".join([ing.get("ingredient", ing) if isinstance(ing, dict) else str(ing) for ing in main_ingredients])
+
+    # 内容物情報がない場合の対応
+    cuisine_category = ingredient_data.get("cuisine_category", "")
+    cooking_method = ingredient_data.get("cooking_method", [])
+    if cuisine_category != "unknown":
+        return f"料理タイプ: {cuisine_category}"
+    if cooking_method:
+        return f"調理法: {', '.join(cooking_method)}"
+    return "材料情報不明"
+
+
+def build_translation_fields(translated_data: Dict[str, Any]) -> Dict[str, Any]:
+    """翻訳結果 -> 部分更新カラム"""
+    return {
+        "translation": translated_data.get("name", ""),
+        "category_translation": translated_data.get("category", "")
+    }
+
+
+def build_description_fields(description_data: Dict[str, Any]) -> Dict[str, Any]:
+    """詳細説明結果 -> 部分更新カラム"""
+    return {"description": format_description_text(description_data)}
+
+
+def build_allergen_fields(allergen_data: Dict[str, Any]) -> Dict[str, Any]:
+    """アレルギー解析結果 -> 部分更新カラム"""
+    return {"allergy": format_allergen_text(allergen_data)}
+
+
+def build_ingredient_fields(ingredient_data: Dict[str, Any]) -> Dict[str, Any]:
+    """内容物解析結果 -> 部分更新カラム"""
+    return {"ingredient": format_ingredient_text(ingredient_data)}
+
+
+def build_search_image_fields(search_data: Dict[str, Any]) -> Dict[str, Any]:
+    """画像検索結果 -> 部分更新カラム"""
+    return {"search_engine": search_data.get("search_engine")}
+
+
+def build_enrich_fields(enrich_data: Dict[str, Any]) -> Dict[str, Any]:
+    """統合エンリッチ結果 -> 部分更新カラム（説明・アレルギー・内容物）"""
+    return {
+        **build_description_fields(enrich_data.get("description") or {}),
+        **build_allergen_fields(enrich_data.get("allergen") or {}),
+        **build_ingredient_fields(enrich_data.get("ingredient") or {})
+    }
@@ -0,0 +1,40 @@
+"""
+Menu Item Loader - Menu Processor v2
+Celeryタスクの入力メニューアイテムを解決
+
+PIPELINE_SLIM_TASK_MESSAGES 時はタスクメッセージに session_id（と任意の item_ids）のみを載せ、
+ワーカー側で必要なカラムだけを1クエリで読み込む（ブローカー・結果バックエンドのメッセージを小さく保つ）
+"""
+from typing import Any, Dict, List, Optional
+
+from app_2.core.database import async_session_factory
+from app_2.infrastructure.repositories.menu_repository_impl import MenuRepositoryImpl
+from app_2.utils.logger import get_logger
+
+logger = get_logger("menu_item_loader")
+
+
+async def load_task_items(
+    session_id: str,
+    menu_items: Optional[List[Dict[str, Any]]] = None,
+    item_ids: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    タスクの処理対象メニューアイテムを取得
+
+    Args:
+        session_id: セッションID
+        menu_items: メッセージに含まれるメニューアイテム（従来形式。指定時はそのまま使用）
+        item_ids: 対象メニューIDの部分集合（省略時はセッション内の全メニュー）
+
+    Returns:
+        List[Dict[str, Any]]: メニューアイテムの辞書一覧
+    """
+    if menu_items is not None:
+        return menu_items
+
+    async with async_session_factory() as db_session:
+        items = await MenuRepositoryImpl(db_session).get_task_items(session_id, item_ids)
+
+    logger.info(f"Loaded {len(items)} task items from DB: session={session_id}")
+    return items
@@ -0,0 +1,63 @@
+"""
+Menu Update Coalescer - Menu Processor v2
+タスクの menu_update を短いウィンドウでまとめ、menu_batch_update として1回で配信
+
+(menu_id, task_type) ごとに後勝ち。SSEエンドポイントはオプトインしていないクライアントには
+menu_batch_update を個別の menu_update フレームに展開して送る。
+"""
+import asyncio
+from typing import Any, Dict, Optional
+
+from app_2.infrastructure.integrations.redis.menu_update_batch import MenuUpdateBuffer
+from app_2.infrastructure.integrations.redis.redis_publisher import RedisPublisher
+from app_2.utils.logger import get_logger
+from app_2.utils.metrics import get_metrics_registry
+
+logger = get_logger("menu_update_coalescer")
+
+
+class MenuUpdateCoalescer:
+    """セッション単位の menu_update 結合配信"""
+
+    def __init__(self, redis_publisher: RedisPublisher, session_id: str, window_seconds: float):
+        self.redis_publisher = redis_publisher
+        self.session_id = session_id
+        self.window_seconds = window_seconds
+        self._buffer = MenuUpdateBuffer()
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._metrics = get_metrics_registry()
+
+    def add(self, menu_id: str, menu_data: Dict[str, Any]) -> None:
+        """更新を追加（ウィンドウ経過後にまとめて配信）"""
+        self._buffer.add(menu_id, menu_data)
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_after_window())
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.window_seconds)
+        # close() によるキャンセルで配信途中の更新を失わないよう保護
+        await asyncio.shield(self.flush())
+
+    async def flush(self) -> None:
+        """保持している更新を配信"""
+        async with self._flush_lock:
+            updates = self._buffer.drain()
+            if not updates:
+                return
+            self._metrics.increment("sse.coalesce.publishes")
+            self._metrics.increment("sse.coalesce.updates", len(updates))
+            if len(updates) == 1:
+                await self.redis_publisher.publish_menu_update(
+                    session_id=self.session_id,
+                    menu_id=updates[0]["menu_id"],
+                    menu_data=updates[0]["menu_data"]
+                )
+            else:
+                await self.redis_publisher.publish_menu_batch_update(self.session_id, updates)
+
+    async def close(self) -> None:
+        """待機中のタイマーを止めて残りを配信"""
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        await self.flush()
@@ -0,0 +1,63 @@
+"""
+Menu Column Updater - Menu Processor v2
+各タスクの処理結果を、そのタスクが担当するカラムだけに書き込むDB更新関数
+
+UPDATE menus SET <担当カラム> WHERE id = ... の1文で更新するため、
+タスク間で分散ロックを取得する必要がない（他タスクのカラムは上書きされない）
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from app_2.core.database import async_session_factory
+from app_2.infrastructure.repositories.menu_repository_impl import MenuRepositoryImpl
+from app_2.utils.logger import get_logger
+
+logger = get_logger("menu_updater")
+
+MAX_UPDATE_ATTEMPTS = 3
+
+
+def make_menu_column_updater(
+    task_name: str,
+    field_builder_func: Callable[[Dict[str, Any]], Dict[str, Any]]
+) -> Callable[[str, Dict[str, Any]], Awaitable[bool]]:
+    """
+    BatchProcessor 用の db_updater_func を作成
+
+    Args:
+        task_name: ログ用タスク名
+        field_builder_func: 処理結果 -> 更新カラム辞書
+
+    Returns:
+        Callable: (item_id, processed_data) -> 更新成功可否
+    """
+    async def menu_column_updater(item_id: str, processed_data: Dict[str, Any]) -> bool:
+        update_fields = field_builder_func(processed_data)
+
+        # リトライ機構付きDB更新（メニュー保存直後で行が未作成の場合に備える）
+        for retry_count in range(MAX_UPDATE_ATTEMPTS):
+            is_last_attempt = retry_count == MAX_UPDATE_ATTEMPTS - 1
+            try:
+                async with async_session_factory() as db_session:
+                    updated = await MenuRepositoryImpl(db_session).update_columns(item_id, update_fields)
+
+                if updated:
+                    logger.info(f"{task_name} DB update successful: {item_id}")
+                    return True
+                if is_last_attempt:
+                    logger.error(f"Menu entity not found for {task_name} update after {MAX_UPDATE_ATTEMPTS} retries: {item_id}")
+                    return False
+                # エンティティが見つからない場合、少し待ってリトライ
+                logger.warning(f"Menu entity not found for {item_id}, retrying... ({retry_count + 1}/{MAX_UPDATE_ATTEMPTS})")
+
+            except Exception as e:
+                if is_last_attempt:
+                    logger.error(f"{task_name} DB update failed for {item_id} after {MAX_UPDATE_ATTEMPTS} retries: {e}")
+                    return False
+                logger.warning(f"{task_name} DB update failed for {item_id}, retrying... ({retry_count + 1}/{MAX_UPDATE_ATTEMPTS}): {e}")
+
+            await asyncio.sleep(0.5 * (retry_count + 1))
+
+        return False
+
+    return menu_column_updater
@@ -0,0 +1,177 @@
+"""
+Write-Behind Buffer - Menu Processor v2
+タスク結果のメニュー部分更新をまとめ、UPDATE ... FROM (VALUES ...) の一括更新で書き込むバッファ
+
+- 件数上限（max_items）または待機時間上限（max_latency）で自動フラッシュ
+- 同一アイテムへの更新はフラッシュ前に結合（後勝ち）
+- 呼び出し側はコミット完了後に結果（True/False）を受け取るため、SSE配信はコミット後になる
+- 行が未作成などで更新されなかったアイテムは max_attempts 回まで次回フラッシュで再試行
+"""
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app_2.core.config import settings
+from app_2.utils.logger import get_logger
+from app_2.utils.metrics import get_metrics_registry, span
+
+logger = get_logger("write_behind")
+
+
+@dataclass
+class _PendingUpdate:
+    """フラッシュ待ちの更新"""
+    fields: Dict[str, Any]
+    waiters: List[asyncio.Future] = field(default_factory=list)
+    attempts: int = 0
+
+
+async def flush_menu_updates(updates: Dict[str, Dict[str, Any]]) -> List[str]:
+    """既定のフラッシュ処理: 1セッション・1コミットで一括部分更新"""
+    from app_2.core.database import async_session_factory
+    from app_2.infrastructure.repositories.menu_repository_impl import MenuRepositoryImpl
+
+    async with async_session_factory() as db_session:
+        return await MenuRepositoryImpl(db_session).bulk_update_fields(updates)
+
+
+class MenuWriteBehindBuffer:
+    """
+    メニュー部分更新の write-behind バッファ
+
+    同一イベントループ内で使用する（Celeryワーカーでは常駐ループ上）
+    """
+
+    def __init__(
+        self,
+        name: str = "",
+        max_items: Optional[int] = None,
+        max_latency_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_delay_seconds: float = 0.5,
+        flush_func: Callable[[Dict[str, Dict[str, Any]]], Awaitable[List[str]]] = flush_menu_updates
+    ):
+        self.name = name
+        self.max_items = max_items or settings.celery.write_behind_max_items
+        self.max_latency_seconds = (
+            max_latency_seconds if max_latency_seconds is not None
+            else settings.celery.write_behind_max_latency_ms / 1000
+        )
+        self.max_attempts = max_attempts or settings.celery.write_behind_max_attempts
+        self.retry_delay_seconds = retry_delay_seconds
+        self._flush_func = flush_func
+        self._pending: Dict[str, _PendingUpdate] = {}
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._metrics = get_metrics_registry()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, item_id: str, fields: Dict[str, Any]) -> asyncio.Future:
+        """
+        更新を登録し、コミット結果を受け取る Future を返す
+
+        Args:
+            item_id: メニューID
+            fields: 更新フィールド
+
+        Returns:
+            asyncio.Future: 更新成功で True、再試行上限に達したら False
+        """
+        key = str(item_id)
+        future = asyncio.get_running_loop().create_future()
+        entry = self._pending.get(key)
+        if entry is None:
+            entry = _PendingUpdate(fields=dict(fields))
+            self._pending[key] = entry
+        else:
+            entry.fields.update(fields)
+        entry.waiters.append(future)
+
+        if len(self._pending) >= self.max_items:
+            self.request_flush()
+        else:
+            self._schedule_timer(self.max_latency_seconds)
+        return future
+
+    async def add(self, item_id: str, fields: Dict[str, Any]) -> bool:
+        """更新を登録してコミット完了まで待機"""
+        return await self.enqueue(item_id, fields)
+
+    def request_flush(self) -> None:
+        """待機時間を待たずにフラッシュ（バッチ内の全アイテム登録完了時など）"""
+        self._spawn(self.flush())
+
+    def _schedule_timer(self, delay: float) -> None:
+        if self._timer is None or self._timer.done():
+            self._timer = self._spawn(self._flush_after(delay))
+
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self.flush()
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def flush(self) -> None:
+        """登録済みの更新を一括書き込みし、待機中の呼び出し側へ結果を通知"""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+
+            updated: Set[str] = set()
+            try:
+                with span("write_behind.flush"):
+                    updated = {str(menu_id) for menu_id in await self._flush_func(
+                        {key: entry.fields for key, entry in batch.items()}
+                    )}
+            except Exception as e:
+                logger.error(f"❌ Write-behind flush failed ({self.name}, {len(batch)} rows): {e}")
+
+            self._metrics.increment("write_behind.flushes")
+            self._metrics.increment("write_behind.rows", len(updated))
+
+            retry: Dict[str, _PendingUpdate] = {}
+            for key, entry in batch.items():
+                if key in updated:
+                    self._resolve(entry, True)
+                    continue
+                entry.attempts += 1
+                if entry.attempts < self.max_attempts:
+                    retry[key] = entry
+                else:
+                    logger.error(f"❌ Write-behind update gave up after {entry.attempts} attempts: {key}")
+                    self._metrics.increment("write_behind.failed_rows")
+                    self._resolve(entry, False)
+
+            if retry:
+                logger.warning(f"⚠️ Write-behind: {len(retry)} rows not updated ({self.name}), retrying")
+                for key, entry in retry.items():
+                    newer = self._pending.get(key)
+                    if newer is not None:
+                        # 再試行中に届いた新しい更新を優先
+                        entry.fields.update(newer.fields)
+                        entry.waiters.extend(newer.waiters)
+                    self._pending[key] = entry
+                self._spawn(self._flush_after(self.retry_delay_seconds))
+
+    @staticmethod
+    def _resolve(entry: _PendingUpdate, success: bool) -> None:
+        for waiter in entry.waiters:
+            if not waiter.done():
+                waiter.set_result(success)
+
+    async def close(self) -> None:
+        """残りの更新をすべて書き込み、タイマーを停止"""
+        while self._pending:
+            await self.flush()
+        for task in list(self._tasks):
+            task.cancel()
+        self._tasks.clear()
@@ -0,0 +1,92 @@
+"""
+Menu Task Items Test
+一括保存したメニューが、created_at が同値でも保存時の並び順（position）で読み込まれ、優先順位付けに使われることを確認するテスト
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app_2.domain.entities.menu_entity import MenuEntity
+from app_2.infrastructure.models.menu_model import MenuModel
+from app_2.infrastructure.models.session_model import SessionModel
+from app_2.infrastructure.repositories.menu_repository_impl import MenuRepositoryImpl
+from app_2.tasks.item_priority import rank_items
+
+TIED_CREATED_AT = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _menu_entity(menu_id: str, name: str, category: str) -> MenuEntity:
+    return MenuEntity(id=menu_id, name=name, translation=None, category=category, price="500")
+
+
+@pytest.fixture
+def sync_session():
+    engine = create_engine("sqlite://")
+    SessionModel.__table__.create(engine)
+    MenuModel.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def repository(sync_session):
+    """同期 SQLite セッションを AsyncSession の代わりに使うリポジトリ"""
+    async_session = MagicMock()
+    async_session.add = sync_session.add
+    async_session.commit = AsyncMock(side_effect=lambda: sync_session.commit())
+    async_session.refresh = AsyncMock(side_effect=lambda model: sync_session.refresh(model))
+    async_session.execute = AsyncMock(side_effect=lambda stmt: sync_session.execute(stmt))
+    return MenuRepositoryImpl(async_session)
+
+
+class TestGetTaskItems:
+    """get_task_items の並び順テスト"""
+
+    @pytest.mark.asyncio
+    async def test_tied_created_at_keeps_saved_order(self, repository, sync_session):
+        """created_at が同値で id の順序が保存順と逆でも、保存時の順序で返すことを確認"""
+        entities = [
+            _menu_entity("m9", "唐揚げ", "FOOD"),
+            _menu_entity("m5", "ビール", "DRINK"),
+            _menu_entity("m1", "ラーメン", "FOOD")
+        ]
+        await repository.bulk_save_with_session(entities, "s1")
+        sync_session.query(MenuModel).update({MenuModel.created_at: TIED_CREATED_AT})
+        sync_session.commit()
+
+        items = await repository.get_task_items("s1")
+
+        assert [item["id"] for item in items] == ["m9", "m5", "m1"]
+
+    @pytest.mark.asyncio
+    async def test_subset_keeps_saved_order(self, repository, sync_session):
+        entities = [_menu_entity(f"m{9 - i}", f"item{i}", "FOOD") for i in range(4)]
+        await repository.bulk_save_with_session(entities, "s1")
+        sync_session.query(MenuModel).update({MenuModel.created_at: TIED_CREATED_AT})
+        sync_session.commit()
+
+        items = await repository.get_task_items("s1", ["m6", "m8"])
+
+        assert [item["id"] for item in items] == ["m8", "m6"]
+
+    @pytest.mark.asyncio
+    async def test_rank_follows_saved_position_with_tied_created_at(self, repository, sync_session):
+        """位置・カテゴリの初出順が UUID 順ではなく保存時の並び順に従うことを確認"""
+        entities = [
+            _menu_entity("m9", "ビール", "DRINK"),
+            _menu_entity("m1", "唐揚げ", "FOOD"),
+            _menu_entity("m8", "ハイボール", "DRINK"),
+            _menu_entity("m2", "ラーメン", "FOOD")
+        ]
+        await repository.bulk_save_with_session(entities, "s1")
+        sync_session.query(MenuModel).update({MenuModel.created_at: TIED_CREATED_AT})
+        sync_session.commit()
+
+        ranked = rank_items(await repository.get_task_items("s1"))
+
+        assert [item["id"] for item in ranked] == ["m9", "m8", "m1", "m2"]
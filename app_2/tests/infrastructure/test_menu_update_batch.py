@@ -0,0 +1,151 @@
+"""
+Menu Update Batch Test
+menu_update の結合（menu_batch_update）・展開と、配信側/SSE側の時間ウィンドウ結合の動作確認テスト
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app_2.api.v1.endpoints.sse import coalesce_menu_updates, expand_menu_batches
+from app_2.infrastructure.integrations.redis.menu_update_batch import (
+    MenuUpdateBuffer,
+    build_menu_batch_update_data,
+    expand_menu_batch_update
+)
+from app_2.infrastructure.integrations.redis.sse_event import SSEEvent
+from app_2.tasks.menu_update_coalescer import MenuUpdateCoalescer
+
+
+def _menu_update(menu_id, task_type, value, event_id=None):
+    message = {
+        "type": "menu_update",
+        "session_id": "s1",
+        "data": {"menu_id": menu_id, "menu_data": {"task_type": task_type, "value": value}}
+    }
+    if event_id:
+        message["event_id"] = event_id
+    return message
+
+
+async def _source(messages, delay=0.0):
+    for message in messages:
+        if delay:
+            await asyncio.sleep(delay)
+        yield SSEEvent.from_message(message)
+
+
+class TestMenuUpdateBuffer:
+    """MenuUpdateBuffer テスト"""
+
+    def test_latest_wins_per_item_and_task(self):
+        buffer = MenuUpdateBuffer()
+        buffer.add_message(_menu_update("m1", "translation", "old"))
+        buffer.add_message(_menu_update("m1", "description", "desc"))
+        buffer.add_message(_menu_update("m1", "translation", "new"))
+
+        updates = buffer.drain()
+
+        assert [(u["menu_id"], u["menu_data"]["task_type"], u["menu_data"]["value"]) for u in updates] == [
+            ("m1", "translation", "new"),
+            ("m1", "description", "desc")
+        ]
+        assert len(buffer) == 0
+
+    def test_expand_assigns_event_id_to_last_frame(self):
+        """展開時はイベントIDを最後の menu_update にのみ付与することを確認"""
+        message = {
+            "type": "menu_batch_update",
+            "session_id": "s1",
+            "event_id": "100-0",
+            "data": build_menu_batch_update_data([
+                {"menu_id": "m1", "menu_data": {"task_type": "translation"}},
+                {"menu_id": "m2", "menu_data": {"task_type": "translation"}}
+            ])
+        }
+
+        expanded = expand_menu_batch_update(message)
+
+        assert [m["type"] for m in expanded] == ["menu_update", "menu_update"]
+        assert [m["data"]["menu_id"] for m in expanded] == ["m1", "m2"]
+        assert "event_id" not in expanded[0] and expanded[1]["event_id"] == "100-0"
+
+
+class TestSSECoalescing:
+    """SSE側の結合テスト"""
+
+    @pytest.mark.asyncio
+    async def test_updates_within_window_become_one_frame(self):
+        """ウィンドウ内の更新が1つの menu_batch_update になり、他のメッセージの順序が保たれることを確認"""
+        messages = [
+            _menu_update("m1", "translation", "a", "1-0"),
+            _menu_update("m2", "translation", "b", "2-0"),
+            _menu_update("m1", "translation", "c", "3-0"),
+            {"type": "progress_update", "data": {}},
+            _menu_update("m3", "translation", "d", "4-0")
+        ]
+
+        frames = [event.message async for event in coalesce_menu_updates(_source(messages), "s1", 0.05)]
+
+        assert [frame["type"] for frame in frames] == ["menu_batch_update", "progress_update", "menu_batch_update"]
+        first_updates = frames[0]["data"]["updates"]
+        assert [(u["menu_id"], u["menu_data"]["value"]) for u in first_updates] == [("m1", "c"), ("m2", "b")]
+        assert frames[0]["event_id"] == "3-0"
+        assert frames[2]["data"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_window_elapses_while_waiting(self):
+        """次のメッセージを待つ間にウィンドウが経過したら送信することを確認"""
+        async def slow_source():
+            yield SSEEvent.from_message(_menu_update("m1", "translation", "a"))
+            await asyncio.sleep(0.2)
+            yield SSEEvent.from_message(_menu_update("m2", "translation", "b"))
+
+        started = asyncio.get_running_loop().time()
+        coalesced = coalesce_menu_updates(slow_source(), "s1", 0.02)
+        first = await coalesced.__anext__()
+
+        assert first.message["data"]["count"] == 1
+        assert asyncio.get_running_loop().time() - started < 0.15
+        await coalesced.aclose()
+
+    @pytest.mark.asyncio
+    async def test_expand_for_clients_without_opt_in(self):
+        batch = {
+            "type": "menu_batch_update",
+            "data": build_menu_batch_update_data([{"menu_id": "m1", "menu_data": {}}, {"menu_id": "m2", "menu_data": {}}])
+        }
+        frames = [event async for event in expand_menu_batches(_source([batch, {"type": "progress_update"}]))]
+        assert [frame.type for frame in frames] == ["menu_update", "menu_update", "progress_update"]
+
+
+class TestMenuUpdateCoalescer:
+    """配信側の結合テスト"""
+
+    @pytest.mark.asyncio
+    async def test_publishes_one_batch_per_window(self):
+        publisher = AsyncMock()
+        coalescer = MenuUpdateCoalescer(publisher, "s1", 0.01)
+
+        for index in range(5):
+            coalescer.add(f"m{index}", {"task_type": "translation", "value": index})
+        coalescer.add("m0", {"task_type": "translation", "value": "latest"})
+        await asyncio.sleep(0.05)
+
+        publisher.publish_menu_batch_update.assert_awaited_once()
+        updates = publisher.publish_menu_batch_update.await_args.args[1]
+        assert len(updates) == 5
+        assert updates[0]["menu_data"]["value"] == "latest"
+        await coalescer.close()
+        publisher.publish_menu_update.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_remaining(self):
+        publisher = AsyncMock()
+        coalescer = MenuUpdateCoalescer(publisher, "s1", 60)
+        coalescer.add("m1", {"task_type": "translation"})
+
+        await coalescer.close()
+
+        publisher.publish_menu_update.assert_awaited_once()
@@ -0,0 +1,122 @@
+"""
+Redis Event Log Test
+SSEイベントログ（Redis Stream）と Last-Event-ID による再送の動作確認テスト
+"""
+
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app_2.api.v1.endpoints import sse
+from app_2.infrastructure.integrations.redis.redis_event_log import (
+    EventReplay,
+    RedisEventLog,
+    parse_event_id
+)
+from app_2.infrastructure.integrations.redis.sse_event import SSEEvent
+
+
+def _redis_client(raw_client):
+    redis_client = MagicMock()
+
+    @asynccontextmanager
+    async def get_connection():
+        yield raw_client
+
+    redis_client.get_connection = get_connection
+    return redis_client
+
+
+def _entry(event_id, message_type):
+    return event_id, {"message": json.dumps({"type": message_type, "session_id": "s1", "data": {}})}
+
+
+class TestRedisEventLog:
+    """RedisEventLog テスト"""
+
+    def test_parse_event_id(self):
+        assert parse_event_id("1700000000000-2") == (1700000000000, 2)
+        assert parse_event_id("1700000000000") == (1700000000000, 0)
+        assert parse_event_id("not-an-id") is None
+        assert parse_event_id(None) is None
+
+    @pytest.mark.asyncio
+    async def test_append_and_publish_single_script(self):
+        """Stream 追記と PUBLISH を1回のスクリプト実行で行うことを確認"""
+        raw_client = MagicMock()
+        raw_client.eval = AsyncMock(return_value="1700000000000-0")
+        event_log = RedisEventLog(_redis_client(raw_client))
+
+        event_id = await event_log.append_and_publish("s1", '{"type": "menu_update"}')
+
+        assert event_id == "1700000000000-0"
+        args = raw_client.eval.await_args.args
+        assert args[1:4] == (2, "sse_log:s1", "sse:s1")
+
+    @pytest.mark.asyncio
+    async def test_read_after_returns_only_missed_events(self):
+        """Last-Event-ID より後のイベントのみを event_id 付きで返すことを確認"""
+        raw_client = MagicMock()
+        raw_client.xrange = AsyncMock(side_effect=[
+            [_entry("100-0", "stage_completed")],
+            [_entry("100-2", "menu_update"), _entry("101-0", "menu_update")]
+        ])
+        event_log = RedisEventLog(_redis_client(raw_client))
+
+        replay = await event_log.read_after("s1", "100-1")
+
+        assert replay.complete is True
+        assert [event["event_id"] for event in replay.events] == ["100-2", "101-0"]
+        assert raw_client.xrange.await_args.kwargs["min"] == "100-2"
+
+    @pytest.mark.asyncio
+    async def test_read_after_detects_trimmed_stream(self):
+        """上限で切り詰められた・存在しない Stream は complete=False になることを確認"""
+        raw_client = MagicMock()
+        raw_client.xrange = AsyncMock(side_effect=[[_entry("200-0", "menu_update")], [_entry("200-0", "menu_update")]])
+        assert (await RedisEventLog(_redis_client(raw_client)).read_after("s1", "100-0")).complete is False
+
+        raw_client.xrange = AsyncMock(return_value=[])
+        assert (await RedisEventLog(_redis_client(raw_client)).read_after("s1", "100-0")).complete is False
+
+
+class FakeSubscription:
+    def __init__(self, messages):
+        self._messages = list(messages)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._messages:
+            raise StopAsyncIteration
+        return SSEEvent.from_message(self._messages.pop(0))
+
+
+class TestSSEReplay:
+    """create_sse_stream の Last-Event-ID 再送テスト"""
+
+    @pytest.mark.asyncio
+    async def test_replay_without_database_and_dedupe_live(self):
+        """再接続時はDB履歴を読まずに取りこぼし分を再送し、重複するライブ配信を除外することを確認"""
+        dispatcher = MagicMock()
+        dispatcher.subscribe = AsyncMock(return_value=FakeSubscription([
+            {"event_id": "100-2", "type": "menu_update"},
+            {"event_id": "100-3", "type": "menu_update"}
+        ]))
+        dispatcher.unsubscribe = AsyncMock()
+        replay = EventReplay(events=[{"event_id": "100-2", "type": "menu_update"}], complete=True)
+        history = AsyncMock(return_value=[])
+
+        with patch.object(sse, "get_redis_pubsub_dispatcher", return_value=dispatcher), \
+                patch.object(sse.settings.celery, "sse_event_log_enabled", True), \
+                patch.object(sse.RedisEventLog, "read_after", AsyncMock(return_value=replay)), \
+                patch.object(sse, "get_session_history", history):
+            frames = [frame async for frame in sse.create_sse_stream("session-1", "conn", "100-1")]
+
+        history.assert_not_awaited()
+        ids = [line for frame in frames for line in frame.splitlines() if line.startswith("id: ")]
+        assert ids == ["id: 100-2", "id: 100-3"]
+        dispatcher.unsubscribe.assert_awaited_once()
@@ -0,0 +1,83 @@
+"""
+Redis Pool Manager Test
+プロセス共通のRedis接続プール（URL × イベントループ単位）の動作確認テスト
+"""
+
+import asyncio
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from app_2.infrastructure.integrations.redis.redis_client import RedisClient
+from app_2.infrastructure.integrations.redis.redis_pool_manager import RedisPoolManager, get_redis_pool_manager
+from app_2.utils.metrics import get_metrics_registry
+
+REDIS_URL = "redis://localhost:6379/0"
+
+
+class TestRedisPoolManager:
+    """RedisPoolManager テスト"""
+
+    @pytest.mark.asyncio
+    async def test_same_loop_shares_pool(self):
+        """同一イベントループ・同一URLでは同じプールとクライアントを返すことを確認"""
+        manager = RedisPoolManager(max_connections=4)
+
+        assert manager.get_client(REDIS_URL) is manager.get_client(REDIS_URL)
+        assert manager.get_pool(REDIS_URL).max_connections == 4
+        assert manager.get_pool(REDIS_URL) is not manager.get_pool("redis://localhost:6379/1")
+
+    def test_pool_per_event_loop(self):
+        """イベントループごとに別のプールを作成し、終了したループのプールは破棄することを確認"""
+        manager = RedisPoolManager()
+
+        async def _get_pool():
+            return manager.get_pool(REDIS_URL)
+
+        first = asyncio.run(_get_pool())
+        second = asyncio.run(_get_pool())
+
+        assert first is not second
+        assert len(manager.stats()) == 1
+
+    @pytest.mark.asyncio
+    async def test_exhausted_pool_times_out_with_metrics(self):
+        """上限まで使用中の場合は待機後に ConnectionError となり、枯渇が計測されることを確認"""
+        metrics = get_metrics_registry()
+        exhausted_before = metrics.get_counter("redis.pool.exhausted")
+        timeouts_before = metrics.get_counter("redis.pool.timeouts")
+
+        manager = RedisPoolManager(max_connections=1, pool_timeout=0.05)
+        pool = manager.get_pool(REDIS_URL)
+        pool._in_use_connections.add(object())
+
+        assert pool.is_exhausted()
+        with pytest.raises(ConnectionError):
+            await pool.get_connection()
+
+        assert metrics.get_counter("redis.pool.exhausted") == exhausted_before + 1
+        assert metrics.get_counter("redis.pool.timeouts") == timeouts_before + 1
+        assert manager.stats()[0]["exhausted"] is True
+
+    @pytest.mark.asyncio
+    async def test_close_loop_pools(self):
+        """現在のイベントループのプールのみ破棄されることを確認"""
+        manager = RedisPoolManager()
+        manager.get_pool(REDIS_URL)
+
+        await manager.close_loop_pools()
+
+        assert manager.stats() == []
+
+    @pytest.mark.asyncio
+    async def test_redis_client_borrows_shared_pool(self):
+        """RedisClient が共有プールのクライアントを使い、cleanup でプールを閉じないことを確認"""
+        client = RedisClient()
+        client._client = get_redis_pool_manager().get_client()
+        client._is_initialized = True
+        shared_pool = client.get_client().connection_pool
+
+        await client.cleanup()
+
+        assert shared_pool is get_redis_pool_manager().get_pool()
+        assert not client._is_initialized
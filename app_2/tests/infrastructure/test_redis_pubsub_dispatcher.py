@@ -0,0 +1,144 @@
+"""
+Redis Pub/Sub Dispatcher Test
+1本の購読接続を複数SSE接続で共有し、参照カウントで購読管理することを確認するテスト
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app_2.infrastructure.integrations.redis.redis_pubsub_dispatcher import (
+    RedisPubSubDispatcher,
+    SlowConsumerError
+)
+
+
+class FakePubSub:
+    """redis.asyncio の PubSub 互換のテスト用購読接続"""
+
+    def __init__(self):
+        self.channels = set()
+        self.subscribe_calls = []
+        self.unsubscribe_calls = []
+        self._messages: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, *channels):
+        self.subscribe_calls.extend(channels)
+        self.channels.update(channels)
+
+    async def unsubscribe(self, *channels):
+        self.unsubscribe_calls.extend(channels)
+        self.channels.difference_update(channels)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        try:
+            return await asyncio.wait_for(self._messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        pass
+
+    def publish(self, channel, payload):
+        self._messages.put_nowait({"type": "message", "channel": channel, "data": json.dumps(payload)})
+
+
+def _dispatcher(pubsubs, **kwargs):
+    def factory():
+        pubsub = FakePubSub()
+        pubsubs.append(pubsub)
+        return pubsub
+    return RedisPubSubDispatcher(pubsub_factory=factory, poll_timeout=0.01, **kwargs)
+
+
+class TestRedisPubSubDispatcher:
+    """RedisPubSubDispatcher テスト"""
+
+    @pytest.mark.asyncio
+    async def test_single_connection_fans_out(self):
+        """同一チャンネルの複数購読が1本の接続・1回のSUBSCRIBEを共有し、全購読に配信されることを確認"""
+        pubsubs = []
+        dispatcher = _dispatcher(pubsubs, shards=1)
+
+        first = await dispatcher.subscribe("sse:s1")
+        second = await dispatcher.subscribe("sse:s1")
+        other = await dispatcher.subscribe("sse:s2")
+
+        assert len(pubsubs) == 1
+        assert pubsubs[0].subscribe_calls == ["sse:s1", "sse:s2"]
+
+        pubsubs[0].publish("sse:s1", {"type": "menu_update"})
+        first_event = await asyncio.wait_for(first.__anext__(), 1)
+        second_event = await asyncio.wait_for(second.__anext__(), 1)
+        assert first_event is second_event
+        assert first_event.message == {"type": "menu_update"}
+        assert other._queue.empty()
+
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_reference_counted_unsubscribe(self):
+        """最後の購読解除でのみ UNSUBSCRIBE することを確認"""
+        pubsubs = []
+        dispatcher = _dispatcher(pubsubs, shards=1)
+
+        first = await dispatcher.subscribe("sse:s1")
+        second = await dispatcher.subscribe("sse:s1")
+
+        await dispatcher.unsubscribe(first)
+        assert pubsubs[0].unsubscribe_calls == []
+
+        await dispatcher.unsubscribe(second)
+        assert pubsubs[0].unsubscribe_calls == ["sse:s1"]
+        assert dispatcher.stats()["channels"] == 0
+
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_policy(self):
+        """drop_oldest ではキュー上限を超えると古いメッセージから破棄されることを確認"""
+        dispatcher = _dispatcher([], shards=1, max_queue_size=2, slow_consumer_policy="drop_oldest")
+        subscription = await dispatcher.subscribe("sse:s1")
+
+        for index in range(3):
+            dispatcher._dispatch("sse:s1", json.dumps({"index": index}))
+
+        assert subscription.dropped_messages == 1
+        assert (await subscription.__anext__()).message["index"] == 1
+        assert (await subscription.__anext__()).message["index"] == 2
+
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy(self):
+        """disconnect ではキュー上限を超えると購読が切断されることを確認"""
+        dispatcher = _dispatcher([], shards=1, max_queue_size=1, slow_consumer_policy="disconnect")
+        subscription = await dispatcher.subscribe("sse:s1")
+
+        dispatcher._dispatch("sse:s1", json.dumps({"index": 0}))
+        dispatcher._dispatch("sse:s1", json.dumps({"index": 1}))
+
+        assert subscription.disconnected
+        with pytest.raises(SlowConsumerError):
+            await subscription.__anext__()
+
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_channels_sharded_across_connections(self):
+        """チャンネルが複数の購読接続に振り分けられることを確認"""
+        pubsubs = []
+        dispatcher = _dispatcher(pubsubs, shards=4)
+
+        for index in range(32):
+            await dispatcher.subscribe(f"sse:session-{index}")
+
+        assert 1 < len(pubsubs) <= 4
+        assert sum(dispatcher.stats()["channels_per_shard"]) == 32
+
+        await dispatcher.close()
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError):
+            RedisPubSubDispatcher(slow_consumer_policy="block")
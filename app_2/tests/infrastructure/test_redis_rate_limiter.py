@@ -0,0 +1,146 @@
+"""
+Redis Rate Limiter Test
+分散トークンバケットの待機・優先度・429 時の一時停止・fail-open の動作確認テスト
+"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import openai
+import pytest
+
+from app_2.infrastructure.integrations.openai import openai_base_client
+from app_2.infrastructure.integrations.openai.allergen_client import AllergenClient
+from app_2.infrastructure.integrations.redis.redis_rate_limiter import (
+    ACQUIRE_SCRIPT,
+    BLOCK_SCRIPT,
+    PRIORITY_RESERVES,
+    RedisRateLimiter
+)
+from app_2.utils.metrics import get_metrics_registry
+
+
+def _limiter(raw_client, **kwargs):
+    redis_client = MagicMock()
+
+    @asynccontextmanager
+    async def get_connection():
+        yield raw_client
+
+    redis_client.get_connection = get_connection
+    return RedisRateLimiter(redis_client, **kwargs)
+
+
+class TestRedisRateLimiter:
+    """RedisRateLimiter テスト"""
+
+    @pytest.mark.asyncio
+    async def test_waits_until_capacity(self):
+        """容量がない間はスクリプトが返す時間だけ待機し、待機を記録することを確認"""
+        metrics = get_metrics_registry()
+        metrics.reset()
+        raw_client = MagicMock()
+        raw_client.eval = AsyncMock(side_effect=[20, 20, 0])
+        limiter = _limiter(raw_client)
+
+        waited = await limiter.acquire("openai", "gpt-4.1-mini", tokens=1200, priority="background")
+
+        assert waited >= 0.04
+        args = raw_client.eval.await_args.args
+        assert args[0] == ACQUIRE_SCRIPT
+        assert args[2] == "ratelimit:openai:gpt-4.1-mini"
+        assert args[5:] == (1200, PRIORITY_RESERVES["background"])
+        assert metrics.get_counter("rate_limiter.openai.throttled") == 1
+        assert metrics.get_histogram("rate_limiter.openai.wait.background")["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_immediate_capacity_not_throttled(self):
+        metrics = get_metrics_registry()
+        metrics.reset()
+        raw_client = MagicMock()
+        raw_client.eval = AsyncMock(return_value=0)
+
+        await _limiter(raw_client).acquire("google_vision", priority="interactive")
+
+        assert raw_client.eval.await_args.args[3:5] == (1800, 0)
+        assert metrics.get_counter("rate_limiter.google_vision.throttled") == 0
+
+    def test_interactive_keeps_no_reserve(self):
+        assert PRIORITY_RESERVES["interactive"] < PRIORITY_RESERVES["normal"] < PRIORITY_RESERVES["background"]
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable_fails_open(self):
+        raw_client = MagicMock()
+        raw_client.eval = AsyncMock(side_effect=ConnectionError("redis down"))
+
+        assert await _limiter(raw_client).acquire("openai", "m") < 1.0
+
+    @pytest.mark.asyncio
+    async def test_redis_outage_skips_redis_until_backoff_expires(self):
+        """障害検知後は待機期間中 Redis に接続せず、警告・復旧ログは状態の切り替わり時に1回ずつ出ることを確認"""
+        raw_client = MagicMock()
+        raw_client.eval = AsyncMock(side_effect=ConnectionError("redis down"))
+        limiter = _limiter(raw_client, redis_backoff_seconds=60)
+
+        with patch("app_2.infrastructure.integrations.redis.redis_rate_limiter.logger") as logger:
+            for _ in range(5):
+                assert await limiter.acquire("openai", "m") < 1.0
+            assert not await limiter.report_rate_limited("openai", "m", 1.0)
+
+            assert raw_client.eval.await_count == 1
+            assert logger.warning.call_count == 1
+
+            limiter._redis_retry_at = 0.0
+            raw_client.eval = AsyncMock(return_value=0)
+            await limiter.acquire("openai", "m")
+            await limiter.acquire("openai", "m")
+
+            assert raw_client.eval.await_count == 2
+            assert logger.info.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_max_wait_sends_anyway(self):
+        raw_client = MagicMock()
+        raw_client.eval = AsyncMock(return_value=60000)
+
+        waited = await _limiter(raw_client, max_wait_seconds=0.05).acquire("google_search")
+
+        assert 0.05 <= waited < 1.5
+
+    @pytest.mark.asyncio
+    async def test_report_rate_limited_blocks_bucket(self):
+        raw_client = MagicMock()
+        raw_client.eval = AsyncMock(return_value=1)
+
+        assert await _limiter(raw_client).report_rate_limited("openai", "m", 2.5)
+        assert raw_client.eval.await_args.args == (BLOCK_SCRIPT, 1, "ratelimit:openai:m", 2500)
+
+
+class TestOpenAIRateLimitHandling:
+    """OpenAI 429 時の処理テスト"""
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_error_pauses_workers_instead_of_sleeping(self):
+        """429 の Retry-After を全ワーカーの停止に使い、自前の sleep をしないことを確認"""
+        response = httpx.Response(429, headers={"retry-after": "3"}, request=httpx.Request("POST", "https://api.openai.com"))
+        error = openai.RateLimitError("rate limited", response=response, body=None)
+        client = AllergenClient()
+        client.client = MagicMock()
+        client.client.chat.completions.create = AsyncMock(side_effect=[error, error])
+        client.is_available = lambda: True
+        limiter = MagicMock()
+        limiter.acquire = AsyncMock(return_value=0.0)
+        limiter.report_rate_limited = AsyncMock(return_value=True)
+
+        with patch.object(openai_base_client, "get_redis_rate_limiter", return_value=limiter), \
+                patch.object(openai_base_client.asyncio, "sleep", AsyncMock()) as sleep:
+            with pytest.raises(Exception, match="Rate limit exceeded"):
+                await client._make_function_call_request(
+                    "system", "user", [{"name": "f"}], {"name": "f"}, max_retries=1, prompt_name="categorize"
+                )
+
+        sleep.assert_not_awaited()
+        limiter.report_rate_limited.assert_awaited_once_with("openai", openai_base_client.settings.ai.openai_model_name, 3.0)
+        assert limiter.acquire.await_count == 2
+        assert limiter.acquire.await_args.kwargs["priority"] == "interactive"
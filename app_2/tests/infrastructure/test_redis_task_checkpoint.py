@@ -0,0 +1,158 @@
+"""
+Redis Task Checkpoint Test
+アイテム単位の完了記録と、リトライ時に BatchProcessor が完了済みアイテムを再処理しないことを確認するテスト
+"""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app_2.infrastructure.integrations.redis.redis_task_checkpoint import RedisTaskCheckpoint
+from app_2.tasks.batch_processor import BatchConfig, BatchItemsFailedError, BatchProcessor, can_retry_failed_items
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def sadd(self, key, *members):
+        self.commands.append(("sadd", key, members))
+
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key, seconds))
+
+    async def execute(self):
+        for command, key, arg in self.commands:
+            if command == "sadd":
+                self.redis.sets.setdefault(key, set()).update(arg)
+            else:
+                self.redis.ttls[key] = arg
+
+
+class FakeRedis:
+    """SET 操作のみを扱う Redis"""
+
+    def __init__(self):
+        self.sets = {}
+        self.ttls = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def smembers(self, key):
+        return {member.encode() for member in self.sets.get(key, set())}
+
+    async def delete(self, key):
+        self.sets.pop(key, None)
+
+
+def _checkpoint(raw_client):
+    redis_client = MagicMock()
+
+    @asynccontextmanager
+    async def get_connection():
+        yield raw_client
+
+    redis_client.get_connection = get_connection
+    return RedisTaskCheckpoint(redis_client)
+
+
+class TestRedisTaskCheckpoint:
+    """RedisTaskCheckpoint テスト"""
+
+    @pytest.mark.asyncio
+    async def test_mark_and_load_completed_items(self):
+        raw_client = FakeRedis()
+        checkpoint = _checkpoint(raw_client)
+
+        assert await checkpoint.mark_completed("s1", "allergen", ["m1", "m2"])
+        assert await checkpoint.get_completed("s1", "allergen") == {"m1", "m2"}
+        assert await checkpoint.get_completed("s1", "ingredient") == set()
+        assert raw_client.ttls[checkpoint.checkpoint_key("s1", "allergen")] == checkpoint.ttl_seconds
+
+        await checkpoint.clear("s1", "allergen")
+        assert await checkpoint.get_completed("s1", "allergen") == set()
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable_processes_everything(self):
+        raw_client = MagicMock()
+        raw_client.smembers = AsyncMock(side_effect=ConnectionError("redis down"))
+
+        assert await _checkpoint(raw_client).get_completed("s1", "allergen") == set()
+
+
+class TestBatchProcessorCheckpoint:
+    """BatchProcessor のリトライ時の再処理スキップテスト"""
+
+    @pytest.mark.asyncio
+    async def test_retry_only_processes_unfinished_items(self):
+        """50件中48件が成功したタスクの再試行では、残り2件のみ処理されることを確認"""
+        checkpoint = _checkpoint(FakeRedis())
+        items = [{"id": f"m{i}", "name": f"item{i}"} for i in range(50)]
+        failing = {"m7", "m31"}
+
+        async def flaky_processor(item):
+            if item["id"] in failing:
+                raise Exception("temporary failure")
+            return {"name": item["name"]}
+
+        def make_processor():
+            processor = BatchProcessor(BatchConfig(batch_size=8, task_name="allergen", adaptive=False))
+            processor.redis_publisher = AsyncMock()
+            processor.checkpoint = checkpoint
+            return processor
+
+        first = await make_processor().process_items(
+            session_id="s1", items=items, processor_func=flaky_processor, db_updater_func=AsyncMock(return_value=True)
+        )
+        assert first["completed_items"] == 48
+
+        retry_processor = AsyncMock(return_value={"name": "ok"})
+        second = await make_processor().process_items(
+            session_id="s1", items=items, processor_func=retry_processor, db_updater_func=AsyncMock(return_value=True)
+        )
+
+        assert retry_processor.await_count == 2
+        assert {call.args[0]["id"] for call in retry_processor.await_args_list} == failing
+        assert second["skipped_items"] == 48
+        assert second["completed_items"] == 50
+        assert second["success_rate"] == 100.0
+
+    @pytest.mark.asyncio
+    async def test_failed_items_raise_for_celery_retry(self):
+        """retry_failed_items 時は失敗アイテムがあれば例外を送出し、完了済みアイテムは記録されることを確認"""
+        checkpoint = _checkpoint(FakeRedis())
+        items = [{"id": f"m{i}", "name": f"item{i}"} for i in range(10)]
+
+        async def flaky_processor(item):
+            if item["id"] == "m3":
+                raise Exception("temporary failure")
+            return {"name": item["name"]}
+
+        processor = BatchProcessor(BatchConfig(batch_size=4, task_name="allergen", adaptive=False, retry_failed_items=True))
+        processor.redis_publisher = AsyncMock()
+        processor.checkpoint = checkpoint
+
+        with pytest.raises(BatchItemsFailedError):
+            await processor.process_items(
+                session_id="s1", items=items, processor_func=flaky_processor, db_updater_func=AsyncMock(return_value=True)
+            )
+
+        assert await processor.pending_items("s1", items) == [{"id": "m3", "name": "item3"}]
+
+    def test_can_retry_until_last_attempt(self):
+        def task(retries):
+            return SimpleNamespace(retry_kwargs={"max_retries": 3}, max_retries=3, request=SimpleNamespace(retries=retries))
+
+        assert can_retry_failed_items(task(0))
+        assert can_retry_failed_items(task(2))
+        assert not can_retry_failed_items(task(3))
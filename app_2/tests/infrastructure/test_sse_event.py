@@ -0,0 +1,90 @@
+"""
+SSE Event Test
+整形済みSSEフレームの受け渡し（パースなし転送・1回だけのシリアライズ）の動作確認テスト
+"""
+
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app_2.infrastructure.integrations.redis.redis_event_log import RedisEventLog
+from app_2.infrastructure.integrations.redis.redis_publisher import RedisPublisher
+from app_2.infrastructure.integrations.redis.sse_event import SSEEvent, format_sse_frame, is_sse_frame
+
+
+MESSAGE = {"type": "menu_update", "session_id": "s1", "data": {"menu_id": "m1", "name": "寿司"}}
+
+
+class TestSSEEvent:
+    """SSEEvent テスト"""
+
+    def test_frame_payload_is_forwarded_without_parsing(self):
+        """整形済みフレームは JSON をパースせずにそのまま転送することを確認"""
+        frame = "id: 100-0\n" + format_sse_frame(MESSAGE)
+        event = SSEEvent.from_payload(frame)
+
+        assert event.frame is frame
+        assert event.type == "menu_update"
+        assert event.event_id == "100-0"
+        assert event._message is None
+
+        assert event.message["data"]["name"] == "寿司"
+        assert event.message["event_id"] == "100-0"
+
+    def test_json_payload_frame_is_built_once(self):
+        """JSON 形式のペイロードは受信した文字列をそのまま data 行に使い、フレームを1回だけ整形することを確認"""
+        payload = json.dumps(MESSAGE, ensure_ascii=False)
+        event = SSEEvent.from_payload(payload)
+
+        frame = event.frame
+        assert frame == f"event: menu_update\ndata: {payload}\n\n"
+        assert event.frame is frame
+
+    def test_stream_entry_gets_event_id(self):
+        """Stream に保存したフレーム（id: なし）には採番済みのイベントIDを付与することを確認"""
+        event = SSEEvent.from_payload(format_sse_frame(MESSAGE), event_id="200-1")
+
+        assert event.frame.startswith("id: 200-1\nevent: menu_update\n")
+        assert event.message["event_id"] == "200-1"
+
+    def test_from_message_formats_with_id(self):
+        event = SSEEvent.from_message({"type": "progress_update", "event_id": "5-0", "data": {}})
+        assert event.frame.splitlines()[:2] == ["id: 5-0", "event: progress_update"]
+
+
+class TestPreserializedPublish:
+    """Publisher 側のフレーム整形テスト"""
+
+    @pytest.mark.asyncio
+    async def test_publisher_sends_frame(self):
+        redis_client = MagicMock()
+        redis_client.publish = AsyncMock(return_value=1)
+        publisher = RedisPublisher(redis_client)
+        publisher.event_log = None
+
+        with patch.object(publisher, "_get_timestamp", return_value="t"):
+            assert await publisher.publish_session_message("s1", "menu_update", {"menu_id": "m1"})
+
+        payload = redis_client.publish.await_args.args[1]
+        assert is_sse_frame(payload)
+        assert SSEEvent.from_payload(payload).message == {
+            "type": "menu_update", "session_id": "s1", "data": {"menu_id": "m1"}, "timestamp": "t"
+        }
+
+    @pytest.mark.asyncio
+    async def test_event_log_marks_frame_payload(self):
+        raw_client = MagicMock()
+        raw_client.eval = AsyncMock(return_value="1-0")
+        redis_client = MagicMock()
+
+        @asynccontextmanager
+        async def get_connection():
+            yield raw_client
+
+        redis_client.get_connection = get_connection
+
+        await RedisEventLog(redis_client).append_and_publish("s1", format_sse_frame(MESSAGE))
+
+        assert raw_client.eval.await_args.args[-1] == "frame"
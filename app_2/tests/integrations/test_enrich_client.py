@@ -0,0 +1,110 @@
+"""
+統合エンリッチテスト
+1回の呼び出し結果が description / allergen / ingredient に分割され、
+既存タスクと同じ menu_update イベントが配信されることを検証
+"""
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app_2.infrastructure.integrations.openai.enrich_client import EnrichClient
+from app_2.tasks.batch_processor import BatchConfig, BatchProcessor
+from app_2.tasks.enrich_task import ENRICH_TASK_TYPES
+from app_2.tasks.menu_field_formatters import format_allergen_text, format_ingredient_text
+
+
+FUSED_RESULT = {
+    "description": "Crispy Japanese fried chicken.",
+    "allergen": {"allergens": ["wheat", "soy"], "allergen_free": False, "confidence": 0.9},
+    "ingredient": {"main_ingredients": [{"ingredient": "chicken"}], "cooking_method": ["deep-fry"], "confidence": 0.8}
+}
+
+
+class TestEnrichClient:
+    """EnrichClient テスト"""
+
+    @pytest.mark.asyncio
+    async def test_single_call_split_per_task(self):
+        """1回の Function Calling 結果がタスク種別ごとに分割されることを確認"""
+        client = EnrichClient()
+        client._make_function_call_request = AsyncMock(return_value=FUSED_RESULT)
+
+        result = await client.enrich_menu_item("唐揚げ", "FOOD")
+
+        client._make_function_call_request.assert_awaited_once()
+        assert result["description"] == {"description": "Crispy Japanese fried chicken."}
+        assert result["allergen"]["allergens"] == ["wheat", "soy"]
+        assert result["ingredient"]["main_ingredients"] == [{"ingredient": "chicken"}]
+
+    @pytest.mark.asyncio
+    async def test_missing_sections_use_fallback(self):
+        """欠落したセクションはフォールバック値になることを確認"""
+        client = EnrichClient()
+        client._make_function_call_request = AsyncMock(return_value={"description": "Tasty."})
+
+        result = await client.enrich_menu_item("唐揚げ", "FOOD")
+
+        assert result["description"]["description"] == "Tasty."
+        assert result["allergen"]["confidence"] == 0.0
+        assert result["ingredient"]["cuisine_category"] == "unknown"
+
+    @pytest.mark.asyncio
+    async def test_batch_keyed_by_item_id(self):
+        """一括呼び出し結果がアイテムIDごとに分割されることを確認"""
+        client = EnrichClient()
+        client._make_function_call_request = AsyncMock(return_value={
+            "results": [{"item_id": "m1", **FUSED_RESULT}]
+        })
+
+        results = await client.enrich_menu_items_batch([{"id": "m1", "name": "唐揚げ", "category": "FOOD"}])
+
+        assert client._make_function_call_request.await_count == 1
+        assert set(results["m1"]) == {"description", "allergen", "ingredient"}
+
+
+class TestFusedBatchProcessor:
+    """統合タスクの BatchProcessor 配信テスト"""
+
+    @pytest.mark.asyncio
+    async def test_menu_update_emitted_per_task_type(self):
+        """1回のDB更新で description / allergen / ingredient の menu_update が配信されることを確認"""
+        processor = BatchProcessor(BatchConfig(task_name="enrich", update_task_types=ENRICH_TASK_TYPES))
+        processor.redis_publisher = AsyncMock()
+
+        split = {
+            "description": {"description": FUSED_RESULT["description"]},
+            "allergen": FUSED_RESULT["allergen"],
+            "ingredient": FUSED_RESULT["ingredient"]
+        }
+        db_updater_func = AsyncMock(return_value=True)
+
+        result = await processor.process_items(
+            session_id="s1",
+            items=[{"id": "m1", "name": "唐揚げ", "category": "FOOD"}],
+            processor_func=AsyncMock(return_value=split),
+            db_updater_func=db_updater_func
+        )
+
+        db_updater_func.assert_awaited_once()
+        menu_updates = [call.kwargs["menu_data"] for call in processor.redis_publisher.publish_menu_update.await_args_list]
+        assert [update["task_type"] for update in menu_updates] == list(ENRICH_TASK_TYPES)
+        assert menu_updates[0]["description"] == "Crispy Japanese fried chicken."
+        assert menu_updates[1]["allergen_info"] == "wheat, soy"
+        assert menu_updates[2]["ingredient_info"] == "chicken"
+
+        progress_tasks = {call.kwargs["task_name"] for call in processor.redis_publisher.publish_progress_update.await_args_list}
+        assert progress_tasks == set(ENRICH_TASK_TYPES)
+        assert result["completed_items"] == 1
+
+
+class TestMenuFieldFormatters:
+    """DBカラム文字列変換テスト"""
+
+    def test_allergen_text(self):
+        assert format_allergen_text({"allergens": ["egg", "milk"]}) == "egg, milk"
+        assert format_allergen_text({"allergens": [], "allergen_free": True}) == "None"
+        assert format_allergen_text({"allergens": []}) == "Unable to determine"
+
+    def test_ingredient_text(self):
+        assert format_ingredient_text({"main_ingredients": [{"ingredient": "rice"}, "nori"]}) == "rice, nori"
+        assert format_ingredient_text({"main_ingredients": [], "cuisine_category": "unknown", "cooking_method": ["grill"]}) == "調理法: grill"
@@ -0,0 +1,104 @@
+"""
+BlockingCallExecutorテスト
+同期SDK呼び出しがイベントループをブロックしないこと・同時実行数の上限を検証
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app_2.infrastructure.integrations.google.google_executor import BlockingCallExecutor, get_google_executor
+from app_2.utils.metrics import get_metrics_registry
+
+
+class TestBlockingCallExecutor:
+    """BlockingCallExecutor 単体テスト"""
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self):
+        """同期呼び出し中もイベントループが他の処理を進められることを確認"""
+        executor = BlockingCallExecutor("test_loop", max_workers=1)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        result = await executor.run(lambda: (time.sleep(0.2), "done")[1])
+        ticker_task.cancel()
+        executor.shutdown()
+
+        assert result == "done"
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded_and_queue_wait_recorded(self):
+        """同時実行数が max_workers に制限され、待機時間が記録されることを確認"""
+        executor = BlockingCallExecutor("test_bounded", max_workers=2)
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def blocking_call():
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+
+        await asyncio.gather(*[executor.run(blocking_call) for _ in range(5)])
+        executor.shutdown()
+
+        registry = get_metrics_registry()
+        assert peak == 2
+        assert registry.get_histogram("google_executor.test_bounded.queue_wait")["count"] == 5
+        assert registry.get_gauge("google_executor.test_bounded.active") == 0
+        assert executor.stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_exception_propagates(self):
+        """ワーカースレッドでの例外が呼び出し元へ送出されることを確認"""
+        executor = BlockingCallExecutor("test_error", max_workers=1)
+
+        def failing_call():
+            raise RuntimeError("sdk error")
+
+        with pytest.raises(RuntimeError, match="sdk error"):
+            await executor.run(failing_call)
+        executor.shutdown()
+
+        assert executor.stats()["active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_while_queued_releases_pending(self):
+        """待機中に呼び出し元がキャンセルされても pending ゲージが残らないことを確認"""
+        executor = BlockingCallExecutor("test_cancel", max_workers=1)
+        release = threading.Event()
+        calls = []
+
+        running = asyncio.create_task(executor.run(release.wait))
+        queued = asyncio.create_task(executor.run(lambda: calls.append("queued")))
+        await asyncio.sleep(0.05)
+        assert executor.stats()["pending"] == 1
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        release.set()
+        await running
+        executor.shutdown(wait=True)
+
+        assert calls == []
+        assert executor.stats() == {"provider": "test_cancel", "max_workers": 1, "active": 0, "pending": 0}
+        assert get_metrics_registry().get_gauge("google_executor.test_cancel.pending") == 0
+
+    def test_unknown_provider(self):
+        """未定義プロバイダーはエラー"""
+        with pytest.raises(ValueError):
+            get_google_executor("unknown")
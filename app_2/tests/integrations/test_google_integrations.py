@@ -211,7 +211,7 @@ class TestGoogleTranslateClient:
     async def test_translate_list_success(self):
         """リスト翻訳成功テスト"""
         mock_translate_client = Mock()
-        mock_translate_client.translate.side_effect = [
+        mock_translate_client.translate.return_value = [
             {'translatedText': 'テキスト1'},
             {'translatedText': 'テキスト2'}
         ]
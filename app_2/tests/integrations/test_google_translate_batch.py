@@ -0,0 +1,93 @@
+"""
+Google Translate 一括翻訳テスト
+重複除去・チャンク分割による API 呼び出し回数の削減を検証
+"""
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from app_2.infrastructure.integrations.google.google_translate_client import GoogleTranslateClient
+from app_2.services.translate_service import TranslateService
+
+
+def _sdk_client():
+    """複数テキスト指定に対して "EN:<原文>" を返す Translate SDK クライアント"""
+    sdk_client = Mock()
+    sdk_client.translate.side_effect = lambda texts, target_language: [
+        {"translatedText": f"EN:{text}"} for text in texts
+    ]
+    return sdk_client
+
+
+def _translate_client(sdk_client):
+    with patch("app_2.infrastructure.integrations.google.google_translate_client.get_google_credential_manager"):
+        client = GoogleTranslateClient()
+    client._ensure_client = AsyncMock(return_value=sdk_client)
+    return client
+
+
+class TestTranslateBatch:
+    """GoogleTranslateClient.translate_batch テスト"""
+
+    @pytest.mark.asyncio
+    async def test_chunks_by_segment_limit(self):
+        """テキスト数の上限ごとに1リクエストで翻訳し、順序を保つことを確認"""
+        sdk_client = _sdk_client()
+        client = _translate_client(sdk_client)
+        texts = [f"item{i}" for i in range(5)] + [""]
+
+        with patch("app_2.infrastructure.integrations.google.google_translate_client.settings") as mock_settings:
+            mock_settings.ai.google_translate_max_segments = 2
+            mock_settings.ai.google_translate_max_request_chars = 5000
+            result = await client.translate_batch(texts, "en")
+
+        assert result == [f"EN:item{i}" for i in range(5)] + [""]
+        assert sdk_client.translate.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_chunks_by_request_chars(self):
+        sdk_client = _sdk_client()
+        client = _translate_client(sdk_client)
+
+        with patch("app_2.infrastructure.integrations.google.google_translate_client.settings") as mock_settings:
+            mock_settings.ai.google_translate_max_segments = 128
+            mock_settings.ai.google_translate_max_request_chars = 10
+            await client.translate_batch(["aaaaaa", "bbbbbb", "cc"], "en")
+
+        assert [call.args[0] for call in sdk_client.translate.call_args_list] == [["aaaaaa"], ["bbbbbb", "cc"]]
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_returns_original(self):
+        sdk_client = Mock()
+        sdk_client.translate.side_effect = Exception("quota exceeded")
+        client = _translate_client(sdk_client)
+
+        assert await client.translate_batch(["寿司"], "en") == ["寿司"]
+
+
+class TestTranslateMenuItems:
+    """TranslateService.translate_menu_items テスト"""
+
+    @pytest.mark.asyncio
+    async def test_deduplicates_names_and_categories(self):
+        """同じカテゴリ・名前は1回だけ翻訳し、各アイテムに対応付けることを確認"""
+        sdk_client = _sdk_client()
+        with patch("app_2.services.translate_service.settings") as mock_settings:
+            mock_settings.ai.translation_memory_enabled = False
+            service = TranslateService(_translate_client(sdk_client))
+        items = [
+            {"id": f"m{i}", "name": f"料理{i % 3}", "category": "前菜" if i < 4 else "メイン"}
+            for i in range(8)
+        ]
+
+        results = await service.translate_menu_items(items, "en")
+
+        assert sdk_client.translate.call_count == 1
+        assert sorted(sdk_client.translate.call_args.args[0]) == sorted(["料理0", "料理1", "料理2", "前菜", "メイン"])
+        assert results["m5"] == {
+            "name": "EN:料理2",
+            "name_original": "料理2",
+            "category": "EN:メイン",
+            "category_original": "メイン"
+        }
+        assert len(results) == 8
@@ -0,0 +1,127 @@
+"""
+OpenAI複数アイテム一括呼び出しテスト
+トークン予算によるバッチ分割・item_idキーでの結果対応・個別処理フォールバックを検証
+"""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app_2.infrastructure.integrations.openai.allergen_client import AllergenClient
+from app_2.infrastructure.integrations.openai.description_client import DescriptionClient
+from app_2.tasks.batch_processor import BatchConfig, BatchProcessor
+
+
+def _items(count: int, name: str = "唐揚げ"):
+    return [{"id": f"m{i}", "name": f"{name}{i}", "category": "FOOD"} for i in range(count)]
+
+
+class TestBatchBuilder:
+    """トークン予算ベースのバッチ分割テスト"""
+
+    def test_respects_max_items(self):
+        client = AllergenClient()
+        chunks = client._build_token_budgeted_batches(
+            _items(10), output_tokens_per_item=10, token_budget=100000, max_items=4
+        )
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+
+    def test_respects_token_budget(self):
+        client = AllergenClient()
+        chunks = client._build_token_budgeted_batches(
+            _items(6), output_tokens_per_item=100, token_budget=250, max_items=50
+        )
+        assert all(len(chunk) <= 2 for chunk in chunks)
+        assert sum(len(chunk) for chunk in chunks) == 6
+
+    def test_oversized_item_gets_own_chunk(self):
+        client = AllergenClient()
+        chunks = client._build_token_budgeted_batches(
+            _items(2), output_tokens_per_item=1000, token_budget=10, max_items=50
+        )
+        assert [len(chunk) for chunk in chunks] == [1, 1]
+
+    def test_batch_schema_wraps_item_schema(self):
+        client = AllergenClient()
+        item_schema = client._get_allergen_function_schema()[0]
+        batch_schema = client._build_batch_function_schema(item_schema, "extract_allergens_batch")
+
+        result_items = batch_schema["parameters"]["properties"]["results"]["items"]
+        assert batch_schema["name"] == "extract_allergens_batch"
+        assert "item_id" in result_items["properties"]
+        assert "allergens" in result_items["properties"]
+        assert result_items["required"][0] == "item_id"
+
+
+class TestBatchedFunctionCall:
+    """一括呼び出しと欠落アイテムのフォールバックテスト"""
+
+    @pytest.mark.asyncio
+    async def test_one_request_per_chunk_with_fallback(self):
+        """1チャンク1リクエストで処理され、モデルが落としたアイテムのみ個別処理されることを確認"""
+        client = AllergenClient()
+        client._make_function_call_request = AsyncMock(return_value={
+            "results": [
+                {"item_id": "m0", "allergens": ["egg"], "allergen_free": False, "confidence": 0.9},
+                {"item_id": "m2", "allergens": [], "allergen_free": True, "confidence": 0.8},
+                {"item_id": "unknown", "allergens": ["milk"], "allergen_free": False, "confidence": 0.5}
+            ]
+        })
+        client.extract_allergens = AsyncMock(return_value={"allergens": ["wheat"], "allergen_free": False})
+
+        with patch("app_2.core.config.settings.ai.openai_batch_max_items", 8):
+            results = await client.extract_allergens_batch(_items(3))
+
+        assert client._make_function_call_request.await_count == 1
+        call_kwargs = client._make_function_call_request.await_args.kwargs
+        assert call_kwargs["function_call"] == {"name": "extract_allergens_batch"}
+        assert '"item_id": "m1"' in call_kwargs["user_prompt"]
+
+        client.extract_allergens.assert_awaited_once_with("唐揚げ1", "FOOD")
+        assert results["m0"] == {"allergens": ["egg"], "allergen_free": False, "confidence": 0.9}
+        assert results["m1"]["allergens"] == ["wheat"]
+        assert "unknown" not in results
+
+    @pytest.mark.asyncio
+    async def test_failed_request_falls_back_to_single_calls(self):
+        """一括リクエスト失敗時は全アイテムが個別処理されることを確認"""
+        client = DescriptionClient()
+        client._make_function_call_request = AsyncMock(side_effect=Exception("OpenAI API error"))
+        client.generate_description = AsyncMock(return_value={"description": "fallback"})
+
+        results = await client.generate_descriptions_batch(_items(2))
+
+        assert client.generate_description.await_count == 2
+        assert results == {"m0": {"description": "fallback"}, "m1": {"description": "fallback"}}
+
+
+class TestBatchProcessorBatchMode:
+    """BatchProcessor の一括処理モードテスト"""
+
+    @pytest.mark.asyncio
+    async def test_batch_processor_func_called_once_per_batch(self):
+        """バッチごとに1回だけ一括処理関数が呼ばれ、欠落分のみ個別処理されることを確認"""
+        processor = BatchProcessor(BatchConfig(batch_size=3, max_concurrent_batches=2, task_name="allergen"))
+        processor.redis_publisher = AsyncMock()
+
+        batch_calls = []
+
+        async def batch_processor_func(batch_items):
+            batch_calls.append([item["id"] for item in batch_items])
+            return {item["id"]: {"allergens": []} for item in batch_items if item["id"] != "m4"}
+
+        processor_func = AsyncMock(return_value={"allergens": ["egg"]})
+        db_updater_func = AsyncMock(return_value=True)
+
+        result = await processor.process_items(
+            session_id="s1",
+            items=_items(5),
+            processor_func=processor_func,
+            db_updater_func=db_updater_func,
+            batch_processor_func=batch_processor_func
+        )
+
+        assert sorted(batch_calls) == [["m0", "m1", "m2"], ["m3", "m4"]]
+        processor_func.assert_awaited_once()
+        assert processor_func.await_args.args[0]["id"] == "m4"
+        assert db_updater_func.await_count == 5
+        assert result["completed_items"] == 5
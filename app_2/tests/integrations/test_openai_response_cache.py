@@ -0,0 +1,180 @@
+"""
+OpenAI応答キャッシュテスト
+同一のモデル・プロンプト・スキーマへの再リクエストがAPIを呼ばずに返ること、プロンプト単位の有効化・ヒット率集計を検証
+"""
+import json
+import shutil
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app_2.infrastructure.integrations.openai import openai_base_client
+from app_2.infrastructure.integrations.openai.allergen_client import AllergenClient
+from app_2.infrastructure.integrations.openai.openai_response_cache import OpenAIResponseCache
+from app_2.prompt_loader import PromptLoader
+
+
+class FakeRedis:
+    """GET / EVAL(SET) のみを扱う Redis"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def eval(self, script, numkeys, key, index_key, value, ttl, now, max_entries):
+        self.values[key] = value
+        return 0
+
+
+def _cache(raw_client):
+    redis_client = MagicMock()
+
+    @asynccontextmanager
+    async def get_connection():
+        yield raw_client
+
+    redis_client.get_connection = get_connection
+    return OpenAIResponseCache(backend="redis", redis_client=redis_client)
+
+
+def _response(arguments):
+    function_call = SimpleNamespace(name="extract_allergens", arguments=json.dumps(arguments))
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(function_call=function_call))])
+
+
+def _client():
+    client = AllergenClient()
+    client.client = MagicMock()
+    client.client.chat.completions.create = AsyncMock(return_value=_response({"allergens": []}))
+    client.is_available = lambda: True
+    return client
+
+
+class TestOpenAIResponseCache:
+    """OpenAIResponseCache テスト"""
+
+    def test_key_changes_with_prompt_and_schema(self):
+        base = ("allergen", "gpt-4.1-mini", "system", "user", [{"name": "f"}], {"name": "f"})
+        key = OpenAIResponseCache.build_key(*base)
+
+        assert key == OpenAIResponseCache.build_key(*base)
+        assert key != OpenAIResponseCache.build_key("allergen", "gpt-4.1-mini", "system", "user2", [{"name": "f"}], {"name": "f"})
+        assert key != OpenAIResponseCache.build_key("allergen", "gpt-4.1", "system", "user", [{"name": "f"}], {"name": "f"})
+        assert key != OpenAIResponseCache.build_key("allergen", "gpt-4.1-mini", "system", "user", [{"name": "g"}], {"name": "f"})
+
+    def test_per_prompt_enable_flags(self):
+        with patch.object(openai_base_client.settings.ai, "openai_response_cache_enabled", True), \
+                patch.object(openai_base_client.settings.ai, "openai_response_cache_prompts", "categorize, allergen"):
+            assert OpenAIResponseCache.is_enabled_for("allergen")
+            assert not OpenAIResponseCache.is_enabled_for("enrich")
+
+        assert not OpenAIResponseCache.is_enabled_for("allergen")
+
+    @pytest.mark.asyncio
+    async def test_identical_request_served_from_cache(self):
+        """2回目の同一リクエストはAPIを呼ばずにキャッシュから返り、ヒット率が集計されることを確認"""
+        cache = _cache(FakeRedis())
+        client = _client()
+
+        with patch.object(openai_base_client, "get_openai_response_cache", return_value=cache), \
+                patch.object(openai_base_client.settings.ai, "openai_response_cache_enabled", True), \
+                patch.object(openai_base_client.settings.ai, "openai_response_cache_prompts", "allergen"):
+            first = await client.extract_allergens("唐揚げ", "FOOD")
+            second = await client.extract_allergens("唐揚げ", "FOOD")
+
+        assert client.client.chat.completions.create.await_count == 1
+        assert second == first
+        assert cache.stats()["prompts"]["allergen"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+    @pytest.mark.asyncio
+    async def test_disabled_prompt_always_calls_api(self):
+        cache = _cache(FakeRedis())
+        client = _client()
+
+        with patch.object(openai_base_client, "get_openai_response_cache", return_value=cache), \
+                patch.object(openai_base_client.settings.ai, "openai_response_cache_enabled", True), \
+                patch.object(openai_base_client.settings.ai, "openai_response_cache_prompts", "categorize"):
+            await client.extract_allergens("唐揚げ", "FOOD")
+            await client.extract_allergens("唐揚げ", "FOOD")
+
+        assert client.client.chat.completions.create.await_count == 2
+        assert cache.stats()["prompts"] == {}
+
+    @pytest.mark.asyncio
+    async def test_backend_failure_is_a_miss(self):
+        raw_client = MagicMock()
+        raw_client.get = AsyncMock(side_effect=ConnectionError("redis down"))
+        cache = _cache(raw_client)
+
+        assert await cache.get("allergen", "allergen:abc") is None
+        assert cache.stats()["prompts"]["allergen"]["misses"] == 1
+
+
+class TestBatchedResponseCache:
+    """複数アイテム一括呼び出しのアイテム単位キャッシュテスト"""
+
+    def test_item_key_ignores_session_specific_id_and_spacing(self):
+        schema = {"name": "extract_allergens"}
+        key = OpenAIResponseCache.build_item_key("allergen", "gpt-4.1-mini", "hash1", schema, "唐揚げ", "FOOD")
+
+        assert key == OpenAIResponseCache.build_item_key("allergen", "gpt-4.1-mini", "hash1", schema, " 唐揚げ ", "ＦＯＯＤ")
+        assert key != OpenAIResponseCache.build_item_key("allergen", "gpt-4.1-mini", "hash1", schema, "唐揚げ", "DRINK")
+        assert key != OpenAIResponseCache.build_item_key("allergen", "gpt-4.1-mini", "hash2", schema, "唐揚げ", "FOOD")
+
+    @pytest.mark.asyncio
+    async def test_same_dishes_in_another_session_served_from_cache(self):
+        """別セッション（item_id が異なる）の同じ料理は一括リクエストを送らずキャッシュから返ることを確認"""
+        cache = _cache(FakeRedis())
+        client = AllergenClient()
+        client._make_function_call_request = AsyncMock(return_value={
+            "results": [
+                {"item_id": "s1-a", "allergens": ["egg"], "allergen_free": False},
+                {"item_id": "s1-b", "allergens": [], "allergen_free": True}
+            ]
+        })
+        client.extract_allergens = AsyncMock(return_value={"allergens": ["wheat"], "allergen_free": False})
+        session_1 = [{"id": "s1-a", "name": "唐揚げ", "category": "FOOD"}, {"id": "s1-b", "name": "枝豆", "category": "FOOD"}]
+        session_2 = [{"id": "s2-a", "name": "唐揚げ", "category": "FOOD"}, {"id": "s2-b", "name": "枝豆", "category": "FOOD"}]
+
+        with patch.object(openai_base_client, "get_openai_response_cache", return_value=cache), \
+                patch.object(openai_base_client.settings.ai, "openai_response_cache_enabled", True), \
+                patch.object(openai_base_client.settings.ai, "openai_response_cache_prompts", "allergen"):
+            first = await client.extract_allergens_batch(session_1)
+            second = await client.extract_allergens_batch(session_2)
+
+        assert client._make_function_call_request.await_count == 1
+        assert client._make_function_call_request.await_args.kwargs["use_response_cache"] is False
+        client.extract_allergens.assert_not_awaited()
+        assert second == {"s2-a": first["s1-a"], "s2-b": first["s1-b"]}
+        assert cache.stats()["prompts"]["allergen"] == {"hits": 2, "misses": 2, "hit_ratio": 0.5}
+
+    @pytest.mark.asyncio
+    async def test_changed_batch_user_prompt_misses_cache(self, tmp_path):
+        """プロンプトYAMLの batch_user を変更すると、同じ料理でもキャッシュを使わず再リクエストすることを確認"""
+        shutil.copytree("app_2/prompts", tmp_path / "prompts")
+        prompt_file = tmp_path / "prompts" / "openai" / "menu_analysis" / "allergen.yaml"
+        cache = _cache(FakeRedis())
+        client = AllergenClient()
+        client.prompt_loader = PromptLoader(str(tmp_path / "prompts"))
+        assert "batch_user: \"Analyze each of" in prompt_file.read_text(encoding="utf-8")
+        client._make_function_call_request = AsyncMock(side_effect=lambda **kwargs: {
+            "results": [{"item_id": item_id, "allergens": [], "allergen_free": True} for item_id in ("s1-a", "s2-a")]
+        })
+        client.extract_allergens = AsyncMock(return_value={"allergens": ["wheat"], "allergen_free": False})
+
+        with patch.object(openai_base_client, "get_openai_response_cache", return_value=cache), \
+                patch.object(openai_base_client.settings.ai, "openai_response_cache_enabled", True), \
+                patch.object(openai_base_client.settings.ai, "openai_response_cache_prompts", "allergen"):
+            await client.extract_allergens_batch([{"id": "s1-a", "name": "唐揚げ", "category": "FOOD"}])
+            prompt_file.write_text(
+                prompt_file.read_text(encoding="utf-8").replace("Analyze each of", "Carefully analyze each of"),
+                encoding="utf-8"
+            )
+            await client.extract_allergens_batch([{"id": "s2-a", "name": "唐揚げ", "category": "FOOD"}])
+
+        assert client._make_function_call_request.await_count == 2
+        assert cache.stats()["prompts"]["allergen"] == {"hits": 0, "misses": 2, "hit_ratio": 0.0}
@@ -0,0 +1 @@
+# Pipelines test package
@@ -0,0 +1,179 @@
+"""
+PipelineJobQueueテスト
+同時実行数の制限・キュー位置・待機上限の検証
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app_2.api.v1.endpoints import pipeline as pipeline_endpoint
+from app_2.domain.entities.session_entity import SessionStatus
+from app_2.pipelines.job_queue import PipelineJobQueue, PipelineQueueFullError
+
+
+class TestPipelineJobQueue:
+    """PipelineJobQueue 単体テスト"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """同時実行数が上限を超えないことを確認"""
+        queue = PipelineJobQueue(max_concurrent=2, max_queued=10)
+        release = asyncio.Event()
+        running = []
+        peak = 0
+
+        async def job():
+            nonlocal peak
+            running.append(1)
+            peak = max(peak, len(running))
+            await release.wait()
+            running.pop()
+
+        for i in range(5):
+            queue.submit(f"s{i}", job)
+        await asyncio.sleep(0)
+
+        assert queue.stats()["running"] == 2
+        assert queue.stats()["queued"] == 3
+
+        release.set()
+        await asyncio.gather(*list(queue._tasks))
+
+        assert peak == 2
+        assert queue.stats() == {"max_concurrent": 2, "max_queued": 10, "running": 0, "queued": 0}
+
+    @pytest.mark.asyncio
+    async def test_queue_position(self):
+        """待機中ジョブのキュー位置を確認"""
+        queue = PipelineJobQueue(max_concurrent=1, max_queued=10)
+        release = asyncio.Event()
+
+        async def job():
+            await release.wait()
+
+        assert queue.submit("s0", job) == 0
+        await asyncio.sleep(0)
+        assert queue.submit("s1", job) == 1
+        assert queue.submit("s2", job) == 2
+
+        assert queue.get_status("s0")["state"] == "running"
+        assert queue.get_status("s2") == {"state": "queued", "queue_position": 2, "queued_ahead": 1}
+        assert queue.get_status("unknown")["state"] == "not_queued"
+
+        release.set()
+        await asyncio.gather(*list(queue._tasks))
+
+    @pytest.mark.asyncio
+    async def test_queue_full_and_duplicate_rejected(self):
+        """待機上限超過・重複セッションが拒否されることを確認"""
+        queue = PipelineJobQueue(max_concurrent=1, max_queued=1)
+        release = asyncio.Event()
+
+        async def job():
+            await release.wait()
+
+        queue.submit("s0", job)
+        await asyncio.sleep(0)
+        queue.submit("s1", job)
+
+        with pytest.raises(PipelineQueueFullError):
+            queue.submit("s2", job)
+        with pytest.raises(ValueError):
+            queue.submit("s0", job)
+
+        release.set()
+        await asyncio.gather(*list(queue._tasks))
+
+    @pytest.mark.asyncio
+    async def test_failed_job_releases_slot(self):
+        """ジョブが例外で終了してもスロットが解放されることを確認"""
+        queue = PipelineJobQueue(max_concurrent=1, max_queued=10)
+        completed = []
+
+        async def failing_job():
+            raise RuntimeError("boom")
+
+        async def ok_job():
+            completed.append(True)
+
+        queue.submit("s0", failing_job)
+        queue.submit("s1", ok_job)
+        await asyncio.gather(*list(queue._tasks))
+
+        assert completed == [True]
+        assert queue.get_status("s0")["state"] == "not_queued"
+
+
+class FakeSessionRepository:
+    """セッションを辞書に保持するリポジトリ"""
+
+    def __init__(self):
+        self.sessions = {}
+
+    async def get_by_id(self, session_id):
+        return self.sessions.get(session_id)
+
+    async def upsert_session(self, session_entity):
+        self.sessions[session_entity.session_id] = session_entity
+        return session_entity
+
+    async def update(self, session_entity):
+        self.sessions[session_entity.session_id] = session_entity
+        return session_entity
+
+
+class FullAfterCheckQueue(PipelineJobQueue):
+    """is_full() の確認後、submit までの間に満杯になるキュー"""
+
+    def is_full(self):
+        return False
+
+    def submit(self, session_id, job_factory):
+        raise PipelineQueueFullError("Pipeline queue is full (1/1 waiting)")
+
+
+class TestProcessAsyncQueueFull:
+    """process-async のキュー満杯時（503）のセッション状態テスト"""
+
+    async def _post(self, queue):
+        repository = FakeSessionRepository()
+        upload = MagicMock(content_type="image/png", filename="menu.png")
+
+        async def read():
+            return b"image"
+
+        upload.read = read
+
+        @asynccontextmanager
+        async def session_factory():
+            yield MagicMock()
+
+        with patch.object(pipeline_endpoint, "get_pipeline_job_queue", return_value=queue), \
+                patch.object(pipeline_endpoint, "get_menu_processing_pipeline", return_value=MagicMock()), \
+                patch("app_2.core.database.async_session_factory", session_factory), \
+                patch("app_2.services.dependencies.get_session_repository", return_value=repository):
+            with pytest.raises(HTTPException) as exc_info:
+                await pipeline_endpoint.process_menu_image_async(file=upload, session_id="s1")
+
+        return exc_info.value, repository
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejected_without_registering_session(self):
+        queue = PipelineJobQueue(max_concurrent=1, max_queued=0)
+
+        error, repository = await self._post(queue)
+
+        assert error.status_code == 503
+        assert error.headers == {"Retry-After": "30"}
+        assert repository.sessions == {}
+
+    @pytest.mark.asyncio
+    async def test_queue_filled_after_registration_marks_session_failed(self):
+        """登録後の submit で満杯になった場合、セッションが PENDING のまま残らないことを確認"""
+        error, repository = await self._post(FullAfterCheckQueue(max_concurrent=1, max_queued=1))
+
+        assert error.status_code == 503
+        assert repository.sessions["s1"].status == SessionStatus.FAILED
@@ -0,0 +1,235 @@
+"""
+PipelineDefinitionテスト
+DAG実行順序・並行実行・リトライ・タイムアウト・再開（restored）の検証
+"""
+import asyncio
+
+import pytest
+
+from app_2.pipelines.context_store import PipelineContext
+from app_2.pipelines.pipeline_def import (
+    PipelineDefinition,
+    PipelineDefinitionError,
+    PipelineHooks,
+    RetryPolicy,
+    StageExecutionError,
+    StageSpec,
+)
+
+
+def _stage(name, inputs=(), outputs=(), func=None, **kwargs):
+    async def default_run(context):
+        return {key: f"{name}:{key}" for key in outputs}
+    return StageSpec(name=name, run=func or default_run, inputs=inputs, outputs=outputs, **kwargs)
+
+
+class RecordingHooks(PipelineHooks):
+    def __init__(self):
+        self.events = []
+
+    async def on_stage_start(self, context, stage):
+        self.events.append(("start", stage.name))
+
+    async def on_stage_complete(self, context, stage, result):
+        self.events.append(("complete", stage.name))
+
+    async def on_stage_error(self, context, stage, error):
+        self.events.append(("error", stage.name))
+
+
+class TestPipelineDefinitionValidation:
+    """定義の検証テスト"""
+
+    def test_unresolved_input(self):
+        """どのステージも生成しない入力は定義エラー"""
+        with pytest.raises(PipelineDefinitionError):
+            PipelineDefinition("p", [_stage("a", inputs=("missing",), outputs=("x",))])
+
+    def test_duplicate_output(self):
+        """同じ成果物を複数ステージが生成すると定義エラー"""
+        with pytest.raises(PipelineDefinitionError):
+            PipelineDefinition("p", [_stage("a", outputs=("x",)), _stage("b", outputs=("x",))])
+
+    def test_cycle(self):
+        """循環依存は定義エラー"""
+        with pytest.raises(PipelineDefinitionError):
+            PipelineDefinition("p", [
+                _stage("a", inputs=("y",), outputs=("x",)),
+                _stage("b", inputs=("x",), outputs=("y",)),
+            ])
+
+
+class TestPipelineDefinitionRun:
+    """DAG実行テスト"""
+
+    @pytest.mark.asyncio
+    async def test_dependencies_and_artifact_passing(self):
+        """依存順に実行され、成果物がオブジェクト参照のまま渡ることを確認"""
+        payload = {"items": [1, 2, 3]}
+        seen = {}
+
+        async def produce(context):
+            return {"data": payload}
+
+        async def consume(context):
+            seen["data"] = context["data"]
+            return {"count": len(context["data"]["items"])}
+
+        definition = PipelineDefinition("p", [
+            _stage("consume", inputs=("data",), outputs=("count",), func=consume),
+            _stage("produce", inputs=("image",), outputs=("data",), func=produce),
+        ], initial_inputs=("image",))
+        context = PipelineContext("s1", {"image": b"img"})
+
+        results = await definition.run(context)
+
+        assert seen["data"] is payload
+        assert context["count"] == 3
+        assert {name: r.status for name, r in results.items()} == {"produce": "completed", "consume": "completed"}
+
+    @pytest.mark.asyncio
+    async def test_independent_stages_overlap(self):
+        """同じ入力に依存する独立ステージが並行実行されることを確認"""
+        both_started = asyncio.Event()
+        started = []
+
+        def make(name):
+            async def run(context):
+                started.append(name)
+                if len(started) == 2:
+                    both_started.set()
+                await asyncio.wait_for(both_started.wait(), 1)
+                return {}
+            return run
+
+        definition = PipelineDefinition("p", [
+            _stage("root", outputs=("x",)),
+            _stage("left", inputs=("x",), func=make("left")),
+            _stage("right", inputs=("x",), func=make("right")),
+        ])
+
+        results = await definition.run(PipelineContext("s1"))
+
+        assert sorted(started) == ["left", "right"]
+        assert results["left"].status == results["right"].status == "completed"
+
+    @pytest.mark.asyncio
+    async def test_required_failure_raises(self):
+        """必須ステージ失敗で StageExecutionError が送出され、エラー通知されることを確認"""
+        async def fail(context):
+            raise ValueError("boom")
+
+        hooks = RecordingHooks()
+        definition = PipelineDefinition("p", [
+            _stage("a", outputs=("x",), func=fail),
+            _stage("b", inputs=("x",), outputs=("y",)),
+        ])
+
+        with pytest.raises(StageExecutionError) as exc_info:
+            await definition.run(PipelineContext("s1"), hooks)
+
+        assert exc_info.value.stage == "a"
+        assert isinstance(exc_info.value.original, ValueError)
+        assert ("error", "a") in hooks.events
+        assert ("start", "b") not in hooks.events
+
+    @pytest.mark.asyncio
+    async def test_optional_failure_skips_dependents(self):
+        """任意ステージ失敗時は依存ステージのみスキップされることを確認"""
+        async def fail(context):
+            raise ValueError("boom")
+
+        definition = PipelineDefinition("p", [
+            _stage("root", outputs=("x",)),
+            _stage("optional", inputs=("x",), outputs=("y",), func=fail, required=False),
+            _stage("after_optional", inputs=("y",), outputs=("z",)),
+            _stage("independent", inputs=("x",), outputs=("w",)),
+        ])
+        context = PipelineContext("s1")
+
+        results = await definition.run(context)
+
+        assert results["optional"].status == "failed"
+        assert results["after_optional"].status == "skipped"
+        assert results["independent"].status == "completed"
+        assert "z" not in context
+
+    @pytest.mark.asyncio
+    async def test_retry_then_success(self):
+        """リトライ方針に従って再試行されることを確認"""
+        calls = []
+
+        async def flaky(context):
+            calls.append(1)
+            if len(calls) < 3:
+                raise ConnectionError("transient")
+            return {"x": "ok"}
+
+        definition = PipelineDefinition("p", [
+            _stage("a", outputs=("x",), func=flaky, retry=RetryPolicy(max_attempts=3)),
+        ])
+
+        results = await definition.run(PipelineContext("s1"))
+
+        assert results["a"].status == "completed"
+        assert results["a"].attempts == 3
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        """タイムアウト超過が失敗として扱われることを確認"""
+        async def slow(context):
+            await asyncio.sleep(1)
+            return {"x": 1}
+
+        definition = PipelineDefinition("p", [
+            _stage("a", outputs=("x",), func=slow, timeout_seconds=0.01),
+        ])
+
+        with pytest.raises(StageExecutionError) as exc_info:
+            await definition.run(PipelineContext("s1"))
+
+        assert isinstance(exc_info.value.original, TimeoutError)
+
+    @pytest.mark.asyncio
+    async def test_max_concurrency(self):
+        """ステージの同時実行数上限が実行間で共有されることを確認"""
+        active = 0
+        peak = 0
+
+        async def run(context):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"x": 1}
+
+        definition = PipelineDefinition("p", [
+            _stage("limited", outputs=("x",), func=run, max_concurrency=1),
+        ])
+
+        await asyncio.gather(*[definition.run(PipelineContext(f"s{i}")) for i in range(3)])
+
+        assert peak == 1
+
+    @pytest.mark.asyncio
+    async def test_stage_with_existing_outputs_is_restored(self):
+        """出力が既に存在するステージは実行されず restored となることを確認"""
+        calls = []
+
+        async def expensive(context):
+            calls.append(1)
+            return {"x": "fresh"}
+
+        definition = PipelineDefinition("p", [
+            _stage("a", outputs=("x",), func=expensive),
+            _stage("b", inputs=("x",), outputs=("y",)),
+        ])
+        context = PipelineContext("s1", {"x": "restored"})
+
+        results = await definition.run(context)
+
+        assert calls == []
+        assert results["a"].status == "restored"
+        assert results["b"].status == "completed"
+        assert context["x"] == "restored"
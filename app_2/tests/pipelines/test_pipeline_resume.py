@@ -0,0 +1,140 @@
+"""
+パイプライン再開テスト
+stages_data からの成果物復元と、未完了ステージのみの再実行を検証
+"""
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app_2.pipelines.context_store import PipelineContext
+from app_2.pipelines.pipeline_runner import MenuProcessingPipeline
+
+
+@asynccontextmanager
+async def _fake_session_factory():
+    yield MagicMock()
+
+
+def _menu_entity(menu_id: str):
+    return SimpleNamespace(
+        id=menu_id, name="唐揚げ", category="FOOD", category_translation=None, price="500",
+        translation=None, description=None, allergy=None, ingredient=None
+    )
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = MenuProcessingPipeline()
+    pipeline.redis_publisher = AsyncMock()
+    pipeline.hooks.redis_publisher = pipeline.redis_publisher
+    pipeline.redis_publisher.publish_categorize_completion.return_value = True
+    pipeline.ocr_service = MagicMock(extract_text_with_positions=AsyncMock())
+    pipeline.mapping_service = MagicMock(_format_mapping_data=MagicMock(return_value="Row 1: '唐揚げ'"))
+    pipeline.categorize_service = MagicMock(categorize_menu_structure=AsyncMock(
+        return_value={"menu": {"categories": [{"name": "FOOD", "items": [{"name": "唐揚げ"}]}]}}
+    ))
+    pipeline._update_session_stage_completion = AsyncMock(return_value=True)
+    pipeline._save_basic_menu_items = AsyncMock(return_value=[_menu_entity("m1")])
+    pipeline._trigger_parallel_tasks = AsyncMock()
+    return pipeline
+
+
+class TestRestoreContextArtifacts:
+    """_restore_context_artifacts テスト"""
+
+    @pytest.mark.asyncio
+    async def test_restores_completed_stages(self, pipeline):
+        """OCR・マッピング・カテゴライズの成果物が復元されることを確認"""
+        stages_data = {
+            "ocr_completed": {"ocr_results": [{"text": "唐揚げ"}]},
+            "mapping_completed": {"formatted_mapping_data": "Row 1: '唐揚げ'"},
+            "categorize_completed": {
+                "categorized_results": {"menu": {"categories": []}},
+                "processing_duration": 3.2
+            }
+        }
+        menu_repository = MagicMock(get_by_session_id=AsyncMock(return_value=[_menu_entity("m1")]))
+
+        with patch("app_2.core.database.async_session_factory", _fake_session_factory), \
+                patch("app_2.pipelines.pipeline_runner.get_menu_repository", return_value=menu_repository):
+            artifacts = await pipeline._restore_context_artifacts("s1", stages_data)
+
+        assert artifacts["ocr_results"] == [{"text": "唐揚げ"}]
+        assert artifacts["formatted_mapping_data"] == "Row 1: '唐揚げ'"
+        assert artifacts["categorize_duration"] == 3.2
+        assert [entity.id for entity in artifacts["saved_entities"]] == ["m1"]
+        assert artifacts["sse_broadcast_success"] is True
+        assert "parallel_tasks_triggered" not in artifacts
+
+    @pytest.mark.asyncio
+    async def test_partial_save_is_cleaned_up(self, pipeline):
+        """カテゴライズ完了記録がないのに保存済みアイテムがある場合は削除されることを確認"""
+        stages_data = {"ocr_completed": {"ocr_results": [{"text": "唐揚げ"}]}}
+        menu_repository = MagicMock(
+            get_by_session_id=AsyncMock(return_value=[_menu_entity("m1"), _menu_entity("m2")]),
+            delete=AsyncMock(return_value=True)
+        )
+
+        with patch("app_2.core.database.async_session_factory", _fake_session_factory), \
+                patch("app_2.pipelines.pipeline_runner.get_menu_repository", return_value=menu_repository):
+            artifacts = await pipeline._restore_context_artifacts("s1", stages_data)
+
+        assert "saved_entities" not in artifacts
+        assert menu_repository.delete.await_count == 2
+
+
+class TestResumeFromCheckpoint:
+    """チェックポイントからのDAG再実行テスト"""
+
+    @pytest.mark.asyncio
+    async def test_resume_after_ocr_skips_vision_call(self, pipeline):
+        """OCR完了後に失敗したセッションはOCRを再実行しないことを確認"""
+        async def noop(context):
+            return {}
+        pipeline.definition.get_stage("session_menu_ids").run = noop
+
+        context = PipelineContext("s1", {
+            "image_data": None,
+            "cached_result": None,
+            "result_cache_key": None,
+            "ocr_results": [{"text": "唐揚げ"}]
+        })
+
+        results = await pipeline.definition.run(context, pipeline.hooks)
+
+        pipeline.ocr_service.extract_text_with_positions.assert_not_called()
+        pipeline.categorize_service.categorize_menu_structure.assert_awaited_once()
+        assert results["ocr"].status == "restored"
+        assert results["categorize"].status == "completed"
+        assert context["parallel_tasks_triggered"] is True
+
+    @pytest.mark.asyncio
+    async def test_resume_after_categorize_only_triggers_tasks(self, pipeline):
+        """カテゴライズ完了後に失敗したセッションは並列タスク起動のみ実行されることを確認"""
+        async def noop(context):
+            return {}
+        pipeline.definition.get_stage("session_menu_ids").run = noop
+
+        context = PipelineContext("s1", {
+            "image_data": None,
+            "cached_result": None,
+            "result_cache_key": None,
+            "ocr_results": [{"text": "唐揚げ"}],
+            "formatted_mapping_data": "Row 1: '唐揚げ'",
+            "categorized_results": {"menu": {"categories": []}},
+            "categorize_duration": 0.0,
+            "saved_entities": [_menu_entity("m1")],
+            "saved_menu_items": [],
+            "save_duration": 0.0,
+            "sse_broadcast_success": True
+        })
+
+        results = await pipeline.definition.run(context, pipeline.hooks)
+
+        pipeline.categorize_service.categorize_menu_structure.assert_not_called()
+        pipeline._save_basic_menu_items.assert_not_called()
+        pipeline._trigger_parallel_tasks.assert_awaited_once()
+        assert results["parallel_tasks"].status == "completed"
+        assert {results[name].status for name in ("ocr", "mapping", "categorize", "save", "categorize_publish")} == {"restored"}
@@ -0,0 +1,101 @@
+"""
+PipelineResultCacheテスト
+画像ハッシュキー・TTL・LRU退避の検証
+"""
+import pytest
+from unittest.mock import patch
+
+from app_2.pipelines.result_cache import PipelineResultCache, compute_prompt_version
+
+
+def _store(cache: PipelineResultCache, key: str):
+    cache.set(
+        key,
+        ocr_results=[{"text": "唐揚げ", "x_center": 10.0, "y_center": 20.0}],
+        formatted_mapping_data="Row 1: '唐揚げ'",
+        categorized_results={"menu": {"categories": [{"name": "FOOD", "items": []}]}}
+    )
+
+
+class TestPipelineResultCache:
+    """PipelineResultCache 単体テスト"""
+
+    def test_build_key_depends_on_image_and_prompt_version(self):
+        """キーが画像内容とプロンプトバージョンの両方に依存することを確認"""
+        key = PipelineResultCache.build_key(b"image-a", "v1")
+
+        assert key == PipelineResultCache.build_key(b"image-a", "v1")
+        assert key != PipelineResultCache.build_key(b"image-b", "v1")
+        assert key != PipelineResultCache.build_key(b"image-a", "v2")
+
+    def test_hit_returns_copy(self):
+        """ヒット時はコピーを返し、変更がキャッシュに波及しないことを確認"""
+        cache = PipelineResultCache(max_entries=4, ttl_seconds=60)
+        _store(cache, "k1")
+
+        first = cache.get("k1")
+        first.categorized_results["menu"]["categories"].clear()
+        second = cache.get("k1")
+
+        assert len(second.categorized_results["menu"]["categories"]) == 1
+        assert cache.stats()["hits"] == 2
+
+    def test_miss_counts(self):
+        """未登録キーはミスとして数えられることを確認"""
+        cache = PipelineResultCache()
+
+        assert cache.get("unknown") is None
+        assert cache.stats()["misses"] == 1
+
+    def test_ttl_expiry(self):
+        """TTL超過エントリが破棄されることを確認"""
+        cache = PipelineResultCache(max_entries=4, ttl_seconds=10)
+        with patch("app_2.pipelines.result_cache.time.monotonic", return_value=100.0):
+            _store(cache, "k1")
+
+        with patch("app_2.pipelines.result_cache.time.monotonic", return_value=111.0):
+            assert cache.get("k1") is None
+
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["evictions"] == 1
+
+    def test_lru_eviction(self):
+        """最大エントリ数超過時に最も古く参照されたエントリが破棄されることを確認"""
+        cache = PipelineResultCache(max_entries=2, ttl_seconds=60)
+        _store(cache, "k1")
+        _store(cache, "k2")
+        cache.get("k1")
+        _store(cache, "k3")
+
+        assert cache.get("k1") is not None
+        assert cache.get("k2") is None
+        assert cache.get("k3") is not None
+
+    def test_invalidate(self):
+        """明示的な破棄を確認"""
+        cache = PipelineResultCache()
+        _store(cache, "k1")
+        _store(cache, "k2")
+
+        cache.invalidate("k1")
+        assert cache.get("k1") is None
+        cache.invalidate()
+        assert cache.stats()["entries"] == 0
+
+
+class TestComputePromptVersion:
+    """compute_prompt_version テスト"""
+
+    def test_version_changes_with_prompt_content(self, tmp_path):
+        """プロンプト内容が変わるとバージョンが変わることを確認"""
+        prompt_file = tmp_path / "openai" / "menu_analysis" / "categorize.yaml"
+        prompt_file.parent.mkdir(parents=True)
+        prompt_file.write_text("system: a\n", encoding="utf-8")
+        files = ["openai/menu_analysis/categorize.yaml"]
+
+        before = compute_prompt_version(str(tmp_path), files)
+        prompt_file.write_text("system: b\n", encoding="utf-8")
+        after = compute_prompt_version(str(tmp_path), files)
+
+        assert before != after
+        assert after == compute_prompt_version(str(tmp_path), files)
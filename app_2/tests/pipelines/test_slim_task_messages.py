@@ -0,0 +1,107 @@
+"""
+Slim タスクメッセージテスト
+並列タスクに session_id のみを渡し、ワーカー側でメニューアイテムを読み込むこと・優先度付きの送信を検証
+"""
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app_2.pipelines import pipeline_runner
+from app_2.pipelines.pipeline_runner import MenuProcessingPipeline
+from app_2.tasks import menu_item_loader
+from app_2.tasks.allergen_task import allergen_menu_task
+from app_2.tasks.describe_task import describe_menu_task
+from app_2.tasks.ingredient_task import ingredient_menu_task
+from app_2.tasks.search_image_task import search_image_menu_task
+from app_2.tasks.translate_task import translate_menu_task
+
+TASKS = (translate_menu_task, describe_menu_task, allergen_menu_task, ingredient_menu_task, search_image_menu_task)
+
+
+def _menu_entity(menu_id: str, category: str = "FOOD"):
+    return SimpleNamespace(
+        id=menu_id, name="唐揚げ", category=category, price="500", translation=None, category_translation=None
+    )
+
+
+async def _trigger(slim: bool, head_items: int = 0, boosted_categories=()):
+    pipeline = MenuProcessingPipeline()
+    pipeline.redis_publisher = AsyncMock()
+    enqueues = {task.name: MagicMock(return_value=SimpleNamespace(id=f"{task.name}-id")) for task in TASKS}
+    viewport_hint = MagicMock(get_boosted_categories=AsyncMock(return_value=list(boosted_categories)))
+    entities = [_menu_entity("m1"), _menu_entity("m2"), _menu_entity("m3", "DRINK")]
+
+    with patch.object(pipeline_runner.settings.pipeline, "slim_task_messages", slim), \
+            patch.object(pipeline_runner.settings.pipeline, "enrichment_mode", "separate"), \
+            patch.object(pipeline_runner.settings.pipeline, "priority_head_items", head_items), \
+            patch.object(pipeline_runner, "get_redis_viewport_hint", return_value=viewport_hint):
+        patchers = [patch.object(task, "apply_async", enqueues[task.name]) for task in TASKS]
+        for patcher in patchers:
+            patcher.start()
+        try:
+            await pipeline._trigger_parallel_tasks("s1", entities)
+        finally:
+            for patcher in patchers:
+                patcher.stop()
+
+    return pipeline, enqueues
+
+
+class TestSlimTaskMessages:
+    """_trigger_parallel_tasks のメッセージ形式テスト"""
+
+    @pytest.mark.asyncio
+    async def test_slim_mode_sends_session_id_only(self):
+        pipeline, enqueues = await _trigger(slim=True)
+
+        for apply_async in enqueues.values():
+            apply_async.assert_called_once_with(args=("s1",), priority=pipeline_runner.TASK_PRIORITY_DEFAULT)
+        data = pipeline.redis_publisher.publish_session_message.await_args.kwargs["data"]
+        assert data["total_items"] == 3
+
+    @pytest.mark.asyncio
+    async def test_legacy_mode_sends_menu_items(self):
+        _, enqueues = await _trigger(slim=False)
+
+        session_id, menu_items = enqueues[translate_menu_task.name].call_args.kwargs["args"]
+        assert session_id == "s1"
+        assert [item["id"] for item in menu_items] == ["m1", "m2", "m3"]
+
+    @pytest.mark.asyncio
+    async def test_head_items_sent_with_higher_priority(self):
+        """上位N件（ビューポートヒントのカテゴリを優先）が高優先度の別メッセージで送信されることを確認"""
+        _, enqueues = await _trigger(slim=True, head_items=1, boosted_categories=["DRINK"])
+
+        calls = enqueues[allergen_menu_task.name].call_args_list
+        assert [call.kwargs for call in calls] == [
+            {"args": ("s1", None, ["m3"]), "priority": pipeline_runner.TASK_PRIORITY_HEAD},
+            {"args": ("s1", None, ["m1", "m2"]), "priority": pipeline_runner.TASK_PRIORITY_TAIL}
+        ]
+
+
+class TestLoadTaskItems:
+    """load_task_items テスト"""
+
+    @pytest.mark.asyncio
+    async def test_message_items_used_as_is(self):
+        items = [{"id": "m1", "name": "唐揚げ"}]
+
+        assert await menu_item_loader.load_task_items("s1", items) is items
+
+    @pytest.mark.asyncio
+    async def test_loads_items_from_db_with_subset(self):
+        """menu_items が省略された場合に、指定IDの部分集合をリポジトリから1回で読み込むことを確認"""
+        repository = MagicMock(get_task_items=AsyncMock(return_value=[{"id": "m2", "name": "ラーメン"}]))
+
+        @asynccontextmanager
+        async def session_factory():
+            yield MagicMock()
+
+        with patch.object(menu_item_loader, "async_session_factory", session_factory), \
+                patch.object(menu_item_loader, "MenuRepositoryImpl", return_value=repository):
+            items = await menu_item_loader.load_task_items("s1", item_ids=["m2"])
+
+        assert items == [{"id": "m2", "name": "ラーメン"}]
+        repository.get_task_items.assert_awaited_once_with("s1", ["m2"])
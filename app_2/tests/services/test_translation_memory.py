@@ -0,0 +1,121 @@
+"""
+Translation Memory Test
+翻訳メモリ（Redis + PostgreSQL）の参照・書き戻しと、TranslateService からの利用を検証
+"""
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app_2.services.translate_service import TranslateService
+from app_2.services.translation_memory import TranslationMemory, normalize_source_text
+from app_2.utils.metrics import get_metrics_registry
+
+
+def _redis_client(raw_client):
+    redis_client = MagicMock()
+
+    @asynccontextmanager
+    async def get_connection():
+        yield raw_client
+
+    redis_client.get_connection = get_connection
+    return redis_client
+
+
+def _session_factory(rows):
+    db_session = MagicMock()
+    db_session.execute = AsyncMock(return_value=rows)
+    db_session.commit = AsyncMock()
+
+    @asynccontextmanager
+    async def factory():
+        yield db_session
+
+    return factory, db_session
+
+
+class InMemoryTranslationMemory:
+    """dict で保持する翻訳メモリ"""
+
+    def __init__(self):
+        self.entries = {}
+
+    async def get_many(self, source_texts, target_language, provider="google"):
+        return {text: self.entries[text] for text in source_texts if text in self.entries}
+
+    async def put_many(self, translations, target_language, provider="google"):
+        self.entries.update(translations)
+
+
+def test_normalize_source_text():
+    assert normalize_source_text("　唐揚げ \n") == "唐揚げ"
+    assert normalize_source_text("ｶﾗｱｹﾞ") == "カラアゲ"
+
+
+class TestTranslationMemory:
+    """TranslationMemory テスト"""
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_then_database_hit_written_back(self):
+        """Redis にない原文は DB から取得して Redis に書き戻し、ヒット・ミスを記録することを確認"""
+        metrics = get_metrics_registry()
+        metrics.reset()
+        raw_client = MagicMock()
+        raw_client.mget = AsyncMock(return_value=["Beer", None, None])
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        raw_client.pipeline.return_value = pipe
+        factory, db_session = _session_factory([SimpleNamespace(source_text="唐揚げ", translated_text="Fried chicken")])
+        memory = TranslationMemory(_redis_client(raw_client), factory)
+
+        found = await memory.get_many(["生ビール", "唐揚げ", "刺身盛り合わせ"], "en")
+
+        assert found == {"生ビール": "Beer", "唐揚げ": "Fried chicken"}
+        pipe.set.assert_called_once()
+        assert pipe.set.call_args.args[1] == "Fried chicken"
+        assert metrics.get_counter("translation_memory.hits.redis") == 1
+        assert metrics.get_counter("translation_memory.hits.db") == 1
+        assert metrics.get_counter("translation_memory.misses") == 1
+
+    @pytest.mark.asyncio
+    async def test_unavailable_tiers_are_misses(self):
+        raw_client = MagicMock()
+        raw_client.mget = AsyncMock(side_effect=ConnectionError("redis down"))
+        factory, db_session = _session_factory([])
+        db_session.execute.side_effect = ConnectionError("db down")
+        memory = TranslationMemory(_redis_client(raw_client), factory)
+
+        assert await memory.get_many(["ドリンク"], "en") == {}
+
+
+class TestTranslateServiceWithMemory:
+    """TranslateService の翻訳メモリ利用テスト"""
+
+    @pytest.mark.asyncio
+    async def test_second_session_skips_api(self):
+        """一度翻訳した原文は正規化後のキーで再利用し、APIを呼び出さないことを確認"""
+        translate_client = MagicMock()
+        translate_client.translate_batch = AsyncMock(side_effect=lambda texts, lang: [f"EN:{t}" for t in texts])
+        memory = InMemoryTranslationMemory()
+        service = TranslateService(translate_client, memory)
+
+        first = await service.translate_menu_items([{"id": "m1", "name": "唐揚げ", "category": "ﾄﾞﾘﾝｸ"}], "en")
+        second = await service.translate_menu_items([{"id": "m2", "name": " 唐揚げ ", "category": "ドリンク"}], "en")
+
+        assert translate_client.translate_batch.await_count == 1
+        assert first["m1"]["category"] == "EN:ドリンク"
+        assert second["m2"]["name"] == "EN:唐揚げ"
+        assert second["m2"]["name_original"] == " 唐揚げ "
+
+    @pytest.mark.asyncio
+    async def test_failed_translation_not_stored(self):
+        translate_client = MagicMock()
+        translate_client.translate_batch = AsyncMock(side_effect=lambda texts, lang: list(texts))
+        memory = InMemoryTranslationMemory()
+
+        result = await TranslateService(translate_client, memory).translate_menu_data({"name": "刺身"}, "en")
+
+        assert result["name"] == "刺身"
+        assert memory.entries == {}
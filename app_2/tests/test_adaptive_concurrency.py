@@ -0,0 +1,128 @@
+"""
+Adaptive Concurrency テスト
+AIMD による同時実行バッチ数の増減と、BatchProcessor での適用・結果への記録を検証
+"""
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app_2.tasks.adaptive_concurrency import AdaptiveConcurrencyController, AdaptiveSemaphore, is_rate_limit_error
+from app_2.tasks.batch_processor import BatchConfig, BatchProcessor
+from app_2.utils.metrics import get_metrics_registry
+
+
+def _controller(**kwargs):
+    options = dict(initial=2, floor=1, ceiling=4, increase_step=1.0, decrease_factor=0.5, latency_target_seconds=1.0)
+    options.update(kwargs)
+    return AdaptiveConcurrencyController("test", **options)
+
+
+class TestAdaptiveConcurrencyController:
+    """AdaptiveConcurrencyController テスト"""
+
+    def test_additive_increase_up_to_ceiling(self):
+        """目標レイテンシ内の成功で1ラウンドごとに約1ずつ増え、上限で止まることを確認"""
+        controller = _controller()
+
+        for _ in range(3):
+            controller.record(0.1)
+        assert controller.limit == 3
+
+        for _ in range(20):
+            controller.record(0.1)
+        assert controller.limit == 4
+
+    def test_multiplicative_decrease_on_rate_limit(self):
+        get_metrics_registry().reset()
+        controller = _controller(initial=4)
+
+        assert controller.record(0.1, error_count=1, rate_limited=1) == 2
+        assert get_metrics_registry().get_counter("batch.test.concurrency.decrease.rate_limited") == 1
+        assert get_metrics_registry().get_gauge("batch.test.concurrency") == 2
+
+    def test_decreases_once_per_latency_window(self):
+        """同時に失敗した複数バッチで一気に下限まで落ちないことを確認"""
+        controller = _controller(initial=4, latency_target_seconds=60)
+
+        controller.record(0.1, error_count=1)
+        controller.record(0.1, error_count=1)
+
+        assert controller.limit == 2
+
+    def test_slow_batches_decrease_and_floor_holds(self):
+        controller = _controller(initial=1, latency_target_seconds=0.0001)
+
+        assert controller.record(5.0) == 1
+
+    def test_rate_limit_error_detection(self):
+        assert is_rate_limit_error("唐揚げ: Rate limit exceeded after 4 attempts")
+        assert is_rate_limit_error(Exception("429 Resource exhausted"))
+        assert not is_rate_limit_error("DB update failed: m1")
+
+
+class TestAdaptiveSemaphore:
+    """AdaptiveSemaphore テスト"""
+
+    @pytest.mark.asyncio
+    async def test_in_flight_follows_controller_limit(self):
+        controller = _controller(initial=2, increase_step=0.001)
+        semaphore = AdaptiveSemaphore(controller)
+        running = 0
+
+        async def work():
+            nonlocal running
+            async with semaphore:
+                running += 1
+                assert running <= 2
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*[work() for _ in range(6)])
+
+        assert semaphore.peak_in_flight == 2
+        assert semaphore.in_flight == 0
+
+
+class TestBatchProcessorAdaptive:
+    """BatchProcessor の adaptive モードテスト"""
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_items_reduce_concurrency_and_are_reported(self):
+        """429 で失敗したバッチが同時実行数を下げ、選ばれた値がタスク結果に記録されることを確認"""
+        processor = BatchProcessor(BatchConfig(batch_size=2, max_concurrent_batches=4, task_name="adaptive_test", adaptive=True))
+        processor.redis_publisher = AsyncMock()
+
+        async def processor_func(item):
+            if item["id"] == "m0":
+                raise Exception("Rate limit exceeded after 4 attempts")
+            return {"name": item["name"]}
+
+        items = [{"id": f"m{i}", "name": f"item{i}"} for i in range(8)]
+        result = await processor.process_items(
+            session_id="s1",
+            items=items,
+            processor_func=processor_func,
+            db_updater_func=AsyncMock(return_value=True)
+        )
+
+        assert result["completed_items"] == 7
+        assert result["batch_size"] == 2
+        assert result["concurrency"]["adaptive"] is True
+        assert result["concurrency"]["initial"] == 4
+        assert result["concurrency"]["concurrency"] < 4
+        assert result["concurrency"]["peak_in_flight"] <= 4
+
+    @pytest.mark.asyncio
+    async def test_fixed_concurrency_reported_when_disabled(self):
+        processor = BatchProcessor(BatchConfig(batch_size=2, max_concurrent_batches=3, task_name="fixed_test", adaptive=False))
+        processor.redis_publisher = AsyncMock()
+
+        result = await processor.process_items(
+            session_id="s1",
+            items=[{"id": "m0", "name": "item0"}],
+            processor_func=AsyncMock(return_value={}),
+            db_updater_func=AsyncMock(return_value=True)
+        )
+
+        assert result["concurrency"] == {"adaptive": False, "concurrency": 3}
@@ -0,0 +1,125 @@
+"""
+Item Priority テスト
+位置・カテゴリ順・ビューポートヒントによる並べ替えと、BatchProcessor が優先度の高いバッチから開始することを検証
+"""
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app_2.infrastructure.integrations.redis.redis_viewport_hint import RedisViewportHint
+from app_2.tasks.batch_processor import BatchConfig, BatchProcessor
+from app_2.tasks.item_priority import pick_next_batch, rank_items
+
+
+def _items(*categories):
+    return [{"id": f"m{i}", "name": f"item{i}", "category": category} for i, category in enumerate(categories)]
+
+
+class TestRankItems:
+    """rank_items / pick_next_batch テスト"""
+
+    def test_position_and_category_order_without_hint(self):
+        items = _items("FOOD", "DRINK", "FOOD", "DESSERT")
+
+        assert [item["id"] for item in rank_items(items)] == ["m0", "m2", "m1", "m3"]
+
+    def test_viewport_hint_bumps_category(self):
+        items = _items("FOOD", "DRINK", "FOOD", "DESSERT")
+
+        ranked = rank_items(items, ["DESSERT", "DRINK"])
+
+        assert [item["id"] for item in ranked] == ["m3", "m1", "m0", "m2"]
+
+    def test_pick_next_batch_prefers_boosted_category(self):
+        pending = [(0, _items("FOOD")), (1, _items("FOOD")), (2, _items("DRINK"))]
+
+        assert pick_next_batch(pending, ["DRINK"])[0] == 2
+        assert pick_next_batch(pending)[0] == 0
+        assert [batch_idx for batch_idx, _ in pending] == [1]
+
+
+class FakeRedisList:
+    """LIST 操作のみを扱う Redis"""
+
+    def __init__(self):
+        self.lists = {}
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class Pipeline:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *args):
+                return False
+
+            def lrem(self, key, count, value):
+                redis.lists[key] = [v for v in redis.lists.get(key, []) if v != value]
+
+            def lpush(self, key, value):
+                redis.lists[key].insert(0, value)
+
+            def ltrim(self, key, start, end):
+                redis.lists[key] = redis.lists[key][start:end + 1]
+
+            def expire(self, key, seconds):
+                pass
+
+            async def execute(self):
+                return []
+
+        return Pipeline()
+
+    async def lrange(self, key, start, end):
+        return [value.encode() for value in self.lists.get(key, [])]
+
+
+class TestRedisViewportHint:
+    """RedisViewportHint テスト"""
+
+    @pytest.mark.asyncio
+    async def test_latest_hint_first_and_bounded(self):
+        redis_client = MagicMock()
+        raw_client = FakeRedisList()
+
+        @asynccontextmanager
+        async def get_connection():
+            yield raw_client
+
+        redis_client.get_connection = get_connection
+        viewport_hint = RedisViewportHint(redis_client)
+        viewport_hint.max_categories = 2
+
+        for category in ("FOOD", "DRINK", "FOOD", "DESSERT"):
+            assert await viewport_hint.set_hint("s1", category)
+
+        assert await viewport_hint.get_boosted_categories("s1") == ["DESSERT", "FOOD"]
+
+
+class TestBatchProcessorPriority:
+    """BatchProcessor の優先順処理テスト"""
+
+    @pytest.mark.asyncio
+    async def test_hinted_category_processed_first(self):
+        """表示中カテゴリのアイテムが一覧の末尾にあっても最初のバッチで処理されることを確認"""
+        processor = BatchProcessor(BatchConfig(batch_size=2, max_concurrent_batches=1, task_name="priority_test", adaptive=False))
+        processor.redis_publisher = AsyncMock()
+        processor.checkpoint = MagicMock(get_completed=AsyncMock(return_value=set()), mark_completed=AsyncMock())
+        processor.viewport_hint = MagicMock(get_boosted_categories=AsyncMock(return_value=["DRINK"]))
+        order = []
+
+        async def processor_func(item):
+            order.append(item["id"])
+            return {}
+
+        await processor.process_items(
+            session_id="s1",
+            items=_items("FOOD", "FOOD", "FOOD", "FOOD", "DRINK"),
+            processor_func=processor_func,
+            db_updater_func=AsyncMock(return_value=True)
+        )
+
+        assert order[0] == "m4"
+        assert sorted(order) == ["m0", "m1", "m2", "m3", "m4"]
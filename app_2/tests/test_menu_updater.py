@@ -0,0 +1,91 @@
+"""
+カラム限定メニュー更新テスト
+分散ロックなしで担当カラムのみを1文で更新することを検証
+"""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app_2.infrastructure.repositories.menu_repository_impl import MenuRepositoryImpl
+from app_2.tasks.menu_field_formatters import build_translation_fields
+from app_2.tasks.menu_updater import make_menu_column_updater
+
+
+def _mock_session(returned_id):
+    session = MagicMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = returned_id
+    session.execute = AsyncMock(return_value=result)
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    return session
+
+
+class TestUpdateColumns:
+    """MenuRepositoryImpl.update_columns テスト"""
+
+    @pytest.mark.asyncio
+    async def test_single_update_statement_without_select(self):
+        """SELECT なしの UPDATE 1文で担当カラムのみ更新されることを確認"""
+        session = _mock_session("m1")
+        repository = MenuRepositoryImpl(session)
+
+        updated = await repository.update_columns("m1", {"translation": "Karaage", "category_translation": "Food"})
+
+        assert updated is True
+        session.execute.assert_awaited_once()
+        sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE menus SET")
+        assert "translation=" in sql and "category_translation=" in sql
+        assert "description" not in sql and "SELECT" not in sql
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_row_returns_false(self):
+        """存在しないIDは False を返すことを確認"""
+        repository = MenuRepositoryImpl(_mock_session(None))
+        assert await repository.update_columns("missing", {"allergy": "None"}) is False
+
+    @pytest.mark.asyncio
+    async def test_unknown_fields_are_ignored(self):
+        """未知のカラムのみの場合はDBにアクセスしないことを確認"""
+        session = _mock_session("m1")
+        assert await MenuRepositoryImpl(session).update_columns("m1", {"not_a_column": 1}) is False
+        session.execute.assert_not_awaited()
+
+
+class TestMenuColumnUpdater:
+    """make_menu_column_updater テスト"""
+
+    @pytest.mark.asyncio
+    async def test_updates_without_redis_lock(self):
+        """Redis を使わずに担当カラムを更新することを確認"""
+        session = _mock_session("m1")
+        session_context = MagicMock()
+        session_context.__aenter__ = AsyncMock(return_value=session)
+        session_context.__aexit__ = AsyncMock(return_value=False)
+
+        updater = make_menu_column_updater("translation", build_translation_fields)
+        with patch("app_2.tasks.menu_updater.async_session_factory", return_value=session_context), \
+                patch("redis.asyncio.from_url") as redis_from_url:
+            assert await updater("m1", {"name": "Karaage", "category": "Food"}) is True
+
+        redis_from_url.assert_not_called()
+        session.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_retries_until_row_exists(self):
+        """行が未作成の場合はリトライすることを確認"""
+        sessions = [_mock_session(None), _mock_session("m1")]
+        contexts = []
+        for session in sessions:
+            context = MagicMock()
+            context.__aenter__ = AsyncMock(return_value=session)
+            context.__aexit__ = AsyncMock(return_value=False)
+            contexts.append(context)
+
+        updater = make_menu_column_updater("allergen", lambda data: {"allergy": "None"})
+        with patch("app_2.tasks.menu_updater.async_session_factory", side_effect=contexts), \
+                patch("app_2.tasks.menu_updater.asyncio.sleep", new=AsyncMock()):
+            assert await updater("m1", {}) is True
@@ -0,0 +1,79 @@
+"""
+MetricsRegistryテスト
+スパン計測・パーセンタイル・デコレータの検証
+"""
+import pytest
+
+from app_2.utils.metrics import MetricsRegistry, RollingHistogram, get_metrics_registry, timed
+
+
+class TestRollingHistogram:
+    """RollingHistogram 単体テスト"""
+
+    def test_percentiles(self):
+        """nearest-rank方式のパーセンタイルを確認"""
+        histogram = RollingHistogram(window_size=100)
+        for value in range(1, 101):
+            histogram.observe(value / 1000)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["p50_ms"] == 50.0
+        assert snapshot["p95_ms"] == 95.0
+        assert snapshot["p99_ms"] == 99.0
+        assert snapshot["max_ms"] == 100.0
+        assert snapshot["count"] == 100
+
+    def test_window_is_rolling(self):
+        """ウィンドウ外の古い値がパーセンタイルに影響しないことを確認"""
+        histogram = RollingHistogram(window_size=3)
+        for value in [10.0, 0.001, 0.001, 0.001]:
+            histogram.observe(value)
+
+        assert histogram.percentile(99) == 0.001
+        assert histogram.count == 4
+        assert histogram.max == 10.0
+
+
+class TestMetricsRegistry:
+    """MetricsRegistry 単体テスト"""
+
+    def test_span_records_duration(self):
+        """スパンが実測時間を記録することを確認"""
+        registry = MetricsRegistry()
+        with registry.span("pipeline.stage.ocr") as s:
+            pass
+
+        assert s.duration > 0
+        assert registry.get_histogram("pipeline.stage.ocr")["count"] == 1
+
+    def test_span_records_errors(self):
+        """例外発生時もエラーとして記録され、例外が再送出されることを確認"""
+        registry = MetricsRegistry()
+        with pytest.raises(RuntimeError):
+            with registry.span("external.openai.completion"):
+                raise RuntimeError("boom")
+
+        assert registry.get_histogram("external.openai.completion")["errors"] == 1
+
+    def test_snapshot_prefix_filter(self):
+        """プレフィックスでの絞り込みを確認"""
+        registry = MetricsRegistry()
+        registry.observe("pipeline.stage.ocr", 0.1)
+        registry.observe("redis.publish", 0.001)
+        registry.increment("pipeline.requests")
+
+        snapshot = registry.snapshot("pipeline.")
+        assert list(snapshot["histograms"]) == ["pipeline.stage.ocr"]
+        assert snapshot["counters"] == {"pipeline.requests": 1}
+
+    @pytest.mark.asyncio
+    async def test_timed_decorator_async(self):
+        """非同期関数へのデコレータ適用を確認"""
+        get_metrics_registry().reset()
+
+        @timed("test.async_call")
+        async def call():
+            return 42
+
+        assert await call() == 42
+        assert get_metrics_registry().get_histogram("test.async_call")["count"] == 1
@@ -2,12 +2,14 @@
 PromptLoaderテスト
 YAML基盤プロンプト管理システムの検証
 """
+import os
 import pytest
 import tempfile
+import yaml
 from pathlib import Path
 from unittest.mock import patch, mock_open
 
-from app_2.prompt_loader import PromptLoader
+from app_2.prompt_loader import CompiledTemplate, PromptLoader
 
 
 class TestPromptLoader:
@@ -181,4 +183,94 @@ class TestPromptLoaderIntegration:
                 )
                 assert isinstance(prompt_data, dict)
                 # system または user のいずれかは存在すべき
-                assert "system" in prompt_data or "user" in prompt_data 
\ No newline at end of file
+                assert "system" in prompt_data or "user" in prompt_data 
+
+class TestPromptLoaderCache:
+    """パース済みプロンプトキャッシュのテスト"""
+    
+    def _age_file(self, path: Path, seconds: float = 10.0):
+        """mtime を過去にずらし、キャッシュ済みエントリを信頼できる状態にする"""
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - int(seconds * 1e9)))
+    
+    def test_repeated_loads_parse_once(self, temp_prompts_dir):
+        """同一ファイルの繰り返し読み込みでYAMLを再パースしないことを確認"""
+        self._age_file(Path(temp_prompts_dir) / "openai" / "menu_analysis" / "description.yaml")
+        loader = PromptLoader(base_path=temp_prompts_dir)
+        
+        with patch("app_2.prompt_loader.yaml.safe_load", wraps=yaml.safe_load) as safe_load:
+            for _ in range(5):
+                loader.load_prompt("openai", "menu_analysis", "description")
+            loader.get_template("openai", "menu_analysis", "description", "user")
+        
+        assert safe_load.call_count == 1
+    
+    def test_file_change_invalidates_cache(self, temp_prompts_dir):
+        """ファイル内容が変わると新しい内容が返ることを確認（mtime粒度内の更新を含む）"""
+        yaml_path = Path(temp_prompts_dir) / "openai" / "menu_analysis" / "description.yaml"
+        loader = PromptLoader(base_path=temp_prompts_dir)
+        
+        before_hash = loader.get_prompt_hash("openai", "menu_analysis", "description")
+        yaml_path.write_text('system: "You are a culinary guide."\nuser: "{menu_item}"\n', encoding="utf-8")
+        
+        assert loader.get_system_prompt("openai", "menu_analysis", "description") == "You are a culinary guide."
+        assert loader.get_prompt_hash("openai", "menu_analysis", "description") != before_hash
+    
+    def test_touch_without_change_reloads_once(self, temp_prompts_dir):
+        """内容を変えずに mtime だけ変わった場合、1回だけ読み直し、以降はファイルを開かないことを確認"""
+        yaml_path = Path(temp_prompts_dir) / "openai" / "menu_analysis" / "description.yaml"
+        self._age_file(yaml_path, seconds=20.0)
+        loader = PromptLoader(base_path=temp_prompts_dir)
+        loader.load_prompt("openai", "menu_analysis", "description")
+        
+        self._age_file(yaml_path, seconds=-10.0)
+        with patch("app_2.prompt_loader.open", create=True, side_effect=open) as opened, \
+                patch("app_2.prompt_loader.yaml.safe_load", wraps=yaml.safe_load) as safe_load:
+            for _ in range(5):
+                loader.load_prompt("openai", "menu_analysis", "description")
+        
+        assert opened.call_count == 1
+        assert safe_load.call_count == 0
+    
+    def test_explicit_invalidate(self, temp_prompts_dir):
+        """invalidate() で次回読み込み時に再パースされることを確認"""
+        loader = PromptLoader(base_path=temp_prompts_dir)
+        loader.load_prompt("openai", "menu_analysis", "description")
+        
+        PromptLoader.invalidate()
+        with patch("app_2.prompt_loader.yaml.safe_load", wraps=yaml.safe_load) as safe_load:
+            loader.load_prompt("openai", "menu_analysis", "description")
+        
+        assert safe_load.call_count == 1
+    
+    def test_returned_data_is_isolated(self, temp_prompts_dir):
+        """呼び出し側で変更してもキャッシュに影響しないことを確認"""
+        loader = PromptLoader(base_path=temp_prompts_dir)
+        prompt = loader.load_prompt("openai", "menu_analysis", "description")
+        prompt["system"] = "mutated"
+        
+        assert loader.get_system_prompt("openai", "menu_analysis", "description") == "You are a culinary expert."
+    
+    def test_compiled_template_matches_str_format(self):
+        """事前解析済みテンプレートが str.format と同じ結果になることを確認"""
+        templates = [
+            "Dish: {menu_item}\nCategory: {category}",
+            "No variables",
+            "Price: {price:>5}",
+            "{{literal}} {menu_item}",
+        ]
+        for template in templates:
+            compiled = CompiledTemplate(template)
+            assert compiled.format(menu_item="寿司", category="FOOD", price=500) == template.format(
+                menu_item="寿司", category="FOOD", price=500
+            )
+        
+        with pytest.raises(KeyError):
+            CompiledTemplate("{menu_item} {category}").format(menu_item="寿司")
+    
+    def test_preload_all(self, temp_prompts_dir):
+        """preload_all で配下の全YAMLが読み込まれることを確認"""
+        loader = PromptLoader(base_path=temp_prompts_dir)
+        expected = len(list(Path(temp_prompts_dir).rglob("*.yaml")))
+        
+        assert loader.preload_all() == expected
@@ -0,0 +1,102 @@
+"""
+WorkerLoopRunnerテスト
+Celeryタスク間で常駐イベントループが再利用されることを検証
+"""
+import asyncio
+
+import pytest
+
+from app_2.core.worker_loop import WorkerLoopRunner
+
+
+@pytest.fixture
+def runner():
+    runner = WorkerLoopRunner()
+    runner.start()
+    yield runner
+    runner.stop()
+
+
+class TestWorkerLoopRunner:
+    """WorkerLoopRunner 単体テスト"""
+
+    def test_run_returns_result(self, runner):
+        """コルーチンの戻り値が返されることを確認"""
+        async def add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        assert runner.run(add(1, 2)) == 3
+
+    def test_loop_reused_across_calls(self, runner):
+        """複数回の実行で同じイベントループが使われることを確認"""
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = runner.run(current_loop())
+        second = runner.run(current_loop())
+
+        assert first is second
+        assert first is runner.loop
+
+    def test_loop_bound_resources_survive_between_calls(self, runner):
+        """ループに紐づくリソース（Lock等）が次のタスクでも利用できることを確認"""
+        holder = {}
+
+        async def create_lock():
+            holder["lock"] = asyncio.Lock()
+
+        async def use_lock():
+            async with holder["lock"]:
+                return True
+
+        runner.run(create_lock())
+        assert runner.run(use_lock()) is True
+
+    def test_exception_propagates(self, runner):
+        """コルーチン内の例外が呼び出し元へ送出されることを確認"""
+        async def failing():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            runner.run(failing())
+        assert runner.is_running()
+
+    def test_timeout_cancels_coroutine(self, runner):
+        """タイムアウト時にループ側のタスクが取り消されることを確認"""
+        cancelled = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(Exception):
+            runner.run(slow(), timeout=0.05)
+
+        async def wait_cancelled():
+            await asyncio.wait_for(cancelled.wait(), timeout=1)
+            return True
+
+        assert runner.run(wait_cancelled()) is True
+
+    def test_stop_runs_cleanup_and_restart(self):
+        """停止時にクリーンアップが実行され、再起動できることを確認"""
+        runner = WorkerLoopRunner()
+        runner.start()
+        cleaned = []
+
+        async def cleanup():
+            cleaned.append(True)
+
+        runner.stop(cleanup())
+        assert cleaned == [True]
+        assert not runner.is_running()
+
+        async def value():
+            return "restarted"
+
+        assert runner.run(value()) == "restarted"
+        runner.stop()
@@ -0,0 +1,128 @@
+"""
+Write-Behind バッファテスト
+メニュー部分更新が一括UPDATEにまとめられ、SSE配信がコミット後に行われることを検証
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app_2.tasks.batch_processor import BatchConfig, BatchProcessor
+from app_2.tasks.menu_field_formatters import build_translation_fields
+from app_2.tasks.write_behind import MenuWriteBehindBuffer
+
+
+class RecordingFlush:
+    """フラッシュ呼び出しを記録し、指定IDを未更新として返す"""
+
+    def __init__(self, missing=()):
+        self.calls = []
+        self.missing = set(missing)
+
+    async def __call__(self, updates):
+        self.calls.append({key: dict(fields) for key, fields in updates.items()})
+        updated = [key for key in updates if key not in self.missing]
+        self.missing.clear()
+        return updated
+
+
+class TestMenuWriteBehindBuffer:
+    """MenuWriteBehindBuffer テスト"""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_updates_into_single_flush(self):
+        """待機時間内の更新が1回のフラッシュにまとめられ、同一IDのフィールドが結合されることを確認"""
+        flush = RecordingFlush()
+        buffer = MenuWriteBehindBuffer(max_items=10, max_latency_seconds=0.01, flush_func=flush)
+
+        futures = [
+            buffer.enqueue("m1", {"translation": "Karaage"}),
+            buffer.enqueue("m2", {"translation": "Ramen"}),
+            buffer.enqueue("m1", {"category_translation": "Food"})
+        ]
+        results = await asyncio.gather(*futures)
+
+        assert results == [True, True, True]
+        assert flush.calls == [{
+            "m1": {"translation": "Karaage", "category_translation": "Food"},
+            "m2": {"translation": "Ramen"}
+        }]
+
+    @pytest.mark.asyncio
+    async def test_flushes_when_size_bound_reached(self):
+        """件数上限に達すると待機時間を待たずにフラッシュされることを確認"""
+        flush = RecordingFlush()
+        buffer = MenuWriteBehindBuffer(max_items=2, max_latency_seconds=60, flush_func=flush)
+
+        results = await asyncio.wait_for(asyncio.gather(
+            buffer.add("m1", {"allergy": "None"}),
+            buffer.add("m2", {"allergy": "egg"})
+        ), timeout=1)
+
+        assert results == [True, True]
+        assert len(flush.calls) == 1
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    async def test_missing_rows_are_retried(self):
+        """更新されなかったIDが次回フラッシュで再試行されることを確認"""
+        flush = RecordingFlush(missing={"m2"})
+        buffer = MenuWriteBehindBuffer(
+            max_items=10, max_latency_seconds=0, retry_delay_seconds=0, flush_func=flush
+        )
+
+        results = await asyncio.gather(
+            buffer.add("m1", {"ingredient": "rice"}),
+            buffer.add("m2", {"ingredient": "nori"})
+        )
+
+        assert results == [True, True]
+        assert [set(call) for call in flush.calls] == [{"m1", "m2"}, {"m2"}]
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        """フラッシュが失敗し続けると max_attempts 回で False を返すことを確認"""
+        flush_func = AsyncMock(side_effect=RuntimeError("db down"))
+        buffer = MenuWriteBehindBuffer(
+            max_items=10, max_latency_seconds=0, max_attempts=2, retry_delay_seconds=0, flush_func=flush_func
+        )
+
+        assert await buffer.add("m1", {"description": "x"}) is False
+        assert flush_func.await_count == 2
+
+
+class TestBatchProcessorWriteBehind:
+    """BatchProcessor の write-behind 経路テスト"""
+
+    @pytest.mark.asyncio
+    async def test_batch_written_once_and_published_after_commit(self):
+        """バッチ内の全アイテムが1回の一括更新で書き込まれ、その後にSSE配信されることを確認"""
+        events = []
+        flush = RecordingFlush()
+
+        async def recording_flush(updates):
+            events.append("flush")
+            return await flush(updates)
+
+        processor = BatchProcessor(BatchConfig(batch_size=3, task_name="translation"))
+        processor.redis_publisher = AsyncMock()
+        processor.redis_publisher.publish_menu_update.side_effect = lambda **kwargs: events.append("publish")
+        db_updater_func = AsyncMock(return_value=True)
+
+        items = [{"id": f"m{i}", "name": f"item{i}", "category": "FOOD"} for i in range(3)]
+
+        with patch("app_2.tasks.batch_processor.MenuWriteBehindBuffer",
+                   lambda name: MenuWriteBehindBuffer(name=name, max_latency_seconds=60, flush_func=recording_flush)):
+            result = await asyncio.wait_for(processor.process_items(
+                session_id="s1",
+                items=items,
+                processor_func=AsyncMock(return_value={"name": "Karaage", "category": "Food"}),
+                db_updater_func=db_updater_func,
+                field_builder_func=build_translation_fields
+            ), timeout=1)
+
+        db_updater_func.assert_not_awaited()
+        assert len(flush.calls) == 1
+        assert flush.calls[0]["m0"] == {"translation": "Karaage", "category_translation": "Food"}
+        assert events == ["flush", "publish", "publish", "publish"]
+        assert result["completed_items"] == 3
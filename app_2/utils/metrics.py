@@ -0,0 +1,198 @@
+"""
+Metrics Utility - Menu Processor v2
+プロセス内の軽量メトリクス（処理時間スパン・ローリングヒストグラム・カウンター・ゲージ）
+
+使い方:
+    with span("pipeline.stage.ocr") as s:
+        ...
+    s.duration  # 実測時間（秒）
+
+    @timed("external.google_vision.document_text_detection")
+    async def call(): ...
+"""
+import asyncio
+import functools
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+
+class Span:
+    """1回分の計測結果"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.perf_counter()
+        self.duration: float = 0.0
+        self.success = True
+
+
+class RollingHistogram:
+    """
+    直近 window_size 件の観測値を保持するヒストグラム
+
+    パーセンタイルは直近ウィンドウから、件数・合計・最大は累計で算出する
+    """
+
+    def __init__(self, window_size: int = 1024):
+        self._values: Deque[float] = deque(maxlen=window_size)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+
+    def observe(self, value: float, success: bool = True) -> None:
+        self._values.append(value)
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        if not success:
+            self.errors += 1
+
+    def percentile(self, q: float) -> float:
+        """直近ウィンドウの q パーセンタイル（0〜100, nearest-rank）"""
+        if not self._values:
+            return 0.0
+        ordered = sorted(self._values)
+        index = max(math.ceil(q / 100.0 * len(ordered)) - 1, 0)
+        return ordered[min(index, len(ordered) - 1)]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 2),
+            "p95_ms": round(self.percentile(95) * 1000, 2),
+            "p99_ms": round(self.percentile(99) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2),
+            "window": len(self._values)
+        }
+
+
+class MetricsRegistry:
+    """
+    メトリクスレジストリ（スレッドセーフ）
+
+    Celeryワーカー・APIプロセスそれぞれで独立して集計される
+    """
+
+    def __init__(self, window_size: int = 1024):
+        self.window_size = window_size
+        self._histograms: Dict[str, RollingHistogram] = {}
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+
+    def observe(self, name: str, seconds: float, success: bool = True) -> None:
+        """処理時間を記録"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = RollingHistogram(self.window_size)
+            histogram.observe(seconds, success)
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """カウンターを加算"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """ゲージを設定"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def get_counter(self, name: str) -> float:
+        return self._counters.get(name, 0)
+
+    def get_gauge(self, name: str) -> Optional[float]:
+        return self._gauges.get(name)
+
+    def get_histogram(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            return histogram.snapshot() if histogram else None
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Span]:
+        """
+        処理時間を計測するコンテキストマネージャ
+
+        例外発生時もエラーとして記録し、例外はそのまま再送出する
+        """
+        current = Span(name)
+        try:
+            yield current
+        except BaseException:
+            current.success = False
+            raise
+        finally:
+            current.duration = time.perf_counter() - current.started_at
+            self.observe(name, current.duration, current.success)
+
+    def snapshot(self, prefix: Optional[str] = None) -> Dict[str, Any]:
+        """全メトリクスのスナップショット"""
+        with self._lock:
+            def _match(name: str) -> bool:
+                return prefix is None or name.startswith(prefix)
+
+            return {
+                "uptime_seconds": round(time.time() - self._started_at, 1),
+                "histograms": {
+                    name: histogram.snapshot()
+                    for name, histogram in sorted(self._histograms.items()) if _match(name)
+                },
+                "counters": {name: value for name, value in sorted(self._counters.items()) if _match(name)},
+                "gauges": {name: value for name, value in sorted(self._gauges.items()) if _match(name)}
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+
+@lru_cache(maxsize=1)
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    MetricsRegistryのシングルトンインスタンスを取得
+
+    Returns:
+        MetricsRegistry: メトリクスレジストリ
+    """
+    return MetricsRegistry()
+
+
+def span(name: str):
+    """グローバルレジストリで処理時間を計測"""
+    return get_metrics_registry().span(name)
+
+
+def timed(name: str) -> Callable:
+    """
+    関数の処理時間を計測するデコレータ（同期・非同期両対応）
+
+    Args:
+        name: メトリクス名
+    """
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return sync_wrapper
+
+    return decorator